@@ -0,0 +1,42 @@
+"""add on delete cascade foreign keys for content tables
+
+Revision ID: 030
+Revises: 029
+Create Date: 2026-10-19 10:00:00.000000
+
+chapters/paragraphs/sentences 的外键在 004 中只建了索引、没有约束。
+这里补上 ON DELETE CASCADE 约束，使用 NOT VALID 避免在存量数据上全表校验，
+也不会因历史孤儿行导致迁移失败；新写入的行仍然会被校验。
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "030"
+down_revision = "029"
+branch_labels = None
+depends_on = None
+
+
+_CONSTRAINTS = [
+    ("sentences", "sentences_paragraph_id_fkey", "paragraph_id", "paragraphs"),
+    ("paragraphs", "paragraphs_chapter_id_fkey", "chapter_id", "chapters"),
+    ("chapters", "chapters_project_id_fkey", "project_id", "projects"),
+]
+
+
+def upgrade():
+    for table, name, column, referred in _CONSTRAINTS:
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}")
+        op.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {name} "
+            f"FOREIGN KEY ({column}) REFERENCES {referred} (id) "
+            f"ON DELETE CASCADE NOT VALID"
+        )
+
+
+def downgrade():
+    for table, name, _column, _referred in reversed(_CONSTRAINTS):
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}")
@@ -0,0 +1,82 @@
+"""denormalize project_id/chapter_id onto paragraphs and sentences
+
+Revision ID: 031
+Revises: 030
+Create Date: 2026-10-19 11:00:00.000000
+
+paragraphs 增加 project_id；sentences 增加 chapter_id、project_id、paragraph_order。
+回填存量数据后设为 NOT NULL，并建立章节渲染和按项目统计使用的组合索引。
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "031"
+down_revision = "030"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 1. 新增冗余列（先允许为空，便于回填）
+    op.add_column(
+        "paragraphs",
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), nullable=True, comment="项目ID（冗余，外键索引，无约束）"),
+    )
+    op.add_column(
+        "sentences",
+        sa.Column("chapter_id", postgresql.UUID(as_uuid=True), nullable=True, comment="章节ID（冗余，外键索引，无约束）"),
+    )
+    op.add_column(
+        "sentences",
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), nullable=True, comment="项目ID（冗余，外键索引，无约束）"),
+    )
+    op.add_column(
+        "sentences",
+        sa.Column("paragraph_order", sa.Integer(), nullable=True, comment="所属段落在章节中的顺序（冗余）"),
+    )
+
+    # 2. 回填
+    op.execute("""
+        UPDATE paragraphs p
+        SET project_id = c.project_id
+        FROM chapters c
+        WHERE p.chapter_id = c.id
+    """)
+    op.execute("""
+        UPDATE sentences s
+        SET chapter_id = p.chapter_id,
+            project_id = p.project_id,
+            paragraph_order = p.order_index
+        FROM paragraphs p
+        WHERE s.paragraph_id = p.id
+    """)
+
+    # 3. 清理无法回填的孤儿行，然后加非空约束
+    op.execute("DELETE FROM sentences WHERE project_id IS NULL")
+    op.execute("DELETE FROM paragraphs WHERE project_id IS NULL")
+    op.alter_column("paragraphs", "project_id", nullable=False)
+    op.alter_column("sentences", "chapter_id", nullable=False)
+    op.alter_column("sentences", "project_id", nullable=False)
+    op.alter_column("sentences", "paragraph_order", nullable=False, server_default="0")
+
+    # 4. 组合索引
+    op.create_index("idx_paragraph_project", "paragraphs", ["project_id"])
+    op.create_index("idx_paragraph_chapter_order", "paragraphs", ["chapter_id", "order_index"])
+    op.create_index("idx_sentence_chapter_order", "sentences", ["chapter_id", "paragraph_order", "order_index"])
+    op.create_index("idx_sentence_project_status", "sentences", ["project_id", "status"])
+
+
+def downgrade():
+    op.drop_index("idx_sentence_project_status", table_name="sentences")
+    op.drop_index("idx_sentence_chapter_order", table_name="sentences")
+    op.drop_index("idx_paragraph_chapter_order", table_name="paragraphs")
+    op.drop_index("idx_paragraph_project", table_name="paragraphs")
+
+    op.drop_column("sentences", "paragraph_order")
+    op.drop_column("sentences", "project_id")
+    op.drop_column("sentences", "chapter_id")
+    op.drop_column("paragraphs", "project_id")
@@ -0,0 +1,56 @@
+"""create statistics_counters table
+
+Revision ID: 032
+Revises: 031
+Create Date: 2026-10-19 12:00:00.000000
+
+仪表盘统计的物化计数表：每个项目一行、每个用户一行。
+表创建后为空，首次读取或定时对账任务会回填。
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "032"
+down_revision = "031"
+branch_labels = None
+depends_on = None
+
+COUNTER_COLUMNS = (
+    ("chapter_count", "章节数量"),
+    ("paragraph_count", "段落数量"),
+    ("sentence_count", "句子数量"),
+    ("prompt_count", "已生成提示词的句子数"),
+    ("image_count", "已生成图片的句子数"),
+    ("audio_count", "已生成音频的句子数"),
+    ("video_count", "已生成视频的章节数"),
+    ("video_task_count", "已完成的视频任务数"),
+)
+
+
+def upgrade():
+    op.create_table(
+        "statistics_counters",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False, comment="主键ID"),
+        sa.Column("scope_type", sa.String(length=20), nullable=False, comment="统计范围: user/project"),
+        sa.Column("scope_id", postgresql.UUID(as_uuid=True), nullable=False, comment="用户ID或项目ID"),
+        sa.Column("owner_id", postgresql.UUID(as_uuid=True), nullable=False, comment="所属用户ID（外键索引，无约束）"),
+        *[
+            sa.Column(name, sa.Integer(), nullable=False, server_default="0", comment=comment)
+            for name, comment in COUNTER_COLUMNS
+        ],
+        sa.Column("reconciled_at", sa.DateTime(timezone=True), nullable=True, comment="最近一次全量对账时间"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, comment="创建时间"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, comment="更新时间"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("scope_type", "scope_id", name="uq_statistics_scope"),
+    )
+    op.create_index("idx_statistics_owner", "statistics_counters", ["owner_id"])
+
+
+def downgrade():
+    op.drop_index("idx_statistics_owner", table_name="statistics_counters")
+    op.drop_table("statistics_counters")
@@ -0,0 +1,48 @@
+"""add chapter listing indexes (keyset pagination + trigram search)
+
+Revision ID: 033
+Revises: 032
+Create Date: 2026-10-19 13:00:00.000000
+
+启用 pg_trgm 扩展，为章节标题/正文建立 gin_trgm_ops 索引，ILIKE '%词%' 搜索可走索引；
+并为项目内按章节序号的键集分页建立 (project_id, chapter_number, id) 组合索引。
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "033"
+down_revision = "032"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.create_index(
+        "idx_chapter_project_number",
+        "chapters",
+        ["project_id", "chapter_number", "id"],
+    )
+    op.create_index(
+        "idx_chapter_title_trgm",
+        "chapters",
+        ["title"],
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "idx_chapter_content_trgm",
+        "chapters",
+        ["content"],
+        postgresql_using="gin",
+        postgresql_ops={"content": "gin_trgm_ops"},
+    )
+
+
+def downgrade():
+    op.drop_index("idx_chapter_content_trgm", table_name="chapters")
+    op.drop_index("idx_chapter_title_trgm", table_name="chapters")
+    op.drop_index("idx_chapter_project_number", table_name="chapters")
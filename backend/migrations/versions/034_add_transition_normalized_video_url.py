@@ -0,0 +1,35 @@
+"""add normalized_video_url to movie_shot_transitions
+
+Revision ID: 034
+Revises: 033
+Create Date: 2026-10-19 14:00:00.000000
+
+过渡视频入库时统一转码为拼接规范并单独存储，电影合成时直接 concat 流拷贝。
+旧数据该字段为空，合成时按需规范化并回填。
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "034"
+down_revision = "033"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "movie_shot_transitions",
+        sa.Column(
+            "normalized_video_url",
+            sa.String(length=500),
+            nullable=True,
+            comment="规范化后的视频URL（统一编码参数，拼接时直接流拷贝）",
+        ),
+    )
+
+
+def downgrade():
+    op.drop_column("movie_shot_transitions", "normalized_video_url")
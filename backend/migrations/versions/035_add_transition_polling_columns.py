@@ -0,0 +1,52 @@
+"""add remote task polling columns to movie_shot_transitions
+
+Revision ID: 035
+Revises: 034
+Create Date: 2026-10-19 15:00:00.000000
+
+过渡视频远程任务状态轮询：记录提交时间、下次查询时间和查询次数，
+轮询器按 (status, next_status_check_at) 取出到期的任务并按任务退避。
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "035"
+down_revision = "034"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "movie_shot_transitions",
+        sa.Column("video_submitted_at", sa.DateTime(timezone=True), nullable=True, comment="视频任务提交时间"),
+    )
+    op.add_column(
+        "movie_shot_transitions",
+        sa.Column("next_status_check_at", sa.DateTime(timezone=True), nullable=True, comment="下次查询任务状态的时间"),
+    )
+    op.add_column(
+        "movie_shot_transitions",
+        sa.Column(
+            "status_check_count",
+            sa.Integer(),
+            nullable=False,
+            server_default="0",
+            comment="已查询状态次数",
+        ),
+    )
+    op.create_index(
+        "idx_transition_status_next_check",
+        "movie_shot_transitions",
+        ["status", "next_status_check_at"],
+    )
+
+
+def downgrade():
+    op.drop_index("idx_transition_status_next_check", table_name="movie_shot_transitions")
+    op.drop_column("movie_shot_transitions", "status_check_count")
+    op.drop_column("movie_shot_transitions", "next_status_check_at")
+    op.drop_column("movie_shot_transitions", "video_submitted_at")
@@ -0,0 +1,29 @@
+"""add time_breakdown to video_tasks
+
+Revision ID: 036
+Revises: 035
+Create Date: 2026-10-19 16:00:00.000000
+
+视频任务保存链路追踪得到的各阶段耗时汇总。
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "036"
+down_revision = "035"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "video_tasks",
+        sa.Column("time_breakdown", sa.JSON(), nullable=True, comment="各阶段耗时汇总（trace_id/total_seconds/stages）"),
+    )
+
+
+def downgrade():
+    op.drop_column("video_tasks", "time_breakdown")
@@ -0,0 +1,29 @@
+"""add audio_timeline to sentences
+
+Revision ID: 037
+Revises: 036
+Create Date: 2026-10-19 17:00:00.000000
+
+保存 TTS 服务返回的字/词时间轴，生成字幕时直接使用，不再识别或对齐音频。
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "037"
+down_revision = "036"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "sentences",
+        sa.Column("audio_timeline", sa.JSON(), nullable=True, comment="TTS返回的字/词时间轴 [{text, start, end}]"),
+    )
+
+
+def downgrade():
+    op.drop_column("sentences", "audio_timeline")
@@ -0,0 +1,36 @@
+"""add image derivative format columns
+
+Revision ID: 038
+Revises: 037
+Create Date: 2026-10-19 18:00:00.000000
+
+记录图片缩略图/预览图是否已生成及其格式，接口只为已生成衍生图的图片签发衍生图URL。
+已有图片由 scripts/backfill_image_derivatives.py 补生成并回填。
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "038"
+down_revision = "037"
+branch_labels = None
+depends_on = None
+
+COLUMNS = (
+    ("sentences", "image_derivative_format", "图片衍生图格式（webp/avif），为空表示没有衍生图"),
+    ("movie_scenes", "scene_image_derivative_format", "场景图衍生图格式（webp/avif），为空表示没有衍生图"),
+    ("movie_shots", "keyframe_derivative_format", "关键帧衍生图格式（webp/avif），为空表示没有衍生图"),
+    ("movie_characters", "avatar_derivative_format", "头像衍生图格式（webp/avif），为空表示没有衍生图"),
+)
+
+
+def upgrade():
+    for table, column, comment in COLUMNS:
+        op.add_column(table, sa.Column(column, sa.String(length=8), nullable=True, comment=comment))
+
+
+def downgrade():
+    for table, column, _ in reversed(COLUMNS):
+        op.drop_column(table, column)
@@ -0,0 +1,138 @@
+"""
+补生成已有图片的缩略图和预览图
+
+衍生图在图片入库时生成；启用衍生图之前生成的图片用本脚本补齐，
+并把衍生图格式记录到原图键旁边的字段，接口据此签发衍生图URL。
+已记录衍生图的图片默认跳过；存储中已有衍生图但未记录的只补记录。
+
+使用方法:
+python scripts/backfill_image_derivatives.py
+python scripts/backfill_image_derivatives.py --concurrency 8 --limit 1000
+python scripts/backfill_image_derivatives.py --force  # 重新生成已存在的衍生图
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import select, update
+
+from src.core.database import get_async_db
+from src.models import CanvasItem, MovieCharacter, MovieScene, MovieShot, Sentence
+from src.utils.image_derivatives import (
+    DERIVATIVE_VARIANTS,
+    create_image_derivatives,
+    get_derivative_format,
+    get_derivative_key,
+)
+from src.utils.storage import get_storage_client
+
+# (模型, 原图键字段, 衍生图格式字段)
+IMAGE_COLUMNS = (
+    (Sentence, "image_url", "image_derivative_format"),
+    (MovieShot, "keyframe_url", "keyframe_derivative_format"),
+    (MovieScene, "scene_image_url", "scene_image_derivative_format"),
+    (MovieCharacter, "avatar_url", "avatar_derivative_format"),
+)
+
+# 每条 UPDATE 的键数量
+UPDATE_BATCH_SIZE = 500
+
+
+async def collect_image_keys(force: bool) -> List[str]:
+    """收集需要处理的生成图片对象键（跳过外部URL；不强制时跳过已记录衍生图的图片）"""
+    keys = set()
+    async with get_async_db() as db:
+        for model, key_field, format_field in IMAGE_COLUMNS:
+            column = getattr(model, key_field)
+            query = select(column).where(column.isnot(None))
+            if not force:
+                query = query.where(getattr(model, format_field).is_(None))
+            result = await db.execute(query)
+            keys.update(value for value in result.scalars() if value)
+
+        result = await db.execute(select(CanvasItem.content_json))
+        for content in result.scalars():
+            value = (content or {}).get("result_image_object_key")
+            if value and (force or ((content or {}).get("result_image_derivatives") or {}).get("object_key") != value):
+                keys.add(str(value))
+    return sorted(key for key in keys if get_derivative_key(key, DERIVATIVE_VARIANTS[0]))
+
+
+async def record_derivative_format(keys: List[str], image_format: str) -> None:
+    """把衍生图格式写入引用这些对象键的记录"""
+    async with get_async_db() as db:
+        for start in range(0, len(keys), UPDATE_BATCH_SIZE):
+            batch = keys[start:start + UPDATE_BATCH_SIZE]
+            for model, key_field, format_field in IMAGE_COLUMNS:
+                await db.execute(
+                    update(model)
+                    .where(getattr(model, key_field).in_(batch))
+                    .values({format_field: image_format})
+                )
+
+        key_set = set(keys)
+        result = await db.execute(select(CanvasItem))
+        for item in result.scalars():
+            content = item.content_json or {}
+            object_key = content.get("result_image_object_key")
+            if object_key in key_set:
+                item.content_json = {
+                    **content,
+                    "result_image_derivatives": {"object_key": object_key, "format": image_format},
+                }
+        await db.commit()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="补生成图片衍生图")
+    parser.add_argument("--concurrency", type=int, default=4, help="并发数")
+    parser.add_argument("--limit", type=int, help="最多处理的图片数")
+    parser.add_argument("--force", action="store_true", help="衍生图已存在时也重新生成")
+    args = parser.parse_args()
+
+    keys = await collect_image_keys(args.force)
+    if args.limit:
+        keys = keys[:args.limit]
+    print(f"共 {len(keys)} 张图片")
+
+    storage = await get_storage_client()
+    semaphore = asyncio.Semaphore(args.concurrency)
+    current_format = get_derivative_format()
+    counts = {"generated": 0, "recorded": 0, "failed": 0}
+    formats: Dict[str, List[str]] = {}
+
+    async def process(key: str):
+        async with semaphore:
+            if not args.force and await storage.file_exists(get_derivative_key(key, DERIVATIVE_VARIANTS[-1])):
+                formats.setdefault(current_format, []).append(key)
+                counts["recorded"] += 1
+                return
+            if not await storage.file_exists(key):
+                counts["failed"] += 1
+                return
+            image_format = await create_image_derivatives(key)
+            if image_format:
+                formats.setdefault(image_format, []).append(key)
+                counts["generated"] += 1
+            else:
+                counts["failed"] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(process(key) for key in keys))
+    for image_format, format_keys in formats.items():
+        await record_derivative_format(sorted(format_keys), image_format)
+    print(
+        f"完成: 生成 {counts['generated']}，补记录 {counts['recorded']}，失败 {counts['failed']}，"
+        f"耗时 {time.perf_counter() - start:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,143 @@
+"""
+编码档位基准测试 - 统计每个档位、每种 Ken Burns 渲染方式的编码耗时
+
+对每个组合用单句视频命令（Ken Burns + 音频）编码同一份素材，记录编码耗时、
+每分钟输出耗时（encode seconds per output minute）、渲染帧率和文件大小。
+
+使用方法:
+python scripts/benchmark_encoding_profiles.py  # 使用合成的测试图片和音频
+python scripts/benchmark_encoding_profiles.py --image <图片> --audio <音频>
+python scripts/benchmark_encoding_profiles.py --duration 30 --repeat 3 --output results.json
+python scripts/benchmark_encoding_profiles.py --renderers zoompan scale_crop --profiles mezzanine
+"""
+
+import argparse
+import json
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.ffmpeg_utils import (
+    CLIP_ENCODING_PROFILE_KEY,
+    ENCODING_PROFILES,
+    KEN_BURNS_RENDERERS,
+    build_sentence_video_command,
+    check_ffmpeg_installed,
+    get_audio_duration,
+    prepare_ken_burns_still,
+    run_ffmpeg_command,
+)
+
+
+def create_sample_materials(work_dir: Path, duration: float, resolution: str):
+    """生成测试图片和正弦波音频"""
+    image_path = work_dir / "sample.png"
+    audio_path = work_dir / "sample.mp3"
+    ok, _, stderr = run_ffmpeg_command([
+        "ffmpeg", "-y", "-f", "lavfi", "-i", f"testsrc2=size={resolution}:duration=1",
+        "-frames:v", "1", str(image_path)
+    ])
+    if not ok:
+        raise RuntimeError(f"生成测试图片失败: {stderr}")
+    ok, _, stderr = run_ffmpeg_command([
+        "ffmpeg", "-y", "-f", "lavfi", "-i", f"sine=frequency=440:duration={duration}",
+        "-b:a", "192k", str(audio_path)
+    ])
+    if not ok:
+        raise RuntimeError(f"生成测试音频失败: {stderr}")
+    return image_path, audio_path
+
+
+def benchmark_profile(profile: str, renderer: str, image_path: Path, audio_path: Path, work_dir: Path, args) -> dict:
+    """用指定档位和渲染方式编码 repeat 次，返回统计结果"""
+    gen_setting = {
+        "resolution": args.resolution,
+        "fps": args.fps,
+        "ken_burns_renderer": renderer,
+        CLIP_ENCODING_PROFILE_KEY: profile,
+    }
+    if renderer == "scale_crop":
+        # 与正式流程一致：画布静帧预先生成一次（不计入耗时）
+        still_path = work_dir / "still.png"
+        if not still_path.exists() and not prepare_ken_burns_still(str(image_path), str(still_path), args.resolution):
+            raise RuntimeError("生成Ken Burns静帧失败")
+        image_path = still_path
+    output_path = work_dir / f"{renderer}_{profile}.mp4"
+    command = build_sentence_video_command(str(image_path), str(audio_path), str(output_path), "", gen_setting)
+
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        ok, _, stderr = run_ffmpeg_command(command, timeout=3600)
+        if not ok:
+            raise RuntimeError(f"档位 {profile} 编码失败: {stderr}")
+        timings.append(time.perf_counter() - start)
+
+    output_seconds = get_audio_duration(str(output_path)) or 0
+    output_minutes = output_seconds / 60
+    encode_seconds = statistics.median(timings)
+    return {
+        "profile": profile,
+        "renderer": renderer,
+        "encode_seconds": round(encode_seconds, 3),
+        "output_minutes": round(output_minutes, 3),
+        "encode_seconds_per_output_minute": round(encode_seconds / output_minutes, 3) if output_minutes else None,
+        "frames_per_second": round(output_seconds * args.fps / encode_seconds, 1) if encode_seconds else None,
+        "size_bytes": output_path.stat().st_size,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="编码档位基准测试")
+    parser.add_argument("--image", help="图片路径（不传则生成测试图片）")
+    parser.add_argument("--audio", help="音频路径（不传则生成测试音频）")
+    parser.add_argument("--duration", type=float, default=20.0, help="生成测试音频的时长（秒）")
+    parser.add_argument("--resolution", default="1440x1080", help="输出分辨率")
+    parser.add_argument("--fps", type=int, default=30, help="输出帧率")
+    parser.add_argument("--repeat", type=int, default=1, help="每个档位重复次数（取中位数）")
+    parser.add_argument("--profiles", nargs="+", default=list(ENCODING_PROFILES), help="要测试的档位")
+    parser.add_argument("--renderers", nargs="+", default=list(KEN_BURNS_RENDERERS), help="要测试的Ken Burns渲染方式")
+    parser.add_argument("--output", help="结果保存为JSON文件")
+    args = parser.parse_args()
+
+    if not check_ffmpeg_installed():
+        print("FFmpeg未安装或不可用")
+        sys.exit(1)
+
+    work_dir = Path(tempfile.mkdtemp(prefix="encoding_bench_"))
+    try:
+        if args.image and args.audio:
+            image_path, audio_path = Path(args.image), Path(args.audio)
+        else:
+            image_path, audio_path = create_sample_materials(work_dir, args.duration, args.resolution)
+
+        results = [
+            benchmark_profile(profile, renderer, image_path, audio_path, work_dir, args)
+            for renderer in args.renderers
+            for profile in args.profiles
+        ]
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"{'渲染':<12}{'档位':<12}{'编码耗时(s)':>14}{'输出(min)':>12}{'s/输出分钟':>14}{'fps':>10}{'大小(MB)':>12}")
+    for r in results:
+        print(
+            f"{r['renderer']:<12}{r['profile']:<12}{r['encode_seconds']:>14.2f}{r['output_minutes']:>12.2f}"
+            f"{r['encode_seconds_per_output_minute'] or 0:>14.2f}{r['frames_per_second'] or 0:>10.1f}"
+            f"{r['size_bytes'] / 1024 / 1024:>12.2f}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"resolution": args.resolution, "fps": args.fps, "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"结果已保存: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+字幕时间轴基准测试 - 强制对齐与 Whisper 识别的质量和耗时对比
+
+以 Whisper 词级时间轴为参照，统计强制对齐逐字开始时间的误差；同时统计 Whisper 识别文本
+与原文的字错误率（强制对齐的文字就是原文），以及两种方式的耗时。
+
+使用方法:
+python scripts/benchmark_subtitle_alignment.py --audio <音频> --text "<原文>"
+python scripts/benchmark_subtitle_alignment.py --manifest samples.json  # [{"audio": "...", "text": "..."}]
+python scripts/benchmark_subtitle_alignment.py --manifest samples.json --output results.json
+"""
+
+import argparse
+import difflib
+import json
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.services.subtitle_service import subtitle_service
+
+_PUNCTUATION = re.compile(r'[，。！？；、,\.!?;:：\'"“”‘’()（）\[\]{}<>《》…—\-\s]')
+
+
+def char_timeline(subtitle_data: dict) -> List[Tuple[str, float]]:
+    """时间轴展开为逐字 (字, 开始时间)，多字的词在词内等分"""
+    chars = []
+    for segment in subtitle_data.get("segments", []):
+        for word in segment.get("words", []):
+            text = _PUNCTUATION.sub("", word.get("word", ""))
+            if not text:
+                continue
+            step = (word["end"] - word["start"]) / len(text)
+            chars.extend((ch, word["start"] + i * step) for i, ch in enumerate(text))
+    return chars
+
+
+def compare(forced: dict, whisper: dict, text: str) -> Dict:
+    """对比两份时间轴：匹配上的字的开始时间误差，以及 Whisper 的字错误率"""
+    forced_chars = char_timeline(forced)
+    whisper_chars = char_timeline(whisper)
+    reference = _PUNCTUATION.sub("", text)
+    recognized = "".join(ch for ch, _ in whisper_chars)
+
+    matcher = difflib.SequenceMatcher(None, "".join(ch for ch, _ in forced_chars), recognized, autojunk=False)
+    errors = []
+    for block in matcher.get_matching_blocks():
+        for k in range(block.size):
+            errors.append(abs(forced_chars[block.a + k][1] - whisper_chars[block.b + k][1]))
+
+    edit_ops = difflib.SequenceMatcher(None, reference, recognized, autojunk=False).get_opcodes()
+    edits = sum(max(i2 - i1, j2 - j1) for tag, i1, i2, j1, j2 in edit_ops if tag != "equal")
+    errors.sort()
+    return {
+        "matched_chars": len(errors),
+        "mean_abs_error": round(statistics.mean(errors), 3) if errors else None,
+        "p90_abs_error": round(errors[min(len(errors) - 1, int(len(errors) * 0.9))], 3) if errors else None,
+        "whisper_cer": round(edits / len(reference), 3) if reference else None,
+    }
+
+
+def run_sample(audio: str, text: str) -> Dict:
+    start = time.perf_counter()
+    forced = subtitle_service.generate_subtitle_timeline(audio, text, alignment="forced")
+    forced_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    whisper = subtitle_service.generate_subtitle_timeline(audio, text, alignment="whisper")
+    whisper_seconds = time.perf_counter() - start
+
+    return {
+        "audio": audio,
+        "duration": round(forced.get("duration", 0), 3),
+        "forced_seconds": round(forced_seconds, 3),
+        "whisper_seconds": round(whisper_seconds, 3),
+        **compare(forced, whisper, text),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="字幕时间轴基准测试")
+    parser.add_argument("--audio", help="音频路径")
+    parser.add_argument("--text", help="音频对应的原文")
+    parser.add_argument("--manifest", help="样本清单JSON：[{\"audio\": ..., \"text\": ...}]")
+    parser.add_argument("--output", help="结果保存为JSON文件")
+    args = parser.parse_args()
+
+    if args.manifest:
+        samples = json.loads(Path(args.manifest).read_text(encoding="utf-8"))
+    elif args.audio and args.text:
+        samples = [{"audio": args.audio, "text": args.text}]
+    else:
+        parser.error("需要 --manifest，或同时提供 --audio 和 --text")
+
+    results = [run_sample(sample["audio"], sample["text"]) for sample in samples]
+
+    print(f"{'音频':<32}{'时长(s)':>9}{'对齐(s)':>9}{'Whisper(s)':>12}{'平均误差':>10}{'P90误差':>10}{'Whisper CER':>13}")
+    for r in results:
+        print(
+            f"{Path(r['audio']).name:<32}{r['duration']:>9.2f}{r['forced_seconds']:>9.2f}{r['whisper_seconds']:>12.2f}"
+            f"{r['mean_abs_error'] if r['mean_abs_error'] is not None else '-':>10}"
+            f"{r['p90_abs_error'] if r['p90_abs_error'] is not None else '-':>10}"
+            f"{r['whisper_cer'] if r['whisper_cer'] is not None else '-':>13}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"结果已保存: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
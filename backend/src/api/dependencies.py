@@ -11,7 +11,8 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.database import get_db
-from src.core.security import TokenError, verify_token
+from src.core.principal_cache import cache_principal, get_cached_principal
+from src.core.rate_limit import identity_from_token
 from src.models.user import User
 
 # OAuth2 scheme for token authentication
@@ -21,67 +22,103 @@ oauth2_scheme = OAuth2PasswordBearer(
 )
 
 
+async def _load_active_user(db: AsyncSession, user_id: uuid.UUID) -> Optional[User]:
+    """从数据库加载用户，活跃用户写入主体缓存"""
+    result = await db.execute(select(User).filter(User.id == user_id))
+    user = result.scalar_one_or_none()
+    if user is not None and user.is_active:
+        await cache_principal(user)
+    return user
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="无法验证凭据",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _inactive_user_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="用户已被禁用"
+    )
+
+
 async def get_current_user_optional(
         token: Optional[str] = Depends(oauth2_scheme),
         db: AsyncSession = Depends(get_db)
 ) -> Optional[User]:
-    """获取当前认证用户（可选）"""
+    """获取当前认证用户（可选，只读，可能来自主体缓存）"""
     if not token:
         return None
 
-    try:
-        payload = verify_token(token)
-        user_id = _parse_user_id(payload.get("sub"))
-        if user_id is None:
-            return None
-
-        stmt = select(User).filter(User.id == user_id)
-        result = await db.execute(stmt)
-        user = result.scalar_one_or_none()
-
-        if user is None or not user.is_active:
-            return None
+    user_id = _parse_user_id(identity_from_token(token))
+    if user_id is None:
+        return None
 
-        return user
+    user = await get_cached_principal(user_id)
+    if user is None:
+        user = await _load_active_user(db, user_id)
 
-    except TokenError:
+    if user is None or not user.is_active:
         return None
 
+    return user
+
 
 async def get_current_user_required(
         token: str = Depends(oauth2_scheme),
         db: AsyncSession = Depends(get_db)
 ) -> User:
-    """获取当前认证用户（必需）"""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="无法验证凭据",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+    """
+    获取当前认证用户（必需）
 
+    令牌解码结果和活跃用户都有缓存，轮询类接口不会每次都查询 users 表。
+    返回的用户可能是未绑定会话的缓存对象，只能读取；需要修改用户或读取密码哈希时
+    使用 get_current_user_for_update。
+    """
     if not token:
-        raise credentials_exception
+        raise _credentials_exception()
 
-    try:
-        payload = verify_token(token)
-        user_id = _parse_user_id(payload.get("sub"))
-        if user_id is None:
-            raise credentials_exception
-    except TokenError:
-        raise credentials_exception
-
-    stmt = select(User).filter(User.id == user_id)
-    result = await db.execute(stmt)
+    user_id = _parse_user_id(identity_from_token(token))
+    if user_id is None:
+        raise _credentials_exception()
+
+    user = await get_cached_principal(user_id)
+    if user is None:
+        user = await _load_active_user(db, user_id)
+
+    if user is None:
+        raise _credentials_exception()
+
+    if not user.is_active:
+        raise _inactive_user_exception()
+
+    return user
+
+
+async def get_current_user_for_update(
+        token: str = Depends(oauth2_scheme),
+        db: AsyncSession = Depends(get_db)
+) -> User:
+    """获取当前认证用户（绑定到本次请求的数据库会话，可修改，不使用主体缓存）"""
+    if not token:
+        raise _credentials_exception()
+
+    user_id = _parse_user_id(identity_from_token(token))
+    if user_id is None:
+        raise _credentials_exception()
+
+    result = await db.execute(select(User).filter(User.id == user_id))
     user = result.scalar_one_or_none()
 
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
 
     if not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="用户已被禁用"
-        )
+        raise _inactive_user_exception()
 
     return user
 
@@ -98,6 +135,7 @@ def _parse_user_id(raw_user_id: Optional[str]) -> Optional[uuid.UUID]:
 
 
 __all__ = [
+    "get_current_user_for_update",
     "get_current_user_optional",
     "get_current_user_required",
     "get_db",
@@ -1,30 +1,39 @@
 """
 健康检查API
+
+各依赖的状态由后台采样器（src.core.health）定时刷新，接口只读缓存的快照，
+探针调用不做任何 I/O，也不会因为依赖变慢而变慢。
 """
 
-import time
 from datetime import datetime
 
-import psutil
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 
 from src.core.config import settings
-from src.core.database import get_db
-from src.core.logging import logger
+from src.core.health import health_sampler
 
 router = APIRouter()
 
-try:
-    import redis.asyncio as redis  # type: ignore
-except Exception:  # pragma: no cover
-    redis = None
+
+async def _component_response(name: str, healthy_key: str):
+    """单个组件的缓存状态，不健康时返回 503"""
+    snapshot = await health_sampler.get_snapshot()
+    component = snapshot["components"].get(name, {"status": "unhealthy", "error": "not sampled"})
+    body = {
+        **component,
+        healthy_key: "connected" if component["status"] != "unhealthy" else "disconnected",
+        "sampled_at": snapshot["sampled_at"],
+        "stale": snapshot["stale"],
+        "timestamp": datetime.utcnow().isoformat(),
+    }
+    status_code = 503 if component["status"] == "unhealthy" or snapshot["stale"] else 200
+    return JSONResponse(status_code=status_code, content=body)
 
 
 @router.get("/")
 async def health_check():
-    """基础健康检查"""
+    """基础健康检查（存活探针）"""
     return {
         "status": "healthy",
         "timestamp": datetime.utcnow().isoformat(),
@@ -33,233 +42,69 @@ async def health_check():
     }
 
 
-@router.get("/db")
-async def database_health(db: AsyncSession = Depends(get_db)):
-    """数据库连接检查"""
-    try:
-        # 执行简单查询
-        result = await db.execute(text("SELECT 1"))
-        row = result.fetchone()
+@router.get("/ready")
+async def readiness_check():
+    """就绪探针：关键依赖不可用或快照过期时返回 503"""
+    snapshot = await health_sampler.get_snapshot()
+    body = {
+        "status": snapshot["status"],
+        "sampled_at": snapshot["sampled_at"],
+        "age_seconds": snapshot["age_seconds"],
+        "timestamp": datetime.utcnow().isoformat(),
+    }
+    return JSONResponse(status_code=503 if snapshot["status"] == "unhealthy" else 200, content=body)
 
-        if row and row[0] == 1:
-            return {
-                "status": "healthy",
-                "database": "connected",
-                "timestamp": datetime.utcnow().isoformat(),
-            }
-        else:
-            raise HTTPException(status_code=503, detail="数据库查询失败")
 
-    except Exception as e:
-        logger.error(f"数据库健康检查失败: {e}")
-        raise HTTPException(status_code=503, detail="数据库连接失败")
+@router.get("/db")
+async def database_health():
+    """数据库连接检查"""
+    return await _component_response("database", "database")
 
 
 @router.get("/redis")
 async def redis_health():
     """Redis连接检查"""
-    if redis is None:
-        raise HTTPException(status_code=503, detail="Redis client unavailable")
-    try:
-        # 创建Redis连接
-        redis_client = redis.from_url(settings.REDIS_URL)
-
-        # 执行ping测试
-        result = await redis_client.ping()
-        await redis_client.close()
-
-        if result:
-            return {
-                "status": "healthy",
-                "redis": "connected",
-                "timestamp": datetime.utcnow().isoformat(),
-            }
-        else:
-            raise HTTPException(status_code=503, detail="Redis ping失败")
-
-    except Exception as e:
-        logger.error(f"Redis健康检查失败: {e}")
-        raise HTTPException(status_code=503, detail="Redis连接失败")
+    return await _component_response("redis", "redis")
 
 
 @router.get("/celery")
 async def celery_health():
     """Celery健康检查"""
-    try:
-        from src.workers.base import app as celery_app
+    return await _component_response("celery", "celery")
 
-        # 检查Celery配置
-        inspect = celery_app.control.inspect()
 
-        # 获取活跃的workers
-        stats = inspect.stats()
-
-        if stats:
-            workers = list(stats.keys())
-            return {
-                "status": "healthy",
-                "celery": "connected",
-                "workers": workers,
-                "worker_count": len(workers),
-                "timestamp": datetime.utcnow().isoformat(),
-            }
-        else:
-            return {
-                "status": "warning",
-                "celery": "no_active_workers",
-                "message": "没有活跃的Celery workers",
-                "timestamp": datetime.utcnow().isoformat(),
-            }
-
-    except Exception as e:
-        logger.error(f"Celery健康检查失败: {e}")
-        raise HTTPException(status_code=503, detail="Celery连接失败")
+@router.get("/minio")
+async def minio_health():
+    """MinIO连接检查"""
+    return await _component_response("minio", "minio")
 
 
 @router.get("/system")
 async def system_health():
     """系统资源健康检查"""
-    try:
-        # CPU使用率
-        cpu_percent = psutil.cpu_percent(interval=1)
-
-        # 内存使用情况
-        memory = psutil.virtual_memory()
-
-        # 磁盘使用情况
-        disk = psutil.disk_usage('/')
-
-        # 系统负载
-        load_avg = psutil.getloadavg()
-
-        # 进程信息
-        process = psutil.Process()
-
-        return {
-            "status": "healthy",
-            "timestamp": datetime.utcnow().isoformat(),
-            "system": {
-                "cpu_percent": cpu_percent,
-                "memory": {
-                    "total": memory.total,
-                    "available": memory.available,
-                    "percent": memory.percent,
-                    "used": memory.used,
-                    "free": memory.free,
-                },
-                "disk": {
-                    "total": disk.total,
-                    "used": disk.used,
-                    "free": disk.free,
-                    "percent": (disk.used / disk.total) * 100,
-                },
-                "load_average": {
-                    "1min": load_avg[0],
-                    "5min": load_avg[1],
-                    "15min": load_avg[2],
-                },
-            },
-            "process": {
-                "pid": process.pid,
-                "memory_percent": process.memory_percent(),
-                "cpu_percent": process.cpu_percent(),
-                "create_time": process.create_time(),
-            },
-        }
-
-    except Exception as e:
-        logger.error(f"系统健康检查失败: {e}")
-        raise HTTPException(status_code=503, detail="系统信息获取失败")
+    snapshot = await health_sampler.get_snapshot()
+    component = snapshot["components"].get("system", {"status": "unhealthy", "error": "not sampled"})
+    return JSONResponse(
+        status_code=503 if component["status"] == "unhealthy" else 200,
+        content={**component, "sampled_at": snapshot["sampled_at"], "timestamp": datetime.utcnow().isoformat()},
+    )
 
 
 @router.get("/detailed")
 async def detailed_health_check():
     """详细健康检查"""
-    start_time = time.time()
-
-    health_status = {
-        "status": "healthy",
+    snapshot = await health_sampler.get_snapshot()
+    checks = snapshot["components"]
+    return {
+        "status": snapshot["status"],
         "timestamp": datetime.utcnow().isoformat(),
+        "sampled_at": snapshot["sampled_at"],
+        "age_seconds": snapshot["age_seconds"],
+        "stale": snapshot["stale"],
         "version": "1.0.0",
         "service": "aicg-backend",
         "environment": settings.ENVIRONMENT,
-        "checks": {},
-        "response_time_ms": 0,
+        "checks": checks,
+        "checks_passed": sum(1 for check in checks.values() if check["status"] == "healthy"),
+        "total_checks": len(checks),
     }
-
-    checks = []
-
-    # 数据库检查
-    try:
-        from src.core.database import get_db
-        async with get_db().__anext__() as db:
-            await db.execute(text("SELECT 1"))
-        health_status["checks"]["database"] = {"status": "healthy"}
-        checks.append("database")
-    except Exception as e:
-        health_status["checks"]["database"] = {"status": "unhealthy", "error": str(e)}
-        health_status["status"] = "unhealthy"
-
-    # Redis检查
-    try:
-        redis_client = redis.from_url(settings.REDIS_URL)
-        await redis_client.ping()
-        await redis_client.close()
-        health_status["checks"]["redis"] = {"status": "healthy"}
-        checks.append("redis")
-    except Exception as e:
-        health_status["checks"]["redis"] = {"status": "unhealthy", "error": str(e)}
-        health_status["status"] = "degraded"
-
-    # Celery检查
-    try:
-        from src.workers.base import app as celery_app
-        inspect = celery_app.control.inspect()
-        stats = inspect.stats()
-        if stats:
-            health_status["checks"]["celery"] = {
-                "status": "healthy",
-                "workers": list(stats.keys())
-            }
-            checks.append("celery")
-        else:
-            health_status["checks"]["celery"] = {
-                "status": "warning",
-                "message": "no_active_workers"
-            }
-    except Exception as e:
-        health_status["checks"]["celery"] = {"status": "unhealthy", "error": str(e)}
-        health_status["status"] = "degraded"
-
-    # 系统资源检查
-    try:
-        cpu_percent = psutil.cpu_percent(interval=1)
-        memory = psutil.virtual_memory()
-
-        # 检查资源使用是否过高
-        if cpu_percent > 90 or memory.percent > 90:
-            health_status["checks"]["system"] = {
-                "status": "warning",
-                "cpu_percent": cpu_percent,
-                "memory_percent": memory.percent,
-                "message": "high resource usage"
-            }
-            if health_status["status"] == "healthy":
-                health_status["status"] = "degraded"
-        else:
-            health_status["checks"]["system"] = {
-                "status": "healthy",
-                "cpu_percent": cpu_percent,
-                "memory_percent": memory.percent
-            }
-            checks.append("system")
-
-    except Exception as e:
-        health_status["checks"]["system"] = {"status": "unhealthy", "error": str(e)}
-        health_status["status"] = "unhealthy"
-
-    health_status["checks_passed"] = len(checks)
-    health_status["total_checks"] = 4
-    health_status["response_time_ms"] = round((time.time() - start_time) * 1000, 2)
-
-    return health_status
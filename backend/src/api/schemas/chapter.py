@@ -111,6 +111,10 @@ class ChapterResponse(UUIDMixin):
 class ChapterListResponse(PaginatedResponse):
     """章节列表响应模型"""
     chapters: List[ChapterResponse] = Field(..., description="章节列表")
+    total: Optional[int] = Field(None, description="总记录数（count_mode=estimated 时为估算值，none 时为空）")
+    total_pages: Optional[int] = Field(None, description="总页数")
+    next_cursor: Optional[str] = Field(None, description="下一页游标，为空表示没有更多数据")
+    has_more: bool = Field(False, description="是否还有下一页")
 
     model_config = {
         "json_schema_extra": {
@@ -127,7 +131,9 @@ class ChapterListResponse(PaginatedResponse):
                 "total": 20,
                 "page": 1,
                 "size": 20,
-                "total_pages": 1
+                "total_pages": 1,
+                "next_cursor": None,
+                "has_more": False
             }
         }
     }
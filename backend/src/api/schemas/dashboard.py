@@ -53,6 +53,13 @@ class CostEstimate(BaseModel):
     generated_count: Dict[str, int] = Field(..., description="已生成数量明细")
 
 
+class StatisticsFreshness(BaseModel):
+    """统计计数新鲜度"""
+    updated_at: Optional[str] = Field(None, description="计数最近一次更新时间")
+    reconciled_at: Optional[str] = Field(None, description="计数最近一次全量对账时间")
+    is_stale: bool = Field(False, description="距上次对账是否已超过阈值")
+
+
 class DashboardStatistics(BaseModel):
     """仪表盘综合统计"""
     projects: ProjectStatistics = Field(..., description="项目统计")
@@ -60,6 +67,7 @@ class DashboardStatistics(BaseModel):
     generation: GenerationStatistics = Field(..., description="生成统计")
     tasks: TaskStatistics = Field(..., description="任务统计")
     cost: CostEstimate = Field(..., description="成本估算")
+    freshness: Optional[StatisticsFreshness] = Field(None, description="统计计数新鲜度")
     last_updated: str = Field(..., description="最后更新时间")
 
     class Config:
@@ -98,6 +106,11 @@ class DashboardStatistics(BaseModel):
                     "prompt_cost": 1.0,
                     "currency": "CNY"
                 },
+                "freshness": {
+                    "updated_at": "2025-12-11T03:14:00+00:00",
+                    "reconciled_at": "2025-12-11T03:00:00+00:00",
+                    "is_stale": False
+                },
                 "last_updated": "2025-12-11T03:15:00"
             }
         }
@@ -157,6 +170,7 @@ __all__ = [
     "GenerationStatistics",
     "TaskStatistics",
     "CostEstimate",
+    "StatisticsFreshness",
     "DashboardStatistics",
     "RecentProject",
     "RecentProjectsResponse",
@@ -2,6 +2,8 @@
 导出相关 API Schema
 """
 
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 
@@ -9,8 +11,18 @@ class JianYingExportResponse(BaseModel):
     """剪映导出响应"""
     success: bool = Field(..., description="是否成功")
     message: str = Field("", description="消息")
-    download_url: str = Field("", description="下载URL")
+    download_url: str = Field("", description="下载URL（流式下载地址或预签名URL）")
+    filename: str = Field("", description="文件名")
+    task_id: Optional[str] = Field(None, description="异步导出任务ID（mode=async 时返回）")
+
+
+class JianYingExportTaskStatus(BaseModel):
+    """剪映异步导出任务状态"""
+    task_id: str = Field(..., description="任务ID")
+    status: str = Field(..., description="任务状态: PENDING/STARTED/SUCCESS/FAILURE")
+    download_url: str = Field("", description="预签名下载URL（成功后返回）")
     filename: str = Field("", description="文件名")
+    error: Optional[str] = Field(None, description="失败原因")
 
 
-__all__ = ["JianYingExportResponse"]
+__all__ = ["JianYingExportResponse", "JianYingExportTaskStatus"]
@@ -4,8 +4,9 @@
 
 from typing import List, Optional
 import uuid
-from pydantic import BaseModel, UUID4, Field, field_validator
+from pydantic import BaseModel, UUID4, Field, field_validator, model_validator
 from datetime import datetime, timedelta
+from src.utils.image_derivatives import get_derivative_urls
 from src.utils.storage import storage_client
 
 # --- 剧本相关 ---
@@ -25,6 +26,9 @@ class MovieShotBase(BaseModel):
     dialogue: Optional[str] = None
     characters: Optional[List[str]] = None
     keyframe_url: Optional[str] = None
+    keyframe_derivative_format: Optional[str] = Field(None, exclude=True)  # 关键帧衍生图格式，为空表示没有衍生图
+    thumbnail_url: Optional[str] = None  # 关键帧缩略图URL
+    preview_url: Optional[str] = None  # 关键帧预览图URL
     
     @field_validator("scene_id", mode="before")
     @classmethod
@@ -33,13 +37,17 @@ class MovieShotBase(BaseModel):
             return str(v)
         return v
     
-    @field_validator("keyframe_url", mode="after")
-    @classmethod
-    def sign_keyframe_url(cls, v: Optional[str]) -> Optional[str]:
-        """为keyframe_url生成预签名URL"""
-        if v and not v.startswith("http"):
-            return storage_client.get_presigned_url(v, timedelta(hours=24))
-        return v
+    @model_validator(mode="after")
+    def sign_keyframe_url(self):
+        """为keyframe_url及其缩略图/预览图生成预签名URL"""
+        if self.keyframe_url and not self.keyframe_url.startswith("http"):
+            derivative_urls = get_derivative_urls(
+                self.keyframe_url, self.keyframe_derivative_format, timedelta(hours=24)
+            )
+            self.thumbnail_url = derivative_urls["thumbnail_url"]
+            self.preview_url = derivative_urls["preview_url"]
+            self.keyframe_url = storage_client.get_presigned_url(self.keyframe_url, timedelta(hours=24))
+        return self
 
 class MovieShotResponse(MovieShotBase):
     id: str
@@ -64,16 +72,23 @@ class MovieSceneBase(BaseModel):
     scene: str
     characters: List[str] = []
     scene_image_url: Optional[str] = None  # 场景图URL
+    scene_image_derivative_format: Optional[str] = Field(None, exclude=True)  # 场景图衍生图格式，为空表示没有衍生图
+    thumbnail_url: Optional[str] = None  # 场景图缩略图URL
+    preview_url: Optional[str] = None  # 场景图预览图URL
     scene_image_prompt: Optional[str] = None  # 场景图提示词
     shots: List['MovieShotResponse']  # 使用MovieShotResponse以包含generated_prompt
     
-    @field_validator("scene_image_url", mode="after")
-    @classmethod
-    def sign_scene_image_url(cls, v: Optional[str]) -> Optional[str]:
-        """为scene_image_url生成预签名URL"""
-        if v and not v.startswith("http"):
-            return storage_client.get_presigned_url(v, timedelta(hours=24))
-        return v
+    @model_validator(mode="after")
+    def sign_scene_image_url(self):
+        """为scene_image_url及其缩略图/预览图生成预签名URL"""
+        if self.scene_image_url and not self.scene_image_url.startswith("http"):
+            derivative_urls = get_derivative_urls(
+                self.scene_image_url, self.scene_image_derivative_format, timedelta(hours=24)
+            )
+            self.thumbnail_url = derivative_urls["thumbnail_url"]
+            self.preview_url = derivative_urls["preview_url"]
+            self.scene_image_url = storage_client.get_presigned_url(self.scene_image_url, timedelta(hours=24))
+        return self
     
     class Config:
         from_attributes = True
@@ -101,6 +116,8 @@ class MovieCharacterBase(BaseModel):
     generated_prompt: Optional[str] = None
     
     avatar_url: Optional[str] = None
+    thumbnail_url: Optional[str] = None  # 头像缩略图URL
+    preview_url: Optional[str] = None  # 头像预览图URL
     reference_images: List[str] = []
     
     class Config:
@@ -128,6 +145,12 @@ class MovieCharacterBase(BaseModel):
         from src.utils.storage import storage_client
         from datetime import timedelta
         
+        avatar_derivatives = (
+            get_derivative_urls(obj.avatar_url, obj.avatar_derivative_format, timedelta(hours=24))
+            if obj.avatar_url and not obj.avatar_url.startswith("http")
+            else {}
+        )
+
         # 先转换为字典
         data = {
             "id": obj.id,
@@ -144,6 +167,8 @@ class MovieCharacterBase(BaseModel):
                 if obj.avatar_url and not obj.avatar_url.startswith("http")
                 else obj.avatar_url
             ),
+            "thumbnail_url": avatar_derivatives.get("thumbnail_url"),
+            "preview_url": avatar_derivatives.get("preview_url"),
             "reference_images": [
                 storage_client.get_presigned_url(img, timedelta(hours=24))
                 if img and not img.startswith("http")
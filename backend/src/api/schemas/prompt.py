@@ -17,6 +17,8 @@ class PromptGenerateRequest(BaseModel):
     style: str = Field("cinematic", description="风格预设")
     model: Optional[str] = Field(None, description="模型名称")
     custom_prompt: Optional[str] = Field(None, description="自定义系统提示词")
+    batch_size: Optional[int] = Field(None, ge=1, le=32, description="每次请求合并的句子数，1 表示逐句请求，默认取服务端配置")
+    use_cache: bool = Field(True, description="是否复用相同内容的历史提示词，False 时强制重新生成")
 
     model_config = {
         "json_schema_extra": {
@@ -38,6 +40,8 @@ class PromptGenerateByIdsRequest(BaseModel):
     style: str = Field("cinematic", description="风格预设")
     model: Optional[str] = Field(None, description="模型名称")
     custom_prompt: Optional[str] = Field(None, description="自定义系统提示词")
+    batch_size: Optional[int] = Field(None, ge=1, le=32, description="每次请求合并的句子数，1 表示逐句请求，默认取服务端配置")
+    use_cache: bool = Field(True, description="是否复用相同内容的历史提示词，False 时强制重新生成")
 
     model_config = {
         "json_schema_extra": {
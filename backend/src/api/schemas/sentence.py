@@ -10,6 +10,7 @@ from pydantic import BaseModel, Field
 
 from src.models.sentence import SentenceStatus
 from .base import PaginatedResponse, UUIDMixin
+from src.utils.image_derivatives import get_derivative_urls
 from src.utils.storage import storage_client
 
 
@@ -54,6 +55,8 @@ class SentenceResponse(UUIDMixin, SentenceBase):
     character_count: int = Field(0, description="字符数量")
     status: SentenceStatus = Field(..., description="处理状态")
     image_url: Optional[str] = Field(None, description="生成的图片URL")
+    thumbnail_url: Optional[str] = Field(None, description="图片缩略图URL（列表展示）")
+    preview_url: Optional[str] = Field(None, description="图片预览图URL")
     image_style: Optional[str] = Field(None, description="图片风格")
     image_prompt: Optional[str] = Field(None, description="图片生成提示词")
     audio_url: Optional[str] = Field(None, description="生成的音频URL")
@@ -78,6 +81,9 @@ class SentenceResponse(UUIDMixin, SentenceBase):
 
         # 处理媒体URL
         if "image_url" in data and data["image_url"]:
+            data.update(get_derivative_urls(
+                data["image_url"], data.get("image_derivative_format"), timedelta(hours=1)
+            ))
             data["image_url"] = storage_client.get_presigned_url(
                 data["image_url"], timedelta(hours=1)
             )
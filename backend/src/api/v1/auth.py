@@ -12,12 +12,9 @@ from sqlalchemy import select, or_
 
 from src.core.config import settings
 from src.core.database import get_db
-from src.core.security import (
-    create_access_token,
-    verify_token,
-    TokenError
-)
+from src.core.security import create_access_token
 from src.models.user import User
+from src.api.dependencies import get_current_user_required
 from src.api.schemas.auth import (
     UserRegister,
     UserResponse,
@@ -37,33 +34,8 @@ async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
 ) -> User:
-    """获取当前认证用户"""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="无法验证凭据",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
-    try:
-        payload = verify_token(token)
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except TokenError:
-        raise credentials_exception
-
-    result = await db.execute(select(User).filter(User.id == user_id))
-    user = result.scalar_one_or_none()
-    if user is None:
-        raise credentials_exception
-
-    if not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="用户已被禁用"
-        )
-
-    return user
+    """获取当前认证用户（与 get_current_user_required 相同，令牌和活跃用户均有缓存）"""
+    return await get_current_user_required(token, db)
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -114,7 +86,7 @@ async def login(
     result = await db.execute(select(User).filter(User.username == form_data.username))
     user = result.scalar_one_or_none()
 
-    if not user or not user.verify_password(form_data.password):
+    if not user or not await user.verify_password_and_rehash(form_data.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="用户名或密码错误",
@@ -128,7 +100,7 @@ async def login(
             detail="用户已被禁用"
         )
 
-    # 更新最后登录时间
+    # 更新最后登录时间（密码哈希需要重新计算时一并提交）
     user.update_last_login()
     await db.commit()
 
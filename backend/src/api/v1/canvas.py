@@ -40,6 +40,7 @@ from src.services.canvas import (
     extract_object_key_from_media_url,
 )
 from src.tasks.canvas import generate_canvas_image, generate_canvas_text, generate_canvas_video
+from src.utils.image_derivatives import get_derivative_urls
 from src.utils.storage import get_storage_client
 
 router = APIRouter()
@@ -54,6 +55,13 @@ async def resolve_canvas_media_fields(payload: dict) -> dict:
     image_object_key = str(content.get("result_image_object_key") or "").strip()
     if image_object_key:
         content["result_image_url"] = storage_client.get_presigned_url(image_object_key)
+        derivatives = content.get("result_image_derivatives") or {}
+        derivative_urls = get_derivative_urls(
+            image_object_key,
+            derivatives.get("format") if derivatives.get("object_key") == image_object_key else None,
+        )
+        content["result_image_thumbnail_url"] = derivative_urls["thumbnail_url"]
+        content["result_image_preview_url"] = derivative_urls["preview_url"]
 
     reference_image_object_key = str(content.get("reference_image_object_key") or "").strip()
     if reference_image_object_key:
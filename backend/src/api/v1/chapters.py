@@ -40,9 +40,11 @@ async def get_chapters(
     chapter_status: Optional[str] = Query("", description="状态过滤"),
     is_confirmed: Optional[bool] = Query(None, description="是否已确认过滤"),
     search: Optional[str] = Query("", description="搜索关键词"),
-    sort_by: str = Query("chapter_number", description="排序字段"),
+    sort_by: str = Query("chapter_number", description="排序字段(chapter_number/title/created_at/updated_at/word_count)"),
     sort_order: str = Query("asc", regex="^(asc|desc)$", description="排序顺序"),
     project_type: Optional[str] = Query(None, description="项目类型过滤(picture_narrative/ai_movie)"),
+    cursor: Optional[str] = Query(None, description="分页游标（上一页返回的 next_cursor，传入时忽略 page）"),
+    count_mode: str = Query("exact", regex="^(exact|estimated|none)$", description="总数模式"),
 ):
     """获取项目的章节列表"""
     chapter_service = ChapterService(db)
@@ -64,7 +66,7 @@ async def get_chapters(
     if search and search.strip():
         search_query = search.strip()
 
-    chapters, total = await chapter_service.get_project_chapters(
+    chapters, total, next_cursor = await chapter_service.get_project_chapters(
         project_id=project_id,
         status=status_filter,
         is_confirmed=is_confirmed,
@@ -74,13 +76,15 @@ async def get_chapters(
         sort_by=sort_by,
         sort_order=sort_order,
         project_type=project_type,
+        cursor=cursor,
+        count_mode=count_mode,
     )
 
     # 转换为响应模型
     chapter_responses = [
         ChapterResponse.from_dict(chapter.to_dict()) for chapter in chapters
     ]
-    total_pages = (total + size - 1) // size
+    total_pages = (total + size - 1) // size if total is not None else None
 
     return ChapterListResponse(
         chapters=chapter_responses,
@@ -88,6 +92,8 @@ async def get_chapters(
         page=page,
         size=size,
         total_pages=total_pages,
+        next_cursor=next_cursor,
+        has_more=next_cursor is not None,
     )
 
 
@@ -2,26 +2,58 @@
 导出相关 API 路由
 """
 
-import os
-from pathlib import Path
+import uuid
+from typing import Optional
+from urllib.parse import quote
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.dependencies import get_current_user_required
-from src.api.schemas.export import JianYingExportResponse
+from src.api.schemas.export import JianYingExportResponse, JianYingExportTaskStatus
 from src.core.database import get_db
+from src.core.logging import get_logger
+from src.core.redis import get_redis_client
 from src.models.user import User
 from src.services.jianying_export import JianYingExportService, JianYingExportError
 
+logger = get_logger(__name__)
+
 router = APIRouter()
 
+# 异步导出任务的所属用户（提交时写入，查询任何状态前都先校验）
+EXPORT_TASK_OWNER_PREFIX = "export:jianying:owner"
+
+
+async def _record_export_owner(task_id: str, user_id: str) -> None:
+    """记录导出任务的所属用户，Redis 不可用时无法校验归属，拒绝异步导出"""
+    try:
+        await get_redis_client().set(
+            f"{EXPORT_TASK_OWNER_PREFIX}:{task_id}",
+            user_id,
+            ex=int(JianYingExportService.EXPORT_URL_EXPIRES.total_seconds()),
+        )
+    except Exception as e:
+        logger.error(f"记录导出任务归属失败: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="异步导出暂不可用，请使用流式下载"
+        )
+
+
+async def _get_export_owner(task_id: str) -> Optional[str]:
+    owner = await get_redis_client().get(f"{EXPORT_TASK_OWNER_PREFIX}:{task_id}")
+    if isinstance(owner, bytes):
+        owner = owner.decode("utf-8")
+    return owner
+
 
 @router.post("/jianying/{chapter_id}", response_model=JianYingExportResponse)
 async def export_chapter_to_jianying(
     *,
     chapter_id: str,
+    mode: str = Query("stream", regex="^(stream|async)$", description="导出方式: stream 直接流式下载 / async 后台生成到对象存储"),
     current_user: User = Depends(get_current_user_required),
     db: AsyncSession = Depends(get_db)
 ):
@@ -30,28 +62,40 @@ async def export_chapter_to_jianying(
     
     Args:
         chapter_id: 章节ID
+        mode: stream 返回流式下载地址；async 提交后台任务，完成后通过任务状态获取预签名URL
         
     Returns:
-        导出结果，包含下载URL
+        导出结果，包含下载URL或任务ID
     """
     try:
         export_service = JianYingExportService(db)
-        zip_path = await export_service.export_chapter(
+        # 先校验章节和状态，错误在这里直接返回
+        package = await export_service.prepare_export(
             chapter_id=chapter_id,
             user_id=str(current_user.id)
         )
         
-        # 生成下载URL（使用文件ID）
-        from urllib.parse import quote
-        filename = Path(zip_path).name
-        # URL编码文件名以支持中文
-        encoded_filename = quote(filename)
+        if mode == "async":
+            from src.tasks.export import export_jianying_chapter
+            # 先记录归属再投递，任务ID和文件名都在这里确定，查询时与本次返回一致
+            task_id = str(uuid.uuid4())
+            await _record_export_owner(task_id, str(current_user.id))
+            export_jianying_chapter.apply_async(
+                args=(chapter_id, str(current_user.id), package.filename),
+                task_id=task_id,
+            )
+            return JianYingExportResponse(
+                success=True,
+                message="导出任务已提交",
+                filename=package.filename,
+                task_id=task_id
+            )
         
         return JianYingExportResponse(
             success=True,
             message="导出成功",
-            download_url=f"/api/v1/export/jianying/download/{encoded_filename}",
-            filename=filename
+            download_url=f"/api/v1/export/jianying/{chapter_id}/download",
+            filename=package.filename
         )
         
     except JianYingExportError as e:
@@ -59,84 +103,94 @@ async def export_chapter_to_jianying(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    except HTTPException:
+        raise
     except Exception as e:
+        logger.error(f"导出章节失败: {e}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"导出失败: {str(e)}"
         )
 
 
-@router.get("/jianying/download/{filename:path}")
+@router.get("/jianying/{chapter_id}/download")
 async def download_jianying_export(
-    filename: str,
-    current_user: User = Depends(get_current_user_required)
+    *,
+    chapter_id: str,
+    current_user: User = Depends(get_current_user_required),
+    db: AsyncSession = Depends(get_db)
 ):
     """
-    下载导出的剪映文件
+    流式下载剪映草稿 ZIP 包
+    
+    ZIP 边生成边发送，素材从对象存储并发拉取，不在 API 容器落盘，
+    因此多副本部署下任意实例都可以处理下载请求。
     
     Args:
-        filename: URL编码的文件名
+        chapter_id: 章节ID
         
     Returns:
-        文件下载响应
+        ZIP 流式响应
     """
-    import tempfile
-    from urllib.parse import unquote
-    from src.core.logging import get_logger
-    
-    logger = get_logger(__name__)
-    
-    # URL解码文件名
-    decoded_filename = unquote(filename)
-    
-    # 构建文件路径（从临时目录）
-    file_path = Path(tempfile.gettempdir()) / decoded_filename
-    
-    logger.info(f"尝试下载文件: {file_path}")
-    logger.info(f"原始文件名: {filename}")
-    logger.info(f"解码后文件名: {decoded_filename}")
-    logger.info(f"文件是否存在: {file_path.exists()}")
-    
-    if file_path.exists():
-        file_size = file_path.stat().st_size
-        logger.info(f"文件大小: {file_size} bytes")
-    
-    if not file_path.exists():
-        logger.error(f"文件不存在: {file_path}")
+    export_service = JianYingExportService(db)
+    try:
+        package = await export_service.prepare_export(
+            chapter_id=chapter_id,
+            user_id=str(current_user.id)
+        )
+    except JianYingExportError as e:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="文件不存在或已过期"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
         )
     
-    # URL编码文件名以支持中文
-    from urllib.parse import quote
-    from fastapi import BackgroundTasks
-    import os
-    
-    # 定义清理函数
-    def cleanup_file(path: str):
-        try:
-            if os.path.exists(path):
-                os.remove(path)
-                logger.info(f"清理临时文件: {path}")
-        except Exception as e:
-            logger.error(f"清理文件失败: {e}")
+    # 对文件名进行URL编码（用于Content-Disposition，支持中文）
+    encoded_filename = quote(package.filename)
     
-    # 对文件名进行URL编码（用于Content-Disposition）
-    encoded_filename = quote(decoded_filename)
-    
-    response = FileResponse(
-        path=str(file_path),
-        filename=decoded_filename,
+    return StreamingResponse(
+        export_service.iter_zip(package),
         media_type="application/zip",
         headers={
             "Content-Disposition": f"attachment; filename*=UTF-8''{encoded_filename}"
         }
     )
+
+
+@router.get("/jianying/tasks/{task_id}", response_model=JianYingExportTaskStatus)
+async def get_jianying_export_task(
+    *,
+    task_id: str,
+    current_user: User = Depends(get_current_user_required)
+):
+    """
+    查询剪映异步导出任务状态
+    
+    只有提交任务的用户能查询，其它任务ID（不存在、已过期或属于其他用户）一律返回 404，
+    不暴露任务状态和失败原因。
+    
+    Args:
+        task_id: 任务ID
+        
+    Returns:
+        任务状态，成功时包含预签名下载URL
+    """
+    from src.tasks.app import celery_app
+    
+    if await _get_export_owner(task_id) != str(current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="导出任务不存在"
+        )
+    
+    result = celery_app.AsyncResult(task_id)
+    response = JianYingExportTaskStatus(task_id=task_id, status=result.status)
     
-    # 注册后台清理任务
-    response.background = BackgroundTasks()
-    response.background.add_task(cleanup_file, str(file_path))
+    if result.successful():
+        payload = result.result or {}
+        response.download_url = payload.get("download_url", "")
+        response.filename = payload.get("filename", "")
+    elif result.failed():
+        response.error = str(result.result)
     
     return response
 
@@ -109,22 +109,28 @@ async def _update_resource_url(db: AsyncSession, resource_type: str, resource_id
     """更新资源的URL字段"""
     from src.models.movie import MovieScene, MovieShot, MovieCharacter, MovieShotTransition
     
+    # 历史图片没有记录衍生图状态，清空后前端回退到原图
     if resource_type == GenerationType.SCENE_IMAGE:
         scene = await db.get(MovieScene, resource_id)
         if scene:
             scene.scene_image_url = url
+            scene.scene_image_derivative_format = None
     elif resource_type == GenerationType.SHOT_KEYFRAME:
         shot = await db.get(MovieShot, resource_id)
         if shot:
             shot.keyframe_url = url
+            shot.keyframe_derivative_format = None
     elif resource_type == GenerationType.CHARACTER_AVATAR:
         character = await db.get(MovieCharacter, resource_id)
         if character:
             character.avatar_url = url
+            character.avatar_derivative_format = None
     elif resource_type == GenerationType.TRANSITION_VIDEO:
         transition = await db.get(MovieShotTransition, resource_id)
         if transition:
             transition.video_url = url
+            # 规范化版本对应旧视频，拼接时重新生成
+            transition.normalized_video_url = None
 
 
 # ============================================================
@@ -53,7 +53,7 @@ async def generate_prompts(
     await project_service.get_project_by_id(chapter.project_id, current_user.id)
 
     # 2. 投递任务到celery
-    result = generate_prompts_task.delay(chapter.id.hex, request.api_key_id.hex, request.style, request.model, request.custom_prompt)
+    result = generate_prompts_task.delay(chapter.id.hex, request.api_key_id.hex, request.style, request.model, request.custom_prompt, request.batch_size, request.use_cache)
 
     # 3.更新章节状态为提示词生成中
     chapter.status = "generating_prompts"
@@ -78,7 +78,7 @@ async def generate_prompts(
     """
 
     # 1. 投递任务到celery
-    result = generate_prompts_by_ids.delay(request.sentence_ids, request.api_key_id.hex, request.style, request.model, request.custom_prompt)
+    result = generate_prompts_by_ids.delay(request.sentence_ids, request.api_key_id.hex, request.style, request.model, request.custom_prompt, request.batch_size, request.use_cache)
 
     logger.info(f"成功为章节 {request.sentence_ids} 投递提示词生成任务，任务ID: {result.id}")
     return PromptGenerateResponse(success=True, message="提示词生成任务已提交，请稍后查看结果。", task_id=result.id)
@@ -9,9 +9,9 @@ from typing import Any, Dict, Optional
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.dependencies import get_current_user_required
+from src.api.dependencies import get_current_user_for_update, get_current_user_required
 from src.core.database import get_db
-from src.core.security import get_password_hash, verify_password
+from src.core.security import get_password_hash_async, verify_password_async
 from src.models.user import User
 from src.services.avatar import avatar_service
 from src.api.schemas.user import (
@@ -62,7 +62,7 @@ async def get_current_user_info(
 @router.put("/me", response_model=UserResponse, summary="更新用户信息")
 async def update_current_user(
         user_update: UserUpdateRequest,
-        current_user: User = Depends(get_current_user_required),
+        current_user: User = Depends(get_current_user_for_update),
         db: AsyncSession = Depends(get_db)
 ):
     """
@@ -108,7 +108,7 @@ async def update_current_user(
 @router.put("/me/password", response_model=PasswordChangeResponse, summary="修改用户密码")
 async def change_user_password(
         password_request: PasswordChangeRequest,
-        current_user: User = Depends(get_current_user_required),
+        current_user: User = Depends(get_current_user_for_update),
         db: AsyncSession = Depends(get_db)
 ):
     """
@@ -119,21 +119,21 @@ async def change_user_password(
     - **验证**: 需要提供当前密码进行验证
     """
     # 验证当前密码
-    if not verify_password(password_request.current_password, current_user.password_hash):
+    if not await verify_password_async(password_request.current_password, current_user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="当前密码不正确"
         )
 
     # 检查新密码是否与当前密码相同
-    if verify_password(password_request.new_password, current_user.password_hash):
+    if await verify_password_async(password_request.new_password, current_user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="新密码不能与当前密码相同"
         )
 
     # 更新密码
-    current_user.password_hash = get_password_hash(password_request.new_password)
+    current_user.password_hash = await get_password_hash_async(password_request.new_password)
     await db.commit()
 
     return PasswordChangeResponse()
@@ -184,7 +184,7 @@ async def resend_verification_email(
 @router.post("/me/delete", response_model=MessageResponse, summary="删除用户账户")
 async def delete_user_account(
         delete_request: UserDeleteRequest,
-        current_user: User = Depends(get_current_user_required),
+        current_user: User = Depends(get_current_user_for_update),
         db: AsyncSession = Depends(get_db)
 ):
     """
@@ -196,7 +196,7 @@ async def delete_user_account(
     - **警告**: 此操作不可逆，请谨慎操作
     """
     # 验证密码
-    if not verify_password(delete_request.password, current_user.password_hash):
+    if not await verify_password_async(delete_request.password, current_user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="密码不正确"
@@ -216,7 +216,7 @@ async def delete_user_account(
 @router.post("/me/avatar", response_model=AvatarUploadResponse, summary="上传用户头像")
 async def upload_user_avatar(
         file: UploadFile = File(..., description="头像图片文件"),
-        current_user: User = Depends(get_current_user_required),
+        current_user: User = Depends(get_current_user_for_update),
         db: AsyncSession = Depends(get_db)
 ):
     """
@@ -268,7 +268,7 @@ async def upload_user_avatar(
 
 @router.delete("/me/avatar", response_model=AvatarDeleteResponse, summary="删除用户头像")
 async def delete_user_avatar(
-        current_user: User = Depends(get_current_user_required),
+        current_user: User = Depends(get_current_user_for_update),
         db: AsyncSession = Depends(get_db)
 ):
     """
@@ -4,7 +4,7 @@
 """
 
 from functools import lru_cache
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings
@@ -31,6 +31,31 @@ class Settings(BaseSettings):
     ]
     ALLOWED_HOSTS: List[str] = ["*"]
 
+    # 请求限流（Redis GCRA，按用户/客户端IP + 路由类计额）
+    RATE_LIMIT_ENABLED: bool = False
+    # 路由类额度："次数/秒数"
+    RATE_LIMIT_CLASSES: Dict[str, str] = {
+        "default": "600/60",
+        "auth": "20/60",
+        "generation": "60/60",
+        "upload": "30/60",
+        "export": "10/60",
+    }
+    # 路由规则：[方法, 路径正则, 路由类, 单次消耗]，按顺序取第一条匹配，未匹配的归入 default
+    RATE_LIMIT_ROUTES: List[List] = [
+        ["POST", r"/auth/(login|register)$", "auth", 1],
+        ["POST", r"/export/", "export", 1],
+        ["POST", r"/(upload|avatar|reference-images|upload-video)$", "upload", 1],
+        ["POST", r"/projects/(from-text)?$", "upload", 1],
+        ["POST", r"/(batch-generate|generate-keyframes|generate-transition-videos|scene-images)$", "generation", 5],
+        ["POST", r"/(generate|extract|regenerate)[^/]*(/stream)?$|/video-tasks/$|/bilibili/publish$", "generation", 1],
+        ["POST", r"/canvas-assistant/(chat|resume)$", "generation", 1],
+    ]
+    RATE_LIMIT_EXEMPT_PATHS: List[str] = ["/health", "/metrics", "/docs", "/redoc", "/openapi.json", "/ws"]
+    # 慢请求日志阈值（秒，按响应头发出时间计）
+    SLOW_REQUEST_WARNING_SECONDS: float = 2.0
+    SLOW_REQUEST_ERROR_SECONDS: float = 5.0
+
     # =============================================================================
     # 数据库配置
     # =============================================================================
@@ -40,6 +65,12 @@ class Settings(BaseSettings):
     )
     DATABASE_POOL_PRE_PING: bool = True
     DATABASE_POOL_RECYCLE: int = 3600
+    # 项目内容批量删除：每批处理的章节数；启用后依赖外键 ON DELETE CASCADE 只删除章节行
+    CONTENT_DELETE_BATCH_SIZE: int = 50
+    CONTENT_DELETE_USE_FK_CASCADE: bool = False
+    # 仪表盘物化统计：定时对账间隔，以及超过多久未对账视为过期
+    STATISTICS_RECONCILE_INTERVAL_SECONDS: int = 3600
+    STATISTICS_STALE_AFTER_SECONDS: int = 7200
 
     # =============================================================================
     # Redis和Celery配置
@@ -57,6 +88,16 @@ class Settings(BaseSettings):
         env="CELERY_RESULT_BACKEND"
     )
 
+    # 过渡视频远程任务轮询：单次最多取出的任务数、全局/单个API Key并发上限、查询间隔范围
+    TRANSITION_POLL_BATCH_SIZE: int = 200
+    TRANSITION_POLL_CONCURRENCY: int = 16
+    TRANSITION_POLL_CONCURRENCY_PER_KEY: int = 4
+    TRANSITION_POLL_MIN_INTERVAL_SECONDS: int = 10
+    TRANSITION_POLL_MAX_INTERVAL_SECONDS: int = 300
+    # 已完成过渡视频的入库队列，以及入库超过多久未完成时重新投递
+    TRANSITION_INGEST_QUEUE: str = "transition_ingest"
+    TRANSITION_INGEST_LEASE_SECONDS: int = 900
+
     # =============================================================================
     # JWT配置
     # =============================================================================
@@ -67,6 +108,18 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 10080  # 7天 (7 * 24 * 60)
 
+    # 认证主体缓存：活跃用户缓存在进程内 LRU 和 Redis 中，用户更新/删除时失效
+    AUTH_PRINCIPAL_CACHE_ENABLED: bool = True
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    # 进程内缓存时间，也是其它进程感知用户变更的最长延迟
+    AUTH_PRINCIPAL_LOCAL_TTL_SECONDS: float = 5.0
+    AUTH_PRINCIPAL_LOCAL_CACHE_SIZE: int = 10000
+
+    # 密码哈希：bcrypt cost（调整后用户下次登录时自动重新哈希）、专用线程数、最多排队任务数
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+
     # =============================================================================
     # 加密配置
     # =============================================================================
@@ -94,6 +147,47 @@ class Settings(BaseSettings):
     ALLOWED_AVATAR_TYPES: List[str] = ["jpg", "jpeg", "png", "webp"]
     AVATAR_DEFAULT_SIZE: tuple = (200, 200)
 
+    # =============================================================================
+    # 图片衍生图配置
+    # =============================================================================
+    # 生成图片入库时同时生成缩略图（列表）和预览图（详情），列表接口返回衍生图URL
+    IMAGE_DERIVATIVES_ENABLED: bool = True
+    # webp / avif（Pillow 不支持 AVIF 编码时使用 webp）
+    IMAGE_DERIVATIVE_FORMAT: str = "webp"
+    IMAGE_THUMBNAIL_MAX_SIZE: int = 320
+    IMAGE_PREVIEW_MAX_SIZE: int = 1280
+    IMAGE_DERIVATIVE_QUALITY: int = 80
+
+    # =============================================================================
+    # CPU密集任务配置
+    # =============================================================================
+    # 图片解码、缩放、衍生图渲染使用的进程池大小（0 表示使用线程池）
+    CPU_EXECUTOR_PROCESSES: int = 2
+
+    # =============================================================================
+    # 健康检查配置
+    # =============================================================================
+    # 后台采样间隔和单项检查超时（秒），健康检查接口只返回缓存的快照
+    HEALTH_SAMPLE_INTERVAL_SECONDS: float = 15.0
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = 3.0
+
+    # =============================================================================
+    # 提示词生成配置
+    # =============================================================================
+    # 每次请求合并的句子数（1 表示逐句请求），以及每批附带的前文句数
+    PROMPT_BATCH_SIZE: int = 8
+    PROMPT_BATCH_CONTEXT_SENTENCES: int = 3
+    # 提示词结果缓存：是否启用、Redis 过期时间、进程内缓存条数
+    PROMPT_CACHE_ENABLED: bool = True
+    PROMPT_CACHE_TTL_SECONDS: int = 30 * 24 * 3600
+    PROMPT_CACHE_LOCAL_SIZE: int = 4096
+
+    # =============================================================================
+    # 语音生成配置
+    # =============================================================================
+    # 向支持的 TTS 服务请求字/词时间轴，随音频保存，生成字幕时直接使用
+    TTS_REQUEST_TIMESTAMPS: bool = False
+
     # =============================================================================
     # 日志配置
     # =============================================================================
@@ -101,6 +195,38 @@ class Settings(BaseSettings):
     STRUCTURED_LOGGING: bool = True
     LOG_FILE: Optional[str] = None
     COLORED_LOGS: bool = True
+    # 日志经队列交给后台线程写出（队列满时丢弃并计数）
+    LOG_ASYNC: bool = True
+    LOG_QUEUE_SIZE: int = 10000
+    # 热点日志器限速（每秒条数）和采样（保留比例），只作用于 WARNING 以下，按名称前缀匹配
+    LOG_RATE_LIMITS: Dict[str, int] = {
+        "src.services.provider": 50,
+        "src.services.faster_whisper_service": 20,
+        "src.utils.ffmpeg_utils": 20,
+    }
+    LOG_SAMPLE_RATES: Dict[str, float] = {}
+
+    # =============================================================================
+    # 指标配置
+    # =============================================================================
+    # API 在 /metrics 暴露指标；Celery worker 子进程在 CELERY_METRICS_PORT + 进程序号 上暴露（0 表示关闭）
+    METRICS_ENABLED: bool = True
+    CELERY_METRICS_PORT: int = 9808
+    # /metrics 采集时统计长度的 Celery 队列
+    METRICS_CELERY_QUEUES: List[str] = ["celery", "transition_ingest"]
+
+    # =============================================================================
+    # 链路追踪配置
+    # =============================================================================
+    # 关闭时仍会计时并汇总视频任务的各阶段耗时，只是不导出 Span
+    TRACING_ENABLED: bool = False
+    # 导出方式：file（本地 JSON Lines）、otlp（OTLP/HTTP collector）、none
+    TRACING_EXPORTER: str = "file"
+    TRACING_FILE_PATH: str = "logs/traces.jsonl"
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACING_SERVICE_NAME: str = "aicg-backend"
+    # 根 Span 的采样比例（子 Span 跟随父 Span）
+    TRACING_SAMPLE_RATIO: float = 1.0
 
     # =============================================================================
     # 验证器
@@ -2,16 +2,18 @@
 数据库连接和会话管理模块
 """
 
+import time
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
 from sqlalchemy import Engine, event, text
 from sqlalchemy.ext.asyncio import (AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine)
 from sqlalchemy.orm import declarative_base, sessionmaker
-from sqlalchemy.pool import QueuePool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from src.core.config import settings
 from src.core.logging import logger
+from src.core.metrics import DB_POOL_CHECKOUT_WAIT, DB_POOL_CONNECTIONS, register_collector
 
 # 创建基础模型类
 Base = declarative_base()
@@ -22,6 +24,29 @@ AsyncSessionLocal: async_sessionmaker = None
 SessionLocal: sessionmaker = None
 
 
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """记录连接获取等待时间的连接池"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+
+def _collect_pool_metrics() -> None:
+    if engine is None:
+        return
+    pool = engine.sync_engine.pool
+    DB_POOL_CONNECTIONS.set(pool.checkedout(), "checked_out")
+    DB_POOL_CONNECTIONS.set(pool.checkedin(), "idle")
+    DB_POOL_CONNECTIONS.set(max(pool.overflow(), 0), "overflow")
+
+
+register_collector(_collect_pool_metrics)
+
+
 async def create_database_engine() -> AsyncEngine:
     """创建数据库引擎"""
     global engine, AsyncSessionLocal, SessionLocal
@@ -33,6 +58,7 @@ async def create_database_engine() -> AsyncEngine:
         settings.DATABASE_URL,
         echo=settings.DEBUG,  # 开发环境下打印SQL
         # 异步引擎使用不同的连接池配置
+        poolclass=InstrumentedAsyncQueuePool,
         pool_size=20,
         max_overflow=30,
         pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
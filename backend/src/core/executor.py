@@ -0,0 +1,119 @@
+"""
+CPU 密集任务执行器 - PIL 解码、缩放、衍生图渲染等放到进程池执行
+
+这些操作在事件循环里执行时会占住整个 worker，且耗时远大于把图片字节 pickle 到子进程的
+开销，因此默认使用进程池。base64 编解码不走这里：其耗时与 pickle 传输相当，直接在线程
+中执行即可（asyncio.to_thread）。
+
+- 进程池按需创建（spawn 启动，不复制 uvicorn/Celery 进程的线程和连接），进程数为
+  CPU_EXECUTOR_PROCESSES；设为 0 时使用线程池
+- 无法创建子进程时（例如 Celery prefork 的 daemon 子进程）自动退回线程池
+- 提交的函数必须是模块级函数，参数和返回值可以 pickle
+"""
+
+import asyncio
+import functools
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, TypeVar
+
+from src.core.config import settings
+from src.core.logging import get_logger
+from src.core.metrics import CPU_TASK_DURATION, CPU_TASKS_IN_PROGRESS
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_disabled = False
+_lock = threading.Lock()
+
+
+def _get_process_pool() -> Optional[ProcessPoolExecutor]:
+    """获取进程池，不可用时返回 None"""
+    global _process_pool
+    if _process_pool_disabled or settings.CPU_EXECUTOR_PROCESSES <= 0:
+        return None
+    if _process_pool is None:
+        with _lock:
+            if _process_pool is None:
+                _process_pool = ProcessPoolExecutor(
+                    max_workers=settings.CPU_EXECUTOR_PROCESSES,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _process_pool
+
+
+def _disable_process_pool(reason: Exception) -> None:
+    """当前进程无法使用进程池（不能创建子进程），之后都走线程池"""
+    global _process_pool, _process_pool_disabled
+    logger.warning(f"CPU任务进程池不可用，使用线程池: {reason}")
+    with _lock:
+        _process_pool_disabled = True
+        pool, _process_pool = _process_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _reset_process_pool() -> None:
+    """子进程异常退出后丢弃进程池，下次提交时重建"""
+    global _process_pool
+    with _lock:
+        pool, _process_pool = _process_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def run_cpu_bound(func: Callable[..., T], *args: Any, task: Optional[str] = None) -> T:
+    """
+    在进程池中执行 CPU 密集函数
+
+    Args:
+        func: 模块级函数
+        *args: 位置参数
+        task: 指标中的任务名（默认为函数名）
+
+    Returns:
+        函数返回值
+    """
+    task = task or getattr(func, "__name__", "cpu_task")
+    loop = asyncio.get_running_loop()
+    call = functools.partial(func, *args)
+    start = time.perf_counter()
+    executor = "process"
+
+    with CPU_TASKS_IN_PROGRESS.track_inprogress(task):
+        try:
+            pool = _get_process_pool()
+            future = loop.run_in_executor(pool, call) if pool is not None else None
+        except (AssertionError, OSError, RuntimeError) as e:
+            # daemon 进程不能创建子进程、系统限制等
+            _disable_process_pool(e)
+            future = None
+
+        try:
+            if future is not None:
+                try:
+                    return await future
+                except BrokenProcessPool as e:
+                    logger.warning(f"CPU任务进程池异常，改用线程执行 {task}: {e}")
+                    _reset_process_pool()
+            executor = "thread"
+            return await asyncio.to_thread(call)
+        finally:
+            CPU_TASK_DURATION.observe(time.perf_counter() - start, task, executor)
+
+
+def shutdown_cpu_executor() -> None:
+    """关闭进程池（应用退出时调用）"""
+    _reset_process_pool()
+
+
+__all__ = [
+    "run_cpu_bound",
+    "shutdown_cpu_executor",
+]
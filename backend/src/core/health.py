@@ -0,0 +1,298 @@
+"""
+健康状态采样 - 后台定时检查各依赖，健康检查接口只读缓存
+
+健康检查接口被负载均衡/容器探针高频调用，不能在请求里做耗时检查：
+psutil.cpu_percent(interval=1) 会让事件循环停顿 1 秒，数据库/Redis/Celery/MinIO
+检查在依赖变慢时也会拖慢探针本身。这里由后台任务按 HEALTH_SAMPLE_INTERVAL_SECONDS
+刷新快照，每项检查有独立超时，接口直接返回最近一次快照及采样时间。
+
+- 阻塞的检查（psutil、Celery inspect、MinIO SDK）放到健康检查专用线程池中执行，
+  不占用默认线程池（存储读写、run_cpu_bound 回退共用）；超时不会终止线程，
+  上一次同名检查还没返回时本轮跳过，每项检查最多占用一个线程
+- MinIO 检查使用短超时、不重试的独立客户端
+- CPU 使用率用非阻塞采样（两次采样之间的平均值）
+- 快照超过 3 个采样周期未刷新视为过期（采样任务卡住或已退出）
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import psutil
+from sqlalchemy import text
+
+from src.core.config import settings
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+HealthCheck = Callable[[], Awaitable[Dict[str, Any]]]
+
+# 这些组件不健康时服务不可用（readiness 失败），其余只降级
+CRITICAL_COMPONENTS = ("database",)
+
+# 阻塞检查专用线程池（celery、minio、system 各最多一个线程）
+_blocking_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="health-check")
+_blocking_inflight: Dict[str, Future] = {}
+
+_minio_client = None
+_process: Optional[psutil.Process] = None
+
+
+async def _run_blocking(name: str, func: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    在健康检查线程池中执行阻塞检查
+
+    超时取消的只是等待，线程会继续运行到检查返回；上一次检查仍在运行时直接返回不健康，
+    不再提交新的线程。
+    """
+    previous = _blocking_inflight.get(name)
+    if previous is not None and not previous.done():
+        return {"status": "unhealthy", "error": "previous check still running"}
+    future = _blocking_executor.submit(func)
+    _blocking_inflight[name] = future
+    return await asyncio.wrap_future(future)
+
+
+async def check_database() -> Dict[str, Any]:
+    """数据库连通性和连接池状态"""
+    from src.core import database
+
+    if database.engine is None:
+        await database.create_database_engine()
+    async with database.engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    pool = database.engine.sync_engine.pool
+    return {
+        "status": "healthy",
+        "pool": {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+        },
+    }
+
+
+async def check_redis() -> Dict[str, Any]:
+    """Redis 连通性（复用进程内的客户端）"""
+    from src.core.redis import get_redis_client
+
+    await get_redis_client().ping()
+    return {"status": "healthy"}
+
+
+def _inspect_celery() -> Dict[str, Any]:
+    from src.tasks.app import celery_app
+
+    replies = celery_app.control.inspect(timeout=settings.HEALTH_CHECK_TIMEOUT_SECONDS / 2).ping() or {}
+    workers = sorted(replies)
+    if not workers:
+        return {"status": "warning", "message": "no_active_workers", "workers": [], "worker_count": 0}
+    return {"status": "healthy", "workers": workers, "worker_count": len(workers)}
+
+
+async def check_celery() -> Dict[str, Any]:
+    """Celery worker 存活情况"""
+    return await _run_blocking("celery", _inspect_celery)
+
+
+def _get_minio_client():
+    """健康检查用的 MinIO 客户端：连接/读取超时为检查超时，不重试（SDK 默认客户端会重试并长时间等待）"""
+    global _minio_client
+    if _minio_client is None:
+        import urllib3
+        from minio import Minio
+
+        timeout = settings.HEALTH_CHECK_TIMEOUT_SECONDS
+        _minio_client = Minio(
+            endpoint=settings.MINIO_ENDPOINT,
+            access_key=settings.MINIO_ACCESS_KEY,
+            secret_key=settings.MINIO_SECRET_KEY,
+            secure=settings.MINIO_SECURE,
+            region=settings.MINIO_REGION,
+            http_client=urllib3.PoolManager(
+                timeout=urllib3.Timeout(connect=timeout, read=timeout),
+                retries=urllib3.Retry(total=0),
+                maxsize=1,
+            ),
+        )
+    return _minio_client
+
+
+def _check_minio() -> Dict[str, Any]:
+    bucket_name = settings.MINIO_BUCKET_NAME
+    if not _get_minio_client().bucket_exists(bucket_name):
+        return {"status": "unhealthy", "error": f"bucket {bucket_name} not found"}
+    return {"status": "healthy", "bucket": bucket_name}
+
+
+async def check_minio() -> Dict[str, Any]:
+    """MinIO 连通性和存储桶"""
+    return await _run_blocking("minio", _check_minio)
+
+
+def _get_process() -> psutil.Process:
+    """当前进程（复用同一个对象，cpu_percent 才有上次采样的基准；fork 后重新创建）"""
+    global _process
+    if _process is None or _process.pid != os.getpid():
+        _process = psutil.Process()
+    return _process
+
+
+def _system_stats() -> Dict[str, Any]:
+    # interval=None：返回距上次调用以来的平均使用率，不阻塞
+    cpu_percent = psutil.cpu_percent(interval=None)
+    memory = psutil.virtual_memory()
+    disk = psutil.disk_usage("/")
+    load_avg = psutil.getloadavg()
+    process = _get_process()
+    status = "warning" if cpu_percent > 90 or memory.percent > 90 else "healthy"
+    return {
+        "status": status,
+        "system": {
+            "cpu_percent": cpu_percent,
+            "memory": {
+                "total": memory.total,
+                "available": memory.available,
+                "percent": memory.percent,
+                "used": memory.used,
+                "free": memory.free,
+            },
+            "disk": {
+                "total": disk.total,
+                "used": disk.used,
+                "free": disk.free,
+                "percent": (disk.used / disk.total) * 100,
+            },
+            "load_average": {
+                "1min": load_avg[0],
+                "5min": load_avg[1],
+                "15min": load_avg[2],
+            },
+        },
+        "process": {
+            "pid": process.pid,
+            "memory_percent": process.memory_percent(),
+            "cpu_percent": process.cpu_percent(interval=None),
+            "create_time": process.create_time(),
+        },
+    }
+
+
+async def check_system() -> Dict[str, Any]:
+    """系统资源"""
+    return await _run_blocking("system", _system_stats)
+
+
+DEFAULT_CHECKS: Dict[str, HealthCheck] = {
+    "database": check_database,
+    "redis": check_redis,
+    "celery": check_celery,
+    "minio": check_minio,
+    "system": check_system,
+}
+
+
+class HealthSampler:
+    """后台健康采样器（每个进程一个）"""
+
+    def __init__(self, checks: Optional[Dict[str, HealthCheck]] = None):
+        self.checks = checks or DEFAULT_CHECKS
+        self._components: Dict[str, Dict[str, Any]] = {}
+        self._sampled_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._refresh_lock: Optional[asyncio.Lock] = None
+
+    async def _run_check(self, name: str, check: HealthCheck) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(check(), timeout=settings.HEALTH_CHECK_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            result = {"status": "unhealthy", "error": f"timeout after {settings.HEALTH_CHECK_TIMEOUT_SECONDS}s"}
+        except Exception as e:
+            result = {"status": "unhealthy", "error": str(e)}
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        result["checked_at"] = datetime.now(timezone.utc).isoformat()
+        if result["status"] == "unhealthy":
+            logger.warning(f"健康检查失败: {name}, {result.get('error')}")
+        return result
+
+    async def refresh(self) -> None:
+        """并发执行所有检查并替换快照"""
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        async with self._refresh_lock:
+            names = list(self.checks)
+            results = await asyncio.gather(*(self._run_check(name, self.checks[name]) for name in names))
+            self._components = dict(zip(names, results))
+            self._sampled_at = time.time()
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"健康采样异常: {e}")
+            await asyncio.sleep(settings.HEALTH_SAMPLE_INTERVAL_SECONDS)
+
+    def start(self) -> None:
+        """启动后台采样（在事件循环中调用）"""
+        if self._task is None or self._task.done():
+            # 第一次 cpu_percent(interval=None) 总是返回 0，先建立基准
+            psutil.cpu_percent(interval=None)
+            _get_process().cpu_percent(interval=None)
+            self._task = asyncio.create_task(self._loop(), name="health-sampler")
+
+    async def stop(self) -> None:
+        """停止后台采样"""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def get_snapshot(self) -> Dict[str, Any]:
+        """
+        最近一次快照
+
+        还没有快照时（采样器未启动或首轮未完成）同步采样一次。
+
+        Returns:
+            {"status", "sampled_at", "age_seconds", "stale", "components"}
+        """
+        if self._sampled_at is None:
+            await self.refresh()
+
+        age = time.time() - self._sampled_at
+        stale = age > settings.HEALTH_SAMPLE_INTERVAL_SECONDS * 3
+        statuses = {name: component["status"] for name, component in self._components.items()}
+        if stale or any(statuses.get(name) == "unhealthy" for name in CRITICAL_COMPONENTS):
+            status = "unhealthy"
+        elif any(value != "healthy" for value in statuses.values()):
+            status = "degraded"
+        else:
+            status = "healthy"
+
+        return {
+            "status": status,
+            "sampled_at": datetime.fromtimestamp(self._sampled_at, timezone.utc).isoformat(),
+            "age_seconds": round(age, 3),
+            "stale": stale,
+            "components": self._components,
+        }
+
+
+health_sampler = HealthSampler()
+
+
+__all__ = [
+    "CRITICAL_COMPONENTS",
+    "HealthSampler",
+    "health_sampler",
+]
@@ -1,13 +1,29 @@
 """
 统一日志系统 - 支持彩色输出和结构化日志
+
+日志写出走 QueueHandler/QueueListener：业务线程（含事件循环）只做消息插值并入队，
+格式化（时间、颜色、JSON）和写终端/文件都在后台监听线程完成。
+队列满时丢弃并计数，不阻塞调用方；热点日志器可按配置限速和采样。
 """
+import atexit
 import json
 import logging
 import os
+import queue
+import random
 import sys
+import threading
+import time
+from collections import Counter
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - 可选依赖
+    orjson = None
 
 import structlog
 from loguru import logger as loguru_logger
@@ -129,13 +145,24 @@ class ColoredFormatter(logging.Formatter):
         return formatted
 
 
+def _dumps(data: Dict[str, Any]) -> str:
+    """JSON 编码（优先 orjson，非基础类型按 str 输出）"""
+    if orjson is not None:
+        return orjson.dumps(data, default=str).decode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+# 随日志输出的额外字段
+STRUCTURED_EXTRA_FIELDS = ("user_id", "request_id", "task_id")
+
+
 class StructuredFormatter(logging.Formatter):
     """结构化日志格式化器 - 生产环境使用"""
 
     def format(self, record: logging.LogRecord) -> str:
         """格式化日志记录"""
         log_entry = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": datetime.utcfromtimestamp(record.created).isoformat() + "Z",
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -147,53 +174,134 @@ class StructuredFormatter(logging.Formatter):
         # 添加异常信息
         if record.exc_info:
             log_entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            log_entry["exception"] = record.exc_text
 
         # 添加额外字段
-        if hasattr(record, "user_id"):
-            log_entry["user_id"] = record.user_id
-        if hasattr(record, "request_id"):
-            log_entry["request_id"] = record.request_id
-        if hasattr(record, "task_id"):
-            log_entry["task_id"] = record.task_id
+        for field in STRUCTURED_EXTRA_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                log_entry[field] = value
 
-        return json.dumps(log_entry, ensure_ascii=False)
+        return _dumps(log_entry)
 
 
-class StructuredHandler(logging.Handler):
-    """结构化日志处理器"""
+class StructuredHandler(logging.StreamHandler):
+    """结构化日志处理器（JSON 行写到 stderr）"""
 
     def __init__(self, level: int = logging.INFO):
-        super().__init__(level)
-        self.formatter = StructuredFormatter()
+        super().__init__(sys.stderr)
+        self.setLevel(level)
+        self.setFormatter(StructuredFormatter())
+
+
+# =============================================================================
+# 非阻塞日志管道：限速/采样、队列、后台监听线程
+# =============================================================================
+
+# 管道统计：dropped 队列满丢弃、rate_limited 限速丢弃、sampled_out 采样丢弃
+_pipeline_stats: Counter = Counter()
+_listener: Optional[QueueListener] = None
+
 
-    def emit(self, record: logging.LogRecord) -> None:
-        """发出日志记录"""
+def get_log_pipeline_stats() -> Dict[str, int]:
+    """获取日志管道的丢弃统计"""
+    return {field: _pipeline_stats.get(field, 0) for field in ("dropped", "rate_limited", "sampled_out")}
+
+
+class LogSamplingFilter(logging.Filter):
+    """
+    按日志器限速和采样（只作用于 WARNING 以下的日志）
+
+    规则按日志器名称前缀匹配，最长前缀优先：
+    - rate_limits: {日志器: 每秒最多条数}，令牌桶，允许一秒的突发
+    - sample_rates: {日志器: 保留比例 0~1}
+    """
+
+    def __init__(
+        self,
+        rate_limits: Optional[Dict[str, int]] = None,
+        sample_rates: Optional[Dict[str, float]] = None,
+        exempt_level: int = logging.WARNING,
+    ):
+        super().__init__()
+        self.rate_limits = dict(rate_limits or {})
+        self.sample_rates = dict(sample_rates or {})
+        self.exempt_level = exempt_level
+        self._rules: Dict[str, Tuple[Optional[int], Optional[float]]] = {}
+        self._buckets: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def _match(self, name: str, rules: Dict[str, Any]) -> Tuple[Optional[str], Any]:
+        best = None
+        for prefix in rules:
+            if name == prefix or name.startswith(prefix + "."):
+                if best is None or len(prefix) > len(best):
+                    best = prefix
+        return best, (rules[best] if best is not None else None)
+
+    def _rules_for(self, name: str) -> Tuple[Optional[str], Optional[int], Optional[float]]:
+        rules = self._rules.get(name)
+        if rules is None:
+            limit_key, limit = self._match(name, self.rate_limits)
+            _, rate = self._match(name, self.sample_rates)
+            rules = (limit_key, limit, rate)
+            self._rules[name] = rules
+        return rules
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.exempt_level:
+            return True
+
+        limit_key, limit, rate = self._rules_for(record.name)
+
+        if rate is not None and rate < 1 and random.random() >= rate:
+            _pipeline_stats["sampled_out"] += 1
+            return False
+
+        if limit:
+            now = time.monotonic()
+            with self._lock:
+                bucket = self._buckets.setdefault(limit_key, [float(limit), now])
+                bucket[0] = min(float(limit), bucket[0] + (now - bucket[1]) * limit)
+                bucket[1] = now
+                if bucket[0] < 1:
+                    _pipeline_stats["rate_limited"] += 1
+                    return False
+                bucket[0] -= 1
+
+        return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    非阻塞队列处理器
+
+    入队前只做消息插值（参数可能是可变对象，需在调用时求值），
+    完整格式化留给监听线程；队列满时丢弃并计数。
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _pipeline_stats["dropped"] += 1
+
+
+def stop_logging() -> None:
+    """停止后台监听线程并写出队列中剩余的日志"""
+    global _listener
+    if _listener is not None:
+        listener, _listener = _listener, None
         try:
-            log_entry = {
-                "timestamp": datetime.utcnow().isoformat() + "Z",
-                "level": record.levelname,
-                "logger": record.name,
-                "message": record.getMessage(),
-                "module": record.module,
-                "function": record.funcName,
-                "line": record.lineno,
-            }
-
-            # 添加异常信息
-            if record.exc_info:
-                log_entry["exception"] = self.formatter.formatException(record.exc_info)
-
-            # 添加额外字段
-            if hasattr(record, "user_id"):
-                log_entry["user_id"] = record.user_id
-            if hasattr(record, "request_id"):
-                log_entry["request_id"] = record.request_id
-            if hasattr(record, "task_id"):
-                log_entry["task_id"] = record.task_id
-
-            print(json.dumps(log_entry, ensure_ascii=False), file=sys.stderr)
+            listener.stop()
         except Exception:
-            self.handleError(record)
+            pass
 
 
 def setup_logging() -> None:
@@ -202,24 +310,27 @@ def setup_logging() -> None:
     root_logger = logging.getLogger()
     root_logger.setLevel(getattr(logging, settings.LOG_LEVEL))
 
-    # 清除现有处理器
+    # 清除现有处理器（重复调用时先停止之前的监听线程）
+    stop_logging()
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
 
+    handlers: List[logging.Handler] = []
+
     # 根据环境选择格式化器
     if settings.is_development and settings.COLORED_LOGS:
         # 开发环境：彩色控制台输出
         console_handler = logging.StreamHandler(sys.stderr)
         console_handler.setLevel(getattr(logging, settings.LOG_LEVEL))
         console_handler.setFormatter(ColoredFormatter(use_colors=True))
-        root_logger.addHandler(console_handler)
+        handlers.append(console_handler)
     else:
         # 生产环境或其他环境：简洁格式
         log_format = "%(asctime)s | %(levelname)-8s | %(name)s:%(funcName)s:%(lineno)d | %(message)s"
         console_handler = logging.StreamHandler(sys.stderr)
         console_handler.setLevel(getattr(logging, settings.LOG_LEVEL))
         console_handler.setFormatter(logging.Formatter(log_format))
-        root_logger.addHandler(console_handler)
+        handlers.append(console_handler)
 
     # 如果启用结构化日志，添加文件处理器
     if settings.STRUCTURED_LOGGING and settings.LOG_FILE:
@@ -229,7 +340,9 @@ def setup_logging() -> None:
         file_handler = logging.FileHandler(settings.LOG_FILE, encoding='utf-8')
         file_handler.setLevel(getattr(logging, settings.LOG_LEVEL))
         file_handler.setFormatter(StructuredFormatter())
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    _install_handlers(root_logger, handlers)
 
     # 配置structlog（用于结构化日志记录器）
     if settings.STRUCTURED_LOGGING:
@@ -251,6 +364,27 @@ def setup_logging() -> None:
     loguru_logger.remove()
 
 
+def _install_handlers(root_logger: logging.Logger, handlers: List[logging.Handler]) -> None:
+    """挂载处理器：默认经队列交给后台线程写出，LOG_ASYNC 关闭时直接挂到根日志器"""
+    global _listener
+
+    sampling_filter = LogSamplingFilter(settings.LOG_RATE_LIMITS, settings.LOG_SAMPLE_RATES)
+
+    if not settings.LOG_ASYNC:
+        for handler in handlers:
+            handler.addFilter(sampling_filter)
+            root_logger.addHandler(handler)
+        return
+
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.addFilter(sampling_filter)
+    root_logger.addHandler(queue_handler)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
 def _configure_third_party_loggers() -> None:
     """配置第三方库日志级别"""
     # Web框架
@@ -493,9 +627,15 @@ def log_task_event(
 
 # 初始化日志系统
 setup_logging()
+atexit.register(stop_logging)
 
 __all__ = [
     "get_logger",
+    "get_log_pipeline_stats",
+    "setup_logging",
+    "stop_logging",
+    "LogSamplingFilter",
+    "NonBlockingQueueHandler",
     "get_structured_logger",
     "LoggerMixin",
     "log_with_context",
@@ -0,0 +1,467 @@
+"""
+进程内指标 - Prometheus 文本格式的计数器/仪表/直方图
+
+不依赖 prometheus_client：指标保存在当前进程内存中，按需渲染为文本格式。
+- API 进程通过 /metrics 暴露
+- Celery worker 子进程各自在 CELERY_METRICS_PORT + 进程序号 上暴露
+- 已有的累计统计（提示词缓存、日志管道、连接池）通过采集函数在渲染时同步
+"""
+
+import bisect
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Prometheus 文本格式的 Content-Type
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+# 请求延迟的默认分桶（秒）
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_registry: List["Metric"] = []
+_registry_lock = threading.Lock()
+_collectors: List[Callable[[], None]] = []
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Metric(ABC):
+    """指标基类"""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), register: bool = True):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        if register:
+            with _registry_lock:
+                _registry.append(self)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self._render_samples())
+        return lines
+
+    @abstractmethod
+    def _render_samples(self) -> List[str]:
+        """渲染样本行（不含 HELP/TYPE 行）"""
+        pass
+
+
+class Counter(Metric):
+    """单调递增计数器"""
+
+    type_name = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        key = tuple(str(value) for value in labelvalues)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def set_total(self, value: float, *labelvalues: str) -> None:
+        """同步外部维护的累计值（采集函数使用）"""
+        with self._lock:
+            self._values[tuple(str(label) for label in labelvalues)] = float(value)
+
+    def value(self, *labelvalues: str) -> float:
+        return self._values.get(tuple(str(value) for value in labelvalues), 0.0)
+
+    def _render_samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}_total{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Gauge(Metric):
+    """可增可减的瞬时值"""
+
+    type_name = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, *labelvalues: str) -> None:
+        with self._lock:
+            self._values[tuple(str(label) for label in labelvalues)] = float(value)
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        key = tuple(str(label) for label in labelvalues)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, *labelvalues: str, amount: float = 1.0) -> None:
+        self.inc(*labelvalues, amount=-amount)
+
+    def value(self, *labelvalues: str) -> float:
+        return self._values.get(tuple(str(label) for label in labelvalues), 0.0)
+
+    @contextmanager
+    def track_inprogress(self, *labelvalues: str) -> Iterator[None]:
+        """进入时加一、退出时减一"""
+        self.inc(*labelvalues)
+        try:
+            yield
+        finally:
+            self.dec(*labelvalues)
+
+    def _render_samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Histogram(Metric):
+    """分桶直方图（每个标签组合一组累计分桶）"""
+
+    type_name = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # {标签: [各分桶计数..., 溢出计数, 总和]}
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        key = tuple(str(label) for label in labelvalues)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, *labelvalues: str) -> Iterator[None]:
+        """记录代码块耗时（秒）"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labelvalues)
+
+    def snapshot(self) -> Dict[Tuple[str, ...], Dict[str, float]]:
+        """每个标签组合的次数和总和"""
+        with self._lock:
+            return {
+                key: {"count": sum(series[:-1]), "sum": series[-1]}
+                for key, series in self._values.items()
+            }
+
+    def _render_samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._values.items())
+        lines = []
+        for key, series in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {_format_value(cumulative)}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(cumulative)}")
+        return lines
+
+
+def register_collector(collector: Callable[[], None]) -> None:
+    """注册采集函数（渲染前调用，用于把外部统计同步到指标）"""
+    with _registry_lock:
+        if collector not in _collectors:
+            _collectors.append(collector)
+
+
+def render_metrics() -> str:
+    """渲染所有已注册指标（Prometheus 文本格式）"""
+    with _registry_lock:
+        metrics = list(_registry)
+        collectors = list(_collectors)
+    for collector in collectors:
+        try:
+            collector()
+        except Exception as e:
+            logger.debug(f"指标采集失败: {e}")
+    lines: List[str] = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:  # noqa: N802
+        body = render_metrics().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE_LATEST)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        return
+
+
+_server: Optional[ThreadingHTTPServer] = None
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0") -> Optional[ThreadingHTTPServer]:
+    """
+    在后台线程启动指标 HTTP 服务（供没有 Web 服务的 Celery worker 使用）
+
+    Args:
+        port: 端口
+        host: 监听地址
+
+    Returns:
+        HTTP 服务，端口被占用时返回 None
+    """
+    global _server
+    if _server is not None:
+        return _server
+    try:
+        _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as e:
+        logger.warning(f"指标服务启动失败（端口 {port}）: {e}")
+        return None
+    thread = threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True)
+    thread.start()
+    logger.info(f"指标服务已启动: http://{host}:{port}/metrics")
+    return _server
+
+
+# =============================================================================
+# 指标定义
+# =============================================================================
+
+# HTTP 请求指标（由请求中间件记录，route 为路由模板）
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP请求耗时（到响应头发出）",
+    ("method", "route", "status"),
+)
+HTTP_REQUEST_ERRORS = Counter(
+    "http_request_errors",
+    "HTTP请求未处理异常次数",
+    ("method", "route"),
+)
+
+# 数据库连接池
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "从连接池获取连接的等待时间（含新建连接）",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "连接池连接数",
+    ("state",),
+)
+
+# FFmpeg
+FFMPEG_JOB_DURATION = Histogram(
+    "ffmpeg_job_duration_seconds",
+    "FFmpeg命令执行耗时",
+    ("status",),
+    buckets=(0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0),
+)
+FFMPEG_JOBS_IN_PROGRESS = Gauge(
+    "ffmpeg_jobs_in_progress",
+    "正在执行的FFmpeg命令数",
+)
+
+# Whisper 识别（实时率 = 识别耗时 / 音频时长）
+WHISPER_REAL_TIME_FACTOR = Histogram(
+    "whisper_real_time_factor",
+    "Whisper识别实时率",
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0),
+)
+
+# AI 服务提供商调用（key 为 API Key 的哈希前缀）
+PROVIDER_REQUEST_DURATION = Histogram(
+    "provider_request_duration_seconds",
+    "AI服务提供商请求耗时",
+    ("provider", "method", "status"),
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0),
+)
+PROVIDER_RATE_LIMITED = Counter(
+    "provider_rate_limited",
+    "AI服务提供商返回429的次数",
+    ("provider", "key"),
+)
+
+# 对象存储传输
+STORAGE_TRANSFER_BYTES = Counter(
+    "storage_transfer_bytes",
+    "对象存储传输字节数",
+    ("direction",),
+)
+STORAGE_TRANSFER_DURATION = Histogram(
+    "storage_transfer_duration_seconds",
+    "对象存储单次传输耗时",
+    ("direction",),
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+
+# CPU 密集任务（executor 为 process / thread）
+CPU_TASK_DURATION = Histogram(
+    "cpu_task_duration_seconds",
+    "CPU密集任务耗时（含排队）",
+    ("task", "executor"),
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+CPU_TASKS_IN_PROGRESS = Gauge(
+    "cpu_tasks_in_progress",
+    "已提交、尚未完成的CPU密集任务数",
+    ("task",),
+)
+
+# 密码哈希（bcrypt，operation 为 hash / verify）
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "bcrypt计算耗时（不含排队）",
+    ("operation",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+PASSWORD_HASH_QUEUE_WAIT = Histogram(
+    "password_hash_queue_wait_seconds",
+    "密码哈希任务在线程池中的排队时间",
+    ("operation",),
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+PASSWORD_HASH_IN_PROGRESS = Gauge(
+    "password_hash_in_progress",
+    "已提交、尚未完成的密码哈希任务数（含排队）",
+    ("operation",),
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected",
+    "排队已满被拒绝的密码哈希任务数",
+    ("operation",),
+)
+
+# 缓存
+CACHE_REQUESTS = Counter(
+    "cache_requests",
+    "缓存查询次数",
+    ("cache", "result"),
+)
+
+# 日志管道
+LOG_RECORDS_DISCARDED = Counter(
+    "log_records_discarded",
+    "日志管道丢弃的记录数",
+    ("reason",),
+)
+
+# Celery
+CELERY_TASK_DURATION = Histogram(
+    "celery_task_duration_seconds",
+    "Celery任务执行耗时",
+    ("task", "state"),
+    buckets=(0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0),
+)
+CELERY_QUEUE_LENGTH = Gauge(
+    "celery_queue_length",
+    "Celery队列中等待的任务数",
+    ("queue",),
+)
+
+
+async def collect_celery_queue_lengths() -> None:
+    """读取 Celery 队列长度（Redis 列表长度），Redis 不可用时跳过"""
+    from src.core.config import settings
+    from src.core.redis import get_redis_client
+
+    # 只在 broker 与缓存共用同一个 Redis 时读取
+    if settings.CELERY_BROKER_URL != settings.REDIS_URL:
+        return
+    try:
+        pipe = get_redis_client().pipeline(transaction=False)
+        for queue_name in settings.METRICS_CELERY_QUEUES:
+            pipe.llen(queue_name)
+        lengths = await pipe.execute()
+    except Exception as e:
+        logger.debug(f"读取Celery队列长度失败: {e}")
+        return
+    for queue_name, length in zip(settings.METRICS_CELERY_QUEUES, lengths):
+        CELERY_QUEUE_LENGTH.set(length, queue_name)
+
+
+def _collect_log_pipeline() -> None:
+    from src.core.logging import get_log_pipeline_stats
+
+    for reason, value in get_log_pipeline_stats().items():
+        LOG_RECORDS_DISCARDED.set_total(value, reason)
+
+
+register_collector(_collect_log_pipeline)
+
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "CONTENT_TYPE_LATEST",
+    "DEFAULT_LATENCY_BUCKETS",
+    "HTTP_REQUEST_DURATION",
+    "HTTP_REQUEST_ERRORS",
+    "DB_POOL_CHECKOUT_WAIT",
+    "DB_POOL_CONNECTIONS",
+    "FFMPEG_JOB_DURATION",
+    "FFMPEG_JOBS_IN_PROGRESS",
+    "WHISPER_REAL_TIME_FACTOR",
+    "PROVIDER_REQUEST_DURATION",
+    "PROVIDER_RATE_LIMITED",
+    "STORAGE_TRANSFER_BYTES",
+    "STORAGE_TRANSFER_DURATION",
+    "CPU_TASK_DURATION",
+    "CPU_TASKS_IN_PROGRESS",
+    "PASSWORD_HASH_DURATION",
+    "PASSWORD_HASH_QUEUE_WAIT",
+    "PASSWORD_HASH_IN_PROGRESS",
+    "PASSWORD_HASH_REJECTED",
+    "CACHE_REQUESTS",
+    "LOG_RECORDS_DISCARDED",
+    "CELERY_TASK_DURATION",
+    "CELERY_QUEUE_LENGTH",
+    "collect_celery_queue_lengths",
+    "register_collector",
+    "render_metrics",
+    "start_metrics_server",
+]
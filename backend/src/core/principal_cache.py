@@ -0,0 +1,256 @@
+"""
+认证主体缓存 - 已登录用户的短期缓存
+
+轮询类接口（任务状态、画布 SSE 重连、生成历史）每个请求都要解析当前用户，
+原来每次都会解码 JWT 并查询 users 表。这里：
+- 令牌解码复用 rate_limit.identity_from_token 的进程内缓存，同一令牌只验证一次
+- 活跃用户的字段（不含密码哈希）缓存在进程内 LRU（AUTH_PRINCIPAL_LOCAL_TTL_SECONDS）
+  和 Redis（AUTH_PRINCIPAL_CACHE_TTL_SECONDS）中，命中时不访问数据库
+- 用户记录更新/删除时（ORM flush 和事务提交）失效本进程缓存和 Redis 缓存；
+  其它进程的本地缓存最多保留 AUTH_PRINCIPAL_LOCAL_TTL_SECONDS
+
+缓存返回的 User 是未绑定会话的临时对象，只能读取；需要修改用户的接口应通过
+get_current_user_for_update 从数据库加载。
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from collections import Counter, OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Set, Tuple, Union
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from src.core.config import settings
+from src.core.logging import get_logger
+from src.core.metrics import CACHE_REQUESTS, register_collector
+from src.core.redis import get_redis_client
+from src.models.user import User
+
+logger = get_logger(__name__)
+
+CACHE_KEY_PREFIX = "auth:principal"
+
+# 缓存的用户字段（密码哈希不进入缓存）
+PRINCIPAL_FIELDS = tuple(
+    column.name for column in User.__table__.columns if column.name != "password_hash"
+)
+_DATETIME_FIELDS = ("created_at", "updated_at", "last_login")
+
+# 会话中待提交后失效的用户ID
+_SESSION_INFO_KEY = "principal_invalidations"
+
+# 进程内 LRU：{user_id: (过期时间, 字段)}
+_local_principals: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_stats: Counter = Counter()
+
+# 提交后异步删除 Redis 键的任务（保留引用避免被回收）
+_pending_deletes: Set[asyncio.Task] = set()
+
+# Redis 出错后暂停使用一段时间，避免每次请求都等待连接失败
+REDIS_RETRY_AFTER_SECONDS = 30
+_redis_retry_at = 0.0
+
+
+def _get_redis():
+    if time.monotonic() < _redis_retry_at:
+        return None
+    return get_redis_client()
+
+
+def _mark_redis_failed() -> None:
+    global _redis_retry_at
+    _redis_retry_at = time.monotonic() + REDIS_RETRY_AFTER_SECONDS
+
+
+def _cache_key(user_id: str) -> str:
+    return f"{CACHE_KEY_PREFIX}:{user_id}"
+
+
+def get_principal_cache_stats() -> Dict[str, int]:
+    """当前进程的命中统计：{"hits", "misses", "errors", "invalidations"}"""
+    return {field: _stats.get(field, 0) for field in ("hits", "misses", "errors", "invalidations")}
+
+
+def _collect_cache_metrics() -> None:
+    for result, value in get_principal_cache_stats().items():
+        CACHE_REQUESTS.set_total(value, "auth_principal", result)
+
+
+register_collector(_collect_cache_metrics)
+
+
+def clear_local_principal_cache() -> None:
+    """清空进程内缓存和统计"""
+    _local_principals.clear()
+    _stats.clear()
+
+
+def serialize_principal(user: User) -> Dict[str, Any]:
+    """用户 → 可 JSON 序列化的缓存字段"""
+    data = {}
+    for field in PRINCIPAL_FIELDS:
+        value = getattr(user, field)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, uuid.UUID):
+            value = str(value)
+        data[field] = value
+    return data
+
+
+def build_principal(data: Dict[str, Any]) -> User:
+    """缓存字段 → 未绑定会话的 User（只读）"""
+    values = dict(data)
+    values["id"] = uuid.UUID(str(values["id"]))
+    for field in _DATETIME_FIELDS:
+        if values.get(field):
+            values[field] = datetime.fromisoformat(values[field])
+    return User(**values)
+
+
+def _set_local(user_id: str, data: Dict[str, Any]) -> None:
+    _local_principals[user_id] = (time.monotonic() + settings.AUTH_PRINCIPAL_LOCAL_TTL_SECONDS, data)
+    _local_principals.move_to_end(user_id)
+    while len(_local_principals) > settings.AUTH_PRINCIPAL_LOCAL_CACHE_SIZE:
+        _local_principals.popitem(last=False)
+
+
+async def get_cached_principal(user_id: Union[str, uuid.UUID]) -> Optional[User]:
+    """
+    读取缓存的活跃用户
+
+    Args:
+        user_id: 用户ID
+
+    Returns:
+        未绑定会话的 User，未命中返回 None
+    """
+    if not settings.AUTH_PRINCIPAL_CACHE_ENABLED:
+        return None
+
+    user_id = str(user_id)
+    entry = _local_principals.get(user_id)
+    if entry is not None and entry[0] > time.monotonic():
+        _local_principals.move_to_end(user_id)
+        _stats["hits"] += 1
+        return build_principal(entry[1])
+
+    redis_client = _get_redis()
+    if redis_client is not None:
+        try:
+            value = await redis_client.get(_cache_key(user_id))
+            if value is not None:
+                if isinstance(value, bytes):
+                    value = value.decode("utf-8")
+                data = json.loads(value)
+                _set_local(user_id, data)
+                _stats["hits"] += 1
+                return build_principal(data)
+        except Exception as e:
+            _stats["errors"] += 1
+            _mark_redis_failed()
+            logger.warning(f"[PrincipalCache] Redis读取失败，暂时仅使用进程内缓存: {e}")
+
+    _stats["misses"] += 1
+    return None
+
+
+async def cache_principal(user: User) -> None:
+    """写入活跃用户（未激活的用户不缓存，每次都回源数据库）"""
+    if not settings.AUTH_PRINCIPAL_CACHE_ENABLED or not user.is_active:
+        return
+
+    data = serialize_principal(user)
+    _set_local(data["id"], data)
+
+    redis_client = _get_redis()
+    if redis_client is None:
+        return
+    try:
+        await redis_client.set(
+            _cache_key(data["id"]),
+            json.dumps(data, ensure_ascii=False),
+            ex=settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS,
+        )
+    except Exception as e:
+        _stats["errors"] += 1
+        _mark_redis_failed()
+        logger.warning(f"[PrincipalCache] Redis写入失败: {e}")
+
+
+def _invalidate_local(user_id: str) -> None:
+    _local_principals.pop(user_id, None)
+    _stats["invalidations"] += 1
+
+
+async def _delete_redis(user_ids: Set[str]) -> None:
+    redis_client = _get_redis()
+    if redis_client is None:
+        return
+    try:
+        await redis_client.delete(*(_cache_key(user_id) for user_id in user_ids))
+    except Exception as e:
+        _stats["errors"] += 1
+        _mark_redis_failed()
+        logger.warning(f"[PrincipalCache] Redis失效失败: {e}")
+
+
+async def invalidate_principal(user_id: Union[str, uuid.UUID]) -> None:
+    """失效指定用户的缓存（本进程 + Redis）"""
+    user_id = str(user_id)
+    _invalidate_local(user_id)
+    await _delete_redis({user_id})
+
+
+def _on_user_changed(mapper, connection, target: User) -> None:
+    """用户记录 UPDATE/DELETE：立即失效本地缓存，提交后再失效一次并删除 Redis 键"""
+    if target.id is None:
+        return
+    user_id = str(target.id)
+    _invalidate_local(user_id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_SESSION_INFO_KEY, set()).add(user_id)
+
+
+def _on_session_commit(session: Session) -> None:
+    # 提交前其它请求可能读到旧记录并重新写入缓存，提交后再失效一次
+    user_ids = session.info.pop(_SESSION_INFO_KEY, None)
+    if not user_ids:
+        return
+    for user_id in user_ids:
+        _invalidate_local(user_id)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # 同步会话（Celery 任务）没有事件循环，Redis 缓存按 TTL 过期
+        return
+    task = loop.create_task(_delete_redis(user_ids))
+    _pending_deletes.add(task)
+    task.add_done_callback(_pending_deletes.discard)
+
+
+def _on_session_rollback(session: Session) -> None:
+    session.info.pop(_SESSION_INFO_KEY, None)
+
+
+event.listen(User, "after_update", _on_user_changed)
+event.listen(User, "after_delete", _on_user_changed)
+event.listen(Session, "after_commit", _on_session_commit)
+event.listen(Session, "after_soft_rollback", _on_session_rollback)
+
+
+__all__ = [
+    "PRINCIPAL_FIELDS",
+    "build_principal",
+    "cache_principal",
+    "clear_local_principal_cache",
+    "get_cached_principal",
+    "get_principal_cache_stats",
+    "invalidate_principal",
+    "serialize_principal",
+]
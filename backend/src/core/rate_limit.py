@@ -0,0 +1,315 @@
+"""
+请求限流 - 基于 Redis 的 GCRA 限流器
+
+- 额度按“身份 + 路由类”计算：已登录用户按用户ID，匿名请求按客户端IP
+- 路由类和每个接口的消耗由配置决定（生成、导出、上传等高成本接口单独计额）
+- Redis 中的判定和写入在一个 Lua 脚本内原子完成，时间取 Redis 服务器时间，多个 worker 共享额度
+- 每个进程保留一份本地状态：它只记录本进程看到的消耗，是全局消耗的下界，
+  本地已判定超限时直接拒绝，不再访问 Redis（被限流的客户端不会把压力转移到 Redis）
+- Redis 不可用时暂停使用一段时间，退回本地限流
+"""
+
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.core.config import settings
+from src.core.logging import get_logger
+from src.core.redis import get_redis_client
+
+logger = get_logger(__name__)
+
+# Redis 出错后暂停使用的秒数
+REDIS_RETRY_AFTER_SECONDS = 30
+
+# 令牌身份缓存（避免每个请求重复解码 JWT）
+IDENTITY_CACHE_SIZE = 10000
+
+# KEYS[1]: 限流键；ARGV: 单位消耗间隔(ms)、突发容量(ms)、本次消耗
+# 返回 {是否放行, 剩余次数, 完全恢复剩余毫秒, 需等待毫秒}
+GCRA_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local emission = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+  tat = now
+end
+local new_tat = tat + emission * cost
+local wait = new_tat - now - burst
+if wait > 0 then
+  return {0, math.floor((burst - (tat - now)) / emission), math.ceil(tat - now), math.ceil(wait)}
+end
+redis.call('SET', KEYS[1], new_tat, 'PX', math.ceil(new_tat - now))
+return {1, math.floor((burst - (new_tat - now)) / emission), math.ceil(new_tat - now), 0}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """路由类额度：period 秒内最多 limit 次（允许一次性突发 limit 次）"""
+    name: str
+    limit: int
+    period: int
+
+    @classmethod
+    def parse(cls, name: str, spec: str) -> "RateLimitPolicy":
+        """解析 "次数/秒数" 格式的额度"""
+        limit, _, period = str(spec).partition("/")
+        return cls(name=name, limit=int(limit), period=int(period or 60))
+
+    @property
+    def emission(self) -> float:
+        """单位消耗对应的间隔（秒）"""
+        return self.period / self.limit
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    """限流判定结果"""
+    allowed: bool
+    policy: RateLimitPolicy
+    remaining: int
+    reset_after: float
+    retry_after: float = 0.0
+
+    def headers(self) -> Dict[str, str]:
+        """RateLimit 响应头（IETF draft），超限时附带 Retry-After"""
+        headers = {
+            "RateLimit-Limit": str(self.policy.limit),
+            "RateLimit-Remaining": str(max(self.remaining, 0)),
+            "RateLimit-Reset": str(max(int(-(-self.reset_after // 1)), 0)),
+            "RateLimit-Policy": f"{self.policy.limit};w={self.policy.period}",
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(int(-(-self.retry_after // 1)), 1))
+        return headers
+
+
+def gcra(tat: float, now: float, policy: RateLimitPolicy, cost: int) -> Tuple[bool, float, int, float, float]:
+    """
+    GCRA 判定（与 Lua 脚本一致，单位为秒）
+
+    Args:
+        tat: 理论到达时间（未记录时传 now）
+        now: 当前时间
+        policy: 额度
+        cost: 本次消耗
+
+    Returns:
+        (是否放行, 新的理论到达时间, 剩余次数, 完全恢复剩余秒数, 需等待秒数)
+    """
+    emission = policy.emission
+    burst = float(policy.period)
+    tat = max(tat, now)
+    new_tat = tat + emission * cost
+    wait = new_tat - now - burst
+    if wait > 0:
+        return False, tat, int((burst - (tat - now)) // emission), tat - now, wait
+    return True, new_tat, int((burst - (new_tat - now)) // emission), new_tat - now, 0.0
+
+
+class RateLimiter:
+    """
+    请求限流器
+
+    使用方式：
+        limiter = get_rate_limiter()
+        decision = await limiter.check("u:<user_id>", "POST", "/api/v1/export/jianying/1")
+    """
+
+    def __init__(
+        self,
+        classes: Dict[str, str],
+        routes: Sequence[Sequence[Any]],
+        exempt_paths: Sequence[str] = (),
+        key_prefix: str = "rl",
+        local_size: int = 100000,
+        redis_factory: Callable[[], Optional[Any]] = get_redis_client,
+    ):
+        self.policies = {name: RateLimitPolicy.parse(name, spec) for name, spec in classes.items()}
+        self.default_policy = self.policies.get("default") or RateLimitPolicy("default", 600, 60)
+        self.routes: List[Tuple[str, Any, RateLimitPolicy, int]] = [
+            (str(method).upper(), re.compile(pattern), self.policies[name], int(cost))
+            for method, pattern, name, cost in routes
+        ]
+        self.exempt_paths = tuple(exempt_paths)
+        self.key_prefix = key_prefix
+        self.local_size = local_size
+        self._redis_factory = redis_factory
+        self._redis_paused_until = 0.0
+        self._script_sha: Optional[str] = None
+        # 本地状态 {限流键: 理论到达时间}（LRU，空闲键被淘汰）
+        self._local: "OrderedDict[str, float]" = OrderedDict()
+        self._route_cache: Dict[Tuple[str, str], Optional[Tuple[RateLimitPolicy, int]]] = {}
+
+    def classify(self, method: str, path: str) -> Optional[Tuple[RateLimitPolicy, int]]:
+        """
+        确定请求所属路由类和消耗
+
+        Returns:
+            (额度, 消耗)，豁免路径返回 None
+        """
+        if method == "OPTIONS" or path.startswith(self.exempt_paths):
+            return None
+
+        cache_key = (method, path)
+        if cache_key in self._route_cache:
+            return self._route_cache[cache_key]
+
+        matched = (self.default_policy, 1)
+        for route_method, pattern, policy, cost in self.routes:
+            if route_method in ("*", method) and pattern.search(path):
+                matched = (policy, cost)
+                break
+
+        if len(self._route_cache) > 4096:
+            self._route_cache.clear()
+        self._route_cache[cache_key] = matched
+        return matched
+
+    async def check(self, identity: str, method: str, path: str) -> Optional[RateLimitDecision]:
+        """
+        判定并记录一次请求
+
+        Args:
+            identity: 身份（"u:<用户ID>" 或 "ip:<客户端IP>"）
+            method: HTTP 方法
+            path: 请求路径
+
+        Returns:
+            判定结果，豁免路径返回 None
+        """
+        route = self.classify(method, path)
+        if route is None:
+            return None
+        policy, cost = route
+        key = f"{self.key_prefix}:{policy.name}:{identity}"
+
+        now = time.time()
+        allowed, new_tat, remaining, reset_after, retry_after = gcra(
+            self._local.get(key, now), now, policy, cost
+        )
+        if not allowed:
+            return RateLimitDecision(False, policy, remaining, reset_after, retry_after)
+
+        decision = await self._check_redis(key, policy, cost)
+        if decision is None:
+            self._store_local(key, new_tat)
+            return RateLimitDecision(True, policy, remaining, reset_after)
+
+        # 以 Redis 的全局状态同步本地下界
+        self._store_local(key, now + decision.reset_after)
+        return decision
+
+    def _store_local(self, key: str, tat: float) -> None:
+        self._local[key] = tat
+        self._local.move_to_end(key)
+        while len(self._local) > self.local_size:
+            self._local.popitem(last=False)
+
+    async def _check_redis(self, key: str, policy: RateLimitPolicy, cost: int) -> Optional[RateLimitDecision]:
+        if time.monotonic() < self._redis_paused_until:
+            return None
+        client = self._redis_factory()
+        if client is None:
+            return None
+
+        args = (policy.emission * 1000, policy.period * 1000, cost)
+        try:
+            if self._script_sha is None:
+                self._script_sha = await client.script_load(GCRA_SCRIPT)
+            try:
+                result = await client.evalsha(self._script_sha, 1, key, *args)
+            except Exception as e:
+                if "NOSCRIPT" not in str(e):
+                    raise
+                result = await client.eval(GCRA_SCRIPT, 1, key, *args)
+        except Exception as e:
+            self._redis_paused_until = time.monotonic() + REDIS_RETRY_AFTER_SECONDS
+            self._script_sha = None
+            logger.warning(f"限流Redis不可用，{REDIS_RETRY_AFTER_SECONDS}秒内使用进程内限流: {e}")
+            return None
+
+        allowed, remaining, reset_ms, wait_ms = (int(value) for value in result)
+        return RateLimitDecision(bool(allowed), policy, remaining, reset_ms / 1000, wait_ms / 1000)
+
+    def reset_local(self) -> None:
+        """清空本地状态"""
+        self._local.clear()
+        self._route_cache.clear()
+
+
+_identity_cache: "OrderedDict[str, Tuple[Optional[str], float]]" = OrderedDict()
+
+
+def identity_from_token(token: str) -> Optional[str]:
+    """
+    从访问令牌解析用户ID（带进程内缓存，缓存到令牌过期）
+
+    Returns:
+        用户ID，令牌无效时返回 None
+    """
+    now = time.time()
+    cached = _identity_cache.get(token)
+    if cached is not None and cached[1] > now:
+        return cached[0]
+
+    from src.core.security import TokenError, verify_token
+
+    try:
+        payload = verify_token(token)
+        user_id, expires_at = payload.get("sub"), float(payload.get("exp") or now)
+    except TokenError:
+        # 无效令牌短时间缓存，避免重复解码
+        user_id, expires_at = None, now + 60
+
+    _identity_cache[token] = (user_id, expires_at)
+    while len(_identity_cache) > IDENTITY_CACHE_SIZE:
+        _identity_cache.popitem(last=False)
+    return user_id
+
+
+def resolve_identity(authorization: Optional[str], client_ip: Optional[str]) -> str:
+    """
+    确定限流身份：有效令牌按用户，否则按客户端IP
+
+    Args:
+        authorization: Authorization 请求头
+        client_ip: 客户端IP
+    """
+    if authorization and authorization.startswith("Bearer "):
+        user_id = identity_from_token(authorization[7:])
+        if user_id:
+            return f"u:{user_id}"
+    return f"ip:{client_ip or 'unknown'}"
+
+
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """获取按配置创建的限流器（进程内单例）"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter(
+            classes=settings.RATE_LIMIT_CLASSES,
+            routes=settings.RATE_LIMIT_ROUTES,
+            exempt_paths=settings.RATE_LIMIT_EXEMPT_PATHS,
+        )
+    return _rate_limiter
+
+
+__all__ = [
+    "RateLimitPolicy",
+    "RateLimitDecision",
+    "RateLimiter",
+    "gcra",
+    "get_rate_limiter",
+    "identity_from_token",
+    "resolve_identity",
+]
@@ -0,0 +1,54 @@
+"""
+Redis 客户端 - 按事件循环缓存的异步客户端
+
+客户端创建时不连接 Redis；连接失败在调用时抛出，由调用方决定退回进程内实现或报错。
+"""
+
+import asyncio
+from typing import Dict
+
+import redis.asyncio as redis
+
+from src.core.config import settings
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# 异步客户端绑定创建时的事件循环，API 进程与 Celery worker 的后台 loop 各用各的
+_clients: Dict[int, redis.Redis] = {}
+
+
+def get_redis_client() -> redis.Redis:
+    """
+    获取当前事件循环的 Redis 异步客户端
+
+    Returns:
+        redis.asyncio.Redis
+    """
+    try:
+        loop_key = id(asyncio.get_running_loop())
+    except RuntimeError:
+        loop_key = 0
+
+    client = _clients.get(loop_key)
+    if client is None:
+        client = redis.from_url(settings.REDIS_URL, socket_connect_timeout=2, socket_timeout=2)
+        _clients[loop_key] = client
+    return client
+
+
+async def close_redis_clients() -> None:
+    """关闭所有缓存的 Redis 客户端"""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.debug(f"关闭Redis客户端失败: {e}")
+
+
+__all__ = [
+    "get_redis_client",
+    "close_redis_clients",
+]
@@ -1,14 +1,35 @@
 """
 安全相关功能模块 - 简化版，只保留核心功能
+
+bcrypt 每次计算需要 100~300ms CPU，异步接口通过 *_async 函数在专用线程池中执行
+（bcrypt 计算时释放 GIL），不阻塞事件循环：
+- 线程数 PASSWORD_HASH_WORKERS 即并发上限，与其它线程池任务互不影响
+- 已提交未完成的任务超过 PASSWORD_HASH_MAX_PENDING 时直接拒绝（PasswordHashBusyError），
+  登录突发或撞库时不会无限排队
+- 登录时发现哈希的 cost 与 PASSWORD_BCRYPT_ROUNDS 不一致会重新计算哈希，
+  调整 cost 后用户下次登录即完成迁移
 """
 
+import asyncio
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from src.core.config import settings
+from src.core.metrics import (
+    PASSWORD_HASH_DURATION,
+    PASSWORD_HASH_IN_PROGRESS,
+    PASSWORD_HASH_QUEUE_WAIT,
+    PASSWORD_HASH_REJECTED,
+)
+
+T = TypeVar("T")
 
 # 密码加密上下文
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -24,6 +45,19 @@ class TokenError(SecurityError):
     pass
 
 
+class PasswordHashBusyError(SecurityError):
+    """密码哈希任务排队已满"""
+    pass
+
+
+# bcrypt 哈希格式：$2b$<cost>$<salt+hash>
+_BCRYPT_COST_PATTERN = re.compile(r"^\$2[abxy]?\$(\d{2})\$")
+
+_password_executor: Optional[ThreadPoolExecutor] = None
+_password_pending = 0
+_password_lock = threading.Lock()
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """验证密码"""
     try:
@@ -41,13 +75,96 @@ def get_password_hash(password: str) -> str:
     try:
         import bcrypt
         # 直接使用 bcrypt 库，避免 passlib 兼容性问题
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=settings.PASSWORD_BCRYPT_ROUNDS)
         hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
         return hashed.decode('utf-8')
     except Exception as e:
         raise SecurityError(f"密码哈希生成失败: {str(e)}")
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """哈希的 cost 与 PASSWORD_BCRYPT_ROUNDS 不一致（或无法识别）时需要重新计算"""
+    match = _BCRYPT_COST_PATTERN.match(hashed_password or "")
+    return match is None or int(match.group(1)) != settings.PASSWORD_BCRYPT_ROUNDS
+
+
+def _verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    if not verify_password(plain_password, hashed_password):
+        return False, None
+    if password_needs_rehash(hashed_password):
+        return True, get_password_hash(plain_password)
+    return True, None
+
+
+def _get_password_executor() -> ThreadPoolExecutor:
+    global _password_executor
+    if _password_executor is None:
+        with _password_lock:
+            if _password_executor is None:
+                _password_executor = ThreadPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    thread_name_prefix="password-hash",
+                )
+    return _password_executor
+
+
+async def _run_password_task(operation: str, func: Callable[..., T], *args: Any) -> T:
+    """在密码哈希线程池中执行，排队已满时抛出 PasswordHashBusyError"""
+    global _password_pending
+    with _password_lock:
+        if _password_pending >= settings.PASSWORD_HASH_MAX_PENDING:
+            PASSWORD_HASH_REJECTED.inc(operation)
+            raise PasswordHashBusyError("密码验证请求过多，请稍后重试")
+        _password_pending += 1
+
+    submitted = time.perf_counter()
+
+    def timed() -> T:
+        started = time.perf_counter()
+        PASSWORD_HASH_QUEUE_WAIT.observe(started - submitted, operation)
+        try:
+            return func(*args)
+        finally:
+            PASSWORD_HASH_DURATION.observe(time.perf_counter() - started, operation)
+
+    try:
+        with PASSWORD_HASH_IN_PROGRESS.track_inprogress(operation):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(_get_password_executor(), timed)
+    finally:
+        with _password_lock:
+            _password_pending -= 1
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """验证密码（密码哈希线程池）"""
+    return await _run_password_task("verify", verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """生成密码哈希（密码哈希线程池）"""
+    return await _run_password_task("hash", get_password_hash, password)
+
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    验证密码，cost 需要调整时顺带重新计算哈希（密码哈希线程池，一次排队）
+
+    Returns:
+        (是否通过, 新哈希)，不需要更新哈希时新哈希为 None
+    """
+    return await _run_password_task("verify", _verify_and_update, plain_password, hashed_password)
+
+
+def shutdown_password_executor() -> None:
+    """关闭密码哈希线程池（应用退出时调用）"""
+    global _password_executor
+    with _password_lock:
+        executor, _password_executor = _password_executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
 def create_access_token(
         data: Dict[str, Any],
         expires_delta: Optional[timedelta] = None
@@ -105,9 +222,15 @@ def verify_websocket_token(token: str) -> Dict[str, Any]:
 __all__ = [
     "verify_password",
     "get_password_hash",
+    "verify_password_async",
+    "get_password_hash_async",
+    "verify_and_update_password",
+    "password_needs_rehash",
+    "shutdown_password_executor",
     "create_access_token",
     "verify_token",
     "verify_websocket_token",
     "SecurityError",
     "TokenError",
+    "PasswordHashBusyError",
 ]
@@ -0,0 +1,463 @@
+"""
+链路追踪 - 与 OpenTelemetry 兼容的轻量实现
+
+- Span 使用 W3C traceparent 传播（HTTP 请求头、Celery 消息头）
+- 当前 Span 保存在 contextvars 中，asyncio 任务、asyncio.to_thread 和 worker 后台事件循环都会继承
+- 导出为 OTLP JSON：写入本地 JSON Lines 文件，或批量 POST 到 OTLP/HTTP collector（/v1/traces）
+- 导出在后台线程批量进行，队列满时丢弃
+- 耗时汇总：在 collect_breakdown() 范围内结束的 Span 按名称累计耗时和次数，
+  不受采样和导出开关影响，用于保存到视频任务上
+
+使用方式：
+    with start_span("video.concat", {"video.count": 12}):
+        ...
+
+    with collect_breakdown() as breakdown:
+        ...
+    breakdown.to_dict()
+"""
+
+import json
+import os
+import queue
+import random
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, MutableMapping, Optional
+
+from src.core.config import settings
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+TRACEPARENT_HEADER = "traceparent"
+_TRACEPARENT_PATTERN = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+# OTLP SpanKind
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+SPAN_KIND_PRODUCER = 4
+SPAN_KIND_CONSUMER = 5
+
+# 导出批次大小和间隔
+EXPORT_BATCH_SIZE = 512
+EXPORT_INTERVAL_SECONDS = 2.0
+EXPORT_QUEUE_SIZE = 10000
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    """Span 的传播信息"""
+    trace_id: str
+    span_id: str
+    sampled: bool = True
+
+    def to_traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+@dataclass
+class Span:
+    """一次计时的操作"""
+    name: str
+    context: SpanContext
+    parent_span_id: Optional[str] = None
+    kind: int = SPAN_KIND_INTERNAL
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    start_time_ns: int = field(default_factory=time.time_ns)
+    end_time_ns: Optional[int] = None
+    status_error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_exception(self, exc: BaseException) -> None:
+        self.status_error = f"{type(exc).__name__}: {exc}"
+
+    @property
+    def duration(self) -> float:
+        end = self.end_time_ns or time.time_ns()
+        return (end - self.start_time_ns) / 1e9
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """OTLP JSON 格式"""
+        data: Dict[str, Any] = {
+            "traceId": self.context.trace_id,
+            "spanId": self.context.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_time_ns),
+            "endTimeUnixNano": str(self.end_time_ns or time.time_ns()),
+            "attributes": [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+            "status": {"code": 2, "message": self.status_error} if self.status_error else {"code": 1},
+        }
+        if self.parent_span_id:
+            data["parentSpanId"] = self.parent_span_id
+        return data
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+class TimeBreakdown:
+    """按 Span 名称累计耗时（并发执行的 Span 会分别计入，合计可能大于墙钟时间）"""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.trace_id: Optional[str] = None
+        self._stages: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            stage = self._stages.setdefault(name, [0.0, 0])
+            stage[0] += seconds
+            stage[1] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            stages = {
+                name: {"seconds": round(seconds, 3), "count": count}
+                for name, (seconds, count) in sorted(self._stages.items(), key=lambda item: -item[1][0])
+            }
+        return {
+            "trace_id": self.trace_id,
+            "total_seconds": round(time.perf_counter() - self.started_at, 3),
+            "stages": stages,
+        }
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+_current_breakdown: ContextVar[Optional[TimeBreakdown]] = ContextVar("current_breakdown", default=None)
+
+
+def _new_id(nbytes: int) -> str:
+    return os.urandom(nbytes).hex()
+
+
+def get_current_span() -> Optional[Span]:
+    """当前 Span"""
+    return _current_span.get()
+
+
+def extract(carrier: Optional[MutableMapping[str, Any]]) -> Optional[SpanContext]:
+    """从请求头/消息头中解析 traceparent"""
+    if not carrier:
+        return None
+    value = carrier.get(TRACEPARENT_HEADER)
+    if not value:
+        return None
+    match = _TRACEPARENT_PATTERN.match(str(value).strip().lower())
+    if not match:
+        return None
+    trace_id, span_id, flags = match.groups()
+    return SpanContext(trace_id=trace_id, span_id=span_id, sampled=bool(int(flags, 16) & 1))
+
+
+def inject(carrier: MutableMapping[str, Any]) -> None:
+    """把当前 Span 写入请求头/消息头"""
+    span = _current_span.get()
+    if span is not None:
+        carrier[TRACEPARENT_HEADER] = span.context.to_traceparent()
+
+
+def begin_span(
+    name: str,
+    attributes: Optional[Dict[str, Any]] = None,
+    kind: int = SPAN_KIND_INTERNAL,
+    parent: Optional[SpanContext] = None,
+) -> Span:
+    """
+    创建 Span（不设为当前 Span）
+
+    Args:
+        name: 名称
+        attributes: 属性
+        kind: OTLP SpanKind
+        parent: 远程父 Span（不传时使用当前 Span）
+    """
+    if parent is None:
+        current = _current_span.get()
+        parent = current.context if current is not None else None
+
+    if parent is not None:
+        context = SpanContext(parent.trace_id, _new_id(8), parent.sampled)
+        parent_span_id = parent.span_id
+    else:
+        sampled = random.random() < settings.TRACING_SAMPLE_RATIO
+        context = SpanContext(_new_id(16), _new_id(8), sampled)
+        parent_span_id = None
+
+    return Span(name=name, context=context, parent_span_id=parent_span_id, kind=kind, attributes=dict(attributes or {}))
+
+
+def end_span(span: Span) -> None:
+    """结束 Span：计入耗时汇总，采样时导出"""
+    if span.end_time_ns is not None:
+        return
+    span.end_time_ns = time.time_ns()
+
+    breakdown = _current_breakdown.get()
+    if breakdown is not None:
+        breakdown.add(span.name, span.duration)
+
+    if span.context.sampled and settings.TRACING_ENABLED:
+        _get_processor().submit(span)
+
+
+@contextmanager
+def start_span(
+    name: str,
+    attributes: Optional[Dict[str, Any]] = None,
+    kind: int = SPAN_KIND_INTERNAL,
+    parent: Optional[SpanContext] = None,
+) -> Iterator[Span]:
+    """创建 Span 并在范围内设为当前 Span（同步和异步代码都可使用）"""
+    span = begin_span(name, attributes, kind, parent)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as exc:
+        span.record_exception(exc)
+        raise
+    finally:
+        _current_span.reset(token)
+        end_span(span)
+
+
+def record_span(
+    name: str,
+    started_at: float,
+    attributes: Optional[Dict[str, Any]] = None,
+    error: Optional[str] = None,
+) -> None:
+    """
+    记录一段已经结束的操作（作为当前 Span 的子 Span）
+
+    Args:
+        name: 名称
+        started_at: 开始时间（time.perf_counter()）
+        attributes: 属性
+        error: 失败原因
+    """
+    duration_ns = int((time.perf_counter() - started_at) * 1e9)
+    span = begin_span(name, attributes, SPAN_KIND_CLIENT)
+    span.start_time_ns = time.time_ns() - duration_ns
+    span.status_error = error
+    end_span(span)
+
+
+def attach(span: Optional[Span]) -> Token:
+    """把 Span 设为当前 Span，返回用于 detach 的令牌（用于无法使用 with 的信号/钩子）"""
+    return _current_span.set(span)
+
+
+def detach(token: Token) -> None:
+    """恢复 attach 之前的当前 Span"""
+    _current_span.reset(token)
+
+
+@contextmanager
+def use_span(span: Optional[Span]) -> Iterator[Optional[Span]]:
+    """把已有 Span 设为当前 Span（不负责结束）"""
+    token = _current_span.set(span)
+    try:
+        yield span
+    finally:
+        _current_span.reset(token)
+
+
+@contextmanager
+def collect_breakdown() -> Iterator[TimeBreakdown]:
+    """在范围内汇总结束的 Span 的耗时"""
+    breakdown = TimeBreakdown()
+    current = _current_span.get()
+    if current is not None:
+        breakdown.trace_id = current.context.trace_id
+    token = _current_breakdown.set(breakdown)
+    try:
+        yield breakdown
+    finally:
+        _current_breakdown.reset(token)
+
+
+# =============================================================================
+# 导出
+# =============================================================================
+
+class SpanExporter(ABC):
+    """导出器基类"""
+
+    @abstractmethod
+    def export(self, spans: List[Span]) -> None:
+        """导出一批 Span"""
+        pass
+
+    def _resource_spans(self, spans: List[Span]) -> Dict[str, Any]:
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", settings.TRACING_SERVICE_NAME)]},
+                "scopeSpans": [{
+                    "scope": {"name": "aicg.tracing"},
+                    "spans": [span.to_otlp() for span in spans],
+                }],
+            }]
+        }
+
+
+class FileSpanExporter(SpanExporter):
+    """每批写一行 OTLP JSON（与 OpenTelemetry Collector 的 file exporter 格式一致）"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, spans: List[Span]) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        line = json.dumps(self._resource_spans(spans), ensure_ascii=False, separators=(",", ":"))
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+class OTLPHttpSpanExporter(SpanExporter):
+    """以 OTLP/HTTP JSON 发送到 collector"""
+
+    def __init__(self, endpoint: str, timeout: float = 5.0):
+        import httpx
+
+        self.endpoint = endpoint
+        self._client = httpx.Client(timeout=timeout)
+
+    def export(self, spans: List[Span]) -> None:
+        response = self._client.post(self.endpoint, json=self._resource_spans(spans))
+        response.raise_for_status()
+
+
+class BatchSpanProcessor:
+    """后台线程批量导出 Span"""
+
+    def __init__(self, exporter: SpanExporter):
+        self.exporter = exporter
+        self.dropped = 0
+        self._queue: "queue.Queue[Span]" = queue.Queue(maxsize=EXPORT_QUEUE_SIZE)
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def submit(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            batch: List[Span] = []
+            deadline = time.monotonic() + EXPORT_INTERVAL_SECONDS
+            while len(batch) < EXPORT_BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            if batch:
+                self._export(batch)
+
+    def _export(self, batch: List[Span]) -> None:
+        try:
+            self.exporter.export(batch)
+        except Exception as e:
+            self.dropped += len(batch)
+            logger.warning(f"Span导出失败（丢弃 {len(batch)} 条）: {e}")
+
+    def flush(self) -> None:
+        """同步导出队列中剩余的 Span"""
+        batch: List[Span] = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._export(batch)
+
+
+class _NoopProcessor:
+    dropped = 0
+
+    def submit(self, span: Span) -> None:
+        return
+
+    def flush(self) -> None:
+        return
+
+
+_processor: Optional[Any] = None
+_processor_lock = threading.Lock()
+
+
+def _get_processor():
+    global _processor
+    if _processor is None:
+        with _processor_lock:
+            if _processor is None:
+                _processor = _create_processor()
+    return _processor
+
+
+def _create_processor():
+    exporter_name = settings.TRACING_EXPORTER
+    try:
+        if exporter_name == "file":
+            return BatchSpanProcessor(FileSpanExporter(settings.TRACING_FILE_PATH))
+        if exporter_name == "otlp":
+            return BatchSpanProcessor(OTLPHttpSpanExporter(settings.TRACING_OTLP_ENDPOINT))
+    except Exception as e:
+        logger.warning(f"创建Span导出器失败，不导出Span: {e}")
+    return _NoopProcessor()
+
+
+def flush_spans() -> None:
+    """导出尚未发送的 Span（进程退出前调用）"""
+    if _processor is not None:
+        _processor.flush()
+
+
+__all__ = [
+    "SPAN_KIND_CLIENT",
+    "SPAN_KIND_CONSUMER",
+    "SPAN_KIND_INTERNAL",
+    "SPAN_KIND_PRODUCER",
+    "SPAN_KIND_SERVER",
+    "Span",
+    "SpanContext",
+    "TRACEPARENT_HEADER",
+    "TimeBreakdown",
+    "attach",
+    "begin_span",
+    "collect_breakdown",
+    "detach",
+    "end_span",
+    "extract",
+    "flush_spans",
+    "get_current_span",
+    "inject",
+    "record_span",
+    "start_span",
+    "use_span",
+]
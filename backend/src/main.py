@@ -8,20 +8,16 @@ import uvicorn
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 from src.api.health import router as health_router
-from src.middleware import (
-    error_handler_middleware,
-    logging_middleware,
-    security_middleware,
-    performance_monitoring_middleware,
-)
+from src.middleware import RequestMiddleware
 from src.api.v1 import api_router
 from src.api.websocket import router as websocket_router
 from src.core.config import settings
 from src.core.exceptions import AICGException
 from src.core.logging import logger, setup_logging
+from src.core.security import PasswordHashBusyError
 
 # 设置日志
 setup_logging()
@@ -45,6 +41,10 @@ app = FastAPI(
     },
 )
 
+# 请求中间件：请求ID、计时、安全头、限流和异常映射在同一层完成（纯 ASGI，不缓冲流式响应）
+# 注意：中间件的执行顺序是注册的逆序，先注册的位于内层，限流/错误响应同样带上CORS头
+app.add_middleware(RequestMiddleware)
+
 # 添加CORS中间件
 app.add_middleware(
     CORSMiddleware,
@@ -61,25 +61,6 @@ if settings.ENVIRONMENT == "production":
         allowed_hosts=settings.ALLOWED_HOSTS,
     )
 
-# 添加自定义中间件 (顺序重要)
-# 注意：中间件的执行顺序是注册的逆序
-app.middleware("http")(error_handler_middleware)          # 最外层，处理所有异常
-app.middleware("http")(performance_monitoring_middleware) # 性能监控
-app.middleware("http")(logging_middleware)                # 日志记录
-app.middleware("http")(security_middleware)               # 安全检查
-
-
-# 添加请求处理时间中间件
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    """添加请求处理时间头"""
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
-
-
 # 注册路由
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 app.include_router(health_router, prefix="/health")
@@ -99,8 +80,9 @@ async def startup_event():
     app_logger.info(f"🔗 API地址: http://0.0.0.0:8000")
     app_logger.info(f"📖 API文档: http://0.0.0.0:8000/docs")
 
-    # 这里可以添加其他启动逻辑
-    # 例如: 检查数据库连接、预热缓存等
+    # 后台刷新健康检查快照
+    from src.core.health import health_sampler
+    health_sampler.start()
 
 
 @app.on_event("shutdown")
@@ -109,7 +91,18 @@ async def shutdown_event():
     import logging
     app_logger = logging.getLogger(__name__)
     app_logger.info("🛑 AICG平台正在关闭...")
-    # 这里可以添加清理逻辑
+
+    from src.core.health import health_sampler
+    await health_sampler.stop()
+
+    from src.core.redis import close_redis_clients
+    await close_redis_clients()
+
+    from src.core.executor import shutdown_cpu_executor
+    shutdown_cpu_executor()
+
+    from src.core.security import shutdown_password_executor
+    shutdown_password_executor()
 
 
 @app.exception_handler(AICGException)
@@ -127,6 +120,21 @@ async def aicg_exception_handler(request: Request, exc: AICGException):
     )
 
 
+@app.exception_handler(PasswordHashBusyError)
+async def password_hash_busy_handler(request: Request, exc: PasswordHashBusyError):
+    """密码哈希排队已满（登录突发/撞库），让客户端稍后重试"""
+    return JSONResponse(
+        status_code=503,
+        headers={"Retry-After": "1"},
+        content={
+            "error": True,
+            "code": "PASSWORD_HASH_BUSY",
+            "message": str(exc),
+            "timestamp": time.time(),
+        },
+    )
+
+
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """通用异常处理"""
@@ -153,6 +161,18 @@ async def root():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus 指标（当前 API 进程）"""
+    if not settings.METRICS_ENABLED:
+        return JSONResponse(status_code=404, content={"error": True, "code": "NOT_FOUND", "message": "指标未启用"})
+
+    from src.core.metrics import CONTENT_TYPE_LATEST, collect_celery_queue_lengths, render_metrics
+
+    await collect_celery_queue_lengths()
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.get("/info")
 async def app_info():
     """应用信息"""
@@ -4,29 +4,28 @@
 
 # 导入所有中间件
 from .auth import auth_middleware, require_auth_middleware
-from .error import error_handler_middleware, not_found_handler, method_not_allowed_handler
-from .logging import logging_middleware, request_details_middleware, performance_monitoring_middleware
-from .security import security_middleware, https_redirect_middleware, rate_limit_middleware, cors_preflight_middleware
+from .error import not_found_handler, method_not_allowed_handler
+from .logging import request_details_middleware
+from .request import RequestMiddleware
+from .security import https_redirect_middleware, cors_preflight_middleware
 
 # 导出所有中间件
 __all__ = [
+    # 请求中间件（请求ID、计时、安全头、限流、异常映射）
+    "RequestMiddleware",
+
     # 认证中间件
     "auth_middleware",
     "require_auth_middleware",
 
     # 错误处理中间件
-    "error_handler_middleware",
     "not_found_handler",
     "method_not_allowed_handler",
 
     # 日志中间件
-    "logging_middleware",
     "request_details_middleware",
-    "performance_monitoring_middleware",
 
     # 安全中间件
-    "security_middleware",
     "https_redirect_middleware",
-    "rate_limit_middleware",
     "cors_preflight_middleware",
-]
\ No newline at end of file
+]
@@ -8,54 +8,6 @@ from typing import Callable
 from fastapi import Request, Response
 from fastapi.responses import JSONResponse
 
-from src.core.config import settings
-from src.core.logging import logger
-from src.core.exceptions import AICGException
-
-
-async def error_handler_middleware(request: Request, call_next: Callable) -> Response:
-    """错误处理中间件"""
-    try:
-        response = await call_next(request)
-        return response
-
-    except AICGException as exc:
-        # 处理自定义异常
-        logger.error(
-            f"AICG应用异常 - {type(exc).__name__}: {exc.message} - "
-            f"错误码: {exc.error_code} - 状态码: {exc.status_code} - "
-            f"路径: {request.method} {request.url.path}"
-        )
-
-        return JSONResponse(
-            status_code=exc.status_code,
-            content={
-                "error": True,
-                "code": exc.error_code,
-                "message": exc.message,
-                "details": exc.details,
-                "timestamp": time.time(),
-            },
-        )
-
-    except Exception as exc:
-        # 处理未知异常
-        logger.error(
-            f"未处理的异常 - {type(exc).__name__}: {str(exc)} - "
-            f"路径: {request.method} {request.url.path}",
-            exc_info=True
-        )
-
-        return JSONResponse(
-            status_code=500,
-            content={
-                "error": True,
-                "code": "INTERNAL_SERVER_ERROR",
-                "message": "内部服务器错误" if not settings.DEBUG else str(exc),
-                "timestamp": time.time(),
-            },
-        )
-
 
 async def not_found_handler(request: Request, call_next: Callable) -> Response:
     """404错误处理中间件"""
@@ -77,7 +29,7 @@ async def not_found_handler(request: Request, call_next: Callable) -> Response:
         return response
 
     except Exception as exc:
-        # 如果在处理过程中出现异常，由error_handler_middleware处理
+        # 如果在处理过程中出现异常，由RequestMiddleware处理
         raise exc
 
 
@@ -106,7 +58,6 @@ async def method_not_allowed_handler(request: Request, call_next: Callable) -> R
 
 
 __all__ = [
-    "error_handler_middleware",
     "not_found_handler",
     "method_not_allowed_handler",
 ]
\ No newline at end of file
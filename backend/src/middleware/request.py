@@ -0,0 +1,201 @@
+"""
+请求中间件 - 单层纯 ASGI 中间件
+
+一次处理完成：
+- 请求ID（沿用合法的 X-Request-ID，否则生成），写入 request.state.request_id
+- HTTP 方法检查和请求限流
+- 计时：X-Process-Time 响应头、慢请求日志、按路由模板的延迟直方图
+- 安全响应头
+- 未处理异常映射为统一的 JSON 错误响应
+- 链路追踪开启时，沿用请求头中的 traceparent 为每个请求创建服务端 Span
+
+不包装响应体，流式响应（SSE、文件下载）原样透传。
+"""
+
+import re
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core import tracing
+from src.core.config import settings
+from src.core.exceptions import AICGException
+from src.core.logging import logger
+from src.core.metrics import HTTP_REQUEST_DURATION, HTTP_REQUEST_ERRORS
+
+ALLOWED_METHODS = frozenset({"GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"})
+
+SECURITY_HEADERS: List[Tuple[bytes, bytes]] = [
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"x-xss-protection", b"1; mode=block"),
+    (b"referrer-policy", b"strict-origin-when-cross-origin"),
+]
+
+_REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{8,128}$")
+
+
+def _get_header(scope: Scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers") or ():
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _route_template(scope: Scope) -> str:
+    """路由模板（如 /api/v1/projects/{project_id}），未匹配路由时归为一类，避免标签基数膨胀"""
+    return getattr(scope.get("route"), "path", None) or "<unmatched>"
+
+
+def _error_response(status_code: int, code: str, message: str, **extra: Any) -> JSONResponse:
+    return JSONResponse(
+        status_code=status_code,
+        content={"error": True, "code": code, "message": message, **extra, "timestamp": time.time()},
+    )
+
+
+class RequestMiddleware:
+    """
+    请求中间件
+
+    使用方式：
+        app.add_middleware(RequestMiddleware)
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if not settings.TRACING_ENABLED:
+            await self._handle(scope, receive, send)
+            return
+
+        span = tracing.begin_span(
+            f"HTTP {scope['method']}",
+            {"http.method": scope["method"], "http.target": scope["path"]},
+            kind=tracing.SPAN_KIND_SERVER,
+            parent=tracing.extract({"traceparent": _get_header(scope, b"traceparent")}),
+        )
+        token = tracing.attach(span)
+        status = None
+        try:
+            status = await self._handle(scope, receive, send)
+        except Exception as exc:
+            span.record_exception(exc)
+            raise
+        finally:
+            tracing.detach(token)
+            route = _route_template(scope)
+            span.name = f"{scope['method']} {route}"
+            span.set_attribute("http.route", route)
+            if status is not None:
+                span.set_attribute("http.status_code", status)
+                if status >= 500:
+                    span.status_error = f"HTTP {status}"
+            tracing.end_span(span)
+
+    async def _handle(self, scope: Scope, receive: Receive, send: Send) -> Optional[int]:
+        """处理请求，返回响应状态码"""
+        start = time.perf_counter()
+        method = scope["method"]
+        path = scope["path"]
+
+        request_id = _get_header(scope, b"x-request-id")
+        if not request_id or not _REQUEST_ID_PATTERN.match(request_id):
+            request_id = uuid.uuid4().hex
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        state: Dict[str, Any] = {"status": None}
+        extra_headers: List[Tuple[bytes, bytes]] = [
+            (b"x-request-id", request_id.encode("latin-1")),
+            *SECURITY_HEADERS,
+        ]
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                elapsed = time.perf_counter() - start
+                state["status"] = message["status"]
+                headers = list(message.get("headers") or [])
+                headers.extend(extra_headers)
+                headers.append((b"x-process-time", f"{elapsed:.3f}".encode("latin-1")))
+                message = {**message, "headers": headers}
+                self._record(scope, method, path, message["status"], elapsed, request_id)
+            await send(message)
+
+        # 方法检查
+        if method not in ALLOWED_METHODS:
+            logger.warning(f"不允许的HTTP方法 - {method} {path}")
+            response = _error_response(405, "METHOD_NOT_ALLOWED", "不允许的HTTP方法")
+            await response(scope, receive, send_wrapper)
+            return state["status"]
+
+        # 请求限流
+        if settings.RATE_LIMIT_ENABLED:
+            from src.core.rate_limit import get_rate_limiter, resolve_identity
+
+            client = scope.get("client")
+            identity = resolve_identity(_get_header(scope, b"authorization"), client[0] if client else None)
+            decision = await get_rate_limiter().check(identity, method, path)
+            if decision is not None:
+                rate_headers = decision.headers()
+                if not decision.allowed:
+                    logger.warning(
+                        f"请求频率超限 - 身份: {identity} - {method} {path} - 路由类: {decision.policy.name}"
+                    )
+                    response = _error_response(
+                        429, "RATE_LIMIT_EXCEEDED", "请求频率过高，请稍后再试",
+                        retry_after=int(rate_headers["Retry-After"]),
+                    )
+                    response.headers.update(rate_headers)
+                    await response(scope, receive, send_wrapper)
+                    return state["status"]
+                extra_headers.extend(
+                    (name.lower().encode("latin-1"), value.encode("latin-1"))
+                    for name, value in rate_headers.items()
+                )
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            HTTP_REQUEST_ERRORS.inc(method, _route_template(scope))
+            if state["status"] is not None:
+                # 响应已开始发送（流式响应中途出错），只能记录
+                logger.error(f"响应发送中异常 - {method} {path} - {type(exc).__name__}: {exc}", exc_info=True)
+                raise
+
+            if isinstance(exc, AICGException):
+                logger.error(
+                    f"AICG应用异常 - {type(exc).__name__}: {exc.message} - "
+                    f"错误码: {exc.error_code} - 状态码: {exc.status_code} - 路径: {method} {path}"
+                )
+                response = _error_response(exc.status_code, exc.error_code, exc.message, details=exc.details)
+            else:
+                logger.error(f"未处理的异常 - {type(exc).__name__}: {exc} - 路径: {method} {path}", exc_info=True)
+                response = _error_response(
+                    500, "INTERNAL_SERVER_ERROR", "内部服务器错误" if not settings.DEBUG else str(exc)
+                )
+            await response(scope, receive, send_wrapper)
+        return state["status"]
+
+    @staticmethod
+    def _record(scope: Scope, method: str, path: str, status: int, elapsed: float, request_id: str) -> None:
+        HTTP_REQUEST_DURATION.observe(elapsed, method, _route_template(scope), str(status))
+
+        if elapsed > settings.SLOW_REQUEST_ERROR_SECONDS:
+            logger.error(f"非常慢请求 - {method} {path} - {status} - {elapsed:.3f}s - {request_id}")
+        elif elapsed > settings.SLOW_REQUEST_WARNING_SECONDS:
+            logger.warning(f"慢请求警告 - {method} {path} - {status} - {elapsed:.3f}s - {request_id}")
+        else:
+            logger.info(f"HTTP请求完成 - {method} {path} - {status} - {elapsed:.3f}s")
+
+
+__all__ = [
+    "RequestMiddleware",
+]
@@ -19,6 +19,7 @@ from src.models.paragraph import Paragraph, ParagraphAction
 from src.models.project import Project, ProjectStatus
 from src.models.publish_task import BilibiliAccount, PublishTask, PublishStatus, PublishPlatform
 from src.models.sentence import Sentence, SentenceStatus
+from src.models.statistics import StatisticsCounter, StatisticsScope
 from src.models.user import User
 from src.models.movie import MovieCharacter, MovieScript, MovieScene, MovieShot, ScriptStatus
 from src.models.video_task import VideoTask, VideoTaskStatus
@@ -35,6 +36,8 @@ __all__ = [
     "ParagraphAction",
     "Sentence",
     "SentenceStatus",
+    "StatisticsCounter",
+    "StatisticsScope",
     "APIKey",
     "APIKeyStatus",
     "APIKeyProvider",
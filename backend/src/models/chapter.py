@@ -35,7 +35,7 @@ class Chapter(BaseModel):
     __tablename__ = 'chapters'
 
     # 基础字段 (ID, created_at, updated_at 继承自 BaseModel)
-    project_id = Column(PostgreSQLUUID(as_uuid=True), ForeignKey('projects.id'), nullable=False, index=True,
+    project_id = Column(PostgreSQLUUID(as_uuid=True), ForeignKey('projects.id', ondelete='CASCADE'), nullable=False, index=True,
                         comment="项目外键")
     title = Column(String(500), nullable=False, comment="章节标题")
     content = Column(Text, nullable=False, comment="章节原始内容")
@@ -57,13 +57,20 @@ class Chapter(BaseModel):
 
     # 关系定义
     project = relationship("Project", back_populates="chapters")
-    paragraphs = relationship("Paragraph", back_populates="chapter", cascade="all, delete-orphan")
+    paragraphs = relationship("Paragraph", back_populates="chapter", cascade="all, delete-orphan", passive_deletes=True)
 
     # 索引定义
     __table_args__ = (
         Index('idx_chapter_project', 'project_id'),
         Index('idx_chapter_status', 'status'),
         Index('idx_chapter_number', 'chapter_number'),
+        # 章节列表键集分页：项目内按 (排序键, id) 定位
+        Index('idx_chapter_project_number', 'project_id', 'chapter_number', 'id'),
+        # 标题/正文模糊搜索（pg_trgm）
+        Index('idx_chapter_title_trgm', 'title', postgresql_using='gin',
+              postgresql_ops={'title': 'gin_trgm_ops'}),
+        Index('idx_chapter_content_trgm', 'content', postgresql_using='gin',
+              postgresql_ops={'content': 'gin_trgm_ops'}),
     )
 
     def __repr__(self) -> str:
@@ -184,11 +191,31 @@ class Chapter(BaseModel):
         )
         return result.scalar()
 
+    @classmethod
+    async def get_ids_by_project_id(cls, db_session, project_id: str) -> List:
+        """
+        获取项目的所有章节ID（只取主键列，不加载章节正文）
+
+        Args:
+            db_session: 数据库会话
+            project_id: 项目ID
+
+        Returns:
+            章节ID列表
+        """
+        result = await db_session.execute(
+            select(cls.id).where(cls.project_id == project_id)
+            .order_by(cls.chapter_number)
+        )
+        return list(result.scalars().all())
+
     @classmethod
     async def delete_by_project_id(cls, db_session, project_id: str) -> int:
         """
         删除项目的所有章节
 
+        调用方需先删除段落和句子（或依赖外键 ON DELETE CASCADE）。
+
         Args:
             db_session: 数据库会话
             project_id: 项目ID
@@ -196,17 +223,30 @@ class Chapter(BaseModel):
         Returns:
             删除的章节数量
         """
-        # 先统计数量
-        count = await cls.count_by_project_id(db_session, project_id)
+        result = await db_session.execute(
+            cls.__table__.delete().where(cls.project_id == project_id)
+        )
+        return result.rowcount or 0
 
-        if count > 0:
-            # 执行删除（会级联删除段落数据）
-            await db_session.execute(
-                cls.__table__.delete().where(cls.project_id == project_id)
-            )
-            await db_session.flush()
+    @classmethod
+    async def delete_by_ids(cls, db_session, chapter_ids: List) -> int:
+        """
+        按ID批量删除章节
+
+        Args:
+            db_session: 数据库会话
+            chapter_ids: 章节ID列表
 
-        return count
+        Returns:
+            删除的章节数量
+        """
+        if not chapter_ids:
+            return 0
+
+        result = await db_session.execute(
+            cls.__table__.delete().where(cls.id.in_(chapter_ids))
+        )
+        return result.rowcount or 0
 
 
 __all__ = [
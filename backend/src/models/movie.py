@@ -4,7 +4,7 @@
 
 from enum import Enum
 from typing import List, Optional
-from sqlalchemy import Column, String, Text, Integer, ForeignKey, Index, JSON, select, Boolean
+from sqlalchemy import Column, DateTime, String, Text, Integer, ForeignKey, Index, JSON, select, Boolean
 from sqlalchemy.dialects.postgresql import UUID as PostgreSQLUUID
 from sqlalchemy.orm import relationship
 from .base import BaseModel
@@ -93,6 +93,7 @@ class MovieScene(BaseModel):
     
     # 场景图相关字段
     scene_image_url = Column(String(500), comment="场景图片URL（无人物的场景环境图）")
+    scene_image_derivative_format = Column(String(8), comment="场景图衍生图格式（webp/avif），为空表示没有衍生图")
     scene_image_prompt = Column(Text, comment="场景图生成提示词")
     
     # 关系
@@ -121,6 +122,7 @@ class MovieShot(BaseModel):
     
     # 关键帧资源
     keyframe_url = Column(String(500), comment="分镜关键帧图片URL")
+    keyframe_derivative_format = Column(String(8), comment="关键帧衍生图格式（webp/avif），为空表示没有衍生图")
     
     # 关系
     scene = relationship("MovieScene", back_populates="shots")
@@ -148,10 +150,16 @@ class MovieShotTransition(BaseModel):
     # 视频生成相关
     video_prompt = Column(Text, comment="视频生成提示词")
     video_url = Column(String(500), comment="生成的视频URL")
+    normalized_video_url = Column(String(500), nullable=True, comment="规范化后的视频URL（统一编码参数，拼接时直接流拷贝）")
     video_task_id = Column(String(100), comment="视频生成任务ID")
     status = Column(String(20), default="pending", index=True, comment="生成状态")
     error_message = Column(Text, nullable=True, comment="失败错误信息")
     
+    # 远程任务轮询
+    video_submitted_at = Column(DateTime(timezone=True), nullable=True, comment="视频任务提交时间")
+    next_status_check_at = Column(DateTime(timezone=True), nullable=True, comment="下次查询任务状态的时间")
+    status_check_count = Column(Integer, nullable=False, default=0, server_default="0", comment="已查询状态次数")
+    
     # 追踪信息
     api_key_id = Column(PostgreSQLUUID(as_uuid=True), ForeignKey('api_keys.id'), nullable=True, index=True, comment="使用的API Key")
     user_id = Column(PostgreSQLUUID(as_uuid=True), ForeignKey('users.id'), nullable=True, index=True, comment="所属用户")
@@ -170,6 +178,11 @@ class MovieShotTransition(BaseModel):
         viewonly=False
     )
 
+    # 索引定义
+    __table_args__ = (
+        Index('idx_transition_status_next_check', 'status', 'next_status_check_at'),
+    )
+
     def __repr__(self) -> str:
         return f"<MovieShotTransition(id={self.id}, from={self.from_shot_id}, to={self.to_shot_id})>"
 
@@ -191,6 +204,7 @@ class MovieCharacter(BaseModel):
     
     # 资源
     avatar_url = Column(String(500), comment="角色头像URL")
+    avatar_derivative_format = Column(String(8), comment="头像衍生图格式（webp/avif），为空表示没有衍生图")
     reference_images = Column(JSON, default=list, comment="参考图URL列表(人物一致性关键)")
     
     # 关系
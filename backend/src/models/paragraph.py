@@ -30,7 +30,8 @@ class Paragraph(BaseModel):
     __tablename__ = 'paragraphs'
 
     # 基础字段 (ID, created_at, updated_at 继承自 BaseModel)
-    chapter_id = Column(PostgreSQLUUID(as_uuid=True), ForeignKey('chapters.id'), nullable=False, index=True, comment="章节外键")
+    chapter_id = Column(PostgreSQLUUID(as_uuid=True), ForeignKey('chapters.id', ondelete='CASCADE'), nullable=False, index=True, comment="章节外键")
+    project_id = Column(PostgreSQLUUID(as_uuid=True), nullable=False, comment="项目ID（冗余，外键索引，无约束）")
     content = Column(Text, nullable=False, comment="段落内容")
 
     # 结构信息
@@ -44,7 +45,7 @@ class Paragraph(BaseModel):
 
     # 关系定义
     chapter = relationship("Chapter", back_populates="paragraphs")
-    sentences = relationship("Sentence", back_populates="paragraph", cascade="all, delete-orphan")
+    sentences = relationship("Sentence", back_populates="paragraph", cascade="all, delete-orphan", passive_deletes=True)
 
     # 索引定义
     __table_args__ = (
@@ -52,6 +53,8 @@ class Paragraph(BaseModel):
         Index('idx_paragraph_order', 'order_index'),
         Index('idx_paragraph_action', 'action'),
         Index('idx_paragraph_confirmed', 'is_confirmed'),
+        Index('idx_paragraph_chapter_order', 'chapter_id', 'order_index'),
+        Index('idx_paragraph_project', 'project_id'),
     )
 
     def __repr__(self) -> str:
@@ -65,6 +68,8 @@ class Paragraph(BaseModel):
         """
         批量创建段落记录
 
+        段落数据中未提供 project_id 时按章节ID一次性查询补齐。
+
         Args:
             db_session: 数据库会话
             paragraphs_data: 段落数据列表
@@ -76,12 +81,27 @@ class Paragraph(BaseModel):
         if not paragraphs_data:
             return []
 
+        # 补齐冗余的项目ID
+        missing_ids = {
+            chapter_ids[i] for i, paragraph_data in enumerate(paragraphs_data)
+            if paragraph_data.get('project_id') is None
+        }
+        project_ids = {}
+        if missing_ids:
+            from src.models.chapter import Chapter
+            result = await db_session.execute(
+                select(Chapter.id, Chapter.project_id).where(Chapter.id.in_(list(missing_ids)))
+            )
+            project_ids = {row.id: row.project_id for row in result}
+
         # 生成ID并添加到数据中
         paragraph_ids = []
         for i, paragraph_data in enumerate(paragraphs_data):
             paragraph_id = uuid.uuid4()
             paragraph_data['id'] = paragraph_id
             paragraph_data['chapter_id'] = chapter_ids[i]
+            if paragraph_data.get('project_id') is None:
+                paragraph_data['project_id'] = project_ids.get(chapter_ids[i])
             paragraph_data.setdefault('action', ParagraphAction.KEEP.value)
             paragraph_data.setdefault('is_confirmed', False)
             paragraph_ids.append(paragraph_id)
@@ -173,23 +193,42 @@ class Paragraph(BaseModel):
         Returns:
             段落列表
         """
-        # 通过子查询获取项目的所有段落
-        from src.models.chapter import Chapter
-
         result = await db_session.execute(
             select(cls)
-            .where(cls.chapter_id.in_(
-                select(Chapter.id).where(Chapter.project_id == project_id)
-            ))
+            .where(cls.project_id == project_id)
             .order_by(cls.chapter_id, cls.order_index)
         )
         return result.scalars().all()
 
+    @classmethod
+    async def aggregate_by_project_id(cls, db_session, project_id: str) -> Dict[str, int]:
+        """
+        聚合统计项目的段落数量和总字数（仅聚合，不加载ORM对象）
+
+        Args:
+            db_session: 数据库会话
+            project_id: 项目ID
+
+        Returns:
+            {'paragraph_count': int, 'word_count': int}
+        """
+        result = await db_session.execute(
+            select(func.count(cls.id), func.coalesce(func.sum(cls.word_count), 0))
+            .where(cls.project_id == project_id)
+        )
+        paragraph_count, word_count = result.one()
+        return {
+            'paragraph_count': paragraph_count or 0,
+            'word_count': int(word_count or 0),
+        }
+
     @classmethod
     async def delete_by_project_id(cls, db_session, project_id: str) -> int:
         """
         删除项目的所有段落
 
+        调用方需先删除句子（或依赖外键 ON DELETE CASCADE）。
+
         Args:
             db_session: 数据库会话
             project_id: 项目ID
@@ -197,27 +236,30 @@ class Paragraph(BaseModel):
         Returns:
             删除的段落数量
         """
-        # 通过子查询删除项目的所有段落
-        from src.models.chapter import Chapter
-
-        # 先统计数量
         result = await db_session.execute(
-            select(func.count(cls.id)).where(cls.chapter_id.in_(
-                select(Chapter.id).where(Chapter.project_id == project_id)
-            ))
+            cls.__table__.delete().where(cls.project_id == project_id)
         )
-        count = result.scalar()
+        return result.rowcount or 0
 
-        if count > 0:
-            # 执行删除（会级联删除句子数据）
-            await db_session.execute(
-                cls.__table__.delete().where(cls.chapter_id.in_(
-                    select(Chapter.id).where(Chapter.project_id == project_id)
-                ))
-            )
-            await db_session.flush()
+    @classmethod
+    async def delete_by_chapter_ids(cls, db_session, chapter_ids: List) -> int:
+        """
+        删除一批章节下的所有段落
 
-        return count
+        Args:
+            db_session: 数据库会话
+            chapter_ids: 章节ID列表
+
+        Returns:
+            删除的段落数量
+        """
+        if not chapter_ids:
+            return 0
+
+        result = await db_session.execute(
+            cls.__table__.delete().where(cls.chapter_id.in_(chapter_ids))
+        )
+        return result.rowcount or 0
 
 
 __all__ = [
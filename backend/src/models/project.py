@@ -59,7 +59,7 @@ class Project(BaseModel):
     error_message = Column(Text, nullable=True, comment="错误信息")
 
     # 关系定义 - 按照data-model.md规范
-    chapters = relationship("Chapter", back_populates="project", cascade="all, delete-orphan")
+    chapters = relationship("Chapter", back_populates="project", cascade="all, delete-orphan", passive_deletes=True)
     # generation_tasks = relationship("GenerationTask", back_populates="project", cascade="all, delete-orphan")
 
     # 索引定义 - 按照data-model.md规范
@@ -8,7 +8,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Dict, List, TYPE_CHECKING
 
-from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Index, Integer, String, Text, func
+from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Index, Integer, JSON, String, Text, func
 from sqlalchemy import select
 from sqlalchemy.dialects.postgresql import UUID as PostgreSQLUUID
 from sqlalchemy.orm import relationship
@@ -34,7 +34,12 @@ class Sentence(BaseModel):
     __tablename__ = 'sentences'
 
     # 基础字段 (ID, created_at, updated_at 继承自 BaseModel)
-    paragraph_id = Column(PostgreSQLUUID(as_uuid=True), ForeignKey('paragraphs.id'), nullable=False, index=True, comment="段落外键")
+    paragraph_id = Column(PostgreSQLUUID(as_uuid=True), ForeignKey('paragraphs.id', ondelete='CASCADE'), nullable=False, index=True, comment="段落外键")
+
+    # 冗余层级字段 - 避免 Project → Chapter → Paragraph → Sentence 多级子查询，由写入路径维护
+    chapter_id = Column(PostgreSQLUUID(as_uuid=True), nullable=False, comment="章节ID（冗余，外键索引，无约束）")
+    project_id = Column(PostgreSQLUUID(as_uuid=True), nullable=False, comment="项目ID（冗余，外键索引，无约束）")
+    paragraph_order = Column(Integer, nullable=False, default=0, comment="所属段落在章节中的顺序（冗余）")
     content = Column(Text, nullable=False, comment="句子内容")
 
     # 结构信息
@@ -44,10 +49,12 @@ class Sentence(BaseModel):
 
     # 生成资源
     image_url = Column(String(500), nullable=True, comment="生成的图片URL")
+    image_derivative_format = Column(String(8), nullable=True, comment="图片衍生图格式（webp/avif），为空表示没有衍生图")
     image_prompt = Column(Text, nullable=True, comment="图片生成提示词")
     image_style = Column(String(100), nullable=True, comment="图片风格")
     audio_url = Column(String(500), nullable=True, comment="生成的音频URL")
     audio_duration = Column(Float, nullable=True, comment="音频时长（秒）")
+    audio_timeline = Column(JSON, nullable=True, comment="TTS返回的字/词时间轴 [{text, start, end}]")
 
     # 视频缓存字段
     sentence_video_key = Column(String(500), nullable=True, comment="单句视频MinIO对象键")
@@ -67,8 +74,13 @@ class Sentence(BaseModel):
         Index('idx_sentence_order', 'order_index'),
         Index('idx_sentence_status', 'status'),
         Index('idx_sentence_needs_regen', 'needs_regeneration'),
+        Index('idx_sentence_chapter_order', 'chapter_id', 'paragraph_order', 'order_index'),
+        Index('idx_sentence_project_status', 'project_id', 'status'),
     )
 
+    # 由段落层级派生的冗余字段
+    HIERARCHY_FIELDS = ('chapter_id', 'project_id', 'paragraph_order')
+
     # ==================== 视频缓存管理方法 ====================
 
     def mark_material_updated(self) -> None:
@@ -114,6 +126,9 @@ class Sentence(BaseModel):
         """
         批量创建句子记录
 
+        句子数据中未提供 chapter_id/project_id/paragraph_order 冗余字段时，
+        按段落ID一次性查询补齐，保证冗余字段与段落层级一致。
+
         Args:
             db_session: 数据库会话
             sentences_data: 句子数据列表
@@ -125,12 +140,22 @@ class Sentence(BaseModel):
         if not sentences_data:
             return []
 
+        # 补齐冗余层级字段
+        missing_ids = {
+            paragraph_ids[i] for i, sentence_data in enumerate(sentences_data)
+            if not all(sentence_data.get(key) is not None for key in cls.HIERARCHY_FIELDS)
+        }
+        hierarchy = await cls._load_paragraph_hierarchy(db_session, missing_ids)
+
         # 生成ID并添加到数据中
         sentence_ids = []
         for i, sentence_data in enumerate(sentences_data):
             sentence_id = uuid.uuid4()
             sentence_data['id'] = sentence_id
             sentence_data['paragraph_id'] = paragraph_ids[i]
+            for key, value in hierarchy.get(paragraph_ids[i], {}).items():
+                if sentence_data.get(key) is None:
+                    sentence_data[key] = value
             sentence_data.setdefault('status', SentenceStatus.PENDING.value)
             sentence_ids.append(sentence_id)
 
@@ -146,6 +171,35 @@ class Sentence(BaseModel):
         # 返回插入的ID列表
         return sentence_ids
 
+    @classmethod
+    async def _load_paragraph_hierarchy(cls, db_session, paragraph_ids) -> Dict:
+        """
+        查询段落对应的章节ID、项目ID和段落顺序
+
+        Args:
+            db_session: 数据库会话
+            paragraph_ids: 段落ID集合
+
+        Returns:
+            {paragraph_id: {'chapter_id', 'project_id', 'paragraph_order'}}
+        """
+        if not paragraph_ids:
+            return {}
+
+        from src.models.paragraph import Paragraph
+
+        result = await db_session.execute(
+            select(Paragraph.id, Paragraph.chapter_id, Paragraph.project_id, Paragraph.order_index)
+            .where(Paragraph.id.in_(list(paragraph_ids)))
+        )
+        return {
+            row.id: {
+                'chapter_id': row.chapter_id,
+                'project_id': row.project_id,
+                'paragraph_order': row.order_index,
+            }
+            for row in result
+        }
 
     @classmethod
     async def get_by_paragraph_id(cls, db_session, paragraph_id: str) -> List['Sentence']:
@@ -195,20 +249,10 @@ class Sentence(BaseModel):
         Returns:
             句子列表
         """
-        # 通过嵌套子查询获取项目的所有句子
-        from src.models.paragraph import Paragraph
-        from src.models.chapter import Chapter
-
         result = await db_session.execute(
             select(cls)
-            .where(cls.paragraph_id.in_(
-                select(Paragraph.id).where(
-                    Paragraph.chapter_id.in_(
-                        select(Chapter.id).where(Chapter.project_id == project_id)
-                    )
-                )
-            ))
-            .order_by(cls.paragraph_id, cls.order_index)
+            .where(cls.project_id == project_id)
+            .order_by(cls.chapter_id, cls.paragraph_order, cls.order_index)
         )
         return result.scalars().all()
 
@@ -231,6 +275,23 @@ class Sentence(BaseModel):
         )
         return result.scalars().all()
 
+    @classmethod
+    async def count_by_project_id(cls, db_session, project_id: str) -> int:
+        """
+        统计项目的句子数量（仅聚合，不加载ORM对象）
+
+        Args:
+            db_session: 数据库会话
+            project_id: 项目ID
+
+        Returns:
+            句子数量
+        """
+        result = await db_session.execute(
+            select(func.count(cls.id)).where(cls.project_id == project_id)
+        )
+        return result.scalar() or 0
+
     @classmethod
     async def delete_by_project_id(cls, db_session, project_id: str) -> int:
         """
@@ -243,36 +304,30 @@ class Sentence(BaseModel):
         Returns:
             删除的句子数量
         """
-        # 通过嵌套子查询删除项目的所有句子
-        from src.models.paragraph import Paragraph
-        from src.models.chapter import Chapter
+        result = await db_session.execute(
+            cls.__table__.delete().where(cls.project_id == project_id)
+        )
+        return result.rowcount or 0
+
+    @classmethod
+    async def delete_by_chapter_ids(cls, db_session, chapter_ids: List) -> int:
+        """
+        删除一批章节下的所有句子
+
+        Args:
+            db_session: 数据库会话
+            chapter_ids: 章节ID列表
+
+        Returns:
+            删除的句子数量
+        """
+        if not chapter_ids:
+            return 0
 
-        # 先统计数量
         result = await db_session.execute(
-            select(func.count(cls.id)).where(cls.paragraph_id.in_(
-                select(Paragraph.id).where(
-                    Paragraph.chapter_id.in_(
-                        select(Chapter.id).where(Chapter.project_id == project_id)
-                    )
-                )
-            ))
+            cls.__table__.delete().where(cls.chapter_id.in_(chapter_ids))
         )
-        count = result.scalar()
-
-        if count > 0:
-            # 执行删除
-            await db_session.execute(
-                cls.__table__.delete().where(cls.paragraph_id.in_(
-                    select(Paragraph.id).where(
-                        Paragraph.chapter_id.in_(
-                            select(Chapter.id).where(Chapter.project_id == project_id)
-                        )
-                    )
-                ))
-            )
-            await db_session.flush()
-
-        return count
+        return result.rowcount or 0
 
 
 __all__ = [
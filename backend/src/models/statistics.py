@@ -0,0 +1,75 @@
+"""
+统计计数模型 - 仪表盘统计的物化计数
+
+每个项目一行（scope_type=project），每个用户一行（scope_type=user，为其所有项目之和）。
+计数由写入路径增量维护，并由定时任务周期性对账。
+"""
+
+from enum import Enum
+
+from sqlalchemy import Column, DateTime, Index, Integer, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID as PostgreSQLUUID
+
+from .base import BaseModel
+
+
+class StatisticsScope(str, Enum):
+    """统计范围"""
+    USER = "user"
+    PROJECT = "project"
+
+
+class StatisticsCounter(BaseModel):
+    """统计计数模型 - 按用户/项目物化的内容与生成计数"""
+    __tablename__ = 'statistics_counters'
+
+    # 基础字段 (ID, created_at, updated_at 继承自 BaseModel)
+    scope_type = Column(String(20), nullable=False, comment="统计范围: user/project")
+    scope_id = Column(PostgreSQLUUID(as_uuid=True), nullable=False, comment="用户ID或项目ID")
+    owner_id = Column(PostgreSQLUUID(as_uuid=True), nullable=False, comment="所属用户ID（外键索引，无约束）")
+
+    # 内容计数
+    chapter_count = Column(Integer, nullable=False, default=0, server_default="0", comment="章节数量")
+    paragraph_count = Column(Integer, nullable=False, default=0, server_default="0", comment="段落数量")
+    sentence_count = Column(Integer, nullable=False, default=0, server_default="0", comment="句子数量")
+
+    # 生成计数
+    prompt_count = Column(Integer, nullable=False, default=0, server_default="0", comment="已生成提示词的句子数")
+    image_count = Column(Integer, nullable=False, default=0, server_default="0", comment="已生成图片的句子数")
+    audio_count = Column(Integer, nullable=False, default=0, server_default="0", comment="已生成音频的句子数")
+    video_count = Column(Integer, nullable=False, default=0, server_default="0", comment="已生成视频的章节数")
+    video_task_count = Column(Integer, nullable=False, default=0, server_default="0", comment="已完成的视频任务数")
+
+    # 对账信息
+    reconciled_at = Column(DateTime(timezone=True), nullable=True, comment="最近一次全量对账时间")
+
+    # 索引定义
+    __table_args__ = (
+        UniqueConstraint('scope_type', 'scope_id', name='uq_statistics_scope'),
+        Index('idx_statistics_owner', 'owner_id'),
+    )
+
+    # 可增量维护的计数字段
+    COUNTER_FIELDS = (
+        'chapter_count',
+        'paragraph_count',
+        'sentence_count',
+        'prompt_count',
+        'image_count',
+        'audio_count',
+        'video_count',
+        'video_task_count',
+    )
+
+    def counters(self) -> dict:
+        """返回计数字段字典"""
+        return {field: getattr(self, field) or 0 for field in self.COUNTER_FIELDS}
+
+    def __repr__(self) -> str:
+        return f"<StatisticsCounter(scope={self.scope_type}:{self.scope_id}, sentences={self.sentence_count})>"
+
+
+__all__ = [
+    "StatisticsCounter",
+    "StatisticsScope",
+]
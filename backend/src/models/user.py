@@ -69,10 +69,12 @@ class User(BaseModel):
     async def create_user(cls, db_session, username: str, email: str, password: str,
                          display_name: str = None):
         """创建新用户"""
-        from src.core.security import get_password_hash, SecurityError
+        from src.core.security import get_password_hash_async, PasswordHashBusyError, SecurityError
 
         try:
-            password_hash = get_password_hash(password)
+            password_hash = await get_password_hash_async(password)
+        except PasswordHashBusyError:
+            raise
         except SecurityError as e:
             raise ValueError(f"密码哈希生成失败: {str(e)}")
 
@@ -92,6 +94,18 @@ class User(BaseModel):
         from src.core.security import verify_password
         return verify_password(password, self.password_hash)
 
+    async def verify_password_and_rehash(self, password: str) -> bool:
+        """
+        验证密码（不阻塞事件循环），cost 配置变化时更新密码哈希
+
+        更新后的哈希由调用方随本次会话提交。
+        """
+        from src.core.security import verify_and_update_password
+        verified, new_hash = await verify_and_update_password(password, self.password_hash)
+        if new_hash:
+            self.password_hash = new_hash
+        return verified
+
     def update_last_login(self):
         """更新最后登录时间"""
         from datetime import datetime, timezone
@@ -9,7 +9,7 @@ from datetime import timedelta
 from enum import Enum
 from typing import Dict, Optional
 
-from sqlalchemy import Column, ForeignKey, Index, Integer, String, Text
+from sqlalchemy import Column, ForeignKey, Index, Integer, JSON, String, Text
 from sqlalchemy.dialects.postgresql import UUID as PostgreSQLUUID
 
 from src.core.logging import get_logger
@@ -68,6 +68,9 @@ class VideoTask(BaseModel):
     error_message = Column(Text, nullable=True, comment="错误信息")
     error_sentence_id = Column(PostgreSQLUUID(as_uuid=True), nullable=True, comment="出错的句子ID（用于调试）")
 
+    # 耗时汇总
+    time_breakdown = Column(JSON, nullable=True, comment="各阶段耗时汇总（trace_id/total_seconds/stages）")
+
     # 关系定义
     from sqlalchemy.orm import relationship
     project = relationship("Project", foreign_keys=[project_id], lazy="noload")
@@ -155,6 +158,10 @@ class VideoTask(BaseModel):
             "audio_codec": "aac",
             "audio_bitrate": "192k",
             "zoom_speed": 0.0005,
+            "clip_encoding_profile": "mezzanine",  # 单句缓存视频（中间文件）
+            "output_encoding_profile": "delivery",  # 最终输出
+            "subtitle_renderer": "ass",  # 字幕渲染：ass（libass）/ drawtext
+            "subtitle_alignment": "forced",  # 字幕时间轴：forced（原文强制对齐）/ whisper（识别+LLM纠错）
             "subtitle_style": {
                 "font": "Arial",
                 "font_size": 70,  # 漫画解说标准字号
@@ -11,6 +11,8 @@
 from .base import BaseService
 from .chapter import ChapterService
 from .chapter_content_parser import ChapterContentParser, chapter_content_parser
+from .content_maintenance import ContentMaintenanceService
+from .statistics import StatisticsService
 from .paragraph import ParagraphService
 from .project import ProjectService
 from .project_processing import ProjectProcessingService
@@ -27,4 +29,6 @@ __all__ = [
     "chapter_content_parser",
     "AvatarService",
     "ParagraphService",
+    "ContentMaintenanceService",
+    "StatisticsService",
 ]
\ No newline at end of file
@@ -8,11 +8,13 @@ from typing import List
 from fastapi import UploadFile
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
+from src.core.config import settings
 from src.core.exceptions import NotFoundError
 from src.core.logging import get_logger
 from src.models import Sentence, SentenceStatus, Paragraph, Chapter
 from src.services.api_key import APIKeyService
 from src.services.base import BaseService
+from src.services.statistics import StatisticsService
 from src.services.provider.base import BaseLLMProvider
 from src.services.provider.factory import ProviderFactory
 from src.utils.storage import get_storage_client
@@ -85,17 +87,16 @@ async def process_sentence(
             # 加入重试机制
             # 注意：OpenAI audio API 返回的是二进制内容，不是 URL
             # 对于 SiliconFlow，voice 格式为 "model:voice_name"，例如 "FunAudioLLM/CosyVoice2-0.5B:alex"
-            response = await retry_with_backoff(
-                lambda: llm_provider.generate_audio(
+            # 服务返回字/词时间轴时一并解析（JSON 响应中的 base64 音频也在这里解码）
+            speech = await retry_with_backoff(
+                lambda: llm_provider.generate_speech(
                     input_text=sentence.content,
                     voice=voice,
                     model=model,
+                    with_timing=settings.TTS_REQUEST_TIMESTAMPS,
                 )
             )
-
-            # OpenAI SDK audio.speech.create 返回的是 HttpxBinaryResponseContent
-            # 需要读取 content
-            content = response.content
+            content = speech.audio
 
             # --- 上传 MinIO ---
             file_id = str(uuid.uuid4())
@@ -141,6 +142,7 @@ async def process_sentence(
             # --- 更新数据库 ---
             sentence.audio_url = object_key
             sentence.audio_duration = duration
+            sentence.audio_timeline = speech.timeline
             sentence.status = SentenceStatus.GENERATED_AUDIO
             sentence.mark_material_updated()  # 标记需要重新生成视频
             # 注意：不在这里 flush/commit，避免并发冲突
@@ -178,6 +180,7 @@ class AudioService(BaseService):
 
         chapter = sentences[0].paragraph.chapter
         user_id = chapter.project.owner_id
+        had_audio = {sentence.id for sentence in sentences if sentence.audio_url}
 
         # --- 2. 获取 API Key ---
         api_key_service = APIKeyService(self.db_session)
@@ -216,6 +219,9 @@ class AudioService(BaseService):
                 success_count += 1
 
         await api_key_service.update_usage(api_key.id, user_id)
+        await StatisticsService(self.db_session).record_new_sentence_assets(
+            user_id, sentences, "audio_url", "audio_count", had_audio
+        )
 
         # --- 7. 提交数据库 ---
         await self.db_session.flush()
@@ -18,9 +18,10 @@
 输出尺寸：200x200像素（居中裁剪）
 """
 
+import asyncio
 import hashlib
 import io
-from typing import Optional
+from typing import Optional, Tuple
 
 from PIL import Image
 from minio import Minio
@@ -28,6 +29,66 @@ from minio.error import S3Error
 
 from src.core.config import settings
 from src.core.exceptions import FileUploadError, ValidationError
+from src.core.executor import run_cpu_bound
+
+
+# 图片解码和缩放是 CPU 密集操作，定义为模块级函数，通过 run_cpu_bound 在进程池中执行
+
+def _inspect_image(file_data: bytes) -> Tuple[str, int, int]:
+    """校验图片完整性，返回 (格式, 宽, 高)；无效图片抛出 ValueError"""
+    try:
+        img = Image.open(io.BytesIO(file_data))
+        img.verify()  # 验证图片完整性
+        # 重新打开图片获取格式信息
+        img = Image.open(io.BytesIO(file_data))
+        width, height = img.size
+        return img.format.lower(), width, height
+    except Exception as e:
+        raise ValueError(str(e)) from None
+
+
+def _resize_image_sync(file_data: bytes, format_type: str, target_size: Tuple[int, int]) -> bytes:
+    """缩放并居中放到目标尺寸的白色画布上"""
+    img = Image.open(io.BytesIO(file_data))
+
+    # 如果是PNG格式且需要透明背景，转换为RGBA
+    if format_type.lower() == 'png' and img.mode != 'RGBA':
+        img = img.convert('RGBA')
+    elif img.mode not in ['RGB', 'RGBA']:
+        img = img.convert('RGB')
+
+    # 计算新尺寸（保持宽高比）
+    width, height = img.size
+    target_width, target_height = target_size
+
+    # 计算缩放比例
+    scale = min(target_width / width, target_height / height)
+    new_width = int(width * scale)
+    new_height = int(height * scale)
+
+    # 调整尺寸
+    if new_width != width or new_height != height:
+        img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+
+    # 创建目标尺寸的背景画布
+    background = Image.new('RGB', (target_width, target_height), (255, 255, 255))
+
+    # 计算居中位置
+    x_offset = (target_width - new_width) // 2
+    y_offset = (target_height - new_height) // 2
+
+    # 粘贴图片到中心
+    if img.mode == 'RGBA':
+        background.paste(img, (x_offset, y_offset), img)
+    else:
+        background.paste(img, (x_offset, y_offset))
+
+    # 保存为字节流
+    output = io.BytesIO()
+    background.save(output, format=format_type, quality=85, optimize=True)
+    output.seek(0)
+
+    return output.getvalue()
 
 
 class AvatarService:
@@ -89,68 +150,25 @@ class AvatarService:
         if file_ext not in settings.ALLOWED_AVATAR_TYPES:
             raise ValidationError(f"不支持的图片格式，支持的格式: {', '.join(settings.ALLOWED_AVATAR_TYPES)}")
 
-        # 验证图片内容
+        # 验证图片内容（在进程池中解码）
         try:
-            img = Image.open(io.BytesIO(file_data))
-            img.verify()  # 验证图片完整性
-            # 重新打开图片获取格式信息
-            img = Image.open(io.BytesIO(file_data))
-
-            # 检查图片尺寸
-            width, height = img.size
-            max_size = 2000  # 最大尺寸限制
-            if width > max_size or height > max_size:
-                raise ValidationError(f"图片尺寸过大，最大允许 {max_size}x{max_size}")
-
-            # 返回实际图片格式
-            return img.format.lower()
-        except ValidationError:
-            raise  # 重新抛出验证错误
-        except Exception:
+            format_type, width, height = await run_cpu_bound(_inspect_image, file_data)
+        except ValueError:
             raise ValidationError("无效的图片文件")
 
-    async def _resize_image(self, file_data: bytes, format_type: str = "JPEG") -> bytes:
-        """调整图片尺寸"""
-        img = Image.open(io.BytesIO(file_data))
-
-        # 如果是PNG格式且需要透明背景，转换为RGBA
-        if format_type.lower() == 'png' and img.mode != 'RGBA':
-            img = img.convert('RGBA')
-        elif img.mode not in ['RGB', 'RGBA']:
-            img = img.convert('RGB')
-
-        # 计算新尺寸（保持宽高比）
-        width, height = img.size
-        target_width, target_height = settings.AVATAR_DEFAULT_SIZE
-
-        # 计算缩放比例
-        scale = min(target_width / width, target_height / height)
-        new_width = int(width * scale)
-        new_height = int(height * scale)
+        # 检查图片尺寸
+        max_size = 2000  # 最大尺寸限制
+        if width > max_size or height > max_size:
+            raise ValidationError(f"图片尺寸过大，最大允许 {max_size}x{max_size}")
 
-        # 调整尺寸
-        if new_width != width or new_height != height:
-            img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        # 返回实际图片格式
+        return format_type
 
-        # 创建目标尺寸的背景画布
-        background = Image.new('RGB', (target_width, target_height), (255, 255, 255))
-
-        # 计算居中位置
-        x_offset = (target_width - new_width) // 2
-        y_offset = (target_height - new_height) // 2
-
-        # 粘贴图片到中心
-        if img.mode == 'RGBA':
-            background.paste(img, (x_offset, y_offset), img)
-        else:
-            background.paste(img, (x_offset, y_offset))
-
-        # 保存为字节流
-        output = io.BytesIO()
-        background.save(output, format=format_type, quality=85, optimize=True)
-        output.seek(0)
-
-        return output.getvalue()
+    async def _resize_image(self, file_data: bytes, format_type: str = "JPEG") -> bytes:
+        """调整图片尺寸（在进程池中执行）"""
+        return await run_cpu_bound(
+            _resize_image_sync, file_data, format_type, tuple(settings.AVATAR_DEFAULT_SIZE)
+        )
 
     def _generate_object_name(self, user_id: int, original_filename: str, format_type: str) -> str:
         """生成对象存储名称"""
@@ -174,7 +192,8 @@ class AvatarService:
         object_name = self._generate_object_name(user_id, filename, format_type)
 
         # 上传到MinIO
-        self.minio_client.put_object(
+        await asyncio.to_thread(
+            self.minio_client.put_object,
             bucket_name=self.bucket_name,
             object_name=object_name,
             data=io.BytesIO(processed_data),
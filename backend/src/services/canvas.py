@@ -1,5 +1,4 @@
 import asyncio
-import base64
 import html
 import inspect
 import io
@@ -31,6 +30,8 @@ from src.services.api_key import APIKeyService
 from src.services.base import BaseService
 from src.services.provider.factory import ProviderFactory
 from src.services.provider.vector_engine_provider import VectorEngineProvider
+from src.utils.image_derivatives import create_image_derivatives
+from src.utils.image_utils import build_image_data_url, decode_base64
 from src.utils.storage import get_storage_client
 
 logger = get_logger(__name__)
@@ -500,6 +501,14 @@ class CanvasService(BaseService):
             next_content["text"] = result_payload["text"]
         if item_type == CanvasItemType.IMAGE.value and result_payload.get("result_image_object_key"):
             next_content["result_image_object_key"] = result_payload["result_image_object_key"]
+            # 衍生图状态与对象键一起记录，节点内容被改成其它图片时不会误用
+            if result_payload.get("result_image_derivative_format"):
+                next_content["result_image_derivatives"] = {
+                    "object_key": result_payload["result_image_object_key"],
+                    "format": result_payload["result_image_derivative_format"],
+                }
+            else:
+                next_content.pop("result_image_derivatives", None)
         if item_type == CanvasItemType.VIDEO.value and result_payload.get("result_video_object_key"):
             next_content["result_video_object_key"] = result_payload["result_video_object_key"]
         if result_payload.get("provider_task_id"):
@@ -528,6 +537,7 @@ class CanvasService(BaseService):
         if item.item_type == CanvasItemType.IMAGE.value:
             return {
                 "result_image_object_key": content.get("result_image_object_key", ""),
+                "result_image_derivatives": content.get("result_image_derivatives"),
                 "reference_image_object_key": content.get("reference_image_object_key", ""),
             }
         if item.item_type == CanvasItemType.VIDEO.value:
@@ -825,6 +835,7 @@ class CanvasGenerationService(BaseService):
                 CanvasRunStatus.COMPLETED.value,
                 result_payload={
                     "result_image_object_key": image_asset.get("object_key"),
+                    "result_image_derivative_format": image_asset.get("derivative_format"),
                 },
             )
             await self.commit()
@@ -1656,10 +1667,11 @@ class CanvasGenerationService(BaseService):
                 file=upload_file,
                 metadata={"user_id": user_id, "file_id": file_id, "file_type": remote_response.headers.get("content-type", "image/png")},
             )
-            return {"object_key": storage["object_key"], "url": storage["url"]}
+            derivative_format = await create_image_derivatives(storage["object_key"], remote_response.content)
+            return {"object_key": storage["object_key"], "url": storage["url"], "derivative_format": derivative_format}
         if hasattr(image_data, "b64_json") and image_data.b64_json:
             content_type = getattr(image_data, "mime", "image/png")
-            raw = base64.b64decode(image_data.b64_json)
+            raw = await asyncio.to_thread(decode_base64, image_data.b64_json)
             ext = "png" if "png" in content_type else "jpg"
             storage_client = await get_storage_client()
             file_id = str(uuid.uuid4())
@@ -1669,7 +1681,8 @@ class CanvasGenerationService(BaseService):
                 file=upload_file,
                 metadata={"user_id": user_id, "file_id": file_id, "file_type": content_type},
             )
-            return {"object_key": storage["object_key"], "url": storage["url"]}
+            derivative_format = await create_image_derivatives(storage["object_key"], raw)
+            return {"object_key": storage["object_key"], "url": storage["url"], "derivative_format": derivative_format}
         raise BusinessLogicError("图片生成结果不包含可用图片")
 
     async def _store_remote_video(self, video_url: str, user_id: str) -> Dict[str, Any]:
@@ -1697,35 +1710,18 @@ class CanvasGenerationService(BaseService):
                 continue
             if normalized.startswith("uploads/"):
                 storage_client = await get_storage_client()
-                image_bytes = await storage_client.download_file(normalized)
-                resolved.append(self._build_image_data_url(image_bytes))
+                image_bytes = await storage_client.read_object(normalized)
+                resolved.append(await asyncio.to_thread(build_image_data_url, image_bytes))
                 continue
 
             async with httpx.AsyncClient(timeout=httpx.Timeout(30.0, connect=10.0)) as client:
                 response = await client.get(normalized)
                 response.raise_for_status()
-                resolved.append(self._build_image_data_url(response.content, response.headers.get("content-type")))
+                resolved.append(
+                    await asyncio.to_thread(build_image_data_url, response.content, response.headers.get("content-type"))
+                )
         return resolved
 
-    def _build_image_data_url(self, image_bytes: bytes, content_type: Optional[str] = None) -> str:
-        mime_type = self._detect_image_mime_type(image_bytes, content_type)
-        encoded = base64.b64encode(image_bytes).decode("utf-8")
-        return f"data:{mime_type};base64,{encoded}"
-
-    def _detect_image_mime_type(self, image_bytes: bytes, content_type: Optional[str] = None) -> str:
-        normalized_type = str(content_type or "").strip().lower()
-        if normalized_type.startswith("image/"):
-            return normalized_type.split(";", 1)[0]
-        if image_bytes.startswith(b"\x89PNG"):
-            return "image/png"
-        if image_bytes.startswith(b"\xff\xd8\xff"):
-            return "image/jpeg"
-        if image_bytes.startswith((b"GIF87a", b"GIF89a")):
-            return "image/gif"
-        if image_bytes.startswith(b"RIFF") and image_bytes[8:12] == b"WEBP":
-            return "image/webp"
-        return "image/jpeg"
-
     def _sanitize_media_content(self, content: Dict[str, Any]) -> Dict[str, Any]:
         if not isinstance(content, dict):
             return {}
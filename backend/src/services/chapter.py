@@ -13,13 +13,16 @@
 - 方法职责单一，保持简洁
 """
 
-from datetime import timedelta
-from typing import List, Optional, Tuple
+import base64
+import json
+from datetime import datetime, timedelta
+from typing import Any, List, Optional, Tuple
+from uuid import UUID
 
-from sqlalchemy import desc, func, or_, select
+from sqlalchemy import desc, func, or_, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.exceptions import BusinessLogicError, NotFoundError
+from src.core.exceptions import BusinessLogicError, NotFoundError, ValidationError
 from src.core.logging import get_logger
 from src.models import SentenceStatus
 from src.models.chapter import Chapter, ChapterStatus as ModelChapterStatus
@@ -28,9 +31,54 @@ from src.models.project import Project
 from src.models.sentence import Sentence
 from src.services.base import BaseService
 from src.services.chapter_content_parser import chapter_content_parser
+from src.services.sentence_projection import invalidate_chapter_meta
+from src.services.statistics import StatisticsService
 
 logger = get_logger(__name__)
 
+# 章节列表允许的排序字段（都有索引或数据量小，可用于键集分页）
+CHAPTER_SORT_KEYS = {
+    "chapter_number": Chapter.chapter_number,
+    "title": Chapter.title,
+    "created_at": Chapter.created_at,
+    "updated_at": Chapter.updated_at,
+    # word_count 可为空，空值按 0 排序，保证 (排序键, id) 的行比较不遇到 NULL
+    "word_count": func.coalesce(Chapter.word_count, 0),
+}
+
+CHAPTER_COUNT_MODES = ("exact", "estimated", "none")
+
+
+def _escape_like(value: str) -> str:
+    """转义 LIKE 通配符，关键词按字面匹配"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _encode_chapter_cursor(sort_by: str, descending: bool, value: Any, chapter_id) -> str:
+    """把上一页最后一行的排序键和ID编码为不透明游标"""
+    if isinstance(value, datetime):
+        value = {"dt": value.isoformat()}
+    payload = {"k": sort_by, "d": descending, "v": value, "id": str(chapter_id)}
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_chapter_cursor(cursor: str, sort_by: str, descending: bool) -> Tuple[Any, UUID]:
+    """解析游标，排序方式与游标不一致时视为无效"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        value = payload["v"]
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value["dt"])
+        chapter_id = UUID(payload["id"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValidationError(f"无效的分页游标: {e}")
+
+    if payload.get("k") != sort_by or bool(payload.get("d")) != descending:
+        raise ValidationError("分页游标与当前排序方式不一致")
+    return value, chapter_id
+
 
 class ChapterService(BaseService):
     """
@@ -121,6 +169,8 @@ class ChapterService(BaseService):
                     paragraph_data["chapter_id"] = chapter.id
 
                 # 批量创建段落
+                for paragraph_data in paragraphs_data:
+                    paragraph_data["project_id"] = chapter.project_id
                 paragraph_ids = await Paragraph.batch_create(
                     self.db_session,
                     paragraphs_data,
@@ -148,6 +198,9 @@ class ChapterService(BaseService):
                         # 设置句子的段落ID
                         for sentence_data in para_sentences_data:
                             sentence_data["paragraph_id"] = paragraph_id
+                            sentence_data["chapter_id"] = chapter.id
+                            sentence_data["project_id"] = chapter.project_id
+                            sentence_data["paragraph_order"] = paragraphs_data[para_idx]["order_index"]
 
                         # 批量创建当前段落的句子
                         if para_sentences_data:
@@ -159,6 +212,17 @@ class ChapterService(BaseService):
 
                         sentence_idx += para_sentence_count
 
+            # 累加仪表盘统计计数（新句子还没有提示词/图片/音频）
+            await StatisticsService(self.db_session).apply_content_change(
+                chapter.project_id,
+                added={
+                    "chapter_count": 1,
+                    "paragraph_count": paragraph_count,
+                    "sentence_count": sentence_count,
+                },
+                owner_id=project.owner_id,
+            )
+
             # 提交事务
             await self.commit()
             await self.refresh(chapter)  # 确保获取最新数据
@@ -238,29 +302,33 @@ class ChapterService(BaseService):
         sort_by: str = "chapter_number",
         sort_order: str = "asc",
         project_type: Optional[str] = None,
-    ) -> Tuple[List[Chapter], int]:
+        cursor: Optional[str] = None,
+        count_mode: str = "exact",
+    ) -> Tuple[List[Chapter], Optional[int], Optional[str]]:
         """
         获取项目的章节列表（分页）
 
-        支持多种过滤条件、搜索和排序方式，返回分页结果。
+        支持多种过滤条件、搜索和排序方式。传入 cursor 时使用键集分页
+        （WHERE (sort_key, id) > 上一页末尾），否则按 page 使用 OFFSET 分页。
 
         Args:
             project_id: 项目ID，可选。如果不传则查询所有项目的章节
-            page: 页码，从1开始，默认1
+            page: 页码，从1开始，默认1（传入 cursor 时忽略）
             size: 每页大小，默认20，最大100
             status: 章节状态过滤，可选
             is_confirmed: 是否已确认过滤，可选 True/False
-            search: 搜索关键词，支持在标题、内容中搜索
-            sort_by: 排序字段，默认chapter_number，支持title、created_at、updated_at等
+            search: 搜索关键词，在标题、内容中搜索（3个字符及以上走 pg_trgm 索引）
+            sort_by: 排序字段，仅支持 CHAPTER_SORT_KEYS 中的字段
             sort_order: 排序顺序，默认asc，支持asc/desc
             project_type: 项目类型过滤，可选（picture_narrative/ai_movie）
+            cursor: 上一页返回的 next_cursor，可选
+            count_mode: 总数模式 exact（精确）/estimated（查询计划估算）/none（不统计）
 
         Returns:
-            Tuple[List[Chapter], int]: (章节列表, 总记录数)
+            Tuple[List[Chapter], Optional[int], Optional[str]]: (章节列表, 总记录数, 下一页游标)
 
         Raises:
-            ValidationError: 当分页参数无效时
-            DatabaseError: 当数据库查询失败时
+            ValidationError: 排序字段、游标或总数模式无效时
         """
         # 参数验证
         if page < 1:
@@ -268,9 +336,18 @@ class ChapterService(BaseService):
         if size < 1 or size > 100:
             size = min(max(size, 1), 100)
 
-        # 构建基础查询
+        sort_column = CHAPTER_SORT_KEYS.get(sort_by)
+        if sort_column is None:
+            raise ValidationError(
+                f"不支持的排序字段: {sort_by}，可选: {', '.join(CHAPTER_SORT_KEYS)}"
+            )
+        descending = sort_order.lower() == "desc"
+        if count_mode not in CHAPTER_COUNT_MODES:
+            raise ValidationError(f"不支持的总数模式: {count_mode}")
+
+        # 过滤条件只构建一次，总数查询和分页查询共用
         query = select(Chapter)
-        
+
         if project_id:
             query = query.filter(Chapter.project_id == project_id)
 
@@ -282,72 +359,97 @@ class ChapterService(BaseService):
         if is_confirmed is not None:
             query = query.filter(Chapter.is_confirmed == is_confirmed)
 
-        # 搜索过滤 - 在标题、内容中搜索
+        # 搜索过滤 - 标题/内容上有 gin_trgm_ops 索引，ILIKE 可直接使用；
+        # pg_trgm 至少需要3个字符，更短的关键词（常见的一两个汉字）无法走索引，按顺序扫描匹配
         if search:
-            search_term = f"%{search}%"
+            search_term = f"%{_escape_like(search)}%"
             query = query.filter(
                 or_(
-                    Chapter.title.ilike(search_term), Chapter.content.ilike(search_term)
+                    Chapter.title.ilike(search_term, escape="\\"),
+                    Chapter.content.ilike(search_term, escape="\\"),
                 )
             )
-        
-        # 项目类型过滤
-        if project_type:
-            query = query.join(Project, Chapter.project_id == Project.id).filter(
-                Project.type == project_type
-            )
 
-        # 获取总数的查询（复用过滤条件）
-        count_query = select(func.count(Chapter.id))
-        
-        if project_id:
-            count_query = count_query.filter(Chapter.project_id == project_id)
-            
-        if status:
-            count_query = count_query.filter(Chapter.status == status.value)
-        if is_confirmed is not None:
-            count_query = count_query.filter(Chapter.is_confirmed == is_confirmed)
-        if search:
-            search_term = f"%{search}%"
-            count_query = count_query.filter(
-                or_(
-                    Chapter.title.ilike(search_term), Chapter.content.ilike(search_term)
-                )
-            )
-        
         # 项目类型过滤
         if project_type:
-            count_query = count_query.join(Project, Chapter.project_id == Project.id).filter(
+            query = query.join(Project, Chapter.project_id == Project.id).filter(
                 Project.type == project_type
             )
 
-        # 执行总数查询
-        total_result = await self.execute(count_query)
-        total = total_result.scalar()
+        total = await self._count_chapters(query, count_mode)
 
-        # 排序处理
-        if hasattr(Chapter, sort_by):
-            sort_column = getattr(Chapter, sort_by)
-            if sort_order.lower() == "desc":
-                query = query.order_by(desc(sort_column))
-            else:
-                query = query.order_by(sort_column)
+        # 排序处理：排序键 + 主键，保证顺序稳定，也作为游标位置
+        if descending:
+            query = query.order_by(desc(sort_column), desc(Chapter.id))
         else:
-            # 默认按章节序号升序
-            query = query.order_by(Chapter.chapter_number)
+            query = query.order_by(sort_column, Chapter.id)
 
         # 分页处理
-        offset = (page - 1) * size
-        query = query.offset(offset).limit(size)
-
-        # 执行主查询
-        result = await self.execute(query)
-        chapters = result.scalars().all()
+        if cursor:
+            last_value, last_id = _decode_chapter_cursor(cursor, sort_by, descending)
+            position = tuple_(sort_column, Chapter.id)
+            query = query.filter(
+                position < (last_value, last_id) if descending else position > (last_value, last_id)
+            )
+        else:
+            query = query.offset((page - 1) * size)
+
+        # 多取一条判断是否还有下一页
+        result = await self.execute(query.limit(size + 1))
+        chapters = list(result.scalars().all())
+
+        next_cursor = None
+        if len(chapters) > size:
+            chapters = chapters[:size]
+            last = chapters[-1]
+            last_value = getattr(last, sort_by)
+            if last_value is None:
+                # 只有 word_count 可为空，与排序表达式中的 coalesce 一致
+                last_value = 0
+            next_cursor = _encode_chapter_cursor(sort_by, descending, last_value, last.id)
 
         logger.debug(
             f"查询章节列表: 项目={project_id}, 总数={total}, 当前页={page}, 数量={len(chapters)}"
         )
-        return list(chapters), total
+        return chapters, total, next_cursor
+
+    async def _count_chapters(self, query, count_mode: str) -> Optional[int]:
+        """
+        统计过滤后的章节总数
+
+        Args:
+            query: 已带过滤条件的章节查询
+            count_mode: exact/estimated/none
+
+        Returns:
+            总数，count_mode 为 none 时返回 None
+        """
+        if count_mode == "none":
+            return None
+
+        if count_mode == "estimated":
+            # 使用查询计划的行数估算，不执行实际扫描。
+            # EXPLAIN 在保存点内执行，出错时只回滚保存点，不会中止本次请求的事务
+            try:
+                async with self.db_session.begin_nested():
+                    connection = await self.db_session.connection()
+                    compiled = query.with_only_columns(Chapter.id).compile(
+                        dialect=connection.dialect,
+                        compile_kwargs={"literal_binds": True},
+                    )
+                    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")
+                    plan = result.scalar()
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                return int(plan[0]["Plan"]["Plan Rows"])
+            except Exception as e:
+                logger.warning(f"章节总数估算失败，改用精确统计: {e}")
+
+        count_query = select(func.count()).select_from(
+            query.with_only_columns(Chapter.id).subquery()
+        )
+        total_result = await self.execute(count_query)
+        return total_result.scalar() or 0
 
     async def update_chapter(
         self, chapter_id: str, project_id: str, **updates
@@ -369,6 +471,7 @@ class ChapterService(BaseService):
         for field, value in updates.items():
             if hasattr(chapter, field) and value is not None:
                 setattr(chapter, field, value)
+        invalidate_chapter_meta(chapter.id)
 
         # 如果更新了内容，使用内容解析服务重新计算统计信息并更新段落句子结构
         if "content" in updates and updates["content"] and not chapter.is_confirmed:
@@ -382,21 +485,19 @@ class ChapterService(BaseService):
             chapter.paragraph_count = stats["paragraph_count"]
             chapter.sentence_count = stats["sentence_count"]
 
-            # 删除现有的段落和句子（级联删除）
-            await self.execute(
-                select(Paragraph).where(Paragraph.chapter_id == chapter.id)
-            )
-            existing_paragraphs_result = await self.execute(
-                select(Paragraph).where(Paragraph.chapter_id == chapter.id)
-            )
-            existing_paragraphs = existing_paragraphs_result.scalars().all()
+            # 删除前记录旧内容的计数，重建后按差值更新仪表盘统计
+            statistics_service = StatisticsService(self.db_session)
+            removed = await statistics_service.compute_chapter_counters([chapter.id])
 
-            for para in existing_paragraphs:
-                self.delete(para)
+            # 删除现有的段落和句子（集合删除，不加载ORM对象）
+            await Sentence.delete_by_chapter_ids(self.db_session, [chapter.id])
+            await Paragraph.delete_by_chapter_ids(self.db_session, [chapter.id])
 
             # 创建新的段落和句子
             if paragraphs_data:
                 # 批量创建段落
+                for paragraph_data in paragraphs_data:
+                    paragraph_data["project_id"] = chapter.project_id
                 paragraph_ids = await Paragraph.batch_create(
                     self.db_session,
                     paragraphs_data,
@@ -424,6 +525,9 @@ class ChapterService(BaseService):
                         # 设置句子的段落ID
                         for sentence_data in para_sentences_data:
                             sentence_data["paragraph_id"] = paragraph_id
+                            sentence_data["chapter_id"] = chapter.id
+                            sentence_data["project_id"] = chapter.project_id
+                            sentence_data["paragraph_order"] = paragraphs_data[para_idx]["order_index"]
 
                         # 批量创建当前段落的句子
                         if para_sentences_data:
@@ -435,6 +539,18 @@ class ChapterService(BaseService):
 
                         sentence_idx += para_sentence_count
 
+            # 同步仪表盘统计计数（章节本身和章节视频不变）
+            await statistics_service.apply_content_change(
+                chapter.project_id,
+                removed=removed,
+                added={
+                    "chapter_count": removed["chapter_count"],
+                    "video_count": removed["video_count"],
+                    "paragraph_count": chapter.paragraph_count,
+                    "sentence_count": chapter.sentence_count,
+                },
+            )
+
         await self.commit()
         await self.refresh(chapter)
 
@@ -488,37 +604,18 @@ class ChapterService(BaseService):
         if chapter.is_confirmed:
             raise BusinessLogicError("已确认的章节不能删除")
 
-        # 先统计要删除的段落和句子数量（用于日志记录）
-        from src.models.paragraph import Paragraph
-        from src.models.sentence import Sentence
-        from sqlalchemy import func
-
-        # 统计段落数量
-        paragraph_count_result = await self.execute(
-            select(func.count(Paragraph.id)).where(Paragraph.chapter_id == chapter_id)
-        )
-        paragraph_count = paragraph_count_result.scalar() or 0
-
-        # 统计句子数量
-        sentence_count_result = await self.execute(
-            select(func.count(Sentence.id)).where(
-                Sentence.paragraph_id.in_(
-                    select(Paragraph.id).where(Paragraph.chapter_id == chapter_id)
-                )
-            )
-        )
-        sentence_count = sentence_count_result.scalar() or 0
-
-        logger.info(
-            f"开始删除章节: ID={chapter_id}, 标题={chapter.title}, 将删除 {paragraph_count} 个段落, {sentence_count} 个句子"
-        )
-
-        # 删除章节（会级联删除所有段落和句子）
-        self.delete(chapter)
+        # 集合删除段落、句子和章节，删除语句直接返回影响行数
+        from src.services.content_maintenance import ContentMaintenanceService
+        statistics_service = StatisticsService(self.db_session)
+        removed = await statistics_service.compute_chapter_counters([chapter.id])
+        deleted = await ContentMaintenanceService(self.db_session).purge_chapters([chapter.id])
+        invalidate_chapter_meta(chapter.id)
+        await statistics_service.apply_content_change(chapter.project_id, removed=removed)
         await self.commit()
 
         logger.info(
-            f"删除章节成功: ID={chapter_id}, 标题={chapter.title}, 已删除 {paragraph_count} 个段落, {sentence_count} 个句子"
+            f"删除章节成功: ID={chapter_id}, 标题={chapter.title}, "
+            f"已删除 {deleted['paragraphs']} 个段落, {deleted['sentences']} 个句子"
         )
         return True
 
@@ -543,22 +640,12 @@ class ChapterService(BaseService):
         Returns:
             List[Sentence]: 句子列表，每个句子包含 id 和 content 字段
         """
-        # 使用 JOIN 一次性查询所有句子，避免 N+1 问题
-        from sqlalchemy.orm import joinedload
-
+        # 冗余的 chapter_id/paragraph_order 使过滤和排序走 idx_sentence_chapter_order 单索引扫描；
+        # 不再关联加载段落/章节/项目，需要元数据的调用方使用 SentenceProjectionService.get_chapter_meta
         stmt = (
             select(Sentence)
-            .join(Paragraph, Sentence.paragraph_id == Paragraph.id)
-            .join(Chapter, Paragraph.chapter_id == Chapter.id)
-            .join(Project, Chapter.project_id == Project.id)
-            .where(Paragraph.chapter_id == chapter_id)
-            .options(
-                joinedload(Sentence.paragraph)
-                .joinedload(Paragraph.chapter)
-                .joinedload(Chapter.project)
-            )
-            .order_by(Paragraph.order_index)
-            .order_by(Sentence.order_index)
+            .where(Sentence.chapter_id == chapter_id)
+            .order_by(Sentence.paragraph_order, Sentence.order_index)
         )
 
         # 如果需要，可以根据章节状态过滤句子（示例中未使用）
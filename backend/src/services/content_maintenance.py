@@ -0,0 +1,132 @@
+"""
+项目内容维护服务 - 基于集合操作的删除与统计
+
+提供服务：
+- 项目/章节内容（章节、段落、句子）的批量删除
+- 项目统计信息的聚合计算
+
+设计原则：
+- 只发送集合级SQL（DELETE ... USING、COUNT/SUM聚合），不把内容树加载进会话
+- 按章节分批删除，控制单条语句的锁范围和WAL体积
+- 可选依赖外键 ON DELETE CASCADE（见迁移030），此时只需删除章节行
+- 不提交事务，由调用方控制
+"""
+
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete
+
+from src.core.config import settings
+from src.core.logging import get_logger
+from src.models.chapter import Chapter
+from src.models.paragraph import Paragraph
+from src.models.project import Project
+from src.models.sentence import Sentence
+from src.services.base import BaseService
+
+logger = get_logger(__name__)
+
+
+class ContentMaintenanceService(BaseService):
+    """
+    项目内容维护服务
+
+    使用方式：
+        service = ContentMaintenanceService(db_session)
+        deleted = await service.purge_project_content(project_id)
+        stats = await service.compute_project_statistics(project_id)
+    """
+
+    def __init__(
+        self,
+        db_session: Any,
+        batch_size: Optional[int] = None,
+        use_fk_cascade: Optional[bool] = None,
+    ):
+        super().__init__(db_session)
+        self.batch_size = max(1, batch_size or settings.CONTENT_DELETE_BATCH_SIZE)
+        self.use_fk_cascade = (
+            settings.CONTENT_DELETE_USE_FK_CASCADE if use_fk_cascade is None else use_fk_cascade
+        )
+
+    async def purge_chapters(self, chapter_ids: List) -> Dict[str, int]:
+        """
+        分批删除指定章节及其段落、句子
+
+        Args:
+            chapter_ids: 章节ID列表
+
+        Returns:
+            删除数量统计: chapters/paragraphs/sentences
+            （启用外键级联时段落和句子由数据库删除，计数为0）
+        """
+        deleted = {'chapters': 0, 'paragraphs': 0, 'sentences': 0}
+
+        for start in range(0, len(chapter_ids), self.batch_size):
+            batch = chapter_ids[start:start + self.batch_size]
+            if not self.use_fk_cascade:
+                deleted['sentences'] += await Sentence.delete_by_chapter_ids(self.db_session, batch)
+                deleted['paragraphs'] += await Paragraph.delete_by_chapter_ids(self.db_session, batch)
+            deleted['chapters'] += await Chapter.delete_by_ids(self.db_session, batch)
+
+        return deleted
+
+    async def purge_project_content(self, project_id: str) -> Dict[str, int]:
+        """
+        删除项目的全部章节、段落、句子（保留项目行）
+
+        Args:
+            project_id: 项目ID
+
+        Returns:
+            删除数量统计: chapters/paragraphs/sentences
+        """
+        chapter_ids = await Chapter.get_ids_by_project_id(self.db_session, project_id)
+        deleted = await self.purge_chapters(chapter_ids)
+
+        logger.info(
+            f"项目 {project_id} 内容已删除: {deleted['chapters']}章节, "
+            f"{deleted['paragraphs']}段落, {deleted['sentences']}句子"
+            f"{'（外键级联）' if self.use_fk_cascade else ''}"
+        )
+        return deleted
+
+    async def delete_project(self, project_id: str) -> Dict[str, int]:
+        """
+        删除项目及其全部内容
+
+        Args:
+            project_id: 项目ID
+
+        Returns:
+            删除数量统计: chapters/paragraphs/sentences
+        """
+        deleted = await self.purge_project_content(project_id)
+        await self.execute(delete(Project.__table__).where(Project.__table__.c.id == project_id))
+        return deleted
+
+    async def compute_project_statistics(self, project_id: str) -> Dict[str, int]:
+        """
+        通过聚合查询计算项目统计信息
+
+        Args:
+            project_id: 项目ID
+
+        Returns:
+            统计信息: chapter_count/paragraph_count/sentence_count/word_count
+        """
+        chapter_count = await Chapter.count_by_project_id(self.db_session, project_id)
+        paragraph_stats = await Paragraph.aggregate_by_project_id(self.db_session, project_id)
+        sentence_count = await Sentence.count_by_project_id(self.db_session, project_id)
+
+        return {
+            'chapter_count': chapter_count or 0,
+            'paragraph_count': paragraph_stats['paragraph_count'],
+            'sentence_count': sentence_count,
+            'word_count': paragraph_stats['word_count'],
+        }
+
+
+__all__ = [
+    'ContentMaintenanceService',
+]
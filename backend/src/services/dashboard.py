@@ -10,7 +10,7 @@
 
 设计原则：
 - 使用BaseService统一管理数据库会话
-- 优化查询性能，使用聚合查询
+- 优化查询性能，内容/生成计数读取物化计数行
 - 方法职责单一，保持简洁
 """
 
@@ -23,9 +23,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.core.logging import get_logger
 from src.models.project import Project, ProjectStatus
 from src.models.chapter import Chapter, ChapterStatus
-from src.models.paragraph import Paragraph
-from src.models.sentence import Sentence, SentenceStatus
 from src.services.base import BaseService
+from src.services.statistics import StatisticsService
 
 logger = get_logger(__name__)
 
@@ -62,17 +61,16 @@ class DashboardService(BaseService):
             # 1. 项目统计
             project_stats = await self._get_project_statistics(owner_id)
             
-            # 2. 内容统计
-            content_stats = await self._get_content_statistics(owner_id)
+            # 2. 内容/生成计数来自物化计数行（单行读取）
+            counters = await self._get_statistics_counters(owner_id)
+            content_stats = self._get_content_statistics(counters)
+            generation_stats = self._get_generation_statistics(counters)
             
-            # 3. 生成统计
-            generation_stats = await self._get_generation_statistics(owner_id)
-            
-            # 4. 任务统计
+            # 3. 任务统计（进行中状态需要实时查询）
             task_stats = await self._get_task_statistics(owner_id)
             
-            # 5. 成本估算
-            cost_estimate = await self._estimate_total_cost(owner_id)
+            # 4. 成本估算
+            cost_estimate = self._estimate_total_cost(counters)
             
             return {
                 "projects": project_stats,
@@ -80,6 +78,7 @@ class DashboardService(BaseService):
                 "generation": generation_stats,
                 "tasks": task_stats,
                 "cost": cost_estimate,
+                "freshness": StatisticsService.describe_freshness(counters),
                 "last_updated": datetime.utcnow().isoformat()
             }
             
@@ -115,105 +114,28 @@ class DashboardService(BaseService):
             "archived": status_distribution.get(ProjectStatus.ARCHIVED.value, 0)
         }
 
-    async def _get_content_statistics(self, owner_id: str) -> Dict[str, Any]:
+    async def _get_statistics_counters(self, owner_id: str) -> Dict[str, Any]:
+        """读取物化计数行；从未对账过时实时汇总（只读，计数行由定时对账任务建立）"""
+        statistics_service = StatisticsService(self.db_session)
+        counters = await statistics_service.get_user_counters(owner_id)
+        if counters is None or counters.get("reconciled_at") is None:
+            counters = await statistics_service.compute_user_counters(owner_id)
+        return counters
+
+    def _get_content_statistics(self, counters: Dict[str, Any]) -> Dict[str, Any]:
         """获取内容统计"""
-        # 章节统计
-        chapter_query = select(func.count(Chapter.id)).where(
-            Chapter.project_id.in_(
-                select(Project.id).where(Project.owner_id == owner_id)
-            )
-        )
-        chapter_result = await self.execute(chapter_query)
-        total_chapters = chapter_result.scalar() or 0
-        
-        # 段落统计
-        paragraph_query = select(func.count(Paragraph.id)).where(
-            Paragraph.chapter_id.in_(
-                select(Chapter.id).where(
-                    Chapter.project_id.in_(
-                        select(Project.id).where(Project.owner_id == owner_id)
-                    )
-                )
-            )
-        )
-        paragraph_result = await self.execute(paragraph_query)
-        total_paragraphs = paragraph_result.scalar() or 0
-        
-        # 句子统计
-        sentence_query = select(func.count(Sentence.id)).where(
-            Sentence.paragraph_id.in_(
-                select(Paragraph.id).where(
-                    Paragraph.chapter_id.in_(
-                        select(Chapter.id).where(
-                            Chapter.project_id.in_(
-                                select(Project.id).where(Project.owner_id == owner_id)
-                            )
-                        )
-                    )
-                )
-            )
-        )
-        sentence_result = await self.execute(sentence_query)
-        total_sentences = sentence_result.scalar() or 0
-        
         return {
-            "total_chapters": total_chapters,
-            "total_paragraphs": total_paragraphs,
-            "total_sentences": total_sentences
+            "total_chapters": counters["chapter_count"],
+            "total_paragraphs": counters["paragraph_count"],
+            "total_sentences": counters["sentence_count"]
         }
 
-    async def _get_generation_statistics(self, owner_id: str) -> Dict[str, Any]:
+    def _get_generation_statistics(self, counters: Dict[str, Any]) -> Dict[str, Any]:
         """获取生成统计"""
-        # 已生成图片数量
-        image_query = select(func.count(Sentence.id)).where(
-            Sentence.paragraph_id.in_(
-                select(Paragraph.id).where(
-                    Paragraph.chapter_id.in_(
-                        select(Chapter.id).where(
-                            Chapter.project_id.in_(
-                                select(Project.id).where(Project.owner_id == owner_id)
-                            )
-                        )
-                    )
-                )
-            ),
-            Sentence.image_url.isnot(None)
-        )
-        image_result = await self.execute(image_query)
-        generated_images = image_result.scalar() or 0
-        
-        # 已生成音频数量
-        audio_query = select(func.count(Sentence.id)).where(
-            Sentence.paragraph_id.in_(
-                select(Paragraph.id).where(
-                    Paragraph.chapter_id.in_(
-                        select(Chapter.id).where(
-                            Chapter.project_id.in_(
-                                select(Project.id).where(Project.owner_id == owner_id)
-                            )
-                        )
-                    )
-                )
-            ),
-            Sentence.audio_url.isnot(None)
-        )
-        audio_result = await self.execute(audio_query)
-        generated_audios = audio_result.scalar() or 0
-        
-        # 已生成视频数量（章节级别）
-        video_query = select(func.count(Chapter.id)).where(
-            Chapter.project_id.in_(
-                select(Project.id).where(Project.owner_id == owner_id)
-            ),
-            Chapter.video_url.isnot(None)
-        )
-        video_result = await self.execute(video_query)
-        generated_videos = video_result.scalar() or 0
-        
         return {
-            "generated_images": generated_images,
-            "generated_audios": generated_audios,
-            "generated_videos": generated_videos
+            "generated_images": counters["image_count"],
+            "generated_audios": counters["audio_count"],
+            "generated_videos": counters["video_count"]
         }
 
     async def _get_task_statistics(self, owner_id: str) -> Dict[str, Any]:
@@ -248,10 +170,9 @@ class DashboardService(BaseService):
             "chapter_tasks": chapter_tasks
         }
 
-    async def _estimate_total_cost(self, owner_id: str) -> Dict[str, Any]:
+    def _estimate_total_cost(self, counters: Dict[str, Any]) -> Dict[str, Any]:
         """估算总成本 - 仅统计已生成的内容"""
-        # 获取生成统计
-        gen_stats = await self._get_generation_statistics(owner_id)
+        gen_stats = self._get_generation_statistics(counters)
         
         # 成本单价（可以从配置文件读取）
         IMAGE_COST = 0.04  # 每张图片成本
@@ -263,22 +184,7 @@ class DashboardService(BaseService):
         audio_cost = gen_stats["generated_audios"] * AUDIO_COST
         
         # 提示词成本 - 只统计已生成提示词的句子
-        prompt_query = select(func.count(Sentence.id)).where(
-            Sentence.paragraph_id.in_(
-                select(Paragraph.id).where(
-                    Paragraph.chapter_id.in_(
-                        select(Chapter.id).where(
-                            Chapter.project_id.in_(
-                                select(Project.id).where(Project.owner_id == owner_id)
-                            )
-                        )
-                    )
-                )
-            ),
-            Sentence.image_prompt.isnot(None)  # 只统计已生成提示词的
-        )
-        prompt_result = await self.execute(prompt_query)
-        generated_prompts = prompt_result.scalar() or 0
+        generated_prompts = counters["prompt_count"]
         prompt_cost = generated_prompts * PROMPT_COST
         
         total_cost = image_cost + audio_cost + prompt_cost
@@ -315,22 +221,15 @@ class DashboardService(BaseService):
         result = await self.execute(query)
         projects = result.scalars().all()
         
-        # 转换为字典并添加章节统计
+        # 转换为字典（章节数量使用项目上维护的统计字段）
         project_list = []
         for project in projects:
-            # 获取章节数量
-            chapter_query = select(func.count(Chapter.id)).where(
-                Chapter.project_id == project.id
-            )
-            chapter_result = await self.execute(chapter_query)
-            chapter_count = chapter_result.scalar() or 0
-            
             project_list.append({
                 "id": str(project.id),
                 "title": project.title,
                 "status": project.status,
                 "updated_at": project.updated_at.isoformat() if project.updated_at else None,
-                "chapter_count": chapter_count,
+                "chapter_count": project.chapter_count or 0,
                 "word_count": project.word_count or 0
             })
         
@@ -1,8 +1,11 @@
 import os
 import json
+import time
 from faster_whisper import WhisperModel
 from opencc import OpenCC
 from src.core.logging import get_logger
+from src.core.metrics import WHISPER_REAL_TIME_FACTOR
+from src.core.tracing import record_span
 
 logger = get_logger(__name__)
 
@@ -43,6 +46,7 @@ class WhisperTranscriptionService:
             raise FileNotFoundError(f"❌ 找不到音频文件: {audio_path}")
 
         logger.info(f"🚀 开始识别音频: {audio_path}")
+        start_time = time.perf_counter()
 
         segments, info = self.model.transcribe(
             audio_path,
@@ -67,8 +71,8 @@ class WhisperTranscriptionService:
 
             # 转成简体
             text_simplified = self.cc.convert(segment.text.strip())
-            logger.info(
-                f"[{segment.start:.2f}s -> {segment.end:.2f}s] {text_simplified}"
+            logger.debug(
+                "[%.2fs -> %.2fs] %s", segment.start, segment.end, text_simplified
             )
 
             item = {
@@ -96,6 +100,13 @@ class WhisperTranscriptionService:
             srt_content += f"{self.format_timestamp(segment.start)} --> {self.format_timestamp(segment.end)}\n"
             srt_content += f"{text_simplified}\n\n"
 
+        # segments 是惰性生成器，遍历结束时识别才完成
+        elapsed = time.perf_counter() - start_time
+        record_span("whisper.transcribe", start_time, {"audio.duration": float(info.duration or 0)})
+        if info.duration:
+            WHISPER_REAL_TIME_FACTOR.observe(elapsed / info.duration)
+            logger.info(f"识别完成: 音频 {info.duration:.1f}s, 耗时 {elapsed:.1f}s, 实时率 {elapsed / info.duration:.2f}")
+
         base_name = os.path.splitext(audio_path)[0]
 
         # 保存 JSON
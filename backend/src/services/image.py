@@ -13,8 +13,11 @@ from src.core.logging import get_logger
 from src.models import Sentence, SentenceStatus, Paragraph, Chapter
 from src.services.api_key import APIKeyService
 from src.services.base import BaseService
+from src.services.statistics import StatisticsService
 from src.services.provider.base import BaseLLMProvider
 from src.services.provider.factory import ProviderFactory
+from src.utils.image_derivatives import create_image_derivatives
+from src.utils.image_utils import decode_base64
 from src.utils.storage import get_storage_client
 from openai import RateLimitError
 
@@ -82,7 +85,6 @@ async def process_sentence(
             # gemini 格式要特殊处理
             if hasattr(image_data, 'b64_json') and image_data.b64_json:
                 # Gemini 返回 base64 数据
-                import base64
                 logger.info(f"[LLM] 使用 base64 数据（Gemini 模型）")
 
                 b64_string = image_data.b64_json
@@ -91,7 +93,7 @@ async def process_sentence(
                 logger.info(f"[LLM] Base64 字符串长度: {len(b64_string)},ContentType:{content_type}")
 
                 try:
-                    content = base64.b64decode(b64_string)
+                    content = await asyncio.to_thread(decode_base64, b64_string)
                 except Exception as e:
                     logger.error(f"[LLM] Base64 解码失败: {e}")
                     raise
@@ -138,8 +140,12 @@ async def process_sentence(
             )
             object_key = storage_result["object_key"]
 
+            # --- 缩略图/预览图 ---
+            derivative_format = await create_image_derivatives(object_key, content)
+
             # --- 更新数据库 ---
             sentence.image_url = object_key
+            sentence.image_derivative_format = derivative_format
             sentence.status = SentenceStatus.GENERATED_IMAGE
             sentence.mark_material_updated()  # 标记需要重新生成视频
             # 注意：不在这里 flush/commit，避免并发冲突
@@ -176,6 +182,7 @@ class ImageService(BaseService):
 
         chapter = sentences[0].paragraph.chapter
         user_id = chapter.project.owner_id
+        had_image = {sentence.id for sentence in sentences if sentence.image_url}
 
         # --- 2. 获取 API Key ---
         api_key_service = APIKeyService(self.db_session)
@@ -214,6 +221,9 @@ class ImageService(BaseService):
                 success_count += 1
 
         await api_key_service.update_usage(api_key.id, user_id)
+        await StatisticsService(self.db_session).record_new_sentence_assets(
+            user_id, sentences, "image_url", "image_count", had_image
+        )
 
         # --- 7. 提交数据库 ---
         await self.db_session.flush()
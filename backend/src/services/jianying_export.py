@@ -1,22 +1,29 @@
 """
 剪映导出服务 - 将章节素材导出为剪映草稿格式
+
+ZIP 包边生成边输出，不在本地落盘：
+- 素材从 MinIO 并发拉取（有界窗口，按句子顺序写入）
+- 已压缩的图片/音频使用 ZIP_STORED，只对 JSON 使用 ZIP_DEFLATED
+- 既可直接流式返回给客户端，也可由 Celery 任务流式写入 MinIO 后返回预签名URL
 """
 
+import asyncio
 import json
-import os
-import shutil
-import tempfile
 import uuid
-from datetime import datetime
-from pathlib import Path
-from typing import Dict, Any, List, Optional
+import zipfile
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from sqlalchemy import select
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
 from src.core.logging import get_logger
 from src.models.chapter import Chapter, ChapterStatus
-from src.models.sentence import Sentence
+from src.services.sentence_projection import EXPORT_SENTENCE_COLUMNS, SentenceProjectionService
 from src.utils.storage import get_storage_client
 
 logger = get_logger(__name__)
@@ -27,6 +34,40 @@ class JianYingExportError(Exception):
     pass
 
 
+@dataclass
+class JianYingExportPackage:
+    """一次导出所需的全部数据（已从数据库读出，流式输出阶段不再访问会话）"""
+    chapter_id: str
+    title: str
+    sentences: List[Row]
+    filename: str
+    root_dir: str
+
+
+class _ZipStreamSink:
+    """
+    zipfile 的只写输出目标
+
+    不提供 tell/seek，zipfile 会按不可寻址流写入（使用数据描述符），
+    写入的字节暂存在内存中，由调用方在每个条目之后取走。
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
 class JianYingExportService:
     """剪映导出服务"""
     
@@ -39,171 +80,234 @@ class JianYingExportService:
     
     # 时间单位转换: 秒 -> 微秒
     SECOND_TO_MICROSECOND = 1_000_000
+
+    # 同时在途的素材下载数（同时也是内存中最多缓存的素材数）
+    DOWNLOAD_CONCURRENCY = 8
+
+    # 异步导出包的下载链接有效期
+    EXPORT_URL_EXPIRES = timedelta(hours=24)
     
     def __init__(self, db: AsyncSession):
         self.db = db
     
-    async def export_chapter(
+    async def prepare_export(
         self,
         chapter_id: str,
         user_id: str
-    ) -> str:
+    ) -> JianYingExportPackage:
         """
-        导出章节为剪映草稿格式
+        读取并校验导出所需的章节和句子数据
         
         Args:
             chapter_id: 章节ID
             user_id: 用户ID
             
         Returns:
-            导出的ZIP文件路径
+            导出数据包
             
         Raises:
-            JianYingExportError: 导出失败
+            JianYingExportError: 章节不存在、无权限或状态不正确
         """
-        try:
-            # 1. 获取章节和句子数据
-            chapter, sentences = await self._get_chapter_data(chapter_id, user_id)
-            
-            # 2. 验证章节状态
-            if chapter.status != ChapterStatus.MATERIALS_PREPARED.value:
-                raise JianYingExportError(
-                    f"章节状态不正确，当前状态: {chapter.status}，需要: {ChapterStatus.MATERIALS_PREPARED.value}"
-                )
-            
-            # 3. 创建临时工作目录 - 使用系统临时目录以便文件在请求间持久化
-            temp_base_dir = Path(tempfile.gettempdir())
-            draft_dir = temp_base_dir / f"jianying_export_{uuid.uuid4().hex[:8]}" / f"draft_{uuid.uuid4().hex[:8]}"
-            draft_dir.mkdir(parents=True, exist_ok=True)
+        chapter, sentences = await self._get_chapter_data(chapter_id, user_id)
+        
+        if chapter.status != ChapterStatus.MATERIALS_PREPARED.value:
+            raise JianYingExportError(
+                f"章节状态不正确，当前状态: {chapter.status}，需要: {ChapterStatus.MATERIALS_PREPARED.value}"
+            )
+        
+        safe_title = "".join(
+            c for c in chapter.title if c.isalnum() or c in (' ', '-', '_')
+        ).strip()
+        if not safe_title:  # 如果标题全是特殊字符
+            safe_title = "chapter"
+        
+        return JianYingExportPackage(
+            chapter_id=str(chapter.id),
+            title=chapter.title,
+            sentences=sentences,
+            filename=f"{safe_title}_{uuid.uuid4().hex[:8]}.zip",
+            root_dir=f"draft_{uuid.uuid4().hex[:8]}",
+        )
+    
+    async def iter_zip(self, package: JianYingExportPackage) -> AsyncIterator[bytes]:
+        """
+        流式生成剪映草稿 ZIP 包
+        
+        Args:
+            package: prepare_export 返回的数据包
             
-            try:
-                # 4. 下载素材文件
-                materials_info = await self._download_materials(sentences, draft_dir)
-                
-                # 5. 生成 draft_content.json
-                draft_content = self._generate_draft_content(
-                    chapter, sentences, materials_info
-                )
-                draft_content_path = draft_dir / "draft_content.json"
-                with open(draft_content_path, 'w', encoding='utf-8') as f:
-                    json.dump(draft_content, f, ensure_ascii=False, indent=2)
-                
-                # 6. 生成 draft_meta_info.json
-                draft_meta = self._generate_draft_meta_info(
-                    chapter, draft_content["duration"]
-                )
-                draft_meta_path = draft_dir / "draft_meta_info.json"
-                with open(draft_meta_path, 'w', encoding='utf-8') as f:
-                    json.dump(draft_meta, f, ensure_ascii=False, indent=2)
-                
-                # 7. 打包为 ZIP - 保存到系统临时目录
-                zip_path = await self._create_zip_package(
-                    draft_dir, chapter, str(temp_base_dir)
-                )
+        Yields:
+            ZIP 字节块
+        """
+        storage_client = await get_storage_client()
+        sink = _ZipStreamSink()
+        materials_info: Dict[str, Dict[str, Any]] = {}
+        total_bytes = 0
+        
+        with zipfile.ZipFile(sink, "w") as zipf:
+            # 1. 素材：边下载边写入，不落本地文件
+            async for sentence, kind, data in self._fetch_materials(storage_client, package.sentences):
+                if data is None:
+                    continue
                 
-                logger.info(f"章节 {chapter_id} 导出成功: {zip_path}")
-                return zip_path
+                sentence_id = str(sentence.id)
+                sentence_materials = materials_info.setdefault(sentence_id, {})
+                if kind == "image":
+                    arcname = f"draft_materials/images/{sentence_id}.jpg"
+                    sentence_materials["image_path"] = arcname
+                    sentence_materials["image_width"] = 1920  # 默认值
+                    sentence_materials["image_height"] = 1080
+                else:
+                    arcname = f"draft_materials/audios/{sentence_id}.mp3"
+                    sentence_materials["audio_path"] = arcname
+                    # 音频时长（微秒）
+                    sentence_materials["audio_duration"] = int(
+                        (sentence.audio_duration or 3.0) * self.SECOND_TO_MICROSECOND
+                    )
                 
-            finally:
-                # 清理临时目录（保留ZIP文件）- 清理整个导出目录
-                export_dir = draft_dir.parent
-                if export_dir.exists() and export_dir.name.startswith("jianying_export_"):
-                    shutil.rmtree(export_dir, ignore_errors=True)
-                    
-        except Exception as e:
-            logger.error(f"导出章节失败: {e}", exc_info=True)
-            raise JianYingExportError(f"导出失败: {str(e)}")
+                # 图片/音频本身已压缩，直接存储
+                self._write_entry(zipf, f"{package.root_dir}/{arcname}", data, zipfile.ZIP_STORED)
+                chunk = sink.drain()
+                total_bytes += len(chunk)
+                yield chunk
+            
+            # 2. 草稿描述文件：素材写完后才能确定哪些下载成功
+            draft_content = self._generate_draft_content(
+                package.title, package.sentences, materials_info
+            )
+            draft_meta = self._generate_draft_meta_info(
+                package.title, draft_content["duration"]
+            )
+            for name, content in (
+                ("draft_content.json", draft_content),
+                ("draft_meta_info.json", draft_meta),
+            ):
+                payload = json.dumps(content, ensure_ascii=False, indent=2).encode("utf-8")
+                self._write_entry(zipf, f"{package.root_dir}/{name}", payload, zipfile.ZIP_DEFLATED)
+        
+        # 3. 中央目录
+        chunk = sink.drain()
+        total_bytes += len(chunk)
+        yield chunk
+        
+        logger.info(f"章节 {package.chapter_id} 导出完成: {package.filename}, 大小: {total_bytes} bytes")
+    
+    async def export_to_storage(
+        self,
+        chapter_id: str,
+        user_id: str,
+        filename: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        生成导出包并流式写入 MinIO（供 Celery 任务使用）
+        
+        Args:
+            chapter_id: 章节ID
+            user_id: 用户ID
+            filename: 提交任务时已返回给客户端的文件名（不传则重新生成）
+            
+        Returns:
+            {object_key, download_url, filename, size}
+        """
+        package = await self.prepare_export(chapter_id, user_id)
+        if filename:
+            package.filename = filename
+        storage_client = await get_storage_client()
+        object_key = storage_client.generate_object_key(
+            user_id, package.filename, prefix="exports/jianying"
+        )
+        
+        result = await storage_client.upload_stream(
+            object_key, self.iter_zip(package), content_type="application/zip"
+        )
+        download_url = storage_client.get_presigned_url(
+            object_key, expires=self.EXPORT_URL_EXPIRES
+        )
+        
+        return {
+            "object_key": object_key,
+            "download_url": download_url,
+            "filename": package.filename,
+            "size": result["size"],
+        }
+    
+    async def _fetch_materials(
+        self, storage_client, sentences: List[Row]
+    ) -> AsyncIterator[Tuple[Row, str, Optional[bytes]]]:
+        """
+        按句子顺序产出素材内容，后台保持有界数量的并发下载
+        
+        Yields:
+            (句子行, 素材类型 image/audio, 内容；下载失败时为 None)
+        """
+        jobs = iter([
+            (sentence, kind, object_key)
+            for sentence in sentences
+            for kind, object_key in (("image", sentence.image_url), ("audio", sentence.audio_url))
+            if object_key
+        ])
+        in_flight = deque()
+        
+        def schedule_next() -> None:
+            job = next(jobs, None)
+            if job is not None:
+                in_flight.append((job, asyncio.create_task(storage_client.read_object(job[2]))))
+        
+        for _ in range(self.DOWNLOAD_CONCURRENCY):
+            schedule_next()
+        
+        try:
+            while in_flight:
+                (sentence, kind, object_key), task = in_flight.popleft()
+                schedule_next()
+                try:
+                    data = await task
+                except Exception as e:
+                    logger.warning(f"下载{'图片' if kind == 'image' else '音频'}失败 {sentence.id}: {e}")
+                    data = None
+                yield sentence, kind, data
+        finally:
+            # 客户端断开或出错时取消剩余下载
+            for _, task in in_flight:
+                task.cancel()
+    
+    @staticmethod
+    def _write_entry(zipf: zipfile.ZipFile, arcname: str, data: bytes, compress_type: int) -> None:
+        zinfo = zipfile.ZipInfo(arcname, date_time=datetime.now().timetuple()[:6])
+        zinfo.compress_type = compress_type
+        zinfo.external_attr = 0o644 << 16
+        zipf.writestr(zinfo, data)
     
     async def _get_chapter_data(
         self, chapter_id: str, user_id: str
-    ) -> tuple[Chapter, List[Sentence]]:
+    ) -> tuple[Chapter, List[Row]]:
         """获取章节和句子数据"""
         from src.models.project import Project
         
-        # 获取章节（通过project检查权限）
+        # 获取章节（通过project检查权限，不加载章节正文）
         query = select(Chapter).join(Project).where(
             Chapter.id == chapter_id,
             Project.owner_id == user_id
-        )
+        ).options(load_only(Chapter.id, Chapter.title, Chapter.status))
         result = await self.db.execute(query)
         chapter = result.scalar_one_or_none()
         
         if not chapter:
             raise JianYingExportError("章节不存在或无权访问")
         
-        # 获取句子列表（通过paragraph关联）
-        from src.models.paragraph import Paragraph
-        
-        query = select(Sentence).join(Paragraph).where(
-            Paragraph.chapter_id == chapter_id
-        ).order_by(Paragraph.order_index, Sentence.order_index)
-        result = await self.db.execute(query)
-        sentences = result.scalars().all()
+        # 获取句子精简行（只取导出需要的列）
+        projection = SentenceProjectionService(self.db)
+        sentences = await projection.list_sentence_rows(chapter_id, EXPORT_SENTENCE_COLUMNS)
         
         if not sentences:
             raise JianYingExportError("章节没有句子数据")
         
-        return chapter, list(sentences)
-    
-    async def _download_materials(
-        self, sentences: List[Sentence], draft_dir: Path
-    ) -> Dict[str, Dict[str, Any]]:
-        """
-        下载素材文件到本地
-        
-        Returns:
-            materials_info: {sentence_id: {image_path, audio_path, ...}}
-        """
-        storage_client = await get_storage_client()
-        materials_info = {}
-        
-        # 创建素材目录
-        images_dir = draft_dir / "draft_materials" / "images"
-        audios_dir = draft_dir / "draft_materials" / "audios"
-        images_dir.mkdir(parents=True, exist_ok=True)
-        audios_dir.mkdir(parents=True, exist_ok=True)
-        
-        for sentence in sentences:
-            sentence_materials = {}
-            
-            # 下载图片
-            if sentence.image_url:
-                image_filename = f"{sentence.id}.jpg"
-                image_path = images_dir / image_filename
-                try:
-                    await storage_client.download_file_to_path(
-                        sentence.image_url, str(image_path)
-                    )
-                    sentence_materials["image_path"] = f"draft_materials/images/{image_filename}"
-                    sentence_materials["image_width"] = 1920  # 默认值
-                    sentence_materials["image_height"] = 1080
-                except Exception as e:
-                    logger.warning(f"下载图片失败 {sentence.id}: {e}")
-            
-            # 下载音频
-            if sentence.audio_url:
-                audio_filename = f"{sentence.id}.mp3"
-                audio_path = audios_dir / audio_filename
-                try:
-                    await storage_client.download_file_to_path(
-                        sentence.audio_url, str(audio_path)
-                    )
-                    sentence_materials["audio_path"] = f"draft_materials/audios/{audio_filename}"
-                    # 音频时长（微秒）
-                    sentence_materials["audio_duration"] = int(
-                        (sentence.audio_duration or 3.0) * self.SECOND_TO_MICROSECOND
-                    )
-                except Exception as e:
-                    logger.warning(f"下载音频失败 {sentence.id}: {e}")
-            
-            materials_info[str(sentence.id)] = sentence_materials
-        
-        return materials_info
+        return chapter, sentences
     
     def _generate_draft_content(
         self,
-        chapter: Chapter,
-        sentences: List[Sentence],
+        title: str,
+        sentences: List[Row],
         materials_info: Dict[str, Dict[str, Any]]
     ) -> Dict[str, Any]:
         """生成 draft_content.json 内容"""
@@ -293,7 +397,7 @@ class JianYingExportService:
         return {
             "version": "5.9.0",
             "draft_id": draft_id,
-            "draft_name": chapter.title,
+            "draft_name": title,
             "create_time": current_time,
             "update_time": current_time,
             "duration": total_duration,
@@ -315,7 +419,7 @@ class JianYingExportService:
         }
     
     def _generate_draft_meta_info(
-        self, chapter: Chapter, duration: int
+        self, title: str, duration: int
     ) -> Dict[str, Any]:
         """生成 draft_meta_info.json 内容"""
         draft_id = uuid.uuid4().hex
@@ -323,45 +427,13 @@ class JianYingExportService:
         
         return {
             "draft_id": draft_id,
-            "draft_name": chapter.title,
+            "draft_name": title,
             "draft_cover": "",
             "create_time": current_time,
             "update_time": current_time,
             "duration": duration,
             "canvas_config": self.DEFAULT_CANVAS
         }
-    
-    async def _create_zip_package(
-        self, draft_dir: Path, chapter: Chapter, temp_dir: str
-    ) -> str:
-        """创建 ZIP 压缩包"""
-        import zipfile
-        
-        # 生成文件名
-        safe_title = "".join(
-            c for c in chapter.title if c.isalnum() or c in (' ', '-', '_')
-        ).strip()
-        if not safe_title:  # 如果标题全是特殊字符
-            safe_title = "chapter"
-        zip_filename = f"{safe_title}_{uuid.uuid4().hex[:8]}.zip"
-        zip_path = Path(temp_dir) / zip_filename
-        
-        # 打包 - 使用draft_dir作为根目录
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for file_path in draft_dir.rglob('*'):
-                if file_path.is_file():
-                    # 保持draft_xxx文件夹结构
-                    arcname = file_path.relative_to(draft_dir.parent)
-                    zipf.write(file_path, arcname)
-                    logger.debug(f"添加文件到ZIP: {arcname}")
-        
-        file_size = zip_path.stat().st_size
-        logger.info(f"创建ZIP包: {zip_path}, 大小: {file_size} bytes")
-        
-        if file_size < 100:  # 如果文件太小，可能有问题
-            logger.warning(f"ZIP文件大小异常: {file_size} bytes")
-        
-        return str(zip_path)
 
 
-__all__ = ["JianYingExportService", "JianYingExportError"]
+__all__ = ["JianYingExportService", "JianYingExportError", "JianYingExportPackage"]
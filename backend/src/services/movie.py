@@ -144,6 +144,7 @@ class MovieService(BaseService):
             
         if 'avatar_url' in data:
             char.avatar_url = data['avatar_url']
+            char.avatar_derivative_format = None
         if 'reference_images' in data:
             char.reference_images = data['reference_images']
             
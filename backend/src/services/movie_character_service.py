@@ -369,7 +369,7 @@ class MovieCharacterService(BaseService):
             # 5. 提取并上传图片（使用通用工具函数）
             from src.utils.image_utils import extract_and_upload_image
             
-            object_key = await extract_and_upload_image(
+            object_key, derivative_format = await extract_and_upload_image(
                 result=result,
                 user_id=str(project.owner_id),
                 metadata={"character_id": str(char.id)}
@@ -377,6 +377,7 @@ class MovieCharacterService(BaseService):
 
             # 6. 更新角色信息
             char.avatar_url = object_key
+            char.avatar_derivative_format = derivative_format
             
             # 7. 创建生成历史记录
             from src.services.generation_history_service import GenerationHistoryService
@@ -23,16 +23,20 @@ from sqlalchemy.orm import joinedload
 
 from src.core.exceptions import BusinessLogicError
 from src.core.logging import get_logger
-from src.models import Chapter, VideoTask, VideoTaskStatus
+from src.models import Chapter, Project, VideoTask, VideoTaskStatus
 from src.models.movie import MovieScript
 from src.services.base import BaseService
 from src.services.chapter import ChapterService
+from src.services.statistics import StatisticsService
 from src.services.video_task import VideoTaskService
 from src.utils.ffmpeg_utils import (
     check_ffmpeg_installed,
+    concat_geometry_from_video,
     concatenate_videos,
     get_audio_duration,
     mix_bgm_with_video,
+    normalize_video_for_concat,
+    video_matches_concat_geometry,
 )
 from src.utils.storage import get_storage_client
 
@@ -118,7 +122,10 @@ class MovieVideoService(BaseService):
         temp_dir: Path
     ) -> List[Path]:
         """
-        并发下载所有过渡视频
+        并发下载所有过渡视频的规范化版本
+        
+        规范化版本在过渡视频入库时生成；旧数据缺少时在这里按需生成并回填，
+        保证拼接阶段所有片段编码参数一致。下载直接流式写盘，不整体读入内存。
         
         Args:
             transitions: 过渡视频列表
@@ -127,22 +134,39 @@ class MovieVideoService(BaseService):
         Returns:
             下载后的本地视频路径列表(按顺序)
         """
+        from src.services.transition_service import TransitionService
+        
         storage_client = await self._get_storage_client()
+        transition_service = TransitionService(self.db_session)
         
         async def download_one(transition, index: int) -> Path:
             """下载单个过渡视频"""
             video_path = temp_dir / f"transition_{index:03d}.mp4"
             
             try:
-                logger.info(f"📥 下载过渡视频 {index + 1}/{len(transitions)}: {transition.video_url}")
-                content = await storage_client.download_file(transition.video_url)
+                if transition.normalized_video_url:
+                    logger.info(f"📥 下载过渡视频 {index + 1}/{len(transitions)}: {transition.normalized_video_url}")
+                    await storage_client.download_file_to_path(transition.normalized_video_url, str(video_path))
+                    return video_path
                 
-                with open(video_path, 'wb') as f:
-                    f.write(content)
+                # 旧数据：下载原始视频，规范化后回填
+                source_path = temp_dir / f"transition_{index:03d}_source.mp4"
+                logger.info(f"📥 下载过渡视频(待规范化) {index + 1}/{len(transitions)}: {transition.video_url}")
+                await storage_client.download_file_to_path(transition.video_url, str(source_path))
                 
-                logger.info(f"✅ 过渡视频 {index + 1} 下载完成: {len(content)} bytes")
+                normalized_key = await transition_service.normalize_transition_video(
+                    transition, source_path, temp_dir
+                )
+                if not normalized_key:
+                    raise BusinessLogicError(f"过渡视频规范化失败: 过渡{transition.order_index}")
+                transition.normalized_video_url = normalized_key
+                
+                source_path.with_name(f"{source_path.stem}_normalized.mp4").rename(video_path)
+                source_path.unlink(missing_ok=True)
                 return video_path
                 
+            except BusinessLogicError:
+                raise
             except Exception as e:
                 logger.error(f"❌ 过渡视频 {index + 1} 下载失败: {e}")
                 raise BusinessLogicError(f"下载过渡视频失败: 过渡{transition.order_index}")
@@ -173,6 +197,8 @@ class MovieVideoService(BaseService):
         """
         拼接分镜视频
         
+        所有片段已规范化为 TRANSITION_CONCAT_PROFILE 的编码参数，直接流拷贝拼接，不重新编码。
+        
         Args:
             video_paths: 视频文件路径列表
             temp_dir: 临时目录
@@ -185,17 +211,14 @@ class MovieVideoService(BaseService):
         
         logger.info(f"🎬 开始拼接 {len(video_paths)} 个分镜视频")
         
-        # 使用crossfade模式,提供专业级的视频过渡效果
-        # mode="crossfade": 使用交叉淡化过渡,视觉效果最自然
-        # transition_type="fade": 淡入淡出效果,适合大多数场景
-        # transition_duration=0.5: 0.5秒过渡时长,平衡流畅度和处理速度
-        success = concatenate_videos(
+        video_paths = await asyncio.to_thread(self._conform_video_geometry, video_paths)
+        
+        success = await asyncio.to_thread(
+            concatenate_videos,
             video_paths,
             final_video_path,
             concat_file_path,
             mode="fast",
-            # transition_type="fade",
-            # transition_duration=0.5
         )
         
         if not success:
@@ -204,6 +227,41 @@ class MovieVideoService(BaseService):
         logger.info(f"✅ 视频拼接完成: {final_video_path}")
         return final_video_path
 
+    @staticmethod
+    def _conform_video_geometry(video_paths: List[Path]) -> List[Path]:
+        """
+        统一片段的分辨率和帧率
+        
+        入库规范化保留各片段自身的分辨率和帧率；不同视频模型的片段可能不一致，
+        这里以第一个片段为准，把不一致的片段重新规范化（只在本地处理，不回填）。
+        
+        Args:
+            video_paths: 视频文件路径列表
+            
+        Returns:
+            可直接流拷贝拼接的视频路径列表
+        """
+        geometry = concat_geometry_from_video(str(video_paths[0]))
+        if geometry is None:
+            raise BusinessLogicError("无法获取分镜视频的分辨率和帧率")
+        
+        conformed = [video_paths[0]]
+        for video_path in video_paths[1:]:
+            if video_matches_concat_geometry(str(video_path), geometry):
+                conformed.append(video_path)
+                continue
+            
+            conformed_path = video_path.with_name(f"{video_path.stem}_conformed.mp4")
+            logger.info(
+                f"片段分辨率/帧率与首个片段不一致，重新规范化: {video_path.name} -> "
+                f"{geometry['width']}x{geometry['height']}@{geometry['fps']}"
+            )
+            if not normalize_video_for_concat(str(video_path), str(conformed_path), profile=geometry):
+                raise BusinessLogicError(f"分镜视频规范化失败: {video_path.name}")
+            conformed.append(conformed_path)
+        
+        return conformed
+
     async def _mix_bgm(
         self,
         video_path: Path,
@@ -340,9 +398,16 @@ class MovieVideoService(BaseService):
         """
         chapter_service = ChapterService(self.db_session)
         chapter = await chapter_service.get_chapter_by_id(chapter_id)
+        first_video = chapter.video_url is None
         
         chapter.video_url = video_key
         chapter.video_duration = duration
+
+        if first_video:
+            project = await self.db_session.get(Project, chapter.project_id)
+            await StatisticsService(self.db_session).increment(
+                project.owner_id, chapter.project_id, video_count=1
+            )
         
         await self.db_session.flush()
         logger.info(f"✅ 章节视频信息已更新: video_url={video_key}, duration={duration}s")
@@ -103,6 +103,7 @@ class ParagraphService(BaseService):
             # 创建段落对象
             paragraph = Paragraph(
                 chapter_id=chapter_id,
+                project_id=chapter.project_id,
                 content=content,
                 order_index=order_index,
                 word_count=word_count,
@@ -123,6 +124,9 @@ class ParagraphService(BaseService):
 
                     sentence_data = {
                         "paragraph_id": paragraph.id,
+                        "chapter_id": paragraph.chapter_id,
+                        "project_id": paragraph.project_id,
+                        "paragraph_order": paragraph.order_index,
                         "content": sentence_text.strip(),
                         "order_index": sent_idx + 1,
                         "word_count": len(sentence_text.replace(' ', '')),
@@ -285,6 +289,9 @@ class ParagraphService(BaseService):
 
                     sentence_data = {
                         "paragraph_id": paragraph.id,
+                        "chapter_id": paragraph.chapter_id,
+                        "project_id": paragraph.project_id,
+                        "paragraph_order": paragraph.order_index,
                         "content": sentence_text.strip(),
                         "order_index": sent_idx + 1,
                         "word_count": len(sentence_text.replace(' ', '')),
@@ -22,6 +22,7 @@ from src.core.exceptions import BusinessLogicError, NotFoundError
 from src.core.logging import get_logger
 from src.models.project import Project, ProjectStatus, ProjectType
 from src.services.base import BaseService
+from src.services.sentence_projection import invalidate_project_meta
 
 logger = get_logger(__name__)
 
@@ -389,6 +390,7 @@ class ProjectService(BaseService):
 
         await self.commit()
         await self.refresh(project)
+        invalidate_project_meta(project.id)
 
         logger.info(f"更新项目成功: ID={project_id}, 更新字段={list(updates.keys())}")
         return project
@@ -443,10 +445,18 @@ class ProjectService(BaseService):
         """
         project = await self.get_project_by_id(project_id, owner_id)
 
-        self.delete(project)
+        # 集合删除章节/段落/句子和项目行，不经过ORM级联加载整棵内容树
+        from src.services.content_maintenance import ContentMaintenanceService
+        from src.services.statistics import StatisticsService
+        deleted = await ContentMaintenanceService(self.db_session).delete_project(project.id)
+        await StatisticsService(self.db_session).remove_project(project.id)
         await self.commit()
+        invalidate_project_meta(project.id)
 
-        logger.info(f"删除项目成功: ID={project_id}, 标题={project.title}")
+        logger.info(
+            f"删除项目成功: ID={project_id}, 标题={project.title}, "
+            f"章节={deleted['chapters']}, 段落={deleted['paragraphs']}, 句子={deleted['sentences']}"
+        )
         return True
 
     async def get_project_statistics(self, owner_id: str) -> Dict[str, Any]:
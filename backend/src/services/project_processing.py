@@ -30,6 +30,8 @@ from src.models.paragraph import Paragraph
 from src.models.project import Project, ProjectStatus
 from src.models.sentence import Sentence
 from src.services.base import BaseService
+from src.services.content_maintenance import ContentMaintenanceService
+from src.services.statistics import StatisticsService
 from src.utils.encoding_detector import decode_file_content
 from src.utils.file_handlers import get_file_handler
 from src.utils.storage import get_storage_client
@@ -180,17 +182,8 @@ class ProjectProcessingService(BaseService):
         """
         logger.info(f"开始清理项目 {project_id} 的已有数据")
 
-        # 1. 删除句子数据
-        deleted_sentences = await Sentence.delete_by_project_id(self.db_session, project_id)
-        logger.info(f"删除了 {deleted_sentences} 个句子")
-
-        # 2. 删除段落数据
-        deleted_paragraphs = await Paragraph.delete_by_project_id(self.db_session, project_id)
-        logger.info(f"删除了 {deleted_paragraphs} 个段落")
-
-        # 3. 删除章节数据
-        deleted_chapters = await Chapter.delete_by_project_id(self.db_session, project_id)
-        logger.info(f"删除了 {deleted_chapters} 个章节")
+        # 1-3. 按章节分批删除句子、段落、章节（集合操作，不加载ORM对象）
+        await ContentMaintenanceService(self.db_session).purge_project_content(project_id)
 
         # 4. 重置项目统计信息
         project = await self.get(Project, project_id)
@@ -286,6 +279,7 @@ class ProjectProcessingService(BaseService):
                 para_index = current_para_index + i
                 if para_index < len(paragraphs_data):
                     paragraphs_data[para_index]['chapter_id'] = chapter_ids[chapter_idx]
+                    paragraphs_data[para_index]['project_id'] = project_id
                     para_chapter_mapping.append(chapter_ids[chapter_idx])
 
             current_para_index += chapter_paragraph_count
@@ -310,6 +304,10 @@ class ProjectProcessingService(BaseService):
                 sent_index = current_sent_index + i
                 if sent_index < len(sentences_data):
                     sentences_data[sent_index]['paragraph_id'] = paragraph_ids[para_idx]
+                    # 冗余层级字段，供按章节/项目直接查询句子
+                    sentences_data[sent_index]['chapter_id'] = paragraph_data['chapter_id']
+                    sentences_data[sent_index]['project_id'] = project_id
+                    sentences_data[sent_index]['paragraph_order'] = paragraph_data.get('order_index', para_idx)
                     sent_para_mapping.append(paragraph_ids[para_idx])
 
             current_sent_index += para_sentence_count
@@ -322,32 +320,32 @@ class ProjectProcessingService(BaseService):
         """
         更新项目统计信息
 
-        重新计算并更新项目的各项统计数据，包括章节数、段落数、
-        句子数和总字数。这些数据用于显示和统计分析。
+        通过聚合查询重新计算项目的章节数、段落数、句子数和总字数，
+        不加载段落和句子对象。
 
         Args:
             project: 项目对象
         """
-        # 统计章节数量
-        chapter_count = await Chapter.count_by_project_id(self.db_session, project.id)
-        project.chapter_count = chapter_count
-
-        # 统计段落数量
-        paragraphs = await Paragraph.get_by_project_id(self.db_session, project.id)
-        project.paragraph_count = len(paragraphs)
-
-        # 统计句子数量
-        sentences = await Sentence.get_by_project_id(self.db_session, project.id)
-        project.sentence_count = len(sentences)
-
-        # 统计总字数
-        total_word_count = 0
-        for paragraph in paragraphs:
-            total_word_count += paragraph.word_count or 0
-        project.word_count = total_word_count
+        stats = await ContentMaintenanceService(self.db_session).compute_project_statistics(project.id)
+        project.chapter_count = stats['chapter_count']
+        project.paragraph_count = stats['paragraph_count']
+        project.sentence_count = stats['sentence_count']
+        project.word_count = stats['word_count']
+
+        # 内容整体重建：章节/段落/句子数取自上面的统计，差值同步到用户行
+        await StatisticsService(self.db_session).replace_project_content(
+            project.id,
+            project.owner_id,
+            chapter_count=stats['chapter_count'],
+            paragraph_count=stats['paragraph_count'],
+            sentence_count=stats['sentence_count'],
+        )
 
         await self.flush()
-        logger.info(f"项目 {project.id} 统计信息更新完成: {chapter_count}章节, {len(paragraphs)}段落, {len(sentences)}句子, {total_word_count}字")
+        logger.info(
+            f"项目 {project.id} 统计信息更新完成: {stats['chapter_count']}章节, "
+            f"{stats['paragraph_count']}段落, {stats['sentence_count']}句子, {stats['word_count']}字"
+        )
 
     async def get_file_content(self, project_id: str) -> str:
         """
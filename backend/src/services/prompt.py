@@ -2,30 +2,124 @@
 AI导演引擎 - 提示词生成服务（优化版，含完整注释）
 
 提供服务：
-- 批量生成图像提示词
+- 批量生成图像提示词（多句合并为一次请求，JSON 结构化输出，逐批提交）
+- 按 (正文, 风格, 模型, 系统提示词) 缓存结果，重复生成和重复句子不再付费
 - 支持多种 LLM 提供商（Volcengine、DeepSeek）
 - 提示词模板与风格预设
 - 异常处理统一、方法职责清晰
 """
 
 import asyncio
-from typing import List
+import json
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
 
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, update
 
+from src.core.config import settings
 from src.core.exceptions import NotFoundError
 from src.core.logging import get_logger
-from src.models import Sentence, APIKey, ChapterStatus, SentenceStatus, Paragraph, Chapter
-from src.services import ChapterService
+from src.models import Sentence, APIKey, ChapterStatus, SentenceStatus, Chapter
 from src.services.api_key import APIKeyService
 from src.services.base import BaseService
+from src.services.prompt_cache import PromptCache
+from src.services.sentence_projection import SentenceProjectionService
+from src.services.statistics import StatisticsService
 from src.services.provider.base import BaseLLMProvider
 from src.services.provider.factory import ProviderFactory
 
 logger = get_logger(__name__)
 
 
+# 多句批量模式的输出要求（固定追加在系统提示词之后，保持请求前缀一致以命中供应商的提示词缓存）
+BATCH_OUTPUT_INSTRUCTIONS = """
+
+批量模式：
+用户消息是一个 JSON 对象，"sentences" 为按原文顺序排列的若干句子，每个句子有编号 "id" 和正文 "text"；
+"context" 为这些句子之前的原文，仅用于理解人物和场景，不需要为其生成提示词。
+请结合上下文保持人物外貌、场景和光线的连贯，为每个句子分别生成提示词，
+只输出一个 JSON 对象，键为句子编号，值为该句子的提示词，例如：{"1": "...", "2": "..."}。
+"""
+
+# 支持 response_format={"type": "json_object"} 的供应商
+JSON_MODE_PROVIDERS = {"openai", "deepseek", "siliconflow", "volcengine"}
+
+_JSON_FENCE_PATTERN = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+def _resolve_model_name(api_key: APIKey, model: str = None) -> str:
+    """如果提供了model参数，优先使用；否则根据供应商选择默认模型"""
+    if model:
+        return model
+    model_name = "deepseek-v3-250324"
+    if api_key.provider == "deepseek":
+        model_name = "deepseek-chat"
+    if api_key.provider == "volcengine":
+        model_name = "doubao-pro"
+    if api_key.provider == "siliconflow":
+        model_name = "deepseek-ai/DeepSeek-V3.1-Terminus"
+    return model_name
+
+
+def build_batch_user_message(sentences: Sequence[Sentence], context: Sequence[str] = ()) -> Tuple[str, Dict[str, Sentence]]:
+    """
+    构建批量请求的用户消息
+
+    句子用批内序号（"1"、"2"…）作为键，比 UUID 更短，模型也不容易抄错。
+
+    Args:
+        sentences: 本批句子（按原文顺序）
+        context: 本批之前的若干句原文
+
+    Returns:
+        (用户消息, {序号: 句子})
+    """
+    keyed = {str(index): sentence for index, sentence in enumerate(sentences, start=1)}
+    payload = {
+        "context": "".join(context),
+        "sentences": [{"id": key, "text": sentence.content} for key, sentence in keyed.items()],
+    }
+    return json.dumps(payload, ensure_ascii=False), keyed
+
+
+def parse_batch_response(content: str, keys: Sequence[str]) -> Dict[str, str]:
+    """
+    解析批量请求的 JSON 输出
+
+    Args:
+        content: 模型输出
+        keys: 期望的句子序号
+
+    Returns:
+        {序号: 提示词}，只包含合法且非空的条目；输出无法解析时返回空字典
+    """
+    text = _JSON_FENCE_PATTERN.sub("", (content or "").strip())
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        start, end = text.find("{"), text.rfind("}")
+        if start < 0 or end <= start:
+            return {}
+        try:
+            data = json.loads(text[start:end + 1])
+        except json.JSONDecodeError:
+            return {}
+
+    if not isinstance(data, dict):
+        return {}
+    # 兼容 {"prompts": {...}} 这类外层包装
+    if len(data) == 1 and isinstance(next(iter(data.values())), dict):
+        data = next(iter(data.values()))
+
+    prompts = {}
+    for key in keys:
+        value = data.get(key)
+        if isinstance(value, str) and value.strip():
+            prompts[key] = value.strip()
+    return prompts
+
+
 # ============================================================
 # 单句处理逻辑（支持并发限流）
 # ============================================================
@@ -55,17 +149,7 @@ async def process_sentence(
     Raises:
         Exception: LLM 调用失败等异常
     """
-    # 如果提供了model参数，优先使用；否则根据供应商选择默认模型
-    if model:
-        model_name = model
-    else:
-        model_name = "deepseek-v3-250324"
-        if api_key.provider == "deepseek":
-            model_name = "deepseek-chat"
-        if api_key.provider == "volcengine":
-            model_name = "doubao-pro"
-        if api_key.provider == "siliconflow":
-            model_name = "deepseek-ai/DeepSeek-V3.1-Terminus"
+    model_name = _resolve_model_name(api_key, model)
 
     logger.debug(f"[LLM] 使用模型: {model_name} (Provider: {api_key.provider})")
     # 使用信号量控制并发，避免过度同时请求
@@ -95,6 +179,60 @@ async def process_sentence(
             raise
 
 
+# ============================================================
+# 多句批量处理逻辑（一次请求生成 K 个句子的提示词）
+# ============================================================
+
+async def process_sentence_batch(
+        sentences: Sequence[Sentence],
+        context: Sequence[str],
+        api_key: APIKey,
+        llm_provider: BaseLLMProvider,
+        system_prompt: str,
+        semaphore: asyncio.Semaphore,
+        model: str = None,
+) -> Dict[str, str]:
+    """
+    一次请求为连续的多个句子生成提示词。
+
+    Args:
+        sentences: 本批句子（按原文顺序）
+        context: 本批之前的若干句原文
+        api_key: 当前使用的 API Key
+        llm_provider: LLM 提供商实例
+        system_prompt: 系统指令提示词（不含批量输出要求）
+        semaphore: 并发控制信号量
+        model: 模型名称
+
+    Returns:
+        {句子ID: 提示词}，模型漏掉或输出不合法的句子不在结果中
+
+    Raises:
+        Exception: LLM 调用失败等异常
+    """
+    model_name = _resolve_model_name(api_key, model)
+    user_message, keyed = build_batch_user_message(sentences, context)
+
+    kwargs = {}
+    if api_key.provider in JSON_MODE_PROVIDERS:
+        kwargs["response_format"] = {"type": "json_object"}
+
+    async with semaphore:
+        logger.info(f"[LLM] 开始批量处理句子: 数量={len(sentences)}, 模型={model_name}")
+        response = await llm_provider.completions(
+            model=model_name,
+            messages=[
+                {"role": "system", "content": system_prompt + BATCH_OUTPUT_INSTRUCTIONS},
+                {"role": "user", "content": user_message},
+            ],
+            **kwargs,
+        )
+
+    prompts = parse_batch_response(response.choices[0].message.content, list(keyed))
+    logger.debug(f"[LLM] 批量生成完成: 请求={len(keyed)}, 返回={len(prompts)}")
+    return {keyed[key].id: prompt for key, prompt in prompts.items()}
+
+
 # ============================================================
 # 主业务服务类
 # ============================================================
@@ -175,21 +313,31 @@ class PromptService(BaseService):
     # ------------------------------------------------------------
 
     async def _generate_prompts(self, sentences: List[Sentence], api_key: APIKey, style: str,
-                                update: bool = True, model: str = None, custom_prompt: str = None) -> dict:
+                                update_chapter: bool = True, model: str = None, custom_prompt: str = None,
+                                batch_size: Optional[int] = None, use_cache: bool = True) -> dict:
         """
         核心执行方法：批量生成提示词 + 写数据库 + 更新章节状态。
 
+        先查提示词缓存，命中的句子和本次任务内重复的句子不再请求 LLM；
+        其余连续的 batch_size 个句子合并为一次请求（共享系统提示词前缀，并带上前文），
+        每批完成后立即写库提交，任务中断时已付费生成的结果不会丢失。
+        批量请求失败或模型漏掉的句子回退为单句请求。
+
         Args:
             sentences (List[Sentence]): 待处理句子列表
             api_key (APIKey): API Key 对象
             style (str): 生成提示词的风格
-            update (bool): 是否更新章节，默认为 True
+            update_chapter (bool): 是否更新章节，默认为 True
             model (str): 模型名称
             custom_prompt (str): 自定义系统提示词
+            batch_size (int): 每次请求的句子数，默认取配置，1 表示逐句请求
+            use_cache (bool): 是否读取提示词缓存，False 时强制重新生成（结果仍写回缓存）
             
         Returns:
             dict: 统计信息 {"total": int, "success": int, "failed": int}
         """
+        batch_size = max(1, batch_size or settings.PROMPT_BATCH_SIZE)
+        system_prompt = custom_prompt or self._build_system_prompt(style)
 
         # 创建 LLM provider 实例
         llm_provider = ProviderFactory.create(
@@ -201,44 +349,121 @@ class PromptService(BaseService):
 
         # 建立并发信号量（限制同一时刻的 LLM 请求数量）
         semaphore = asyncio.Semaphore(20)
+        # 数据库会话不能并发使用，各批次写库串行
+        db_lock = asyncio.Lock()
 
-        # 构建所有句子的任务列表
-        tasks = [
-            process_sentence(sentence, api_key, llm_provider, custom_prompt, semaphore, model)
+        # 按原文顺序排列，保证同批句子是相邻的
+        sentences = sorted(
+            sentences,
+            key=lambda s: (str(s.chapter_id), s.paragraph_order or 0, s.order_index or 0),
+        )
+        positions = {sentence.id: index for index, sentence in enumerate(sentences)}
+        meta = await SentenceProjectionService(self.db_session).get_chapter_meta(sentences[0].chapter_id)
+        statistics_service = StatisticsService(self.db_session)
+
+        # 内容寻址缓存：正文、风格、模型、系统提示词都相同的句子直接复用结果
+        cache = PromptCache("sentence_prompt")
+        model_name = _resolve_model_name(api_key, model)
+        cache_keys = {
+            sentence.id: cache.make_key(
+                content=sentence.content, style=style, model=model_name, system_prompt=system_prompt
+            )
             for sentence in sentences
-        ]
+        }
+        if use_cache:
+            cached = await cache.get_many(cache_keys.values())
+        else:
+            cache.record_bypass(len(sentences))
+            cached = {}
+
+        # 缓存命中的句子直接写入；本次任务内重复的句子只请求一次
+        hits: List[Sentence] = []
+        pending: List[Sentence] = []
+        duplicates: Dict = defaultdict(list)
+        first_by_key: Dict[str, object] = {}
+        for sentence in sentences:
+            key = cache_keys[sentence.id]
+            if key in cached:
+                hits.append(sentence)
+            elif key in first_by_key:
+                duplicates[first_by_key[key]].append(sentence)
+            else:
+                first_by_key[key] = sentence.id
+                pending.append(sentence)
+
+        counters = {"success": 0, "failed": 0}
+        if hits:
+            await self._save_batch(
+                hits, {sentence.id: cached[cache_keys[sentence.id]] for sentence in hits},
+                style, meta.owner_id, statistics_service, db_lock
+            )
+            counters["success"] += len(hits)
+        logger.info(
+            f"[CACHE] 提示词缓存命中 {len(hits)}，任务内重复 {len(sentences) - len(hits) - len(pending)}，"
+            f"需要生成 {len(pending)}"
+        )
 
-        logger.info(f"[LLM] 开始批量生成提示词，总数={len(sentences)}")
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        async def run_batch(index: int) -> None:
+            batch = pending[index:index + batch_size]
+            start = positions[batch[0].id]
+            context = [
+                s.content for s in sentences[max(0, start - settings.PROMPT_BATCH_CONTEXT_SENTENCES):start]
+                if s.chapter_id == batch[0].chapter_id
+            ]
+
+            prompts: Dict = {}
+            if batch_size > 1:
+                try:
+                    prompts = await process_sentence_batch(
+                        batch, context, api_key, llm_provider, system_prompt, semaphore, model
+                    )
+                except Exception as e:
+                    logger.warning(f"[LLM] 批量请求失败，回退为逐句请求: {e}")
+
+            # 批量模式漏掉的句子逐句补齐
+            missing = [sentence for sentence in batch if sentence.id not in prompts]
+            if missing:
+                results = await asyncio.gather(*[
+                    process_sentence(sentence, api_key, llm_provider, system_prompt, semaphore, model)
+                    for sentence in missing
+                ], return_exceptions=True)
+                for result in results:
+                    if isinstance(result, Exception):
+                        logger.error(f"[LLM] 句子处理失败: {result}")
+                        continue
+                    sentence, prompt = result
+                    prompts[sentence.id] = prompt
+
+            await cache.set_many({
+                cache_keys[sentence_id]: prompt for sentence_id, prompt in prompts.items()
+            })
+
+            # 重复句子复用同一结果
+            for sentence in list(batch):
+                for duplicate in duplicates.get(sentence.id, ()):
+                    batch.append(duplicate)
+                    if sentence.id in prompts:
+                        prompts[duplicate.id] = prompts[sentence.id]
+
+            await self._save_batch(batch, prompts, style, meta.owner_id, statistics_service, db_lock)
+            counters["success"] += len(prompts)
+            counters["failed"] += len(batch) - len(prompts)
+
+        logger.info(f"[LLM] 开始批量生成提示词，总数={len(pending)}，每批={batch_size}")
+        await asyncio.gather(*[run_batch(index) for index in range(0, len(pending), batch_size)])
         logger.info("[LLM] 所有句子处理完成")
 
-        # 统计成功和失败数量
-        success_count = 0
-        failed_count = 0
-
-        # 写入返回结果到数据库
-        logger.info("[DB] 写入生成结果到数据库")
-        for result in results:
-            if isinstance(result, Exception):
-                # 处理失败
-                failed_count += 1
-                logger.error(f"[LLM] 句子处理失败: {result}")
-                continue
-            
-            sentence, prompt = result
-            sentence.image_prompt = prompt
-            sentence.status = SentenceStatus.GENERATED_PROMPTS
-            sentence.image_style = style
-            success_count += 1
-
-        chapter = sentences[0].paragraph.chapter
-        if update:
+        if update_chapter:
             # 统一更新章节状态
-            chapter.status = ChapterStatus.GENERATED_PROMPTS.value
+            await self.execute(
+                update(Chapter)
+                .where(Chapter.id == meta.chapter_id)
+                .values(status=ChapterStatus.GENERATED_PROMPTS.value)
+            )
 
         # 更新 API Key 使用次数
         api_key_service = APIKeyService(self.db_session)
-        await api_key_service.update_usage(api_key.id, chapter.project.owner_id)
+        await api_key_service.update_usage(api_key.id, meta.owner_id)
         logger.info("[API KEY] 使用统计已更新")
 
         # 提交数据库
@@ -249,46 +474,74 @@ class PromptService(BaseService):
         # 返回统计信息
         statistics = {
             "total": len(sentences),
-            "success": success_count,
-            "failed": failed_count
+            "success": counters["success"],
+            "failed": counters["failed"]
         }
         logger.info(f"[STATS] 提示词生成统计: {statistics}")
         return statistics
 
+    async def _save_batch(
+        self,
+        batch: Sequence[Sentence],
+        prompts: Dict,
+        style: str,
+        owner_id,
+        statistics_service: StatisticsService,
+        db_lock: asyncio.Lock,
+    ) -> None:
+        """写入一批生成结果并立即提交"""
+        if not prompts:
+            return
+
+        async with db_lock:
+            had_prompt = {sentence.id for sentence in batch if sentence.image_prompt}
+            for sentence in batch:
+                prompt = prompts.get(sentence.id)
+                if prompt is None:
+                    continue
+                sentence.image_prompt = prompt
+                sentence.status = SentenceStatus.GENERATED_PROMPTS
+                sentence.image_style = style
+
+            # 累加仪表盘统计计数
+            await statistics_service.record_new_sentence_assets(
+                owner_id, batch, "image_prompt", "prompt_count", had_prompt
+            )
+            await self.db_session.commit()
+            logger.info(f"[DB] 已提交 {len(prompts)} 个句子的提示词")
+
     # ============================================================
     # 对外方法：按章节处理
     # ============================================================
 
-    async def generate_prompts_batch(self, chapter_id: str, api_key_id: str, style: str = "cinematic", model: str = None, custom_prompt: str = None) -> dict:
+    async def generate_prompts_batch(self, chapter_id: str, api_key_id: str, style: str = "cinematic", model: str = None, custom_prompt: str = None, batch_size: Optional[int] = None, use_cache: bool = True) -> dict:
         """
         批量生成提示词（按章节 ID 获取所有待处理句子）
         """
-        # 查询章节句子
-        chapter_service = ChapterService(self.db_session)
-        sentences = await chapter_service.get_sentences(chapter_id)
+        # 查询章节句子（不关联加载章节/项目，元数据单独查询并缓存）
+        projection = SentenceProjectionService(self.db_session)
+        sentences = await projection.list_sentences(chapter_id)
 
         if not sentences:
             raise NotFoundError("未找到待处理句子", resource_id=chapter_id, resource_type="chapter")
 
         # 加载 API Key
-        user_id = sentences[0].paragraph.chapter.project.owner_id
+        user_id = (await projection.get_chapter_meta(chapter_id)).owner_id
         api_key = await self._load_api_key(api_key_id, user_id)
 
         # 统一执行批量处理
-        return await self._generate_prompts(sentences, api_key, style, True, model, custom_prompt)
+        return await self._generate_prompts(sentences, api_key, style, True, model, custom_prompt, batch_size, use_cache)
 
     # ============================================================
     # 对外方法：按句子 ID 数组处理
     # ============================================================
 
-    async def generate_prompts_by_ids(self, sentence_ids: List[str], api_key_id: str, style: str = "cinematic", model: str = None, custom_prompt: str = None) -> dict:
+    async def generate_prompts_by_ids(self, sentence_ids: List[str], api_key_id: str, style: str = "cinematic", model: str = None, custom_prompt: str = None, batch_size: Optional[int] = None, use_cache: bool = True) -> dict:
         """
         批量生成提示词（按句子 ID 列表处理）
         """
         # 根据 ID 查询句子
-        stmt = select(Sentence).where(Sentence.id.in_(sentence_ids)).options(
-            selectinload(Sentence.paragraph).selectinload(Paragraph.chapter).selectinload(Chapter.project)
-        )
+        stmt = select(Sentence).where(Sentence.id.in_(sentence_ids))
 
         result = await self.execute(stmt)
         sentences = result.scalars().all()
@@ -301,11 +554,12 @@ class PromptService(BaseService):
             )
 
         # 加载 API Key
-        user_id = sentences[0].paragraph.chapter.project.owner_id
+        meta = await SentenceProjectionService(self.db_session).get_chapter_meta(sentences[0].chapter_id)
+        user_id = meta.owner_id
         api_key = await self._load_api_key(api_key_id, user_id)
 
         # 执行批量生成
-        return await self._generate_prompts(sentences, api_key, style, False, model, custom_prompt)
+        return await self._generate_prompts(sentences, api_key, style, False, model, custom_prompt, batch_size, use_cache)
 
 
 __all__ = ["PromptService"]
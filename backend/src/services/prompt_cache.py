@@ -0,0 +1,291 @@
+"""
+提示词结果缓存 - 按内容寻址的 LLM 输出缓存
+
+提供服务：
+- 以 (命名空间, 模型, 系统提示词, 输入内容, 其它参数) 的哈希为键缓存 LLM 输出
+- Redis 共享缓存 + 进程内 LRU，Redis 不可用时只用进程内缓存
+- 命中/未命中/跳过/错误计数
+- 显式跳过缓存（强制重新生成）
+
+使用方式：
+    cache = PromptCache("sentence_prompt")
+    key = cache.make_key(model=model, system_prompt=system_prompt, content=text, style=style)
+    prompt = await cache.get(key)
+
+    # 或直接包装一次 LLM 调用
+    content = await cached_completion(llm_provider, "storyboard", model=model, messages=messages)
+"""
+
+import hashlib
+import json
+import time
+from collections import Counter, OrderedDict, defaultdict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from src.core.config import settings
+from src.core.logging import get_logger
+from src.core.metrics import CACHE_REQUESTS, register_collector
+from src.core.redis import get_redis_client
+
+logger = get_logger(__name__)
+
+CACHE_KEY_PREFIX = "prompt_cache"
+
+# 进程内 LRU：{key: (过期时间, 值)}
+_local_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+# 命中统计：{命名空间: Counter(hits/misses/bypassed/errors)}
+_stats: Dict[str, Counter] = defaultdict(Counter)
+
+# Redis 出错后暂停使用一段时间，避免每次调用都等待连接失败
+REDIS_RETRY_AFTER_SECONDS = 30
+_redis_retry_at = 0.0
+
+
+def _get_redis():
+    if time.monotonic() < _redis_retry_at:
+        return None
+    return get_redis_client()
+
+
+def _mark_redis_failed() -> None:
+    global _redis_retry_at
+    _redis_retry_at = time.monotonic() + REDIS_RETRY_AFTER_SECONDS
+
+
+def get_prompt_cache_stats() -> Dict[str, Dict[str, int]]:
+    """
+    获取当前进程的缓存统计
+
+    Returns:
+        {命名空间: {"hits": int, "misses": int, "bypassed": int, "errors": int}}
+    """
+    return {
+        namespace: {field: counter.get(field, 0) for field in ("hits", "misses", "bypassed", "errors")}
+        for namespace, counter in _stats.items()
+    }
+
+
+def _collect_cache_metrics() -> None:
+    for namespace, stats in get_prompt_cache_stats().items():
+        for result, value in stats.items():
+            CACHE_REQUESTS.set_total(value, f"prompt:{namespace}", result)
+
+
+register_collector(_collect_cache_metrics)
+
+
+def clear_local_prompt_cache() -> None:
+    """清空进程内缓存和统计"""
+    _local_cache.clear()
+    _stats.clear()
+
+
+class PromptCache:
+    """
+    按内容寻址的提示词缓存
+
+    同一命名空间、相同输入的 LLM 调用只付费一次；输入任一部分变化（正文、风格、模型、
+    系统提示词）都会得到不同的键。
+    """
+
+    def __init__(self, namespace: str, ttl_seconds: Optional[int] = None):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds or settings.PROMPT_CACHE_TTL_SECONDS
+        self.enabled = settings.PROMPT_CACHE_ENABLED
+
+    def make_key(self, **parts: Any) -> str:
+        """
+        生成缓存键
+
+        Args:
+            **parts: 决定输出的全部输入，需可 JSON 序列化
+
+        Returns:
+            缓存键
+        """
+        canonical = json.dumps(
+            {"namespace": self.namespace, **parts},
+            ensure_ascii=False,
+            sort_keys=True,
+            default=str,
+        )
+        digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        return f"{CACHE_KEY_PREFIX}:{self.namespace}:{digest}"
+
+    def record_bypass(self, count: int = 1) -> None:
+        """记录调用方显式跳过缓存的次数"""
+        _stats[self.namespace]["bypassed"] += count
+
+    async def get(self, key: str) -> Optional[str]:
+        """读取单个键，未命中返回 None"""
+        return (await self.get_many([key])).get(key)
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """
+        批量读取
+
+        Args:
+            keys: 缓存键
+
+        Returns:
+            命中的 {key: 值}
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys or not self.enabled:
+            return {}
+
+        found: Dict[str, str] = {}
+        now = time.monotonic()
+        for key in keys:
+            entry = _local_cache.get(key)
+            if entry and entry[0] > now:
+                _local_cache.move_to_end(key)
+                found[key] = entry[1]
+
+        remaining = [key for key in keys if key not in found]
+        redis_client = _get_redis() if remaining else None
+        if redis_client is not None:
+            try:
+                values = await redis_client.mget(remaining)
+                for key, value in zip(remaining, values):
+                    if value is None:
+                        continue
+                    if isinstance(value, bytes):
+                        value = value.decode("utf-8")
+                    found[key] = value
+                    self._set_local(key, value)
+            except Exception as e:
+                _stats[self.namespace]["errors"] += 1
+                _mark_redis_failed()
+                logger.warning(f"[PromptCache] Redis读取失败，暂时仅使用进程内缓存: {e}")
+
+        _stats[self.namespace]["hits"] += len(found)
+        _stats[self.namespace]["misses"] += len(keys) - len(found)
+        return found
+
+    async def set(self, key: str, value: str) -> None:
+        """写入单个键"""
+        await self.set_many({key: value})
+
+    async def set_many(self, mapping: Dict[str, str]) -> None:
+        """
+        批量写入
+
+        Args:
+            mapping: {key: 值}，空值不缓存
+        """
+        mapping = {key: value for key, value in mapping.items() if value}
+        if not mapping or not self.enabled:
+            return
+
+        for key, value in mapping.items():
+            self._set_local(key, value)
+
+        redis_client = _get_redis()
+        if redis_client is None:
+            return
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for key, value in mapping.items():
+                pipe.set(key, value, ex=self.ttl_seconds)
+            await pipe.execute()
+        except Exception as e:
+            _stats[self.namespace]["errors"] += 1
+            _mark_redis_failed()
+            logger.warning(f"[PromptCache] Redis写入失败: {e}")
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[str]],
+        bypass: bool = False,
+        validate: Optional[Callable[[str], bool]] = None,
+    ) -> str:
+        """
+        读取缓存，未命中时调用 compute 并写回
+
+        Args:
+            key: 缓存键
+            compute: 生成结果的协程函数
+            bypass: 为 True 时跳过读取，直接生成并覆盖缓存
+            validate: 结果校验函数，不通过的结果不写入缓存
+
+        Returns:
+            结果
+        """
+        if bypass:
+            self.record_bypass()
+        else:
+            cached = await self.get(key)
+            if cached is not None:
+                return cached
+
+        value = await compute()
+        if validate is None or validate(value):
+            await self.set(key, value)
+        return value
+
+    def _set_local(self, key: str, value: str) -> None:
+        _local_cache[key] = (time.monotonic() + self.ttl_seconds, value)
+        _local_cache.move_to_end(key)
+        while len(_local_cache) > settings.PROMPT_CACHE_LOCAL_SIZE:
+            _local_cache.popitem(last=False)
+
+
+async def cached_completion(
+    llm_provider,
+    namespace: str,
+    model: Optional[str],
+    messages: list,
+    bypass: bool = False,
+    validate: Optional[Callable[[str], bool]] = None,
+    **kwargs: Any,
+) -> str:
+    """
+    带缓存的 LLM completions 调用，返回去除首尾空白的消息内容
+
+    缓存键包含模型、完整消息列表和其它请求参数（如 response_format）。
+
+    Args:
+        llm_provider: LLM 提供商实例
+        namespace: 缓存命名空间（按业务区分统计）
+        model: 模型名称
+        messages: 消息列表
+        bypass: 是否跳过缓存强制重新生成
+        validate: 结果校验函数，不通过的结果不写入缓存（如要求合法 JSON）
+        **kwargs: 透传给 completions 的参数
+
+    Returns:
+        消息内容
+    """
+    cache = PromptCache(namespace)
+    key = cache.make_key(model=model, messages=messages, params=kwargs)
+
+    async def _compute() -> str:
+        response = await llm_provider.completions(model=model, messages=messages, **kwargs)
+        return (response.choices[0].message.content or "").strip()
+
+    return await cache.get_or_compute(key, _compute, bypass=bypass, validate=validate)
+
+
+def is_json_object(content: str) -> bool:
+    """结果是否为合法的 JSON 对象（允许 ```json 代码块包裹）"""
+    text = (content or "").strip()
+    if text.startswith("```"):
+        text = text.strip("`").strip()
+        if text.startswith("json"):
+            text = text[4:]
+    try:
+        return isinstance(json.loads(text), dict)
+    except ValueError:
+        return False
+
+
+__all__ = [
+    "PromptCache",
+    "cached_completion",
+    "clear_local_prompt_cache",
+    "get_prompt_cache_stats",
+    "is_json_object",
+]
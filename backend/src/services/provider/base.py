@@ -1,15 +1,36 @@
 # src/services/providers/base.py
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 from functools import wraps
+import hashlib
 import json
+import logging
 import time
 from src.core.logging import get_logger
+from src.core.metrics import PROVIDER_RATE_LIMITED, PROVIDER_REQUEST_DURATION
+from src.core.tracing import record_span
+from src.services.provider.tts_timing import SpeechResult, parse_speech_response
 
 logger = get_logger(__name__)
 
 
+def _error_status(error: Exception) -> Any:
+    """取异常中的HTTP状态码（openai/httpx异常）"""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status
+
+
+def _key_label(provider: Any) -> str:
+    """API Key 的指标标签（哈希前缀，不暴露原文）"""
+    api_key = getattr(provider, "api_key", None) or getattr(getattr(provider, "client", None), "api_key", None)
+    if not api_key:
+        return "unknown"
+    return hashlib.sha256(str(api_key).encode("utf-8")).hexdigest()[:8]
+
+
 def log_provider_call(method_name: str):
     """
     Provider方法调用日志装饰器
@@ -20,20 +41,23 @@ def log_provider_call(method_name: str):
         async def wrapper(self, *args, **kwargs):
             # 记录请求开始
             start_time = time.time()
+            span_start = time.perf_counter()
             base_url = self.base_url
             provider_name = self.__class__.__name__
             
-            # 构建请求日志
-            request_info = {
-                "provider": provider_name,
-                "method": method_name,
-                "args": _sanitize_for_log(args),
-                "kwargs": _sanitize_for_log(kwargs),
-                "base_url": base_url
-            }
-            
-            logger.info(f"[{provider_name}] {method_name} 请求开始")
-            logger.info(f"[{provider_name}] {method_name} 请求参数: {json.dumps(request_info, ensure_ascii=False, indent=2)}")
+            # 请求参数只在 DEBUG 级别序列化
+            if logger.isEnabledFor(logging.DEBUG):
+                request_info = {
+                    "provider": provider_name,
+                    "method": method_name,
+                    "args": _sanitize_for_log(args),
+                    "kwargs": _sanitize_for_log(kwargs),
+                    "base_url": base_url
+                }
+                logger.debug(
+                    "[%s] %s 请求参数: %s",
+                    provider_name, method_name, json.dumps(request_info, ensure_ascii=False, default=str),
+                )
             
             try:
                 # 执行实际方法
@@ -43,8 +67,11 @@ def log_provider_call(method_name: str):
                 elapsed = time.time() - start_time
                 
                 # 记录响应
-                logger.info(f"[{provider_name}] {method_name} 请求成功 (耗时: {elapsed:.2f}s)")
-                logger.info(f"[{provider_name}] {method_name} 响应摘要: {_get_response_summary(result)}")
+                PROVIDER_REQUEST_DURATION.observe(elapsed, provider_name, method_name, "success")
+                record_span(f"provider.{method_name}", span_start, {"provider": provider_name})
+                logger.info("[%s] %s 请求成功 (耗时: %.2fs)", provider_name, method_name, elapsed)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("[%s] %s 响应摘要: %s", provider_name, method_name, _get_response_summary(result))
                 
                 return result
                 
@@ -53,6 +80,15 @@ def log_provider_call(method_name: str):
                 elapsed = time.time() - start_time
                 
                 # 记录错误
+                status = _error_status(e)
+                PROVIDER_REQUEST_DURATION.observe(elapsed, provider_name, method_name, str(status or "error"))
+                if status == 429:
+                    PROVIDER_RATE_LIMITED.inc(provider_name, _key_label(self))
+                record_span(
+                    f"provider.{method_name}", span_start,
+                    {"provider": provider_name, "http.status_code": str(status or "error")},
+                    error=f"{type(e).__name__}: {e}",
+                )
                 logger.error(f"[{provider_name}] {method_name} 请求失败 (耗时: {elapsed:.2f}s): {e}")
                 
                 raise
@@ -99,6 +135,9 @@ class BaseLLMProvider(ABC):
     所有 Provider 都必须实现 completions() 方法。
     """
 
+    # 请求 TTS 字/词时间轴时附加到请求体的参数（None 表示该服务不支持返回时间轴）
+    tts_timing_params: Optional[Dict[str, Any]] = None
+
     @abstractmethod
     async def completions(
             self,
@@ -135,3 +174,28 @@ class BaseLLMProvider(ABC):
         生成音频的调用（纯粹透传）
         """
         pass
+
+    async def generate_speech(
+            self,
+            input_text: str,
+            voice: str = "alloy",
+            model: str = "tts-1",
+            with_timing: bool = False,
+            **kwargs: Any
+    ) -> SpeechResult:
+        """
+        生成音频并解析时间轴
+
+        Args:
+            input_text: 文本
+            voice: 音色
+            model: 模型
+            with_timing: 是否向服务请求字/词时间轴（仅 tts_timing_params 不为 None 的服务）
+
+        Returns:
+            音频和时间轴（服务没有返回时间轴时为 None）
+        """
+        if with_timing and self.tts_timing_params:
+            kwargs["extra_body"] = {**kwargs.get("extra_body", {}), **self.tts_timing_params}
+        response = await self.generate_audio(input_text=input_text, voice=voice, model=model, **kwargs)
+        return parse_speech_response(response)
@@ -23,6 +23,9 @@ class CustomProvider(BaseLLMProvider):
     只提供 completions() 和 generate_image() 接口 → 等同于一个可并发的 SiliconFlow SDK wrapper
     """
 
+    # 自定义网关可以在 JSON 响应中返回 base64 音频和时间轴
+    tts_timing_params = {"timestamps": True}
+
     def __init__(
         self,
         api_key: str,
@@ -175,8 +178,7 @@ class CustomProvider(BaseLLMProvider):
         # 处理参考图 (Persona)
         reference_images = kwargs.get("reference_images")
         if reference_images:
-            import base64
-            from datetime import timedelta
+            from src.utils.image_utils import detect_image_mime_type, encode_base64
             from src.utils.storage import get_storage_client
             
             logger.info(f"处理 {len(reference_images)} 张参考图")
@@ -191,7 +193,7 @@ class CustomProvider(BaseLLMProvider):
                     # 优先检查是否是 MinIO key (如果刚才没转换成功或者还是key形式)
                     if img_url.startswith("uploads/"):
                         storage_client = await get_storage_client()
-                        img_data = await storage_client.download_file(img_url)
+                        img_data = await storage_client.read_object(img_url)
                         logger.info(f"从存储直接读取参考图: {img_url[:30]}...")
                     else:
                         # 下载参考图并转 Base64
@@ -203,16 +205,12 @@ class CustomProvider(BaseLLMProvider):
                                     logger.warning(f"下载参考图失败 HTTP {resp.status}: {img_url[:50]}...")
                     
                     if img_data:
-                        b64_img = base64.b64encode(img_data).decode('utf-8')
-                        
-                        # 检测MIME类型
-                        mime_type = "image/jpeg"
-                        if img_data[:4] == b'\x89PNG':
-                            mime_type = "image/png"
-                        
+                        # 参考图通常有数 MB，编码放到线程里执行，不占事件循环
+                        b64_img = await asyncio.to_thread(encode_base64, img_data)
+
                         parts.append({
                             "inline_data": {
-                                "mime_type": mime_type,
+                                "mime_type": detect_image_mime_type(img_data),
                                 "data": b64_img
                             }
                         })
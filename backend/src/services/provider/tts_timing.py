@@ -0,0 +1,152 @@
+"""
+TTS 时间轴 - 解析语音合成响应中的音频和字/词时间轴
+
+不同服务返回时间轴的格式不同，统一整理为：
+    [{"text": "你", "start": 0.0, "end": 0.21}, ...]（秒）
+
+支持的响应：
+- 二进制音频（没有时间轴）
+- JSON：音频为 base64（audio_base64 / audio / data），时间轴为以下任一形式
+  - {"alignment": {"characters": [...], "character_start_times_seconds": [...], "character_end_times_seconds": [...]}}
+  - {"words" | "timestamps" | "subtitles" | "word_timestamps" | "characters": [{"word"|"text"|"character", 时间字段}]}
+    时间字段：start/end、start_time/end_time（秒），begin_time、start_ms/end_ms（毫秒）
+"""
+
+import base64
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+_AUDIO_KEYS = ("audio_base64", "audio", "data")
+_ALIGNMENT_KEYS = ("alignment", "normalized_alignment")
+_ENTRY_LIST_KEYS = ("words", "timestamps", "subtitles", "word_timestamps", "characters")
+_TEXT_KEYS = ("word", "text", "character", "char")
+
+
+@dataclass
+class SpeechResult:
+    """语音合成结果"""
+    audio: bytes
+    timeline: Optional[List[Dict[str, Any]]] = None
+
+
+def _entry_times(entry: Dict[str, Any]) -> Optional[tuple]:
+    """单个条目的 (开始, 结束) 秒"""
+    if "begin_time" in entry:
+        return float(entry["begin_time"]) / 1000, float(entry["end_time"]) / 1000
+    if "start_ms" in entry:
+        return float(entry["start_ms"]) / 1000, float(entry["end_ms"]) / 1000
+    for start_key, end_key in (("start", "end"), ("start_time", "end_time")):
+        if start_key in entry and end_key in entry:
+            return float(entry[start_key]), float(entry[end_key])
+    return None
+
+
+def _normalize_entries(entries: List[Any]) -> List[Dict[str, Any]]:
+    timeline = []
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        text = next((entry[key] for key in _TEXT_KEYS if isinstance(entry.get(key), str)), None)
+        times = _entry_times(entry)
+        if text is None or times is None:
+            continue
+        timeline.append({"text": text, "start": round(times[0], 3), "end": round(max(times), 3)})
+    return timeline
+
+
+def normalize_tts_timeline(payload: Any) -> Optional[List[Dict[str, Any]]]:
+    """
+    整理响应中的时间轴
+
+    Args:
+        payload: 响应 JSON（dict），或时间轴列表
+
+    Returns:
+        时间轴，没有可识别的时间轴时返回 None
+    """
+    if isinstance(payload, list):
+        return _normalize_entries(payload) or None
+    if not isinstance(payload, dict):
+        return None
+
+    for key in _ALIGNMENT_KEYS:
+        alignment = payload.get(key)
+        if isinstance(alignment, dict) and alignment.get("characters"):
+            starts = alignment.get("character_start_times_seconds") or []
+            ends = alignment.get("character_end_times_seconds") or []
+            timeline = [
+                {"text": ch, "start": round(float(s), 3), "end": round(float(e), 3)}
+                for ch, s, e in zip(alignment["characters"], starts, ends)
+            ]
+            if timeline:
+                return timeline
+
+    for key in _ENTRY_LIST_KEYS:
+        entries = payload.get(key)
+        if isinstance(entries, list):
+            timeline = _normalize_entries(entries)
+            if timeline:
+                return timeline
+
+    # 部分服务把结果包在 data/result 中
+    for key in ("data", "result"):
+        if isinstance(payload.get(key), (dict, list)):
+            timeline = normalize_tts_timeline(payload[key])
+            if timeline:
+                return timeline
+    return None
+
+
+def _content_type(response: Any) -> str:
+    http_response = getattr(response, "response", None)
+    headers = getattr(http_response, "headers", None) or getattr(response, "headers", None) or {}
+    return str(headers.get("content-type", "")).lower()
+
+
+def parse_speech_response(response: Any) -> SpeechResult:
+    """
+    解析 audio.speech.create 的响应
+
+    Args:
+        response: SDK 响应（带 content 属性）或 bytes
+
+    Returns:
+        音频和时间轴（没有时间轴时为 None）
+    """
+    content = response if isinstance(response, (bytes, bytearray)) else response.content
+    if "json" not in _content_type(response) and content[:1] != b"{":
+        return SpeechResult(audio=bytes(content))
+
+    try:
+        payload = json.loads(content)
+    except (ValueError, UnicodeDecodeError):
+        return SpeechResult(audio=bytes(content))
+    if not isinstance(payload, dict):
+        raise ValueError("语音合成响应格式无法识别")
+
+    audio_b64 = None
+    for container in (payload, payload.get("data") if isinstance(payload.get("data"), dict) else None):
+        if not container:
+            continue
+        audio_b64 = next((container[key] for key in _AUDIO_KEYS if isinstance(container.get(key), str)), None)
+        if audio_b64:
+            break
+    if not audio_b64:
+        raise ValueError(f"语音合成响应中没有音频数据: {list(payload.keys())[:5]}")
+
+    timeline = normalize_tts_timeline(payload)
+    if timeline:
+        logger.debug(f"语音合成响应包含时间轴: {len(timeline)} 项")
+    return SpeechResult(audio=base64.b64decode(audio_b64), timeline=timeline)
+
+
+__all__ = [
+    "SpeechResult",
+    "normalize_tts_timeline",
+    "parse_speech_response",
+]
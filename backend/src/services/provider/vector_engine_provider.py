@@ -11,7 +11,12 @@ class VectorEngineProvider:
     专门用于视频生成任务
     """
 
-    def __init__(self, api_key: str, base_url: str = "https://api.vectorengine.ai/v1"):
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://api.vectorengine.ai/v1",
+        http_client: Optional[httpx.AsyncClient] = None
+    ):
         self.api_key = api_key
         self.base_url = base_url
         self.headers = {
@@ -19,6 +24,8 @@ class VectorEngineProvider:
             "Content-Type": "application/json"
         }
         self.timeout = httpx.Timeout(60.0, connect=20.0)
+        # 可选的共享连接池（批量查询状态时复用连接）
+        self.http_client = http_client
 
     @log_provider_call("create_video")
     async def create_video(
@@ -63,14 +70,17 @@ class VectorEngineProvider:
         查询任务状态
         """
         url = f"{self.base_url}/videos/{task_id}"
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.get(url, headers=self.headers)
-                response.raise_for_status()
-                return response.json()
-            except Exception as e:
-                logger.error(f"Vector Engine Query Status Failed: {e}")
-                raise
+        try:
+            if self.http_client is not None:
+                response = await self.http_client.get(url, headers=self.headers, timeout=self.timeout)
+            else:
+                async with httpx.AsyncClient(timeout=self.timeout) as client:
+                    response = await client.get(url, headers=self.headers)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logger.error(f"Vector Engine Query Status Failed: {e}")
+            raise
 
     @log_provider_call("get_video_content")
     async def get_video_content(self, task_id: str) -> Dict[str, Any]:
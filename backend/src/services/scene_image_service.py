@@ -83,7 +83,7 @@ async def _generate_scene_image_worker(
                 
                 # 上传图片
                 from src.utils.image_utils import extract_and_upload_image
-                image_url = await extract_and_upload_image(
+                image_url, derivative_format = await extract_and_upload_image(
                     result=result,
                     user_id=str(user_id),
                     metadata={"scene_id": str(scene.id), "type": "scene_image"}
@@ -91,6 +91,7 @@ async def _generate_scene_image_worker(
                 
                 # 更新场景
                 scene.scene_image_url = image_url
+                scene.scene_image_derivative_format = derivative_format
                 scene.scene_image_prompt = prompt
                 await db_session.flush()
                 
@@ -65,6 +65,9 @@ class SentenceService(BaseService):
 
         sentence = Sentence(
             paragraph_id=paragraph_id,
+            chapter_id=paragraph.chapter_id,
+            project_id=paragraph.project_id,
+            paragraph_order=paragraph.order_index,
             content=content,
             order_index=order_index,
             word_count=len(content.replace(' ', '')),
@@ -0,0 +1,247 @@
+"""
+句子投影查询服务 - 为视频流水线提供精简的句子查询
+
+提供服务：
+- 按章节查询句子的精简行（只取流水线需要的列，不关联章节/项目）
+- 章节/项目元数据查询（进程内短时缓存）
+- 视频缓存字段的批量回写
+
+设计原则：
+- 句子行不再通过 joinedload 携带章节正文和项目行
+- 章节/项目元数据单独查询一次并缓存，供整条流水线复用
+- 需要写回句子字段的流水线使用按主键的批量 UPDATE
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.engine import Row
+
+from src.core.exceptions import NotFoundError
+from src.core.logging import get_logger
+from src.core.metrics import CACHE_REQUESTS
+from src.models.chapter import Chapter
+from src.models.project import Project
+from src.models.sentence import Sentence
+from src.services.base import BaseService
+
+logger = get_logger(__name__)
+
+# 视频合成：素材校验、缓存判断、句子视频生成
+VIDEO_SENTENCE_COLUMNS = (
+    Sentence.id,
+    Sentence.order_index,
+    Sentence.content,
+    Sentence.image_url,
+    Sentence.audio_url,
+    Sentence.audio_timeline,
+    Sentence.sentence_video_key,
+    Sentence.needs_regeneration,
+)
+
+# 剪映导出：素材下载和时间线
+EXPORT_SENTENCE_COLUMNS = (
+    Sentence.id,
+    Sentence.image_url,
+    Sentence.audio_url,
+    Sentence.audio_duration,
+)
+
+# 章节元数据缓存（按章节ID，进程内）
+# 失效只作用于修改数据的进程（API），Celery worker 中的缓存靠 TTL 过期，
+# TTL 只需覆盖一次流水线内的重复查询
+CHAPTER_META_CACHE_TTL = 10
+CHAPTER_META_CACHE_SIZE = 512
+_chapter_meta_cache: "OrderedDict[str, Tuple[float, ChapterMeta]]" = OrderedDict()
+
+
+@dataclass(frozen=True)
+class ChapterMeta:
+    """章节/项目元数据（不含章节正文和会频繁变化的状态字段）"""
+    chapter_id: Any
+    project_id: Any
+    owner_id: Any
+    chapter_title: str
+    chapter_number: int
+    project_title: str
+    project_type: Optional[str]
+
+
+def invalidate_chapter_meta(chapter_id=None) -> None:
+    """
+    清除章节元数据缓存
+
+    Args:
+        chapter_id: 章节ID，不传时清空全部
+    """
+    if chapter_id is None:
+        _chapter_meta_cache.clear()
+    else:
+        _chapter_meta_cache.pop(str(chapter_id), None)
+
+
+def invalidate_project_meta(project_id) -> None:
+    """
+    清除项目下所有章节的元数据缓存（项目标题/类型变化或项目删除时调用）
+
+    Args:
+        project_id: 项目ID
+    """
+    project_id = str(project_id)
+    for key in [key for key, (_, meta) in _chapter_meta_cache.items() if str(meta.project_id) == project_id]:
+        del _chapter_meta_cache[key]
+
+
+def has_valid_video_cache(row) -> bool:
+    """句子行是否有可复用的视频缓存（与 Sentence.has_valid_cache 一致）"""
+    return row.sentence_video_key is not None and not row.needs_regeneration
+
+
+class SentenceProjectionService(BaseService):
+    """
+    句子投影查询服务
+
+    使用方式：
+        projection = SentenceProjectionService(db_session)
+        meta = await projection.get_chapter_meta(chapter_id)
+        rows = await projection.list_sentence_rows(chapter_id, VIDEO_SENTENCE_COLUMNS)
+    """
+
+    async def get_chapter_meta(self, chapter_id, use_cache: bool = True) -> ChapterMeta:
+        """
+        获取章节/项目元数据
+
+        Args:
+            chapter_id: 章节ID
+            use_cache: 是否使用进程内缓存
+
+        Returns:
+            章节元数据
+
+        Raises:
+            NotFoundError: 章节不存在
+        """
+        key = str(chapter_id)
+        if use_cache:
+            cached = _chapter_meta_cache.get(key)
+            if cached and cached[0] > time.monotonic():
+                _chapter_meta_cache.move_to_end(key)
+                CACHE_REQUESTS.inc("chapter_meta", "hits")
+                return cached[1]
+            CACHE_REQUESTS.inc("chapter_meta", "misses")
+
+        result = await self.execute(
+            select(
+                Chapter.id,
+                Chapter.project_id,
+                Project.owner_id,
+                Chapter.title,
+                Chapter.chapter_number,
+                Project.title,
+                Project.type,
+            )
+            .join(Project, Chapter.project_id == Project.id)
+            .where(Chapter.id == chapter_id)
+        )
+        row = result.first()
+        if row is None:
+            raise NotFoundError("章节不存在", resource_type="chapter", resource_id=key)
+
+        meta = ChapterMeta(*row)
+        _chapter_meta_cache[key] = (time.monotonic() + CHAPTER_META_CACHE_TTL, meta)
+        _chapter_meta_cache.move_to_end(key)
+        while len(_chapter_meta_cache) > CHAPTER_META_CACHE_SIZE:
+            _chapter_meta_cache.popitem(last=False)
+        return meta
+
+    async def list_sentence_rows(
+        self, chapter_id, columns: Sequence = VIDEO_SENTENCE_COLUMNS
+    ) -> List[Row]:
+        """
+        按章节顺序查询句子的精简行
+
+        Args:
+            chapter_id: 章节ID
+            columns: 需要的句子列
+
+        Returns:
+            行元组列表，可按列名访问（row.image_url）
+        """
+        result = await self.execute(
+            select(*columns)
+            .where(Sentence.chapter_id == chapter_id)
+            .order_by(Sentence.paragraph_order, Sentence.order_index)
+        )
+        return list(result.all())
+
+    async def list_sentences(self, chapter_id) -> List[Sentence]:
+        """
+        按章节顺序查询句子实体（需要回写句子字段的流水线使用，不做关联加载）
+
+        Args:
+            chapter_id: 章节ID
+
+        Returns:
+            句子列表
+        """
+        result = await self.execute(
+            select(Sentence)
+            .where(Sentence.chapter_id == chapter_id)
+            .order_by(Sentence.paragraph_order, Sentence.order_index)
+        )
+        return list(result.scalars().all())
+
+    async def save_video_caches(self, caches: Dict[Any, Tuple[str, int]]) -> None:
+        """
+        批量保存句子视频缓存（与 Sentence.save_video_cache 一致）
+
+        Args:
+            caches: {sentence_id: (video_key, duration)}
+        """
+        if not caches:
+            return
+        now = datetime.utcnow()
+        await self.execute(
+            update(Sentence),
+            [
+                {
+                    "id": sentence_id,
+                    "sentence_video_key": video_key,
+                    "sentence_video_duration": duration,
+                    "needs_regeneration": False,
+                    "last_video_generated_at": now,
+                }
+                for sentence_id, (video_key, duration) in caches.items()
+            ],
+        )
+
+    async def mark_materials_updated(self, sentence_ids: Iterable) -> None:
+        """
+        批量标记句子需要重新生成视频（与 Sentence.mark_material_updated 一致）
+
+        Args:
+            sentence_ids: 句子ID列表
+        """
+        sentence_ids = list(sentence_ids)
+        if not sentence_ids:
+            return
+        await self.execute(
+            update(Sentence)
+            .where(Sentence.id.in_(sentence_ids))
+            .values(needs_regeneration=True)
+        )
+
+
+__all__ = [
+    "ChapterMeta",
+    "SentenceProjectionService",
+    "VIDEO_SENTENCE_COLUMNS",
+    "EXPORT_SENTENCE_COLUMNS",
+    "has_valid_video_cache",
+    "invalidate_chapter_meta",
+    "invalidate_project_meta",
+]
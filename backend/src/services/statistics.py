@@ -0,0 +1,520 @@
+"""
+统计计数服务 - 物化的用户/项目计数维护
+
+提供服务：
+- 增量计数（解析入库、提示词/图片/音频生成、视频任务完成时调用）
+- 项目级/用户级全量对账
+- 仪表盘读取（单行读取，带更新时间和对账时间）
+
+设计原则：
+- 计数更新使用 INSERT ... ON CONFLICT DO UPDATE 原子累加，不读-改-写
+- 与业务数据在同一事务内写入，不在这里提交
+- 计数行缺失或从未对账时视为未知，读取方实时汇总（只读），由定时任务对账
+- 章节增删/重建按差值累加；对账和内容整体重建先锁定项目计数行再计算差值
+"""
+
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from src.core.config import settings
+from src.core.logging import get_logger
+from src.models.chapter import Chapter
+from src.models.paragraph import Paragraph
+from src.models.project import Project
+from src.models.sentence import Sentence
+from src.models.statistics import StatisticsCounter, StatisticsScope
+from src.models.video_task import VideoTask, VideoTaskStatus
+from src.services.base import BaseService
+
+logger = get_logger(__name__)
+
+COUNTER_FIELDS = StatisticsCounter.COUNTER_FIELDS
+
+
+def _empty_counters() -> Dict[str, int]:
+    return {field: 0 for field in COUNTER_FIELDS}
+
+
+class StatisticsService(BaseService):
+    """
+    统计计数服务
+
+    使用方式：
+        stats = StatisticsService(db_session)
+        await stats.increment(owner_id, project_id, image_count=3)
+        await db_session.commit()
+    """
+
+    # ------------------------------------------------------------
+    # 增量维护
+    # ------------------------------------------------------------
+
+    async def increment(self, owner_id, project_id, **deltas: int) -> None:
+        """
+        原子累加项目行和用户行的计数
+
+        Args:
+            owner_id: 用户ID
+            project_id: 项目ID
+            **deltas: 计数字段增量，如 image_count=2、sentence_count=-5
+        """
+        deltas = {field: value for field, value in deltas.items() if value}
+        if not deltas:
+            return
+
+        unknown = set(deltas) - set(COUNTER_FIELDS)
+        if unknown:
+            raise ValueError(f"未知的统计字段: {sorted(unknown)}")
+
+        await self._apply_delta(StatisticsScope.PROJECT, project_id, owner_id, deltas)
+        await self._apply_delta(StatisticsScope.USER, owner_id, owner_id, deltas)
+
+    async def record_new_sentence_assets(
+        self,
+        owner_id,
+        sentences: Iterable[Sentence],
+        attr: str,
+        counter: str,
+        already_present: Iterable,
+    ) -> int:
+        """
+        统计本次新生成某类素材的句子并累加计数
+
+        Args:
+            owner_id: 用户ID
+            sentences: 本次处理的句子
+            attr: 素材字段名（image_url/audio_url/image_prompt）
+            counter: 对应计数字段
+            already_present: 处理前已有该素材的句子ID
+
+        Returns:
+            新增数量
+        """
+        already_present = set(already_present)
+        per_project = Counter(
+            sentence.project_id for sentence in sentences
+            if getattr(sentence, attr) and sentence.id not in already_present
+        )
+        for project_id, count in per_project.items():
+            await self.increment(owner_id, project_id, **{counter: count})
+        return sum(per_project.values())
+
+    async def _apply_delta(self, scope_type: StatisticsScope, scope_id, owner_id, deltas: Dict[str, int]) -> None:
+        table = StatisticsCounter.__table__
+        now = datetime.now(timezone.utc)
+
+        # 行不存在时插入（负增量按0处理，reconciled_at 为空表示需要对账）
+        values = {
+            'id': uuid.uuid4(),
+            'scope_type': scope_type.value,
+            'scope_id': scope_id,
+            'owner_id': owner_id,
+            'created_at': now,
+            'updated_at': now,
+            **_empty_counters(),
+        }
+        values.update({field: max(value, 0) for field, value in deltas.items()})
+
+        stmt = pg_insert(table).values(**values)
+        update_set = {
+            field: func.greatest(table.c[field] + value, 0)
+            for field, value in deltas.items()
+        }
+        update_set['updated_at'] = now
+        await self.execute(
+            stmt.on_conflict_do_update(constraint='uq_statistics_scope', set_=update_set)
+        )
+
+    async def _set_counters(
+        self,
+        scope_type: StatisticsScope,
+        scope_id,
+        owner_id,
+        counters: Dict[str, int],
+        reconciled_at: datetime,
+    ) -> None:
+        table = StatisticsCounter.__table__
+        values = {
+            'id': uuid.uuid4(),
+            'scope_type': scope_type.value,
+            'scope_id': scope_id,
+            'owner_id': owner_id,
+            'created_at': reconciled_at,
+            'updated_at': reconciled_at,
+            'reconciled_at': reconciled_at,
+            **counters,
+        }
+        update_set = dict(counters)
+        update_set['updated_at'] = reconciled_at
+        update_set['reconciled_at'] = reconciled_at
+        await self.execute(
+            pg_insert(table).values(**values)
+            .on_conflict_do_update(constraint='uq_statistics_scope', set_=update_set)
+        )
+
+    async def _lock_project_row(self, project_id, owner_id) -> Dict[str, Any]:
+        """确保项目计数行存在并加行锁（SELECT ... FOR UPDATE），返回当前计数"""
+        table = StatisticsCounter.__table__
+        now = datetime.now(timezone.utc)
+        await self.execute(
+            pg_insert(table).values(
+                id=uuid.uuid4(),
+                scope_type=StatisticsScope.PROJECT.value,
+                scope_id=project_id,
+                owner_id=owner_id,
+                created_at=now,
+                updated_at=now,
+                **_empty_counters(),
+            ).on_conflict_do_nothing(constraint='uq_statistics_scope')
+        )
+        result = await self.execute(
+            select(table).where(
+                StatisticsCounter.scope_type == StatisticsScope.PROJECT.value,
+                StatisticsCounter.scope_id == project_id,
+            ).with_for_update()
+        )
+        return dict(result.mappings().one())
+
+    async def _get_owner_id(self, project_id):
+        result = await self.execute(select(Project.owner_id).where(Project.id == project_id))
+        return result.scalar_one_or_none()
+
+    async def compute_chapter_counters(self, chapter_ids: List) -> Dict[str, int]:
+        """
+        计算若干章节（含其段落、句子）贡献的计数，用于删除或重建章节前求差值
+
+        按 chapter_id 过滤（有索引），只扫描这些章节的数据，不做项目级聚合。
+
+        Args:
+            chapter_ids: 章节ID列表
+
+        Returns:
+            计数字典（video_task_count 恒为 0）
+        """
+        counters = _empty_counters()
+        if not chapter_ids:
+            return counters
+
+        chapters, videos = (await self.execute(
+            select(
+                func.count(Chapter.id),
+                func.count(Chapter.id).filter(Chapter.video_url.isnot(None)),
+            ).where(Chapter.id.in_(chapter_ids))
+        )).one()
+        paragraphs = (await self.execute(
+            select(func.count(Paragraph.id)).where(Paragraph.chapter_id.in_(chapter_ids))
+        )).scalar() or 0
+        sentences, prompts, images, audios = (await self.execute(
+            select(
+                func.count(Sentence.id),
+                func.count(Sentence.id).filter(Sentence.image_prompt.isnot(None)),
+                func.count(Sentence.id).filter(Sentence.image_url.isnot(None)),
+                func.count(Sentence.id).filter(Sentence.audio_url.isnot(None)),
+            ).where(Sentence.chapter_id.in_(chapter_ids))
+        )).one()
+
+        counters.update(
+            chapter_count=chapters,
+            video_count=videos,
+            paragraph_count=paragraphs,
+            sentence_count=sentences,
+            prompt_count=prompts,
+            image_count=images,
+            audio_count=audios,
+        )
+        return counters
+
+    async def apply_content_change(
+        self,
+        project_id,
+        removed: Optional[Dict[str, int]] = None,
+        added: Optional[Dict[str, int]] = None,
+        owner_id=None,
+    ) -> None:
+        """
+        章节增删或重建后按差值累加计数（added - removed）
+
+        Args:
+            project_id: 项目ID
+            removed: 移除的内容计数（compute_chapter_counters 的结果）
+            added: 新增的内容计数，如 {"chapter_count": 1, "sentence_count": 30}
+            owner_id: 用户ID（不传时查询项目）
+        """
+        removed = removed or {}
+        added = added or {}
+        deltas = {field: added.get(field, 0) - removed.get(field, 0) for field in COUNTER_FIELDS}
+        if not any(deltas.values()):
+            return
+        if owner_id is None:
+            owner_id = await self._get_owner_id(project_id)
+            if owner_id is None:
+                return
+        await self.increment(owner_id, project_id, **deltas)
+
+    async def replace_project_content(
+        self,
+        project_id,
+        owner_id,
+        chapter_count: int,
+        paragraph_count: int,
+        sentence_count: int,
+    ) -> None:
+        """
+        项目内容整体重建（清空后重新解析）后更新计数
+
+        重建后的章节/段落/句子数由解析结果给出，新句子还没有提示词、图片和音频，
+        章节还没有视频；视频任务不受影响。差值在项目行锁内计算后同步到用户行。
+        """
+        old = await self._lock_project_row(project_id, owner_id)
+        counters = {field: old.get(field) or 0 for field in COUNTER_FIELDS}
+        counters.update(
+            chapter_count=chapter_count,
+            paragraph_count=paragraph_count,
+            sentence_count=sentence_count,
+            prompt_count=0,
+            image_count=0,
+            audio_count=0,
+            video_count=0,
+        )
+        delta = {field: counters[field] - (old.get(field) or 0) for field in COUNTER_FIELDS}
+        await self._apply_delta(StatisticsScope.USER, owner_id, owner_id, delta)
+
+        table = StatisticsCounter.__table__
+        await self.execute(
+            table.update()
+            .where(
+                StatisticsCounter.scope_type == StatisticsScope.PROJECT.value,
+                StatisticsCounter.scope_id == project_id,
+            )
+            .values(**counters, updated_at=datetime.now(timezone.utc))
+        )
+
+    # ------------------------------------------------------------
+    # 读取
+    # ------------------------------------------------------------
+
+    async def _get_row(self, scope_type: StatisticsScope, scope_id) -> Optional[Dict[str, Any]]:
+        result = await self.execute(
+            select(StatisticsCounter.__table__).where(
+                StatisticsCounter.scope_type == scope_type.value,
+                StatisticsCounter.scope_id == scope_id,
+            )
+        )
+        row = result.mappings().first()
+        return dict(row) if row else None
+
+    async def get_user_counters(self, owner_id) -> Optional[Dict[str, Any]]:
+        """
+        读取用户的计数行
+
+        Returns:
+            计数字典（含 updated_at/reconciled_at），不存在时返回 None
+        """
+        return await self._get_row(StatisticsScope.USER, owner_id)
+
+    async def compute_user_counters(self, owner_id) -> Dict[str, Any]:
+        """
+        从业务表实时汇总用户计数（只读，不写计数行）
+
+        用于计数行缺失或从未对账时的读取；计数行由定时对账任务建立。
+
+        Returns:
+            计数字典，updated_at/reconciled_at 为 None
+        """
+        result = await self.execute(select(Project.id).where(Project.owner_id == owner_id))
+        project_ids = list(result.scalars().all())
+        totals: Dict[str, Any] = _empty_counters()
+        for counters in (await self.compute_counters(project_ids)).values():
+            for field in COUNTER_FIELDS:
+                totals[field] += counters[field]
+        totals.update(updated_at=None, reconciled_at=None)
+        return totals
+
+    # ------------------------------------------------------------
+    # 对账
+    # ------------------------------------------------------------
+
+    async def compute_counters(self, project_ids: List) -> Dict[Any, Dict[str, int]]:
+        """
+        通过分组聚合从业务表计算项目计数
+
+        Args:
+            project_ids: 项目ID列表
+
+        Returns:
+            {project_id: counters}
+        """
+        counters = {project_id: _empty_counters() for project_id in project_ids}
+        if not project_ids:
+            return counters
+
+        chapter_rows = await self.execute(
+            select(
+                Chapter.project_id,
+                func.count(Chapter.id),
+                func.count(Chapter.id).filter(Chapter.video_url.isnot(None)),
+            ).where(Chapter.project_id.in_(project_ids)).group_by(Chapter.project_id)
+        )
+        for project_id, chapters, videos in chapter_rows:
+            counters[project_id].update(chapter_count=chapters, video_count=videos)
+
+        paragraph_rows = await self.execute(
+            select(Paragraph.project_id, func.count(Paragraph.id))
+            .where(Paragraph.project_id.in_(project_ids)).group_by(Paragraph.project_id)
+        )
+        for project_id, paragraphs in paragraph_rows:
+            counters[project_id]['paragraph_count'] = paragraphs
+
+        sentence_rows = await self.execute(
+            select(
+                Sentence.project_id,
+                func.count(Sentence.id),
+                func.count(Sentence.id).filter(Sentence.image_prompt.isnot(None)),
+                func.count(Sentence.id).filter(Sentence.image_url.isnot(None)),
+                func.count(Sentence.id).filter(Sentence.audio_url.isnot(None)),
+            ).where(Sentence.project_id.in_(project_ids)).group_by(Sentence.project_id)
+        )
+        for project_id, sentences, prompts, images, audios in sentence_rows:
+            counters[project_id].update(
+                sentence_count=sentences,
+                prompt_count=prompts,
+                image_count=images,
+                audio_count=audios,
+            )
+
+        task_rows = await self.execute(
+            select(VideoTask.project_id, func.count(VideoTask.id))
+            .where(
+                VideoTask.project_id.in_(project_ids),
+                VideoTask.status == VideoTaskStatus.COMPLETED.value,
+            ).group_by(VideoTask.project_id)
+        )
+        for project_id, tasks in task_rows:
+            counters[project_id]['video_task_count'] = tasks
+
+        return counters
+
+    async def reconcile_project(self, project_id, owner_id=None) -> Dict[str, int]:
+        """
+        重新计算单个项目的计数，并把差值同步到用户行
+
+        Args:
+            project_id: 项目ID
+            owner_id: 用户ID（不传时查询项目）
+
+        Returns:
+            项目计数
+        """
+        if owner_id is None:
+            owner_id = await self._get_owner_id(project_id)
+            if owner_id is None:
+                return _empty_counters()
+
+        # 先锁定项目行再计算，并发对账串行执行，后一个读到前一个提交后的计数，差值不会重复累加
+        old = await self._lock_project_row(project_id, owner_id)
+        counters = (await self.compute_counters([project_id]))[project_id]
+        delta = {field: counters[field] - (old.get(field) or 0) for field in COUNTER_FIELDS}
+
+        await self._apply_delta(StatisticsScope.USER, owner_id, owner_id, delta)
+        await self._set_counters(
+            StatisticsScope.PROJECT, project_id, owner_id, counters, datetime.now(timezone.utc)
+        )
+        return counters
+
+    async def remove_project(self, project_id) -> None:
+        """
+        删除项目计数行，并从用户行扣除
+
+        Args:
+            project_id: 项目ID
+        """
+        old = await self._get_row(StatisticsScope.PROJECT, project_id)
+        if not old:
+            return
+
+        delta = {field: -(old.get(field) or 0) for field in COUNTER_FIELDS}
+        await self._apply_delta(StatisticsScope.USER, old['owner_id'], old['owner_id'], delta)
+        await self.execute(
+            delete(StatisticsCounter.__table__).where(
+                StatisticsCounter.scope_type == StatisticsScope.PROJECT.value,
+                StatisticsCounter.scope_id == project_id,
+            )
+        )
+
+    async def reconcile_user(self, owner_id) -> Dict[str, Any]:
+        """
+        全量对账用户的所有项目，重写项目行和用户行
+
+        Args:
+            owner_id: 用户ID
+
+        Returns:
+            用户计数行
+        """
+        now = datetime.now(timezone.utc)
+        result = await self.execute(select(Project.id).where(Project.owner_id == owner_id))
+        project_ids = list(result.scalars().all())
+
+        per_project = await self.compute_counters(project_ids)
+        totals = _empty_counters()
+        for project_id, counters in per_project.items():
+            await self._set_counters(StatisticsScope.PROJECT, project_id, owner_id, counters, now)
+            for field in COUNTER_FIELDS:
+                totals[field] += counters[field]
+
+        # 清理已删除项目遗留的计数行
+        stale_rows = delete(StatisticsCounter.__table__).where(
+            StatisticsCounter.scope_type == StatisticsScope.PROJECT.value,
+            StatisticsCounter.owner_id == owner_id,
+        )
+        if project_ids:
+            stale_rows = stale_rows.where(StatisticsCounter.scope_id.notin_(project_ids))
+        await self.execute(stale_rows)
+
+        await self._set_counters(StatisticsScope.USER, owner_id, owner_id, totals, now)
+        logger.info(f"用户 {owner_id} 统计对账完成: {len(project_ids)} 个项目")
+        return await self.get_user_counters(owner_id)
+
+    async def list_owner_ids(self) -> List:
+        """列出需要对账的用户ID（有项目或已有计数行的用户）"""
+        result = await self.execute(
+            select(Project.owner_id).union(
+                select(StatisticsCounter.owner_id).where(
+                    StatisticsCounter.scope_type == StatisticsScope.USER.value
+                )
+            )
+        )
+        return list(result.scalars().all())
+
+    @staticmethod
+    def describe_freshness(row: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        生成计数行的新鲜度描述
+
+        Args:
+            row: 计数行
+
+        Returns:
+            updated_at/reconciled_at/is_stale
+        """
+        reconciled_at = row.get('reconciled_at')
+        updated_at = row.get('updated_at')
+        is_stale = True
+        if reconciled_at is not None:
+            age = (datetime.now(timezone.utc) - reconciled_at).total_seconds()
+            is_stale = age > settings.STATISTICS_STALE_AFTER_SECONDS
+        return {
+            'updated_at': updated_at.isoformat() if updated_at else None,
+            'reconciled_at': reconciled_at.isoformat() if reconciled_at else None,
+            'is_stale': is_stale,
+        }
+
+
+__all__ = [
+    "StatisticsService",
+]
@@ -13,6 +13,7 @@ from src.models.movie import MovieScript, MovieScene, MovieShot, MovieCharacter
 from src.services.base import BaseService
 from src.services.provider.factory import ProviderFactory
 from src.services.api_key import APIKeyService
+from src.services.prompt_cache import cached_completion, is_json_object
 
 logger = get_logger(__name__)
 
@@ -26,7 +27,8 @@ class StoryboardService(BaseService):
         self,
         scene_id: str,
         api_key_id: str,
-        model: str = None
+        model: str = None,
+        use_cache: bool = True
     ) -> List[MovieShot]:
         """
         从单个场景提取分镜
@@ -35,6 +37,7 @@ class StoryboardService(BaseService):
             scene_id: 场景ID
             api_key_id: API Key ID
             model: 模型名称
+            use_cache: 是否复用相同场景和角色的历史提取结果
             
         Returns:
             List[MovieShot]: 生成的分镜列表
@@ -77,16 +80,18 @@ class StoryboardService(BaseService):
         )
 
         # 6. 调用LLM
-        response = await llm_provider.completions(
+        content = await cached_completion(
+            llm_provider,
+            "storyboard_shots",
             model=model,
             messages=[
                 {"role": "system", "content": "你是一个专业的电影分镜提取专家。只输出JSON。"},
                 {"role": "user", "content": prompt},
             ],
+            bypass=not use_cache,
+            validate=is_json_object,
             response_format={"type": "json_object"}
         )
-
-        content = response.choices[0].message.content.strip()
         
         # 清理代码块标记
         if content.startswith("```json"):
@@ -146,8 +151,8 @@ class StoryboardService(BaseService):
             await self.db_session.flush()
             logger.info(f"场景 {scene_id} 的现有分镜已删除")
 
-        # 3. 调用现有的提取方法生成新分镜
-        created_shots = await self.extract_shots_from_scene(scene_id, api_key_id, model)
+        # 3. 调用现有的提取方法生成新分镜（重新提取，不复用缓存结果）
+        created_shots = await self.extract_shots_from_scene(scene_id, api_key_id, model, use_cache=False)
         
         logger.info(f"场景 {scene_id} 重新提取完成，生成 {len(created_shots)} 个分镜")
         return created_shots
@@ -193,6 +198,7 @@ class StoryboardService(BaseService):
                     await self.db_session.delete(shot)
             # 同时清空场景图
             scene.scene_image_url = None
+            scene.scene_image_derivative_format = None
             scene.scene_image_prompt = None
         
         await self.db_session.commit()
@@ -238,18 +244,20 @@ class StoryboardService(BaseService):
                         scene=scene_description
                     )
 
-                    # 调用LLM
-                    response = await llm_provider.completions(
+                    # 调用LLM（相同场景和角色复用历史提取结果）
+                    content = await cached_completion(
+                        llm_provider,
+                        "storyboard_shots",
                         model=model,
                         messages=[
                             {"role": "system", "content": "你是一个专业的电影分镜提取专家。只输出JSON。"},
                             {"role": "user", "content": prompt}
                         ],
+                        validate=is_json_object,
                         response_format={"type": "json_object"}
                     )
 
                     # 解析结果
-                    content = response.choices[0].message.content
                     data = json.loads(content)
                     shots_data = data.get("shots", [])
                     
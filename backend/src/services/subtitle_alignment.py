@@ -0,0 +1,353 @@
+"""
+字幕强制对齐 - 已知句子文本直接对齐到音频时间
+
+句子的文本（Sentence.content）和音频（TTS生成）都是已知的，不需要语音识别：
+- 文本按字切分（连续的英文/数字算一个词），标点附着在前一个字上（开引号、开括号附着在后一个字上），用于断句
+- 用 silencedetect 找出音频中的停顿，把停顿对齐到最接近的小句边界（标点处）作为锚点
+- 锚点之间按字的权重在有声区间内等比例分配时间，跳过静音
+
+TTS 服务返回了字/词时间轴时（Sentence.audio_timeline），align_timeline 直接把时间轴映射到文本，
+不需要分析音频。
+
+输出与 Whisper 时间轴相同的结构（segments/words/duration），可以直接生成字幕，
+也不需要再调用 LLM 纠错。
+"""
+
+import bisect
+import difflib
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.core.logging import get_logger
+from src.utils.ffmpeg_utils import detect_silences, get_audio_duration
+
+logger = get_logger(__name__)
+
+# 小句结束的标点（停顿通常出现在这些位置）
+_CLAUSE_PUNCTUATION = "，。！？；、,.!?;:："
+_PUNCTUATION_CHARS = r'，。！？；、,\.!?;:：\'"“”‘’()（）\[\]{}<>《》…—'
+_PUNCTUATION_PATTERN = re.compile(rf'[{_PUNCTUATION_CHARS}\-\s]')
+# 字幕中的标点（正则字符类），生成字幕条时据此断句并从显示文本中移除
+SUBTITLE_PUNCTUATION = rf'[{_PUNCTUATION_CHARS}]'
+# 开引号/开括号：属于后面的文字，不表示小句结束
+OPENING_PUNCTUATION = "“‘《（([{<"
+# 连续的英文字母/数字作为一个词
+_TOKEN_PATTERN = re.compile(r"[A-Za-z0-9]+(?:['.][A-Za-z0-9]+)*|\S")
+
+# 锚点匹配：停顿位置与小句边界的预期位置相差超过有声时长的该比例时不匹配
+ANCHOR_TOLERANCE = 0.2
+# 短于该时长的静音不作为停顿锚点（TTS 字间的短暂静音）
+MIN_PAUSE_SECONDS = 0.15
+# TTS 时间轴与文本能匹配上的字少于该比例时不使用（时间轴对应的不是这段文本）
+MIN_TIMELINE_MATCH_RATIO = 0.6
+
+
+def _token_weight(token: str) -> float:
+    """朗读时长权重：汉字为 1，英文/数字按长度折算"""
+    if len(token) == 1:
+        return 1.0
+    if token.isdigit():
+        # 数字按位读
+        return 0.8 * len(token)
+    return 0.3 + 0.25 * len(token)
+
+
+def tokenize(text: str) -> List[Dict]:
+    """
+    把文本切分为朗读单位
+
+    Returns:
+        [{"text": 显示文本（含前面的开引号/开括号和后面的标点）, "weight": 权重, "clause_end": 是否小句结束}]
+    """
+    tokens: List[Dict] = []
+    opening = ""
+    for match in _TOKEN_PATTERN.finditer(text):
+        value = match.group(0)
+        if value in OPENING_PUNCTUATION:
+            opening += value
+            continue
+        if _PUNCTUATION_PATTERN.fullmatch(value):
+            if tokens:
+                tokens[-1]["text"] += opening + value
+                if value in _CLAUSE_PUNCTUATION:
+                    tokens[-1]["clause_end"] = True
+            opening = ""
+            continue
+        tokens.append({"text": opening + value, "weight": _token_weight(value), "clause_end": False})
+        opening = ""
+    if opening and tokens:
+        tokens[-1]["text"] += opening
+    return tokens
+
+
+def _speech_intervals(duration: float, silences: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    """静音区间的补集（有声区间）"""
+    intervals = []
+    cursor = 0.0
+    for start, end in sorted(silences):
+        start, end = max(start, 0.0), min(end, duration)
+        if start > cursor:
+            intervals.append((cursor, start))
+        cursor = max(cursor, end)
+    if cursor < duration:
+        intervals.append((cursor, duration))
+    return intervals or [(0.0, duration)]
+
+
+class _SpeechClock:
+    """有声时间（去掉静音后的累计时长）与音频时间的换算"""
+
+    def __init__(self, intervals: List[Tuple[float, float]]):
+        self.intervals = intervals
+        self.offsets = [0.0]
+        for start, end in intervals:
+            self.offsets.append(self.offsets[-1] + (end - start))
+        self.total = self.offsets[-1]
+
+    def to_audio_time(self, speech_time: float, prefer_next: bool = False) -> float:
+        """
+        有声时间 → 音频时间
+
+        Args:
+            speech_time: 有声时间
+            prefer_next: 恰好落在区间边界时取下一个有声区间的开始（用于字的开始时间，避免落在停顿里）
+        """
+        speech_time = min(max(speech_time, 0.0), self.total)
+        index = (bisect.bisect_right if prefer_next else bisect.bisect_left)(self.offsets, speech_time) - 1
+        index = min(max(index, 0), len(self.intervals) - 1)
+        start, _ = self.intervals[index]
+        return start + (speech_time - self.offsets[index])
+
+    def pause_positions(self) -> List[float]:
+        """每个内部停顿在有声时间上的位置"""
+        return self.offsets[1:-1]
+
+
+def _match_anchors(
+        boundaries: List[Tuple[float, int]],
+        pauses: List[float],
+        total_weight: float,
+        total_speech: float
+) -> List[Tuple[float, float]]:
+    """
+    把停顿按顺序匹配到小句边界（每个边界最多匹配一个停顿，保持单调）
+
+    Args:
+        boundaries: 小句边界 [(累计权重, 边界序号)]
+        pauses: 停顿在有声时间上的位置
+        total_weight: 总权重
+        total_speech: 有声总时长
+
+    Returns:
+        锚点 [(累计权重, 有声时间)]，包含首尾
+    """
+    anchors = [(0.0, 0.0)]
+    if boundaries and pauses and total_weight > 0:
+        expected = [weight / total_weight * total_speech for weight, _ in boundaries]
+        tolerance = ANCHOR_TOLERANCE * total_speech
+        next_boundary = 0
+        for pause in pauses:
+            best = None
+            for i in range(next_boundary, len(expected)):
+                distance = abs(expected[i] - pause)
+                if distance <= tolerance and (best is None or distance < abs(expected[best] - pause)):
+                    best = i
+                if expected[i] > pause + tolerance:
+                    break
+            if best is not None:
+                anchors.append((boundaries[best][0], pause))
+                next_boundary = best + 1
+    anchors.append((total_weight, total_speech))
+    return anchors
+
+
+def _interpolate(anchors: List[Tuple[float, float]], weight: float) -> float:
+    """按锚点分段线性插值：累计权重 → 有声时间"""
+    index = bisect.bisect_right([w for w, _ in anchors], weight) - 1
+    index = min(max(index, 0), len(anchors) - 2)
+    (w0, t0), (w1, t1) = anchors[index], anchors[index + 1]
+    if w1 <= w0:
+        return t0
+    return t0 + (weight - w0) / (w1 - w0) * (t1 - t0)
+
+
+def _build_segments(tokens: List[Dict], times: List[Tuple[float, float]]) -> List[Dict]:
+    """按小句把逐字时间组成 Whisper 格式的 segments"""
+    segments: List[Dict] = []
+    current: Optional[Dict] = None
+    for token, (start, end) in zip(tokens, times):
+        word = {"word": token["text"], "start": round(start, 3), "end": round(max(end, start), 3)}
+
+        if current is None:
+            current = {"id": len(segments) + 1, "start": word["start"], "end": word["end"], "text": "", "words": []}
+            segments.append(current)
+        current["words"].append(word)
+        current["text"] += token["text"]
+        current["end"] = word["end"]
+        if token["clause_end"]:
+            current = None
+
+    return segments
+
+
+def align_text(
+        text: str,
+        duration: float,
+        silences: Optional[List[Tuple[float, float]]] = None
+) -> List[Dict]:
+    """
+    把文本对齐到音频时间
+
+    Args:
+        text: 句子文本
+        duration: 音频时长（秒）
+        silences: 静音区间（可选）
+
+    Returns:
+        Whisper 格式的 segments（每个小句一个 segment，words 为逐字时间）
+    """
+    tokens = tokenize(text)
+    if not tokens or duration <= 0:
+        return []
+
+    pauses = [(s, e) for s, e in (silences or []) if e - s >= MIN_PAUSE_SECONDS]
+    clock = _SpeechClock(_speech_intervals(duration, pauses))
+
+    # 小句边界（不含最后一个字）的累计权重
+    cumulative = [0.0]
+    for token in tokens:
+        cumulative.append(cumulative[-1] + token["weight"])
+    total_weight = cumulative[-1]
+    boundaries = [(cumulative[i + 1], i) for i, token in enumerate(tokens[:-1]) if token["clause_end"]]
+
+    anchors = _match_anchors(boundaries, clock.pause_positions(), total_weight, clock.total)
+
+    times = [
+        (
+            clock.to_audio_time(_interpolate(anchors, cumulative[i]), prefer_next=True),
+            clock.to_audio_time(_interpolate(anchors, cumulative[i + 1])),
+        )
+        for i in range(len(tokens))
+    ]
+    return _build_segments(tokens, times)
+
+
+def _timeline_chars(timeline: List[Dict[str, Any]]) -> List[Tuple[str, float, float]]:
+    """TTS 时间轴展开为逐字 (字, 开始, 结束)，多字的词在词内等分，去掉标点和空白"""
+    chars = []
+    for entry in timeline:
+        text = _PUNCTUATION_PATTERN.sub("", str(entry.get("text", ""))).lower()
+        if not text:
+            continue
+        start, end = float(entry["start"]), float(entry["end"])
+        step = max(end - start, 0.0) / len(text)
+        chars.extend((ch, start + i * step, start + (i + 1) * step) for i, ch in enumerate(text))
+    return chars
+
+
+def align_timeline(
+        text: str,
+        timeline: List[Dict[str, Any]],
+        duration: Optional[float] = None
+) -> List[Dict]:
+    """
+    把 TTS 返回的字/词时间轴映射到文本
+
+    时间轴的切分方式（逐字、逐词）和文本可能不同，按字符序列匹配；时间轴中缺失的字
+    （例如服务对数字做了读法转换）按权重在前后已匹配的字之间插值。
+
+    Args:
+        text: 句子文本
+        timeline: TTS 时间轴 [{"text", "start", "end"}]（秒）
+        duration: 音频时长（秒，可选，用于限制结束时间）
+
+    Returns:
+        Whisper 格式的 segments；时间轴与文本对不上时返回空列表
+    """
+    tokens = tokenize(text)
+    provider_chars = _timeline_chars(timeline or [])
+    if not tokens or not provider_chars:
+        return []
+
+    text_chars = []
+    for index, token in enumerate(tokens):
+        text_chars.extend((ch, index) for ch in _PUNCTUATION_PATTERN.sub("", token["text"]).lower())
+
+    matcher = difflib.SequenceMatcher(
+        None,
+        "".join(ch for ch, _ in text_chars),
+        "".join(ch for ch, _, _ in provider_chars),
+        autojunk=False
+    )
+    spans: List[Optional[List[float]]] = [None] * len(tokens)
+    matched = 0
+    for block in matcher.get_matching_blocks():
+        for k in range(block.size):
+            _, start, end = provider_chars[block.b + k]
+            index = text_chars[block.a + k][1]
+            if spans[index] is None:
+                spans[index] = [start, end]
+            else:
+                spans[index][0] = min(spans[index][0], start)
+                spans[index][1] = max(spans[index][1], end)
+            matched += 1
+    if matched < MIN_TIMELINE_MATCH_RATIO * len(text_chars):
+        return []
+
+    end_limit = duration if duration and duration > 0 else provider_chars[-1][2]
+
+    # 未匹配的字：在前一个已匹配字的结束和后一个已匹配字的开始之间按权重分配
+    times: List[Tuple[float, float]] = []
+    i = 0
+    while i < len(tokens):
+        if spans[i] is not None:
+            times.append((spans[i][0], min(spans[i][1], end_limit)))
+            i += 1
+            continue
+        j = i
+        while j < len(tokens) and spans[j] is None:
+            j += 1
+        gap_start = times[-1][1] if times else 0.0
+        gap_end = spans[j][0] if j < len(tokens) else end_limit
+        gap_end = max(gap_end, gap_start)
+        weights = [tokens[k]["weight"] for k in range(i, j)]
+        total = sum(weights)
+        cursor = gap_start
+        for weight in weights:
+            step = (gap_end - gap_start) * weight / total if total else 0.0
+            times.append((cursor, cursor + step))
+            cursor += step
+        i = j
+
+    return _build_segments(tokens, times)
+
+
+def align_audio(audio_path: str, text: str) -> dict:
+    """
+    对齐音频文件和已知文本
+
+    Args:
+        audio_path: 音频路径
+        text: 句子文本
+
+    Returns:
+        字幕数据，包含 segments 和 duration（与 SubtitleService.generate_subtitle_timeline 一致）
+    """
+    duration = get_audio_duration(audio_path) or 0
+    if duration <= 0:
+        raise ValueError(f"无法获取音频时长: {audio_path}")
+
+    silences = detect_silences(audio_path, min_duration=MIN_PAUSE_SECONDS)
+    segments = align_text(text, duration, silences)
+    logger.debug(f"强制对齐完成: {audio_path}, 时长 {duration:.2f}s, 停顿 {len(silences)} 处, 小句 {len(segments)} 个")
+    return {"segments": segments, "duration": duration}
+
+
+__all__ = [
+    "OPENING_PUNCTUATION",
+    "SUBTITLE_PUNCTUATION",
+    "align_audio",
+    "align_text",
+    "align_timeline",
+    "tokenize",
+]
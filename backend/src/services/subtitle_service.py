@@ -2,39 +2,135 @@
 字幕服务 - 处理字幕生成、时间轴和LLM纠错
 
 负责:
-- 使用Whisper生成字幕时间轴
-- 使用LLM纠正字幕中的错别字
-- 创建FFmpeg字幕滤镜
+- 已知文本强制对齐生成字幕时间轴（或使用Whisper识别）
+- 使用LLM纠正Whisper字幕中的错别字
+- 创建FFmpeg字幕滤镜（ASS 文件 + libass，或 drawtext）
 - 文本分割和格式化
 """
 
 import re
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 from src.core.logging import get_logger
 from src.models import APIKey
-from src.services.faster_whisper_service import transcription_service
 from src.services.provider.factory import ProviderFactory
+from src.services.subtitle_alignment import (
+    OPENING_PUNCTUATION,
+    SUBTITLE_PUNCTUATION,
+    align_audio,
+    align_timeline,
+)
 from src.utils.ffmpeg_utils import get_audio_duration
 
 logger = get_logger(__name__)
 
+# 字幕渲染方式：ass（写 ASS 文件，一个 libass 滤镜烧录）/ drawtext（每行一个 drawtext 滤镜）
+SUBTITLE_RENDERERS = ("ass", "drawtext")
+DEFAULT_SUBTITLE_RENDERER = "ass"
+
+# 字幕时间轴来源：forced（已知文本强制对齐）/ whisper（语音识别，可再用LLM纠错）
+SUBTITLE_ALIGNMENTS = ("forced", "whisper")
+DEFAULT_SUBTITLE_ALIGNMENT = "forced"
+
+# drawtext 颜色名对应的 RGB
+_COLOR_NAMES = {
+    "white": (255, 255, 255),
+    "black": (0, 0, 0),
+    "yellow": (255, 255, 0),
+    "red": (255, 0, 0),
+    "green": (0, 128, 0),
+    "blue": (0, 0, 255),
+    "cyan": (0, 255, 255),
+    "magenta": (255, 0, 255),
+    "orange": (255, 165, 0),
+    "gray": (128, 128, 128),
+}
+
+
+def _ass_color(color: str, opacity: float = 1.0) -> str:
+    """颜色名或 #RRGGBB 转为 ASS 的 &HAABBGGRR（AA 为透明度，00 不透明）"""
+    value = str(color).strip().lower()
+    if value.startswith("#") and len(value) == 7:
+        r, g, b = (int(value[i:i + 2], 16) for i in (1, 3, 5))
+    elif value.startswith("0x") and len(value) == 8:
+        r, g, b = (int(value[i:i + 2], 16) for i in (2, 4, 6))
+    else:
+        r, g, b = _COLOR_NAMES.get(value, _COLOR_NAMES["white"])
+    alpha = round((1 - opacity) * 255)
+    return f"&H{alpha:02X}{b:02X}{g:02X}{r:02X}"
+
+
+def _ass_time(seconds: float) -> str:
+    """秒转为 ASS 时间格式 H:MM:SS.cc"""
+    centiseconds = max(0, int(round(seconds * 100)))
+    hours, rest = divmod(centiseconds, 360000)
+    minutes, rest = divmod(rest, 6000)
+    secs, cs = divmod(rest, 100)
+    return f"{hours}:{minutes:02d}:{secs:02d}.{cs:02d}"
+
+
+def _ass_escape(text: str) -> str:
+    """ASS 没有转义语法，把会被当作覆盖标签的字符换成全角字符"""
+    return text.replace("\\", "＼").replace("{", "｛").replace("}", "｝").replace("\n", " ")
+
+
+def _escape_filter_path(path: str) -> str:
+    """
+    滤镜参数中的文件路径（单引号包裹，引号内只有单引号本身无法表示）
+
+    路径来自任务临时目录，只统一路径分隔符。
+    """
+    if "'" in path:
+        raise ValueError(f"字幕文件路径不能包含单引号: {path}")
+    return path.replace("\\", "/")
+
 
 class SubtitleService:
     """字幕服务 - 处理所有字幕相关操作"""
 
-    def generate_subtitle_timeline(self, audio_path: str, original_text: str) -> dict:
+    def generate_subtitle_timeline(
+            self,
+            audio_path: str,
+            original_text: str,
+            alignment: str = DEFAULT_SUBTITLE_ALIGNMENT,
+            timeline: Optional[list] = None
+    ) -> dict:
         """
         生成字幕时间轴
 
+        TTS 返回了时间轴时优先使用（不分析音频），其次按 alignment 对齐或识别。
+
         Args:
             audio_path: 音频文件路径
-            original_text: 原始句子文本（用于提示Whisper更好识别）
+            original_text: 原始句子文本（强制对齐的文本 / 提示Whisper更好识别）
+            alignment: forced（已知文本对齐到音频，文字与原文一致）/ whisper（语音识别）
+            timeline: TTS 返回的字/词时间轴（Sentence.audio_timeline，可选）
 
         Returns:
-            字幕数据，包含segments和duration
+            字幕数据，包含segments、duration 和 source（provider / forced / whisper）
         """
+        if timeline and original_text and original_text.strip():
+            duration = get_audio_duration(audio_path) or 0
+            segments = align_timeline(original_text, timeline, duration)
+            if segments:
+                return {"segments": segments, "duration": duration, "source": "provider"}
+            logger.warning("TTS时间轴与句子文本不匹配，改用音频对齐")
+
+        if alignment == "forced" and original_text and original_text.strip():
+            try:
+                subtitle_data = align_audio(audio_path, original_text)
+                if subtitle_data["segments"]:
+                    subtitle_data["source"] = "forced"
+                    return subtitle_data
+                logger.warning("强制对齐结果为空，使用Whisper识别")
+            except Exception as e:
+                logger.warning(f"强制对齐失败，使用Whisper识别: {e}")
+
         try:
+            # 首次使用时才加载 Whisper 模型
+            from src.services.faster_whisper_service import transcription_service
+
             # 使用Whisper服务进行转录
             results, srt_content = transcription_service.transcribe(
                 audio_path,
@@ -47,7 +143,8 @@ class SubtitleService:
 
             return {
                 "segments": results,
-                "duration": duration
+                "duration": duration,
+                "source": "whisper"
             }
 
         except Exception as e:
@@ -288,347 +385,331 @@ class SubtitleService:
 
         return [line1, line2] if line2 else [line1]
 
-    def _add_subtitle_filter(
-            self,
-            filters: list,
-            words: list,
-            font_size: int,
-            color: str,
-            base_y_pos: int,
-            max_line_chars: int,
-            video_height: int
-    ) -> None:
+    @staticmethod
+    def _split_words_into_lines(words: list, max_line_chars: int) -> List[str]:
         """
-        添加字幕滤镜，支持双行显示
-        
+        把一条字幕的词拆成最多两行（尽量在中间的词边界处分割）
+
         Args:
-            filters: 滤镜列表
             words: 词列表，每个词包含 text, start, end
-            font_size: 字体大小
-            color: 字体颜色
-            base_y_pos: 基准Y坐标
             max_line_chars: 每行最大字符数
-            video_height: 视频高度
+
+        Returns:
+            行文本列表（1-2行）
         """
-        if not words:
-            return
-            
-        # 合并所有词的文本
         full_text = "".join([w["text"] for w in words])
-        start_time = words[0]["start"]
-        end_time = words[-1]["end"]
-        
-        # 计算总字符数
         total_len = len(full_text)
-        
+
         # 如果文本长度不超过单行最大长度，显示单行
         if total_len <= max_line_chars:
-            text_escaped = full_text.replace("'", "'\\\\\\''").replace(":", "\\:")
-            filter_str = (
-                f"drawtext="
-                f"text='{text_escaped}':"
-                f"fontsize={font_size}:"
-                f"fontcolor={color}:"
-                f"borderw=5:"
-                f"bordercolor=black:"
-                f"shadowcolor=black@0.7:"
-                f"shadowx=4:"
-                f"shadowy=4:"
-                f"box=1:"
-                f"boxcolor=black@0.65:"
-                f"boxborderw=20:"
-                f"x=(w-text_w)/2:"
-                f"y={base_y_pos}:"
-                f"enable='between(t,{start_time:.3f},{end_time:.3f})'"
-            )
-            filters.append(filter_str)
+            return [full_text]
+
+        # 文本过长，分成两行显示
+        # 智能分割：尽量在中间位置分割（优先在词边界）
+        mid_point = total_len // 2
+        current_len = 0
+        for i, word in enumerate(words):
+            word_len = len(word["text"])
+            if current_len + word_len >= mid_point:
+                # 检查是在当前词之前还是之后分割更合适
+                if abs(current_len - mid_point) < abs(current_len + word_len - mid_point):
+                    split_index = i
+                else:
+                    split_index = i + 1
+                break
+            current_len += word_len
         else:
-            # 文本过长，分成两行显示
-            # 智能分割：尽量在中间位置分割
-            mid_point = total_len // 2
-            
-            # 在中间点附近找最佳分割位置（优先在词边界）
-            best_split = mid_point
-            current_len = 0
-            for i, word in enumerate(words):
-                word_len = len(word["text"])
-                if current_len + word_len >= mid_point:
-                    # 检查是在当前词之前还是之后分割更合适
-                    if abs(current_len - mid_point) < abs(current_len + word_len - mid_point):
-                        best_split = current_len
-                        split_index = i
-                    else:
-                        best_split = current_len + word_len
-                        split_index = i + 1
-                    break
-                current_len += word_len
-            else:
-                split_index = len(words) // 2
-                best_split = sum(len(w["text"]) for w in words[:split_index])
-            
-            # 分割文本
-            line1_text = "".join([w["text"] for w in words[:split_index]])
-            line2_text = "".join([w["text"] for w in words[split_index:]])
-            
-            # 确保每行不超过最大长度
-            if len(line1_text) > max_line_chars:
-                line1_text = line1_text[:max_line_chars]
-            if len(line2_text) > max_line_chars:
-                line2_text = line2_text[:max_line_chars]
-            
-            # 计算行间距（字体大小的1.2倍）
-            line_spacing = int(font_size * 1.2)
-            
-            # 计算两行的Y坐标（使第一行在base_y_pos上方，第二行在下方）
-            line1_y = base_y_pos - line_spacing // 2
-            line2_y = base_y_pos + line_spacing // 2
-            
-            # 添加第一行字幕
-            text1_escaped = line1_text.replace("'", "'\\\\\\''").replace(":", "\\:")
-            filter_str1 = (
-                f"drawtext="
-                f"text='{text1_escaped}':"
-                f"fontsize={font_size}:"
-                f"fontcolor={color}:"
-                f"borderw=5:"
-                f"bordercolor=black:"
-                f"shadowcolor=black@0.7:"
-                f"shadowx=4:"
-                f"shadowy=4:"
-                f"box=1:"
-                f"boxcolor=black@0.65:"
-                f"boxborderw=20:"
-                f"x=(w-text_w)/2:"
-                f"y={line1_y}:"
-                f"enable='between(t,{start_time:.3f},{end_time:.3f})'"
-            )
-            filters.append(filter_str1)
-            
-            # 添加第二行字幕
-            text2_escaped = line2_text.replace("'", "'\\\\\\''").replace(":", "\\:")
-            filter_str2 = (
-                f"drawtext="
-                f"text='{text2_escaped}':"
-                f"fontsize={font_size}:"
-                f"fontcolor={color}:"
-                f"borderw=5:"
-                f"bordercolor=black:"
-                f"shadowcolor=black@0.7:"
-                f"shadowx=4:"
-                f"shadowy=4:"
-                f"box=1:"
-                f"boxcolor=black@0.65:"
-                f"boxborderw=20:"
-                f"x=(w-text_w)/2:"
-                f"y={line2_y}:"
-                f"enable='between(t,{start_time:.3f},{end_time:.3f})'"
-            )
-            filters.append(filter_str2)
+            split_index = len(words) // 2
 
-    def create_subtitle_filter(
-            self,
-            subtitle_data: dict,
-            gen_setting: dict
-    ) -> str:
+        # 分割文本，确保每行不超过最大长度
+        line1_text = "".join([w["text"] for w in words[:split_index]])[:max_line_chars]
+        line2_text = "".join([w["text"] for w in words[split_index:]])[:max_line_chars]
+        return [line for line in (line1_text, line2_text) if line]
+
+    def build_subtitle_cues(self, subtitle_data: dict) -> List[Dict]:
         """
-        创建漫画解说字幕滤镜（固定位置，专业样式）
+        把字幕时间轴整理成字幕条（漫画解说双行规则，不含标点）
 
         Args:
             subtitle_data: 字幕数据
-            gen_setting: 生成设置
 
         Returns:
-            FFmpeg drawtext滤镜字符串
+            字幕条列表，每条包含 start, end, lines（1-2行）
         """
-        try:
-            subtitle_style = gen_setting.get("subtitle_style", {})
-            font_size = subtitle_style.get("font_size", 70)  # 适中字号
-            color = subtitle_style.get("color", "white")
+        # 标点符号正则（用于检测断句，以及移除显示的标点）；与强制对齐使用同一组全角/半角标点
+        split_pattern = SUBTITLE_PUNCTUATION
+        remove_pattern = split_pattern
+        max_line_chars = 15  # 每行最大字符数
+
+        cues = []
+
+        def add_cue(line_words: list) -> None:
+            if line_words:
+                cues.append({
+                    "start": line_words[0]["start"],
+                    "end": line_words[-1]["end"],
+                    "lines": self._split_words_into_lines(line_words, max_line_chars),
+                })
+
+        for segment in subtitle_data.get("segments", []):
+            words = segment.get("words", [])
+
+            if words:
+                # 使用词级时间轴构建字幕行
+                current_line_words = []
+                current_line_len = 0
+
+                for w in words:
+                    raw_word = w.get("word", "")
+                    # 检查这个词是否包含标点符号（意味着小句结束）；词首的开引号/开括号不算
+                    has_punctuation = bool(re.search(split_pattern, raw_word.strip().lstrip(OPENING_PUNCTUATION)))
+
+                    # 移除标点用于显示和长度计算
+                    clean_word = re.sub(remove_pattern, '', raw_word).strip()
+
+                    if not clean_word:
+                        # 即使是纯标点，如果它标志着句子结束，也触发换行
+                        if has_punctuation and current_line_words:
+                            add_cue(current_line_words)
+                            current_line_words = []
+                            current_line_len = 0
+                        continue
+
+                    word_len = len(clean_word)
+
+                    # 换行条件：加上当前词超过双行最大长度（30字）
+                    if current_line_len + word_len > max_line_chars * 2 and current_line_words:
+                        add_cue(current_line_words)
+                        current_line_words = []
+                        current_line_len = 0
+
+                    # 添加词到当前行
+                    current_line_words.append({
+                        "text": clean_word,
+                        "start": w.get("start", 0),
+                        "end": w.get("end", 0)
+                    })
+                    current_line_len += word_len
+
+                    # 如果当前词带有标点，则强制换行（小句结束）
+                    if has_punctuation:
+                        add_cue(current_line_words)
+                        current_line_words = []
+                        current_line_len = 0
+
+                # 处理最后一行
+                add_cue(current_line_words)
 
-            # 动态计算字幕位置
-            resolution = gen_setting.get("resolution", "1440x1080")
-            try:
-                w_str, h_str = resolution.split('x')
-                width = int(w_str)
-                height = int(h_str)
-            except:
-                width = 1440
-                height = 1080
-
-            # 根据宽高比决定位置
-            # 竖屏 (9:16) -> 下方30%处 (避开抖音/快手底部UI)
-            # 横屏 (16:9, 4:3) -> 下方15%处
-            if height > width:
-                fixed_y_pos = int(height * 0.7)
             else:
-                fixed_y_pos = int(height * 0.85)
+                # 没有词级时间轴，使用比例计算时间（回退方案）
+                text = segment.get("text", "").strip()
+                if not text:
+                    continue
 
-            logger.info(f"视频分辨率: {width}x{height}, 字幕Y坐标: {fixed_y_pos}")
+                # 优先按标点分割（保留分隔符，以便知道在哪里分割的）
+                parts = re.split(f'({split_pattern})', text)
+                lines = []
+                current_part = ""
+
+                for part in parts:
+                    if re.match(split_pattern, part):
+                        if current_part:
+                            lines.append(current_part)
+                            current_part = ""
+                    elif len(current_part) + len(part) > 18:
+                        if current_part:
+                            lines.append(current_part)
+                        current_part = part
+                    else:
+                        current_part += part
 
-            # 标点符号正则（用于检测断句）
-            split_pattern = r'[，。！？；、,\.!?;:\'"()\[\]{}<>]'
-            # 仅用于移除显示的标点
-            remove_pattern = r'[，。！？；、,\.!?;:\'"()\[\]{}<>]'
+                if current_part:
+                    lines.append(current_part)
 
-            filters = []
-            segments = subtitle_data.get("segments", [])
+                # 移除每行中的标点
+                clean_lines = [re.sub(remove_pattern, '', line).strip() for line in lines]
+                clean_lines = [line for line in clean_lines if line]
+                if not clean_lines:
+                    continue
 
-            for segment in segments:
-                words = segment.get("words", [])
-
-                if words:
-                    # 使用词级时间轴构建字幕行
-                    current_line_words = []
-                    current_line_len = 0
-                    max_line_chars = 15  # 每行最大字符数
-
-                    for w in words:
-                        raw_word = w.get("word", "")
-                        # 检查这个词是否包含标点符号（意味着小句结束）
-                        has_punctuation = bool(re.search(split_pattern, raw_word))
-
-                        # 移除标点用于显示和长度计算
-                        clean_word = re.sub(remove_pattern, '', raw_word).strip()
-
-                        if not clean_word:
-                            # 即使是纯标点，如果它标志着句子结束，也可能触发换行
-                            if has_punctuation and current_line_words:
-                                # 输出当前累积的字幕（可能是双行）
-                                self._add_subtitle_filter(
-                                    filters, current_line_words, font_size, color, 
-                                    fixed_y_pos, max_line_chars, height
-                                )
-                                current_line_words = []
-                                current_line_len = 0
-                            continue
+                segment_start = segment.get("start", 0)
+                total_duration = segment.get("end", 0) - segment_start
+                total_length = len("".join(clean_lines))
 
-                        word_len = len(clean_word)
+                current_start = segment_start
+                for line_text in clean_lines:
+                    # 按长度比例计算持续时间
+                    if total_length > 0:
+                        line_duration = total_duration * (len(line_text) / total_length)
+                    else:
+                        line_duration = total_duration / len(clean_lines)
 
-                        # 换行条件：加上当前词超过双行最大长度（30字）
-                        if current_line_len + word_len > max_line_chars * 2 and current_line_words:
-                            # 输出当前累积的字幕（可能是双行）
-                            self._add_subtitle_filter(
-                                filters, current_line_words, font_size, color, 
-                                fixed_y_pos, max_line_chars, height
-                            )
-                            current_line_words = []
-                            current_line_len = 0
+                    cues.append({"start": current_start, "end": current_start + line_duration, "lines": [line_text]})
+                    current_start += line_duration
 
-                        # 添加词到当前行
-                        current_line_words.append({
-                            "text": clean_word,
-                            "start": w.get("start", 0),
-                            "end": w.get("end", 0)
-                        })
-                        current_line_len += word_len
+        return cues
 
-                        # 如果当前词带有标点，且当前行不为空，则强制换行（小句结束）
-                        if has_punctuation and current_line_words:
-                            self._add_subtitle_filter(
-                                filters, current_line_words, font_size, color, 
-                                fixed_y_pos, max_line_chars, height
-                            )
-                            current_line_words = []
-                            current_line_len = 0
+    @staticmethod
+    def _get_subtitle_layout(gen_setting: dict) -> Tuple[int, int, int, str, str]:
+        """
+        解析字幕样式和位置
+
+        Returns:
+            (视频宽度, 视频高度, 字幕基准Y坐标, 字号, 颜色)
+        """
+        subtitle_style = gen_setting.get("subtitle_style", {})
+        font_size = subtitle_style.get("font_size", 70)  # 适中字号
+        color = subtitle_style.get("color", "white")
 
-                    # 处理最后一行
-                    if current_line_words:
-                        self._add_subtitle_filter(
-                            filters, current_line_words, font_size, color, 
-                            fixed_y_pos, max_line_chars, height
-                        )
+        resolution = gen_setting.get("resolution", "1440x1080")
+        try:
+            w_str, h_str = resolution.split('x')
+            width = int(w_str)
+            height = int(h_str)
+        except (ValueError, AttributeError):
+            width = 1440
+            height = 1080
+
+        # 根据宽高比决定位置
+        # 竖屏 (9:16) -> 下方30%处 (避开抖音/快手底部UI)
+        # 横屏 (16:9, 4:3) -> 下方15%处
+        if height > width:
+            fixed_y_pos = int(height * 0.7)
+        else:
+            fixed_y_pos = int(height * 0.85)
 
-                else:
-                    # 没有词级时间轴，使用比例计算时间（回退方案）
-                    text = segment.get("text", "").strip()
-                    if not text:
-                        continue
+        return width, height, fixed_y_pos, font_size, color
 
-                    # 优先按标点分割
-                    # 使用正则保留分隔符，以便知道在哪里分割的
-                    parts = re.split(f'({split_pattern})', text)
-                    lines = []
-                    current_part = ""
-
-                    for part in parts:
-                        # 如果是标点
-                        if re.match(split_pattern, part):
-                            if current_part:
-                                lines.append(current_part)
-                                current_part = ""
-                        else:
-                            # 如果是文字
-                            if len(current_part) + len(part) > 18:
-                                if current_part:
-                                    lines.append(current_part)
-                                current_part = part
-                            else:
-                                current_part += part
-
-                    if current_part:
-                        lines.append(current_part)
-
-                    # 移除每行中的标点
-                    clean_lines = [re.sub(remove_pattern, '', line).strip() for line in lines if
-                                   re.sub(remove_pattern, '', line).strip()]
-
-                    if not clean_lines:
-                        continue
+    @staticmethod
+    def _line_positions(line_count: int, base_y_pos: int, font_size: int) -> List[int]:
+        """每行字幕顶部的Y坐标：双行时第一行在基准线上方，第二行在下方（行距为字号的1.2倍）"""
+        if line_count < 2:
+            return [base_y_pos]
+        line_spacing = int(font_size * 1.2)
+        return [base_y_pos - line_spacing // 2, base_y_pos + line_spacing // 2]
 
-                    segment_start = segment.get("start", 0)
-                    segment_end = segment.get("end", 0)
-                    total_duration = segment_end - segment_start
-                    total_length = len("".join(clean_lines))
-
-                    current_start = segment_start
-
-                    for line_text in clean_lines:
-                        # 按长度比例计算持续时间
-                        line_len = len(line_text)
-                        if total_length > 0:
-                            line_duration = total_duration * (line_len / total_length)
-                        else:
-                            line_duration = total_duration / len(clean_lines)
-
-                        line_end = current_start + line_duration
-
-                        text_escaped = line_text.replace("'", "'\\\\\\''").replace(":", "\\:")
-
-                        filter_str = (
-                            f"drawtext="
-                            f"text='{text_escaped}':"
-                            f"fontsize={font_size}:"
-                            f"fontcolor={color}:"
-                            f"borderw=5:"
-                            f"bordercolor=black:"
-                            f"shadowcolor=black@0.7:"
-                            f"shadowx=4:"
-                            f"shadowy=4:"
-                            f"box=1:"
-                            f"boxcolor=black@0.65:"
-                            f"boxborderw=20:"
-                            f"x=(w-text_w)/2:"
-                            f"y={fixed_y_pos}:"
-                            f"enable='between(t,{current_start:.3f},{line_end:.3f})'"
-                        )
-                        filters.append(filter_str)
-
-                        current_start = line_end
-
-            if not filters:
+    def create_subtitle_filter(
+            self,
+            subtitle_data: dict,
+            gen_setting: dict,
+            output_dir: Optional[Path] = None
+    ) -> str:
+        """
+        创建漫画解说字幕滤镜（固定位置，专业样式）
+
+        默认把字幕写成 ASS 文件并用一个 ass 滤镜烧录；gen_setting.subtitle_renderer 为 drawtext
+        或未提供 output_dir 时，每行字幕生成一个 drawtext 滤镜（旧实现）。
+
+        Args:
+            subtitle_data: 字幕数据
+            gen_setting: 生成设置
+            output_dir: ASS 文件输出目录
+
+        Returns:
+            FFmpeg字幕滤镜字符串
+        """
+        try:
+            cues = self.build_subtitle_cues(subtitle_data)
+            if not cues:
                 return ""
 
-            return ",".join(filters)
+            renderer = gen_setting.get("subtitle_renderer", DEFAULT_SUBTITLE_RENDERER)
+            if renderer == "ass" and output_dir is not None:
+                ass_path = Path(output_dir) / "subtitles.ass"
+                self.write_ass_file(cues, gen_setting, ass_path)
+                return f"ass=filename='{_escape_filter_path(str(ass_path))}'"
+
+            return self._create_drawtext_filter(cues, gen_setting)
 
         except Exception as e:
             logger.error(f"创建字幕滤镜失败: {e}", exc_info=True)
             return ""
 
+    def _create_drawtext_filter(self, cues: List[Dict], gen_setting: dict) -> str:
+        """每行字幕一个 drawtext 滤镜"""
+        _, _, base_y_pos, font_size, color = self._get_subtitle_layout(gen_setting)
+
+        filters = []
+        for cue in cues:
+            positions = self._line_positions(len(cue["lines"]), base_y_pos, font_size)
+            for line_text, y_pos in zip(cue["lines"], positions):
+                text_escaped = line_text.replace("'", "'\\\\\\''").replace(":", "\\:")
+                filters.append(
+                    f"drawtext="
+                    f"text='{text_escaped}':"
+                    f"fontsize={font_size}:"
+                    f"fontcolor={color}:"
+                    f"borderw=5:"
+                    f"bordercolor=black:"
+                    f"shadowcolor=black@0.7:"
+                    f"shadowx=4:"
+                    f"shadowy=4:"
+                    f"box=1:"
+                    f"boxcolor=black@0.65:"
+                    f"boxborderw=20:"
+                    f"x=(w-text_w)/2:"
+                    f"y={y_pos}:"
+                    f"enable='between(t,{cue['start']:.3f},{cue['end']:.3f})'"
+                )
+        return ",".join(filters)
+
+    def write_ass_file(self, cues: List[Dict], gen_setting: dict, output_path: Path) -> None:
+        """
+        把字幕条写成 ASS 文件（样式与 drawtext 版本一致：白字黑描边、阴影、半透明底框）
+
+        每行字幕两个事件：第0层为底框（BorderStyle=3），第1层为带描边和阴影的文字；
+        行位置用 \\an8\\pos 固定，与 drawtext 的 y 坐标一致。
+
+        Args:
+            cues: build_subtitle_cues 生成的字幕条
+            gen_setting: 生成设置
+            output_path: 输出路径
+        """
+        width, height, base_y_pos, font_size, color = self._get_subtitle_layout(gen_setting)
+        font_name = gen_setting.get("subtitle_style", {}).get("font", "Arial")
+        primary = _ass_color(color)
+        black = _ass_color("black")
+        box = _ass_color("black", opacity=0.65)
+        shadow = _ass_color("black", opacity=0.7)
+
+        lines = [
+            "[Script Info]",
+            "ScriptType: v4.00+",
+            f"PlayResX: {width}",
+            f"PlayResY: {height}",
+            "WrapStyle: 2",
+            "ScaledBorderAndShadow: yes",
+            "",
+            "[V4+ Styles]",
+            "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, "
+            "Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, "
+            "Alignment, MarginL, MarginR, MarginV, Encoding",
+            f"Style: Box,{font_name},{font_size},{box},{box},{box},{box},0,0,0,0,100,100,0,0,3,20,0,8,0,0,0,1",
+            f"Style: Text,{font_name},{font_size},{primary},{primary},{black},{shadow},0,0,0,0,100,100,0,0,1,5,4,8,0,0,0,1",
+            "",
+            "[Events]",
+            "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text",
+        ]
+        center_x = width // 2
+        for cue in cues:
+            start, end = _ass_time(cue["start"]), _ass_time(cue["end"])
+            positions = self._line_positions(len(cue["lines"]), base_y_pos, font_size)
+            for line_text, y_pos in zip(cue["lines"], positions):
+                text = _ass_escape(line_text)
+                lines.append(f"Dialogue: 0,{start},{end},Box,,0,0,0,,{{\\an8\\pos({center_x},{y_pos})}}{text}")
+                lines.append(f"Dialogue: 1,{start},{end},Text,,0,0,0,,{{\\an8\\pos({center_x},{y_pos})}}{text}")
+
+        Path(output_path).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
 
 # 创建全局实例
 subtitle_service = SubtitleService()
 
 __all__ = [
+    "DEFAULT_SUBTITLE_ALIGNMENT",
+    "DEFAULT_SUBTITLE_RENDERER",
+    "SUBTITLE_ALIGNMENTS",
+    "SUBTITLE_RENDERERS",
     "SubtitleService",
     "subtitle_service",
 ]
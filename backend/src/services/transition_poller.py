@@ -0,0 +1,336 @@
+"""
+过渡视频远程任务状态轮询
+
+提供服务：
+- 取出到期需要查询的处理中过渡视频（按任务的下次查询时间）
+- 按 API Key 分组，并发查询供应商任务状态（全局和单Key两级并发上限）
+- 按任务年龄和供应商返回的预计耗时计算下次查询时间，网络异常指数退避
+- 已完成的任务交给独立的入库队列下载，不阻塞状态查询
+
+设计原则：
+- 数据库会话只在查询前后顺序使用，并发部分只做 HTTP 请求
+- 取任务时先写入租约（下次查询时间），并发的轮询不会重复处理同一任务
+- 交给入库队列的任务保持 processing 状态并设置入库租约，入库任务丢失时会被重新发现
+"""
+
+import asyncio
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import httpx
+from sqlalchemy import or_, select
+
+from src.core.config import settings
+from src.core.logging import get_logger
+from src.models.movie import MovieShotTransition
+from src.services.api_key import APIKeyService
+from src.services.base import BaseService
+
+logger = get_logger(__name__)
+
+# 供应商状态分类
+PENDING_STATUSES = ("video_generating", "processing", "pending", "queued")
+ETA_KEYS = ("eta", "estimated_time", "estimated_seconds", "remaining_seconds")
+
+
+@dataclass
+class PollOutcome:
+    """单个任务的查询结果"""
+    kind: str  # pending / completed / failed / retry / unknown
+    video_url: Optional[str] = None
+    error: Optional[str] = None
+    eta_seconds: Optional[float] = None
+
+
+def compute_next_poll_delay(age_seconds: float, eta_seconds: Optional[float] = None) -> float:
+    """
+    计算处理中任务的下次查询间隔
+
+    有预计剩余时间时按预计时间查询；否则按任务年龄的 10% 退避
+    （刚提交的任务查得勤，跑了很久的任务查得少）。
+
+    Args:
+        age_seconds: 任务已提交时长
+        eta_seconds: 供应商返回的预计剩余时间
+
+    Returns:
+        间隔秒数（限制在最小/最大间隔之间）
+    """
+    min_interval = settings.TRANSITION_POLL_MIN_INTERVAL_SECONDS
+    max_interval = settings.TRANSITION_POLL_MAX_INTERVAL_SECONDS
+    if eta_seconds is not None and eta_seconds > 0:
+        delay = eta_seconds
+    else:
+        delay = age_seconds * 0.1
+    return float(min(max(delay, min_interval), max_interval))
+
+
+def compute_retry_delay(attempts: int) -> float:
+    """
+    计算查询失败（网络异常、未知状态）后的重试间隔，按连续查询次数指数退避
+
+    Args:
+        attempts: 已查询次数
+
+    Returns:
+        间隔秒数
+    """
+    min_interval = settings.TRANSITION_POLL_MIN_INTERVAL_SECONDS
+    max_interval = settings.TRANSITION_POLL_MAX_INTERVAL_SECONDS
+    return float(min(min_interval * (2 ** min(attempts, 10)), max_interval))
+
+
+def parse_task_status(status_data: Dict[str, Any], age_seconds: float = 0) -> PollOutcome:
+    """
+    解析 VectorEngine 任务状态响应
+
+    返回格式: {"id": "...", "status": "...", "video_url": "...", "detail": {...}}，
+    视频URL和进度信息可能在顶层或 detail 中。
+
+    Args:
+        status_data: 状态响应
+        age_seconds: 任务已提交时长（用于从进度推算剩余时间）
+
+    Returns:
+        查询结果
+    """
+    status = status_data.get("status")
+    detail = status_data.get("detail") or {}
+
+    if status in PENDING_STATUSES:
+        return PollOutcome(kind="pending", eta_seconds=_extract_eta(status_data, detail, age_seconds))
+
+    if status == "completed":
+        video_url = status_data.get("video_url") or detail.get("video_url")
+        if video_url:
+            return PollOutcome(kind="completed", video_url=video_url)
+        return PollOutcome(kind="failed", error="视频生成完成但未返回视频URL")
+
+    if status == "failed":
+        error_data = status_data.get("error", "视频生成失败")
+        if isinstance(error_data, dict):
+            import json
+            error_msg = json.dumps(error_data, ensure_ascii=False)
+        else:
+            error_msg = str(error_data)
+        return PollOutcome(kind="failed", error=error_msg)
+
+    return PollOutcome(kind="unknown", error=f"未知状态: {status}")
+
+
+def _extract_eta(status_data: Dict[str, Any], detail: Dict[str, Any], age_seconds: float) -> Optional[float]:
+    for source in (status_data, detail):
+        for key in ETA_KEYS:
+            value = source.get(key)
+            if isinstance(value, (int, float)) and value > 0:
+                return float(value)
+
+    # 只有进度百分比时，按已用时间线性推算剩余时间
+    for source in (status_data, detail):
+        progress = source.get("progress")
+        if isinstance(progress, (int, float)) and 0 < progress < 100 and age_seconds > 0:
+            return age_seconds * (100 - progress) / progress
+    return None
+
+
+class TransitionStatusPoller(BaseService):
+    """
+    过渡视频远程任务状态轮询器
+
+    使用方式：
+        poller = TransitionStatusPoller(db_session)
+        stats = await poller.poll()
+    """
+
+    async def poll(self, fallback_api_key_id: Optional[str] = None) -> Dict[str, int]:
+        """
+        查询所有到期的处理中过渡视频任务
+
+        Args:
+            fallback_api_key_id: 过渡记录缺少 api_key_id 时使用的 API Key
+
+        Returns:
+            同步统计信息
+        """
+        now = datetime.now(timezone.utc)
+        transitions = await self._claim_due_transitions(now)
+        if not transitions:
+            logger.debug("没有到期需要同步的过渡视频任务")
+            return {"synced": 0, "failed": 0, "queued": 0}
+
+        groups: Dict[str, List[MovieShotTransition]] = defaultdict(list)
+        for transition in transitions:
+            key_id = str(transition.api_key_id) if transition.api_key_id else fallback_api_key_id
+            if not key_id:
+                logger.warning(f"过渡 {transition.id} 缺少api_key_id，跳过")
+                continue
+            groups[key_id].append(transition)
+
+        # 按 API Key 加载一次凭证（数据库会话不能并发使用，先顺序加载）
+        credentials: Dict[str, Any] = {}
+        outcomes: Dict[Any, PollOutcome] = {}
+        api_key_service = APIKeyService(self.db_session)
+        for key_id, items in groups.items():
+            try:
+                api_key = await api_key_service.get_api_key_by_id(key_id)
+                credentials[key_id] = (api_key.get_api_key(), api_key.base_url)
+            except Exception as e:
+                logger.error(f"加载API Key {key_id} 失败: {e}")
+                for transition in items:
+                    outcomes[transition.id] = PollOutcome(kind="failed", error=f"同步失败: {e}")
+
+        logger.info(
+            f"开始同步 {len(transitions)} 个过渡视频任务，{len(credentials)} 个API Key"
+        )
+
+        global_limit = asyncio.Semaphore(settings.TRANSITION_POLL_CONCURRENCY)
+        limits = httpx.Limits(
+            max_connections=settings.TRANSITION_POLL_CONCURRENCY,
+            max_keepalive_connections=settings.TRANSITION_POLL_CONCURRENCY,
+        )
+        async with httpx.AsyncClient(limits=limits) as client:
+            group_results = await asyncio.gather(*[
+                self._poll_group(groups[key_id], api_key, base_url, client, global_limit, now)
+                for key_id, (api_key, base_url) in credentials.items()
+            ])
+        for group_result in group_results:
+            outcomes.update(group_result)
+
+        return await self._apply_outcomes(transitions, outcomes, now)
+
+    async def _claim_due_transitions(self, now: datetime) -> List[MovieShotTransition]:
+        """取出到期的任务并写入租约，避免重叠的轮询重复处理"""
+        result = await self.execute(
+            select(MovieShotTransition)
+            .where(
+                MovieShotTransition.status == "processing",
+                MovieShotTransition.video_task_id.isnot(None),
+                or_(
+                    MovieShotTransition.next_status_check_at.is_(None),
+                    MovieShotTransition.next_status_check_at <= now,
+                ),
+            )
+            .order_by(MovieShotTransition.next_status_check_at.asc().nulls_first())
+            .limit(settings.TRANSITION_POLL_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+        transitions = list(result.scalars().all())
+
+        lease_until = now + timedelta(seconds=settings.TRANSITION_POLL_MAX_INTERVAL_SECONDS)
+        for transition in transitions:
+            transition.next_status_check_at = lease_until
+        await self.commit()
+        return transitions
+
+    async def _poll_group(
+        self,
+        transitions: List[MovieShotTransition],
+        api_key: str,
+        base_url: str,
+        client: httpx.AsyncClient,
+        global_limit: asyncio.Semaphore,
+        now: datetime,
+    ) -> Dict[Any, PollOutcome]:
+        """并发查询同一 API Key 下的任务（单Key并发上限 + 全局并发上限）"""
+        from src.services.provider.vector_engine_provider import VectorEngineProvider
+
+        provider = VectorEngineProvider(api_key=api_key, base_url=base_url, http_client=client)
+        key_limit = asyncio.Semaphore(settings.TRANSITION_POLL_CONCURRENCY_PER_KEY)
+
+        async def poll_one(transition: MovieShotTransition):
+            age = _age_seconds(transition, now)
+            async with key_limit, global_limit:
+                try:
+                    status_data = await provider.get_task_status(transition.video_task_id)
+                    return transition.id, parse_task_status(status_data, age)
+                except (httpx.TimeoutException, httpx.ConnectError) as e:
+                    # 网络超时或连接错误，不标记失败，退避后重试
+                    logger.warning(f"查询过渡 {transition.id} 状态遭遇网络异常, 将退避重试: {e}")
+                    return transition.id, PollOutcome(kind="retry", error=str(e))
+                except Exception as e:
+                    logger.error(f"查询过渡 {transition.id} 状态遭遇不可恢复失败: {e}", exc_info=True)
+                    return transition.id, PollOutcome(kind="failed", error=f"同步失败: {e}")
+
+        results = await asyncio.gather(*[poll_one(transition) for transition in transitions])
+        return dict(results)
+
+    async def _apply_outcomes(
+        self,
+        transitions: List[MovieShotTransition],
+        outcomes: Dict[Any, PollOutcome],
+        now: datetime,
+    ) -> Dict[str, int]:
+        """写回查询结果，提交后把已完成的任务投递到入库队列"""
+        stats = {"synced": 0, "failed": 0, "queued": 0}
+        to_ingest = []
+
+        for transition in transitions:
+            outcome = outcomes.get(transition.id)
+            if outcome is None:
+                continue
+
+            transition.status_check_count = (transition.status_check_count or 0) + 1
+            age = _age_seconds(transition, now)
+
+            if outcome.kind == "pending":
+                delay = compute_next_poll_delay(age, outcome.eta_seconds)
+                transition.next_status_check_at = now + timedelta(seconds=delay)
+                continue
+
+            if outcome.kind in ("retry", "unknown"):
+                if outcome.kind == "unknown":
+                    logger.warning(f"过渡视频{outcome.error}: {transition.id}")
+                delay = compute_retry_delay(transition.status_check_count)
+                transition.next_status_check_at = now + timedelta(seconds=delay)
+                continue
+
+            stats["synced"] += 1
+            if outcome.kind == "completed":
+                # 入库期间保持 processing，租约过期仍未完成时会被重新投递
+                transition.next_status_check_at = now + timedelta(
+                    seconds=settings.TRANSITION_INGEST_LEASE_SECONDS
+                )
+                to_ingest.append((str(transition.id), transition.video_task_id, outcome.video_url))
+                stats["queued"] += 1
+            else:
+                transition.status = "failed"
+                transition.error_message = (outcome.error or "视频生成失败")[:500]
+                transition.next_status_check_at = None
+                stats["failed"] += 1
+                logger.error(f"过渡视频失败: {transition.id} - {outcome.error}")
+
+        await self.commit()
+
+        if to_ingest:
+            from src.tasks.movie import ingest_transition_video
+            for transition_id, video_task_id, video_url in to_ingest:
+                ingest_transition_video.apply_async(
+                    args=[transition_id, video_task_id, video_url],
+                    queue=settings.TRANSITION_INGEST_QUEUE,
+                )
+
+        logger.info(
+            f"同步完成: 查询 {len(outcomes)}, 终态 {stats['synced']}, "
+            f"投递入库 {stats['queued']}, 失败 {stats['failed']}"
+        )
+        return stats
+
+
+def _age_seconds(transition: MovieShotTransition, now: datetime) -> float:
+    submitted_at = transition.video_submitted_at or transition.created_at
+    if submitted_at is None:
+        return 0.0
+    if submitted_at.tzinfo is None:
+        submitted_at = submitted_at.replace(tzinfo=timezone.utc)
+    return max((now - submitted_at).total_seconds(), 0.0)
+
+
+__all__ = [
+    "PollOutcome",
+    "TransitionStatusPoller",
+    "compute_next_poll_delay",
+    "compute_retry_delay",
+    "parse_task_status",
+]
@@ -4,6 +4,11 @@
 
 import json
 import asyncio
+import shutil
+import tempfile
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
 from typing import List, Dict, Any, Optional
 from sqlalchemy.orm import selectinload
 from sqlalchemy import select
@@ -13,6 +18,7 @@ from src.models.movie import MovieScript, MovieScene, MovieShot, MovieShotTransi
 from src.services.base import BaseService
 from src.services.provider.factory import ProviderFactory
 from src.services.api_key import APIKeyService
+from src.services.prompt_cache import cached_completion
 
 logger = get_logger(__name__)
 
@@ -32,7 +38,8 @@ class TransitionService(BaseService):
         to_shot_dialogue: str,
         to_shot_characters: list,
         api_key,
-        model: str = None
+        model: str = None,
+        use_cache: bool = True
     ) -> str:
         """
         生成过渡视频提示词（内部方法，可复用）
@@ -46,6 +53,7 @@ class TransitionService(BaseService):
             to_shot_characters: 结束分镜角色列表
             api_key: API Key对象
             model: 模型名称
+            use_cache: 是否复用相同输入的历史结果
             
         Returns:
             str: 生成的视频提示词
@@ -83,15 +91,16 @@ class TransitionService(BaseService):
 
         prompt = MoviePromptTemplates.get_transition_video_prompt(previous_shot, current_shot)
 
-        response = await llm_provider.completions(
+        video_prompt = await cached_completion(
+            llm_provider,
+            "transition_prompt",
             model=model,
             messages=[
                 {"role": "system", "content": "你是一个专业的电影视频提示词生成专家。"},
                 {"role": "user", "content": prompt},
-            ]
+            ],
+            bypass=not use_cache,
         )
-
-        video_prompt = response.choices[0].message.content.strip()
         logger.info(f"生成视频提示词: {video_prompt[:100]}...")
         
         return video_prompt
@@ -101,7 +110,8 @@ class TransitionService(BaseService):
         from_shot: MovieShot,
         to_shot: MovieShot,
         api_key_id: str,
-        model: str = None
+        model: str = None,
+        use_cache: bool = True
     ) -> str:
         """
         生成两个分镜之间的视频提示词
@@ -111,6 +121,7 @@ class TransitionService(BaseService):
             to_shot: 结束分镜
             api_key_id: API Key ID
             model: 模型名称
+            use_cache: 是否复用相同输入的历史结果（重新生成时传 False）
             
         Returns:
             str: 生成的视频提示词（英文）
@@ -136,7 +147,8 @@ class TransitionService(BaseService):
             to_shot_dialogue=to_shot.dialogue or '无',
             to_shot_characters=to_shot.characters or [],
             api_key=api_key,
-            model=model
+            model=model,
+            use_cache=use_cache
         )
 
     async def create_transition(
@@ -372,9 +384,8 @@ class TransitionService(BaseService):
         Returns:
             list: base64 data URL列表
         """
-        import base64
         import aiohttp
-        from datetime import timedelta
+        from src.utils.image_utils import build_image_data_url
         from src.utils.storage import get_storage_client
         
         # 加载分镜
@@ -394,7 +405,7 @@ class TransitionService(BaseService):
                 
                 if keyframe_url.startswith("uploads/"):
                     storage_client = await get_storage_client()
-                    img_data = await storage_client.download_file(keyframe_url)
+                    img_data = await storage_client.read_object(keyframe_url)
                     logger.info(f"成功从内部存储直接加载{shot_name}关键帧数据")
                 else:
                     # 下载关键帧并转base64
@@ -407,15 +418,8 @@ class TransitionService(BaseService):
                                 logger.warning(f"下载{shot_name}关键帧失败: HTTP {resp.status}")
                 
                 if img_data:
-                    b64_img = base64.b64encode(img_data).decode('utf-8')
-                    
-                    # 检测MIME类型
-                    mime_type = "image/jpeg"
-                    if img_data[:4] == b'\x89PNG':
-                        mime_type = "image/png"
-                    
-                    # VectorEngine使用data URL格式
-                    keyframe_images.append(f"data:{mime_type};base64,{b64_img}")
+                    # VectorEngine使用data URL格式（关键帧通常有数 MB，编码放到线程里执行）
+                    keyframe_images.append(await asyncio.to_thread(build_image_data_url, img_data))
             except Exception as e:
                 logger.warning(f"处理{shot_name}关键帧失败: {e}")
         
@@ -464,6 +468,9 @@ class TransitionService(BaseService):
             # 更新记录
             transition.video_task_id = task_id
             transition.status = "processing"
+            transition.video_submitted_at = datetime.now(timezone.utc)
+            transition.next_status_check_at = None
+            transition.status_check_count = 0
             transition.api_key_id = api_key_id
             transition.user_id = user_id
             
@@ -659,183 +666,181 @@ class TransitionService(BaseService):
         """
         同步过渡视频任务状态
         
+        按 API Key 分组并发查询到期的任务，已完成的任务投递到入库队列，
+        详见 TransitionStatusPoller。
+        
         Args:
             api_key_id: 可选，如果不提供则从transition记录中获取
             
         Returns:
             dict: 同步统计信息
         """
+        from src.services.transition_poller import TransitionStatusPoller
+        
+        poller = TransitionStatusPoller(self.db_session)
+        return await poller.poll(fallback_api_key_id=api_key_id)
+
+    async def complete_transition_video(
+        self,
+        transition_id: str,
+        video_task_id: str,
+        video_url: str
+    ) -> dict:
+        """
+        入库已生成完成的过渡视频（入库队列任务调用）
+        
+        Args:
+            transition_id: 过渡ID
+            video_task_id: 完成的远程任务ID（过渡已重新提交时跳过）
+            video_url: 供应商返回的视频URL
+            
+        Returns:
+            dict: {"success": bool, ...}
+        """
         import httpx
-        from fastapi import UploadFile
-        import io
-        import uuid
-        from src.utils.storage import get_storage_client
         
-        logger.info("开始同步过渡视频任务状态")
+        transition = await self.db_session.get(MovieShotTransition, transition_id)
+        if (
+            transition is None
+            or transition.status != "processing"
+            or transition.video_task_id != video_task_id
+        ):
+            logger.info(f"过渡 {transition_id} 已不需要入库，跳过")
+            return {"success": False, "skipped": True}
         
-        # 查询所有processing状态的过渡
-        stmt = select(MovieShotTransition).where(
-            MovieShotTransition.status == "processing",
-            MovieShotTransition.video_task_id.isnot(None)
-        )
-        result = await self.db_session.execute(stmt)
-        transitions = result.scalars().all()
+        try:
+            # 下载、入库并规范化（拼接时直接流拷贝）
+            object_key = await self._ingest_transition_video(transition, video_url)
+            
+            transition.status = "completed"
+            transition.error_message = None  # 清除之前的错误信息
+            transition.next_status_check_at = None
+            
+            # 创建生成历史记录
+            from src.services.generation_history_service import GenerationHistoryService
+            from src.models.movie import GenerationType, MediaType
+            
+            history_service = GenerationHistoryService(self.db_session)
+            await history_service.create_history(
+                resource_type=GenerationType.TRANSITION_VIDEO,
+                resource_id=str(transition.id),
+                result_url=object_key,
+                prompt=transition.video_prompt or "",
+                media_type=MediaType.VIDEO,
+                model=None,
+                api_key_id=str(transition.api_key_id) if transition.api_key_id else None
+            )
+            
+            await self.db_session.commit()
+            logger.info(f"过渡视频完成: {transition.id}, 已保存到MinIO")
+            return {"success": True, "transition_id": str(transition.id), "video_url": object_key}
+            
+        except (httpx.TimeoutException, httpx.ConnectError) as e:
+            # 网络超时或连接错误，不标记失败，入库租约到期后轮询器会重新投递
+            await self.db_session.rollback()
+            logger.warning(f"过渡 {transition_id} 下载遭遇网络异常, 将在租约到期后重试: {e}")
+            return {"success": False, "retry": True}
+        except Exception as e:
+            await self.db_session.rollback()
+            logger.error(f"过渡 {transition_id} 入库遭遇不可恢复失败: {e}", exc_info=True)
+            transition = await self.db_session.get(MovieShotTransition, transition_id)
+            transition.status = "failed"
+            transition.error_message = f"同步失败: {str(e)}"[:500]  # 限制长度避免过长
+            transition.next_status_check_at = None
+            await self.db_session.commit()
+            return {"success": False, "error": str(e)}
+
+    async def _ingest_transition_video(self, transition: MovieShotTransition, video_url: str) -> str:
+        """
+        下载供应商生成的过渡视频，保存原始文件和规范化文件
         
-        if not transitions:
-            logger.info("没有需要同步的过渡视频任务")
-            return {"synced": 0, "completed": 0, "failed": 0}
+        视频流式写入临时文件，不整体读入内存；规范化失败不影响原始视频入库，
+        合成电影时会对缺少规范化版本的过渡按需补齐。
         
-        logger.info(f"找到 {len(transitions)} 个待同步的过渡视频任务")
+        Args:
+            transition: 过渡视频记录
+            video_url: 供应商返回的视频URL
+            
+        Returns:
+            原始视频对象键
+        """
+        import httpx
+        from src.utils.storage import get_storage_client
         
-        synced_count = 0
-        completed_count = 0
-        failed_count = 0
+        user_id = str(transition.user_id) if transition.user_id else "system"
+        storage_client = await get_storage_client()
+        temp_dir = Path(tempfile.mkdtemp(prefix="transition_ingest_"))
         
-        for transition in transitions:
-            try:
-                # 从记录中获取API Key ID
-                transition_api_key_id = str(transition.api_key_id) if transition.api_key_id else api_key_id
-                if not transition_api_key_id:
-                    logger.warning(f"过渡 {transition.id} 缺少api_key_id，跳过")
-                    continue
-                
-                # 加载API Key
-                api_key_service = APIKeyService(self.db_session)
-                api_key = await api_key_service.get_api_key_by_id(transition_api_key_id)
-                
-                # 创建provider
-                from src.services.provider.vector_engine_provider import VectorEngineProvider
-                provider = VectorEngineProvider(
-                    api_key=api_key.get_api_key(),
-                    base_url=api_key.base_url
-                )
-                
-                # 查询任务状态
-                status_data = await provider.get_task_status(transition.video_task_id)
-                
-                # VectorEngine API返回格式: {"id": "...", "status": "...", "detail": {...}}
-                # 状态可能在顶层或detail中
-                status = status_data.get("status")
-                detail = status_data.get("detail", {})
-                
-                logger.debug(f"任务 {transition.video_task_id} 状态: {status}, detail状态: {detail.get('status')}")
-                
-                # 如果顶层状态是video_generating或processing，使用detail中的状态
-                if status in ["video_generating", "processing", "pending"]:
-                    # 仍在处理中，不更新
-                    logger.debug(f"过渡视频仍在处理中: {transition.id}, 状态: {status}")
-                    continue
-                
-                if status == "completed":
-                    # VectorEngine API在完成时，video_url在顶层
-                    video_url = status_data.get("video_url")
-                    
-                    # 如果顶层没有，尝试从detail中获取
-                    if not video_url:
-                        detail = status_data.get("detail", {})
-                        video_url = detail.get("video_url")
-                    
-                    if video_url:
-                        # 获取user_id
-                        user_id = str(transition.user_id) if transition.user_id else "system"
-                        
-                        # 下载视频 (增加超时设置: 连接30s, 读取300s)
-                        async with httpx.AsyncClient(timeout=httpx.Timeout(timeout=300.0, connect=30.0)) as client:
-                            response = await client.get(video_url)
-                            response.raise_for_status()
-                            video_content = response.content
-                        
-                        # 上传到MinIO（使用通用方法）
-                        storage_client = await get_storage_client()
-                        file_id = str(uuid.uuid4())
-                        upload_file = UploadFile(
-                            filename=f"{file_id}.mp4",
-                            file=io.BytesIO(video_content)
-                        )
-                        
-                        storage_result = await storage_client.upload_file(
-                            user_id=user_id,
-                            file=upload_file,
-                            metadata={"transition_id": str(transition.id)}
-                        )
-                        
-                        transition.video_url = storage_result["object_key"]
-                        transition.status = "completed"
-                        transition.error_message = None  # 清除之前的错误信息
-                        
-                        # 创建生成历史记录
-                        from src.services.generation_history_service import GenerationHistoryService
-                        from src.models.movie import GenerationType, MediaType
-                        
-                        history_service = GenerationHistoryService(self.db_session)
-                        await history_service.create_history(
-                            resource_type=GenerationType.TRANSITION_VIDEO,
-                            resource_id=str(transition.id),
-                            result_url=storage_result["object_key"],
-                            prompt=transition.video_prompt or "",
-                            media_type=MediaType.VIDEO,
-                            model=None,
-                            api_key_id=str(transition.api_key_id) if transition.api_key_id else None
-                        )
-                        
-                        completed_count += 1
-                        logger.info(f"过渡视频完成: {transition.id}, 已保存到MinIO")
-                    else:
-                        # 没有视频URL，标记为失败
-                        transition.status = "failed"
-                        transition.error_message = "视频生成完成但未返回视频URL"
-                        failed_count += 1
-                        logger.error(f"过渡视频失败: {transition.id} - 未返回视频URL")
-                    
-                elif status == "failed":
-                    # 获取失败原因
-                    error_data = status_data.get("error", "视频生成失败")
-                    
-                    # 如果error是字典，转换为字符串
-                    if isinstance(error_data, dict):
-                        import json
-                        error_msg = json.dumps(error_data, ensure_ascii=False)
-                    else:
-                        error_msg = str(error_data)
-                    
-                    transition.status = "failed"
-                    transition.error_message = error_msg
-                    failed_count += 1
-                    logger.error(f"过渡视频失败: {transition.id} - {error_msg}")
-                
-                elif status == "processing":
-                    # 仍在处理中，不更新
-                    logger.debug(f"过渡视频仍在处理中: {transition.id}")
-                    continue
-                
-                else:
-                    # 未知状态
-                    logger.warning(f"过渡视频未知状态: {transition.id} - {status}")
-                    continue
-                
-                synced_count += 1
-                
-            except (httpx.TimeoutException, httpx.ConnectError) as e:
-                # 网络超时或连接错误，不标记失败，允许下一次重试
-                logger.warning(f"同步过渡 {transition.id} 遭遇网络异常(超时/连接), 将在下次循环重试: {e}")
-                continue
-            except Exception as e:
-                error_msg = f"同步失败: {str(e)}"
-                logger.error(f"同步过渡 {transition.id} 遭遇不可恢复失败: {e}", exc_info=True)
-                
-                # 记录错误信息（确保是字符串）
-                transition.status = "failed"
-                transition.error_message = error_msg[:500]  # 限制长度避免过长
-                failed_count += 1
+        try:
+            source_path = temp_dir / "source.mp4"
+            
+            # 下载视频 (增加超时设置: 连接30s, 读取300s)
+            async with httpx.AsyncClient(timeout=httpx.Timeout(timeout=300.0, connect=30.0)) as client:
+                async with client.stream("GET", video_url) as response:
+                    response.raise_for_status()
+                    with open(source_path, "wb") as f:
+                        async for chunk in response.aiter_bytes(1024 * 1024):
+                            f.write(chunk)
+            
+            file_id = str(uuid.uuid4())
+            storage_result = await storage_client.upload_file_from_path(
+                user_id=user_id,
+                file_path=str(source_path),
+                original_filename=f"{file_id}.mp4",
+                metadata={"transition_id": str(transition.id)}
+            )
+            transition.video_url = storage_result["object_key"]
+            transition.normalized_video_url = await self.normalize_transition_video(
+                transition, source_path, temp_dir
+            )
+            return storage_result["object_key"]
+            
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    async def normalize_transition_video(
+        self,
+        transition: MovieShotTransition,
+        source_path: Path,
+        temp_dir: Path
+    ) -> Optional[str]:
+        """
+        将过渡视频转为统一拼接规范并上传
         
-        await self.db_session.commit()
+        Args:
+            transition: 过渡视频记录
+            source_path: 本地原始视频路径
+            temp_dir: 临时目录
+            
+        Returns:
+            规范化视频对象键，失败返回None
+        """
+        from src.utils.ffmpeg_utils import normalize_video_for_concat
+        from src.utils.storage import get_storage_client
         
-        logger.info(f"同步完成: 总计 {synced_count}, 完成 {completed_count}, 失败 {failed_count}")
-        return {
-            "synced": synced_count,
-            "completed": completed_count,
-            "failed": failed_count
-        }
+        user_id = str(transition.user_id) if transition.user_id else "system"
+        normalized_path = temp_dir / f"{source_path.stem}_normalized.mp4"
+        
+        success = await asyncio.to_thread(
+            normalize_video_for_concat, str(source_path), str(normalized_path)
+        )
+        if not success:
+            logger.warning(f"过渡视频规范化失败: {transition.id}，合成时将重试")
+            return None
+        
+        storage_client = await get_storage_client()
+        storage_result = await storage_client.upload_file_from_path(
+            user_id=user_id,
+            file_path=str(normalized_path),
+            original_filename=f"{transition.id}_normalized.mp4",
+            object_key=storage_client.generate_object_key(
+                user_id, f"{transition.id}_normalized.mp4", prefix="transitions"
+            ),
+            metadata={"transition_id": str(transition.id), "normalized": "true"}
+        )
+        logger.info(f"过渡视频规范化完成: {transition.id} -> {storage_result['object_key']}")
+        return storage_result["object_key"]
+
 
 __all__ = ["TransitionService"]
 
@@ -7,15 +7,21 @@
 - 视频拼接
 """
 
+import asyncio
+import hashlib
+import os
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 from src.core.logging import get_logger
+from src.core.tracing import start_span
 from src.models import Sentence, APIKey
 from src.services.material_service import material_service
-from src.services.subtitle_service import subtitle_service
+from src.services.subtitle_service import DEFAULT_SUBTITLE_ALIGNMENT, subtitle_service
 from src.utils.ffmpeg_utils import (
+    DEFAULT_KEN_BURNS_RENDERER,
     build_sentence_video_command,
+    prepare_ken_burns_still,
     run_ffmpeg_command,
 )
 
@@ -25,6 +31,55 @@ logger = get_logger(__name__)
 class VideoCompositionService:
     """视频合成服务 - 处理FFmpeg视频操作"""
 
+    def __init__(self):
+        # 画布静帧锁 {静帧路径: 锁}，多个句子共用同一张图片时只生成一次；
+        # 锁在合成任务结束时由 release_ken_burns_stills 清理，不能在生成后立即删除，
+        # 否则仍在等待旧锁的句子与新创建锁的句子会同时生成同一张静帧
+        self._still_locks: Dict[str, asyncio.Lock] = {}
+
+    async def get_ken_burns_still(self, image_url: str, temp_dir: Path, resolution: str) -> Path:
+        """
+        获取图片的 Ken Burns 画布静帧（同一任务目录内按图片和分辨率复用）
+
+        Args:
+            image_url: 图片对象键或URL
+            temp_dir: 任务临时目录
+            resolution: 输出分辨率
+
+        Returns:
+            画布静帧路径
+        """
+        key = hashlib.sha1(f"{image_url}|{resolution}".encode("utf-8")).hexdigest()[:16]
+        stills_dir = temp_dir / "stills"
+        still_path = stills_dir / f"{key}.png"
+        lock = self._still_locks.setdefault(str(still_path), asyncio.Lock())
+        async with lock:
+            if still_path.exists():
+                return still_path
+
+            stills_dir.mkdir(parents=True, exist_ok=True)
+            source_path = stills_dir / f"{key}_source.jpg"
+            await material_service.fetch_material_from_minio(image_url, source_path)
+
+            # 先写临时文件再改名，避免其他句子读到写了一半的静帧
+            partial_path = stills_dir / f"{key}.partial.png"
+            if not prepare_ken_burns_still(str(source_path), str(partial_path), resolution):
+                raise Exception(f"生成Ken Burns静帧失败: {image_url}")
+            os.replace(partial_path, still_path)
+            source_path.unlink(missing_ok=True)
+            return still_path
+
+    def release_ken_burns_stills(self, temp_dir: Path) -> None:
+        """
+        合成任务结束时清理该任务目录下的画布静帧锁
+
+        Args:
+            temp_dir: 任务临时目录
+        """
+        prefix = str(temp_dir / "stills") + os.sep
+        for still_path in [path for path in self._still_locks if path.startswith(prefix)]:
+            del self._still_locks[still_path]
+
     async def synthesize_sentence_video(
             self,
             sentence: Sentence,
@@ -53,29 +108,42 @@ class VideoCompositionService:
             sentence_dir = temp_dir / f"sentence_{index:03d}"
             sentence_dir.mkdir(parents=True, exist_ok=True)
 
-            # 下载图片
-            image_path = sentence_dir / f"image.jpg"
-            await material_service.fetch_material_from_minio(sentence.image_url, image_path)
+            with start_span("sentence.materials"):
+                # 下载图片（scale_crop 渲染时使用按图片复用的画布静帧）
+                if gen_setting.get("ken_burns_renderer", DEFAULT_KEN_BURNS_RENDERER) == "zoompan":
+                    image_path = sentence_dir / f"image.jpg"
+                    await material_service.fetch_material_from_minio(sentence.image_url, image_path)
+                else:
+                    image_path = await self.get_ken_burns_still(
+                        sentence.image_url, temp_dir, gen_setting.get("resolution", "1440x1080")
+                    )
 
-            # 下载音频
-            audio_path = sentence_dir / f"audio.mp3"
-            await material_service.fetch_material_from_minio(sentence.audio_url, audio_path)
+                # 下载音频
+                audio_path = sentence_dir / f"audio.mp3"
+                await material_service.fetch_material_from_minio(sentence.audio_url, audio_path)
 
             # 生成字幕时间轴
-            subtitle_data = subtitle_service.generate_subtitle_timeline(str(audio_path),sentence.content)
+            alignment = gen_setting.get("subtitle_alignment", DEFAULT_SUBTITLE_ALIGNMENT)
+            with start_span("sentence.subtitle_timeline", {"subtitle.alignment": alignment}) as span:
+                subtitle_data = subtitle_service.generate_subtitle_timeline(
+                    str(audio_path), sentence.content, alignment=alignment,
+                    timeline=getattr(sentence, "audio_timeline", None)
+                )
+                span.set_attribute("subtitle.source", subtitle_data.get("source"))
 
-            # 如果提供了API密钥，使用LLM纠正字幕
-            if api_key:
+            # Whisper识别的字幕，如果提供了API密钥，使用LLM纠正（TTS时间轴和强制对齐的文字就是原文，无需纠错）
+            if api_key and subtitle_data.get("source") == "whisper":
                 logger.info(f"[LLM纠错] 句子 {index} 使用LLM纠正字幕")
-                subtitle_data = await subtitle_service.correct_subtitle_with_llm(
-                    subtitle_data=subtitle_data,
-                    original_text=sentence.content,
-                    api_key=api_key,
-                    model=model
-                )
+                with start_span("sentence.subtitle_correction"):
+                    subtitle_data = await subtitle_service.correct_subtitle_with_llm(
+                        subtitle_data=subtitle_data,
+                        original_text=sentence.content,
+                        api_key=api_key,
+                        model=model
+                    )
 
             # 创建字幕滤镜
-            subtitle_filter = subtitle_service.create_subtitle_filter(subtitle_data, gen_setting)
+            subtitle_filter = subtitle_service.create_subtitle_filter(subtitle_data, gen_setting, sentence_dir)
 
             # 输出视频路径
             output_path = sentence_dir / f"video.mp4"
@@ -90,7 +158,8 @@ class VideoCompositionService:
             )
 
             # 执行FFmpeg命令
-            success, stdout, stderr = run_ffmpeg_command(command, timeout=300)
+            with start_span("sentence.render"):
+                success, stdout, stderr = run_ffmpeg_command(command, timeout=300)
 
             if not success:
                 raise Exception(f"FFmpeg执行失败: {stderr}")
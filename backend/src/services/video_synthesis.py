@@ -6,20 +6,30 @@ import asyncio
 import shutil
 import tempfile
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 
 from src.core.exceptions import BusinessLogicError
 from src.core.logging import get_logger
+from src.core.tracing import collect_breakdown, start_span
 from src.models import Chapter, ChapterStatus, Sentence, VideoTask, VideoTaskStatus
 from src.services.api_key import APIKeyService
 from src.services.base import BaseService
 from src.services.chapter import ChapterService
+from src.services.sentence_projection import (
+    VIDEO_SENTENCE_COLUMNS,
+    SentenceProjectionService,
+    has_valid_video_cache,
+)
 from src.services.video_composition_service import video_composition_service
 from src.services.video_task import VideoTaskService
 from src.utils.ffmpeg_utils import (
+    DEFAULT_CLIP_ENCODING_PROFILE,
+    DEFAULT_OUTPUT_ENCODING_PROFILE,
+    OUTPUT_ENCODING_PROFILE_KEY,
     check_ffmpeg_installed,
     concatenate_videos,
     get_audio_duration,
+    resolve_encoding_profile,
 )
 from src.utils.storage import get_storage_client
 
@@ -64,9 +74,9 @@ class VideoSynthesisService(BaseService):
                 f"章节状态不正确，当前状态: {chapter.status}，需要: {ChapterStatus.MATERIALS_PREPARED.value}"
             )
 
-        # 获取章节的所有句子
-        chapter_service = ChapterService(self.db_session)
-        sentences = await chapter_service.get_sentences(chapter.id)
+        # 获取章节的所有句子（精简行，只取素材列）
+        projection = SentenceProjectionService(self.db_session)
+        sentences = await projection.list_sentence_rows(chapter.id, VIDEO_SENTENCE_COLUMNS)
 
         if not sentences:
             raise BusinessLogicError("章节没有句子")
@@ -245,13 +255,14 @@ class VideoSynthesisService(BaseService):
             semaphore: asyncio.Semaphore,
             user_id: str,
             api_key=None,
-            model: Optional[str] = None
+            model: Optional[str] = None,
+            cache_updates: Optional[Dict] = None
     ) -> Tuple[bool, Optional[Path], Optional[Exception]]:
         """
         处理单个句子：生成视频并上传缓存
         
         Args:
-            sentence: 句子对象
+            sentence: 句子对象或精简行
             temp_dir: 临时目录
             index: 句子索引
             gen_setting: 生成设置
@@ -259,41 +270,46 @@ class VideoSynthesisService(BaseService):
             user_id: 用户ID
             api_key: API密钥
             model: 模型名称
+            cache_updates: 收集缓存信息 {sentence_id: (video_key, duration)}，由主流程统一写回
             
         Returns:
             (是否成功, 视频路径, 异常对象)
         """
         async with semaphore:
-            try:
-                # 1. 生成视频
-                video_path = await video_composition_service.synthesize_sentence_video(
-                    sentence=sentence,
-                    temp_dir=temp_dir,
-                    index=index,
-                    gen_setting=gen_setting,
-                    api_key=api_key,
-                    model=model
-                )
-                
-                # 2. 上传到 MinIO 作为缓存
-                video_key = await self._upload_sentence_video_cache(
-                    video_path, str(sentence.id), user_id
-                )
-                
-                # 3. 获取视频时长
-                duration = await self._get_video_duration(video_path)
-                
-                # 4. 保存缓存信息到数据库
-                # 注意：这里只更新对象状态，不要 flush，避免并发 flush 导致 "Session is already flushing" 错误
-                # 统一在主流程中 flush
-                sentence.save_video_cache(video_key, duration)
-                
-                logger.info(f"✅ 句子 {index} 视频已生成并缓存")
-                return True, video_path, None
+            with start_span("video.sentence", {"sentence.index": index, "sentence.id": str(sentence.id)}) as span:
+                try:
+                    # 1. 生成视频
+                    video_path = await video_composition_service.synthesize_sentence_video(
+                        sentence=sentence,
+                        temp_dir=temp_dir,
+                        index=index,
+                        gen_setting=gen_setting,
+                        api_key=api_key,
+                        model=model
+                    )
+
+                    # 2. 上传到 MinIO 作为缓存
+                    video_key = await self._upload_sentence_video_cache(
+                        video_path, str(sentence.id), user_id
+                    )
+
+                    # 3. 获取视频时长
+                    duration = await self._get_video_duration(video_path)
+
+                    # 4. 记录缓存信息
+                    # 注意：这里不访问数据库会话，避免并发使用同一会话，统一在主流程中批量写回
+                    if cache_updates is not None:
+                        cache_updates[sentence.id] = (video_key, duration)
+                    else:
+                        sentence.save_video_cache(video_key, duration)
+
+                    logger.info(f"✅ 句子 {index} 视频已生成并缓存")
+                    return True, video_path, None
                 
-            except Exception as e:
-                logger.error(f"❌ 处理句子 {index} 失败: {e}")
-                return False, None, e
+                except Exception as e:
+                    span.record_exception(e)
+                    logger.error(f"❌ 处理句子 {index} 失败: {e}")
+                    return False, None, e
 
     def _merge_video_paths(
             self,
@@ -328,7 +344,7 @@ class VideoSynthesisService(BaseService):
 
     async def synthesize_video(self, video_task_id: str) -> dict:
         """
-        合成视频（主流程）
+        合成视频（主流程），成功或失败都会保存各阶段耗时汇总
 
         Args:
             video_task_id: 视频任务ID
@@ -336,6 +352,17 @@ class VideoSynthesisService(BaseService):
         Returns:
             统计信息字典
         """
+        with start_span("video.synthesize", {"video_task.id": video_task_id}), collect_breakdown() as breakdown:
+            try:
+                return await self._synthesize_video(video_task_id)
+            finally:
+                try:
+                    await VideoTaskService(self.db_session).save_time_breakdown(video_task_id, breakdown.to_dict())
+                except Exception as e:
+                    logger.warning(f"保存任务耗时汇总失败: {e}")
+
+    async def _synthesize_video(self, video_task_id: str) -> dict:
+        """合成视频的具体流程"""
         temp_dir = None
         try:
             # 检查FFmpeg
@@ -352,13 +379,14 @@ class VideoSynthesisService(BaseService):
                     f"任务状态不正确: {task.status}"
                 )
 
-            # 3. 更新状态为验证中
-            await task_service.update_task_status(task.id, VideoTaskStatus.VALIDATING)
+            with start_span("video.validate"):
+                # 3. 更新状态为验证中
+                await task_service.update_task_status(task.id, VideoTaskStatus.VALIDATING)
 
-            # 4. 加载章节并验证素材
-            chapter_service = ChapterService(self.db_session)
-            chapter = await chapter_service.get_chapter_by_id(task.chapter_id)
-            await self._validate_chapter_materials(chapter)
+                # 4. 加载章节并验证素材
+                chapter_service = ChapterService(self.db_session)
+                chapter = await chapter_service.get_chapter_by_id(task.chapter_id)
+                await self._validate_chapter_materials(chapter)
 
             # 5. 解析生成设置
             gen_setting = task.get_gen_setting()
@@ -384,8 +412,9 @@ class VideoSynthesisService(BaseService):
             # 7. 更新状态为下载素材
             await task_service.update_task_status(task.id, VideoTaskStatus.DOWNLOADING_MATERIALS)
 
-            # 8. 获取所有句子
-            sentences = await chapter_service.get_sentences(task.chapter_id)
+            # 8. 获取所有句子（精简行，不携带章节正文和项目行）
+            projection = SentenceProjectionService(self.db_session)
+            sentences = await projection.list_sentence_rows(task.chapter_id, VIDEO_SENTENCE_COLUMNS)
             task.total_sentences = len(sentences)
             await self.db_session.flush()
 
@@ -404,7 +433,7 @@ class VideoSynthesisService(BaseService):
             cached_sentences = []
             
             for sentence in sentences:
-                if sentence.has_valid_cache():
+                if has_valid_video_cache(sentence):
                     cached_sentences.append(sentence)
                     logger.info(f"🔄 句子 {sentence.order_index} 使用缓存: {sentence.sentence_video_key}")
                 else:
@@ -419,16 +448,19 @@ class VideoSynthesisService(BaseService):
 
             # 12. 并发生成需要更新的句子视频
             generated_videos = {}
+            cache_updates = {}
             if sentences_to_generate:
                 semaphore = asyncio.Semaphore(3)  # 限制并发数为3
                 tasks_list = [
                     self._process_sentence_with_cache(
-                        sentence, temp_dir, idx, gen_setting, semaphore, str(task.user_id), api_key, model
+                        sentence, temp_dir, idx, gen_setting, semaphore, str(task.user_id), api_key, model,
+                        cache_updates
                     )
                     for idx, sentence in enumerate(sentences_to_generate)
                 ]
                 
-                results = await asyncio.gather(*tasks_list, return_exceptions=True)
+                with start_span("video.sentences", {"sentence.count": len(tasks_list)}):
+                    results = await asyncio.gather(*tasks_list, return_exceptions=True)
                 
                 # 收集成功生成的视频
                 for idx, (success, video_path, error) in enumerate(results):
@@ -437,19 +469,24 @@ class VideoSynthesisService(BaseService):
                         generated_videos[sentence_id] = video_path
                     elif error:
                         logger.error(f"句子 {idx} 生成失败: {error}")
+
+                # 批量写回句子视频缓存
+                await projection.save_video_caches(cache_updates)
             
             # 13. 下载缓存的句子视频
             cached_videos = {}
             if cached_sentences:
-                for sentence in cached_sentences:
-                    try:
-                        video_path = await self._download_cached_video(sentence, temp_dir)
-                        cached_videos[str(sentence.id)] = video_path
-                    except Exception as e:
-                        logger.error(f"下载缓存视频失败 {sentence.id}: {e}")
-                        # 如果缓存下载失败，标记需要重新生成
-                        sentence.mark_material_updated()
-                        await self.db_session.flush()
+                with start_span("video.download_cache", {"sentence.count": len(cached_sentences)}):
+                    failed_cache_ids = []
+                    for sentence in cached_sentences:
+                        try:
+                            video_path = await self._download_cached_video(sentence, temp_dir)
+                            cached_videos[str(sentence.id)] = video_path
+                        except Exception as e:
+                            logger.error(f"下载缓存视频失败 {sentence.id}: {e}")
+                            # 如果缓存下载失败，标记需要重新生成
+                            failed_cache_ids.append(sentence.id)
+                    await projection.mark_materials_updated(failed_cache_ids)
             
             # 14. 合并所有视频路径（按句子顺序）
             video_paths = self._merge_video_paths(
@@ -485,122 +522,134 @@ class VideoSynthesisService(BaseService):
             task.update_progress(85)
             await self.db_session.flush()
 
-            # 15. 拼接视频
-            final_video_path = temp_dir / "final_video.mp4"
-            concat_file_path = temp_dir / "concat.txt"
-
-            # 使用crossfade模式提供专业级的视频过渡效果
-            success = concatenate_videos(
-                video_paths, 
-                final_video_path, 
-                concat_file_path,
-                mode="crossfade",
-                transition_type="fade",
-                transition_duration=0.5
+            # 只有最后一次视频编码使用输出档位；需要变速时拼接结果还会再编码一次，拼接使用中间档位
+            video_speed = gen_setting.get("video_speed", 1.0)
+            output_profile = resolve_encoding_profile(
+                gen_setting, OUTPUT_ENCODING_PROFILE_KEY, DEFAULT_OUTPUT_ENCODING_PROFILE
             )
-            if not success:
-                raise BusinessLogicError("视频拼接失败")
+            concat_profile = output_profile if video_speed == 1.0 else DEFAULT_CLIP_ENCODING_PROFILE
+
+            with start_span("video.concat", {"video.count": len(video_paths), "encoding.profile": concat_profile}):
+                # 15. 拼接视频
+                final_video_path = temp_dir / "final_video.mp4"
+                concat_file_path = temp_dir / "concat.txt"
+
+                # 使用crossfade模式提供专业级的视频过渡效果
+                success = concatenate_videos(
+                    video_paths, 
+                    final_video_path, 
+                    concat_file_path,
+                    mode="crossfade",
+                    transition_type="fade",
+                    transition_duration=0.5,
+                    encoding_profile=concat_profile
+                )
+                if not success:
+                    raise BusinessLogicError("视频拼接失败")
 
             # 16. 应用视频速度（如果不是1.0）
-            video_speed = gen_setting.get("video_speed", 1.0)
             if video_speed != 1.0:
-                logger.info(f"开始应用视频速度: {video_speed}x")
-                from src.utils.ffmpeg_utils import apply_video_speed
-                
-                speed_video_path = temp_dir / "final_video_speed.mp4"
-                speed_success = apply_video_speed(
-                    str(final_video_path),
-                    str(speed_video_path),
-                    video_speed
-                )
-                
-                if speed_success:
-                    final_video_path = speed_video_path
-                    logger.info(f"视频速度调整成功: {video_speed}x")
-                else:
-                    logger.warning("视频速度调整失败，使用原视频")
+                with start_span("video.speed", {"video.speed": video_speed}):
+                    logger.info(f"开始应用视频速度: {video_speed}x")
+                    from src.utils.ffmpeg_utils import apply_video_speed
+
+                    speed_video_path = temp_dir / "final_video_speed.mp4"
+                    speed_success = apply_video_speed(
+                        str(final_video_path),
+                        str(speed_video_path),
+                        video_speed,
+                        encoding_profile=output_profile
+                    )
+
+                    if speed_success:
+                        final_video_path = speed_video_path
+                        logger.info(f"视频速度调整成功: {video_speed}x")
+                    else:
+                        logger.warning("视频速度调整失败，使用原视频")
 
             # 17. 混合BGM（如果有）
             if task.background_id:
                 logger.info(f"开始混合BGM: background_id={task.background_id}")
-                try:
-                    # 16.1 加载BGM信息
-                    from src.services.bgm_service import BGMService
-                    bgm_service = BGMService(self.db_session)
-                    bgm = await bgm_service.get_bgm_by_id(
-                        str(task.background_id),
-                        str(task.user_id)
-                    )
-                    
-                    if not bgm or not bgm.file_key:
-                        logger.warning(f"BGM不存在或无file_key，跳过BGM混合")
-                    else:
-                        # 16.2 下载BGM文件
-                        storage = await self._get_storage_client()
-                        bgm_content = await storage.download_file(bgm.file_key)
-                        
-                        # 保存到临时文件
-                        import os
-                        bgm_ext = os.path.splitext(bgm.file_name)[1] or ".mp3"
-                        bgm_temp_path = temp_dir / f"bgm{bgm_ext}"
-                        with open(bgm_temp_path, 'wb') as f:
-                            f.write(bgm_content)
-                        
-                        logger.info(f"BGM下载成功: {bgm.name}, 大小={len(bgm_content)} bytes")
-                        
-                        # 16.3 获取BGM音量配置（从gen_setting读取，默认0.15）
-                        bgm_volume = gen_setting.get("bgm_volume", 0.15)
-                        logger.info(f"BGM音量配置: {bgm_volume}")
-                        
-                        # 16.4 混合BGM
-                        from src.utils.ffmpeg_utils import mix_bgm_with_video
-                        final_video_with_bgm_path = temp_dir / "final_video_with_bgm.mp4"
-                        
-                        mix_success = mix_bgm_with_video(
-                            str(final_video_path),
-                            str(bgm_temp_path),
-                            str(final_video_with_bgm_path),
-                            bgm_volume=bgm_volume,
-                            loop_bgm=True
+                with start_span("video.bgm"):
+                    try:
+                        # 16.1 加载BGM信息
+                        from src.services.bgm_service import BGMService
+                        bgm_service = BGMService(self.db_session)
+                        bgm = await bgm_service.get_bgm_by_id(
+                            str(task.background_id),
+                            str(task.user_id)
                         )
-                        
-                        if mix_success:
-                            # 使用混合后的视频
-                            final_video_path = final_video_with_bgm_path
-                            logger.info("BGM混合成功，使用混合后的视频")
+
+                        if not bgm or not bgm.file_key:
+                            logger.warning(f"BGM不存在或无file_key，跳过BGM混合")
                         else:
-                            logger.warning("BGM混合失败，使用原视频")
-                            
-                except Exception as e:
-                    logger.error(f"BGM混合过程出错: {e}", exc_info=True)
-                    logger.warning("BGM混合失败，继续使用原视频")
+                            # 16.2 下载BGM文件
+                            storage = await self._get_storage_client()
+                            bgm_content = await storage.download_file(bgm.file_key)
+
+                            # 保存到临时文件
+                            import os
+                            bgm_ext = os.path.splitext(bgm.file_name)[1] or ".mp3"
+                            bgm_temp_path = temp_dir / f"bgm{bgm_ext}"
+                            with open(bgm_temp_path, 'wb') as f:
+                                f.write(bgm_content)
+
+                            logger.info(f"BGM下载成功: {bgm.name}, 大小={len(bgm_content)} bytes")
+
+                            # 16.3 获取BGM音量配置（从gen_setting读取，默认0.15）
+                            bgm_volume = gen_setting.get("bgm_volume", 0.15)
+                            logger.info(f"BGM音量配置: {bgm_volume}")
+
+                            # 16.4 混合BGM
+                            from src.utils.ffmpeg_utils import mix_bgm_with_video
+                            final_video_with_bgm_path = temp_dir / "final_video_with_bgm.mp4"
+
+                            mix_success = mix_bgm_with_video(
+                                str(final_video_path),
+                                str(bgm_temp_path),
+                                str(final_video_with_bgm_path),
+                                bgm_volume=bgm_volume,
+                                loop_bgm=True
+                            )
+
+                            if mix_success:
+                                # 使用混合后的视频
+                                final_video_path = final_video_with_bgm_path
+                                logger.info("BGM混合成功，使用混合后的视频")
+                            else:
+                                logger.warning("BGM混合失败，使用原视频")
+
+                    except Exception as e:
+                        logger.error(f"BGM混合过程出错: {e}", exc_info=True)
+                        logger.warning("BGM混合失败，继续使用原视频")
 
             # 17. 更新状态为上传中
             await task_service.update_task_status(task.id, VideoTaskStatus.UPLOADING)
             task.update_progress(90)
             await self.db_session.flush()
 
-            # 18. 上传到MinIO
-            storage = await self._get_storage_client()
-            video_key = storage.generate_object_key(
-                str(task.user_id),
-                f"chapter_{task.chapter_id}_video.mp4",
-                prefix="videos"
-            )
-
-            # 读取文件并上传
-            from fastapi import UploadFile
-            with open(final_video_path, 'rb') as f:
-                upload_file = UploadFile(
-                    filename=f"chapter_{task.chapter_id}_video.mp4",
-                    file=f
-                )
-                result = await storage.upload_file(
+            with start_span("video.upload"):
+                # 18. 上传到MinIO
+                storage = await self._get_storage_client()
+                video_key = storage.generate_object_key(
                     str(task.user_id),
-                    upload_file,
-                    object_key=video_key
+                    f"chapter_{task.chapter_id}_video.mp4",
+                    prefix="videos"
                 )
 
+                # 读取文件并上传
+                from fastapi import UploadFile
+                with open(final_video_path, 'rb') as f:
+                    upload_file = UploadFile(
+                        filename=f"chapter_{task.chapter_id}_video.mp4",
+                        file=f
+                    )
+                    result = await storage.upload_file(
+                        str(task.user_id),
+                        upload_file,
+                        object_key=video_key
+                    )
+
             video_key = result["object_key"]
 
             # 19. 获取视频时长
@@ -638,6 +687,9 @@ class VideoSynthesisService(BaseService):
 
 
         finally:
+            if temp_dir:
+                video_composition_service.release_ken_burns_stills(temp_dir)
+
             # 清理临时目录
             if temp_dir and temp_dir.exists():
                 try:
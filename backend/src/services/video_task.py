@@ -241,8 +241,15 @@ class VideoTaskService(BaseService):
             更新后的任务
         """
         task = await self.get_video_task_by_id(task_id)
+        newly_completed = task.status != VideoTaskStatus.COMPLETED.value
         task.mark_as_completed(video_key, duration)
 
+        if newly_completed:
+            from src.services.statistics import StatisticsService
+            await StatisticsService(self.db_session).increment(
+                task.user_id, task.project_id, video_task_count=1
+            )
+
         await self.commit()
         await self.refresh(task)
 
@@ -275,6 +282,21 @@ class VideoTaskService(BaseService):
         logger.error(f"任务失败: ID={task_id}, 错误={error_message}")
         return task
 
+    async def save_time_breakdown(self, task_id: str, breakdown: dict) -> None:
+        """
+        保存任务各阶段耗时汇总
+
+        Args:
+            task_id: 任务ID
+            breakdown: 耗时汇总（TimeBreakdown.to_dict()）
+        """
+        task = await self.get_video_task_by_id(task_id)
+        task.time_breakdown = breakdown
+
+        await self.commit()
+
+        logger.info(f"保存任务耗时汇总: ID={task_id}, 总耗时={breakdown.get('total_seconds')}s")
+
     async def retry_task(self, task_id: str) -> VideoTask:
         """
         重试失败的任务
@@ -129,7 +129,7 @@ async def _generate_keyframe_worker(
             # 3. 提取并上传图片（使用通用工具函数）
             from src.utils.image_utils import extract_and_upload_image
             
-            object_key = await extract_and_upload_image(
+            object_key, derivative_format = await extract_and_upload_image(
                 result=result,
                 user_id=str(user_id),
                 metadata={"shot_id": str(shot.id), "type": "keyframe"}
@@ -137,6 +137,7 @@ async def _generate_keyframe_worker(
 
             # 4. 更新对象属性 (不 Commit) - 使用新的keyframe_url字段
             shot.keyframe_url = object_key
+            shot.keyframe_derivative_format = derivative_format
             
             # 5. 创建生成历史记录
             # 使用传入的db_session而不是object_session
@@ -583,7 +584,7 @@ class VisualIdentityService(BaseService):
         # 6. 提取并上传图片（使用通用工具函数，支持base64格式）
         from src.utils.image_utils import extract_and_upload_image
         
-        object_key = await extract_and_upload_image(
+        object_key, derivative_format = await extract_and_upload_image(
             result=result,
             user_id=user_id,
             metadata={"shot_id": str(shot_id)}
@@ -593,6 +594,7 @@ class VisualIdentityService(BaseService):
         
         # 7. 更新分镜
         shot.keyframe_url = object_key
+        shot.keyframe_derivative_format = derivative_format
         
         # 8. 创建生成历史记录
         from src.services.generation_history_service import GenerationHistoryService
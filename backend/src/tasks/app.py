@@ -1,11 +1,21 @@
 """
 Celery 应用初始化模块
 """
+import time
+
 from celery import Celery
 from src.core.config import settings
 
-from celery.signals import worker_process_init, worker_process_shutdown
+from celery.signals import (
+    before_task_publish,
+    task_postrun,
+    task_prerun,
+    worker_process_init,
+    worker_process_shutdown,
+)
+from src.core import tracing
 from src.core.database import initialize_database, close_database_connections
+from src.core.metrics import CELERY_TASK_DURATION, start_metrics_server
 from src.tasks.base import run_async_task
 
 celery_app = Celery(
@@ -18,19 +28,80 @@ celery_app = Celery(
         "src.tasks.canvas",
         "src.tasks.movie",
         "src.tasks.movie_composition",  # 电影合成任务
-        "src.tasks.bilibili_task"
+        "src.tasks.bilibili_task",
+        "src.tasks.statistics",  # 仪表盘统计对账
+        "src.tasks.export",  # 剪映导出
     ]
 )
 
 @worker_process_init.connect
 def init_worker(**kwargs):
-    """Worker 进程启动时初始化数据库引擎"""
+    """Worker 进程启动时初始化数据库引擎，并按进程序号启动指标服务"""
     run_async_task(initialize_database())
 
+    if settings.METRICS_ENABLED and settings.CELERY_METRICS_PORT:
+        from billiard.process import current_process
+
+        index = getattr(current_process(), "index", None) or 0
+        start_metrics_server(settings.CELERY_METRICS_PORT + index)
+
 @worker_process_shutdown.connect
 def shutdown_worker(**kwargs):
-    """Worker 进程关闭时清理数据库连接"""
+    """Worker 进程关闭时清理数据库连接，并导出剩余的 Span"""
     run_async_task(close_database_connections())
+    tracing.flush_spans()
+
+
+# 任务开始时间 {task_id: perf_counter}
+_task_started_at = {}
+# 任务 Span {task_id: (span, contextvar token)}
+_task_spans = {}
+
+
+@before_task_publish.connect
+def inject_trace_context(headers=None, **kwargs):
+    """发布任务时把当前 Span 写入消息头，worker 端接续同一条链路"""
+    if headers is not None:
+        tracing.inject(headers)
+
+
+def _task_parent_context(task):
+    request = getattr(task, "request", None)
+    if request is None:
+        return None
+    carrier = {tracing.TRACEPARENT_HEADER: getattr(request, tracing.TRACEPARENT_HEADER, None)}
+    if not carrier[tracing.TRACEPARENT_HEADER]:
+        carrier = getattr(request, "headers", None) or {}
+    return tracing.extract(carrier)
+
+
+@task_prerun.connect
+def record_task_start(task_id=None, task=None, **kwargs):
+    _task_started_at[task_id] = time.perf_counter()
+    if task is not None:
+        span = tracing.begin_span(
+            f"celery.task {task.name}",
+            {"celery.task_id": task_id, "celery.task_name": task.name},
+            kind=tracing.SPAN_KIND_CONSUMER,
+            parent=_task_parent_context(task),
+        )
+        _task_spans[task_id] = (span, tracing.attach(span))
+
+
+@task_postrun.connect
+def record_task_duration(task_id=None, task=None, state=None, **kwargs):
+    started_at = _task_started_at.pop(task_id, None)
+    if started_at is not None and task is not None:
+        CELERY_TASK_DURATION.observe(time.perf_counter() - started_at, task.name, state or "UNKNOWN")
+
+    entry = _task_spans.pop(task_id, None)
+    if entry is not None:
+        span, token = entry
+        span.set_attribute("celery.state", state or "UNKNOWN")
+        if state == "FAILURE":
+            span.status_error = "task failed"
+        tracing.detach(token)
+        tracing.end_span(span)
 
 celery_app.conf.update(
     task_serializer="json",
@@ -45,10 +116,17 @@ celery_app.conf.update(
     task_acks_late=True,
     task_reject_on_worker_lost=True,
     result_expires=3600,
+    task_routes={
+        "movie.ingest_transition_video": {"queue": settings.TRANSITION_INGEST_QUEUE},
+    },
     beat_schedule={
         "sync-video-status-every-30s": {
             "task": "movie.sync_transition_video_status",
             "schedule": 30.0,
         },
+        "reconcile-statistics": {
+            "task": "statistics.reconcile_statistics",
+            "schedule": float(settings.STATISTICS_RECONCILE_INTERVAL_SECONDS),
+        },
     }
 )
@@ -2,6 +2,7 @@
 任务基础工具模块 - 提供异步任务运行和数据库会话管理
 """
 import asyncio
+import contextvars
 import functools
 import threading
 from typing import Any, Callable, Coroutine, TypeVar
@@ -64,11 +65,17 @@ def run_async_task(coro: Coroutine[Any, Any, T]) -> T:
     """
     在同步环境中运行异步协程的辅助函数。
     所有任务都提交到同一个后台事件循环，避免 loop 重入以及数据库连接池跨 loop 复用。
+    协程在调用方的 contextvars 上下文中运行（当前 Span 等随之传递到 loop 线程）。
     """
     loop = get_worker_loop()
     if threading.current_thread() is _worker_loop_thread:
         raise RuntimeError("run_async_task 不能在 worker loop 线程内部再次同步等待")
-    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    context = contextvars.copy_context()
+
+    async def _run_in_context() -> T:
+        return await loop.create_task(coro, context=context)
+
+    future = asyncio.run_coroutine_threadsafe(_run_in_context(), loop)
     return future.result()
 
 def async_task_decorator(func: Callable[..., Coroutine[Any, Any, T]]) -> Callable[..., T]:
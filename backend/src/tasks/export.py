@@ -0,0 +1,44 @@
+"""
+导出相关的 Celery 任务
+"""
+
+from typing import Any, Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.logging import get_logger
+from src.tasks.app import celery_app
+from src.tasks.base import async_task_decorator
+
+logger = get_logger(__name__)
+
+
+@celery_app.task(
+    bind=True,
+    max_retries=0,
+    name="export.export_jianying_chapter"
+)
+@async_task_decorator
+async def export_jianying_chapter(
+    db_session: AsyncSession,
+    self,
+    chapter_id: str,
+    user_id: str,
+    filename: Optional[str] = None
+) -> Dict[str, Any]:
+    """导出章节为剪映草稿并写入 MinIO 的 Celery 任务（filename 为提交时返回给客户端的文件名）"""
+    logger.info(f"Celery任务开始: export_jianying_chapter (chapter_id={chapter_id})")
+
+    from src.services.jianying_export import JianYingExportService
+
+    service = JianYingExportService(db_session)
+    result = await service.export_to_storage(chapter_id=chapter_id, user_id=user_id, filename=filename)
+    result["user_id"] = user_id
+
+    logger.info(f"Celery任务完成: export_jianying_chapter (object_key={result['object_key']})")
+    return result
+
+
+__all__ = [
+    "export_jianying_chapter",
+]
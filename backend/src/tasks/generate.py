@@ -15,13 +15,13 @@ logger = get_logger(__name__)
     name="generate.generate_prompts"
 )
 @async_task_decorator
-async def generate_prompts(db_session: AsyncSession, self, chapter_id: str, api_key_id: str, style: str, model: str = None, custom_prompt: str = None):
+async def generate_prompts(db_session: AsyncSession, self, chapter_id: str, api_key_id: str, style: str, model: str = None, custom_prompt: str = None, batch_size: int = None, use_cache: bool = True):
     """为章节生成提示词的 Celery 任务"""
     from src.services.prompt import PromptService
     logger.info(f"Celery任务开始: generate_prompts (chapter_id={chapter_id})")
     
     service = PromptService(db_session)
-    result = await service.generate_prompts_batch(chapter_id, api_key_id, style, model, custom_prompt)
+    result = await service.generate_prompts_batch(chapter_id, api_key_id, style, model, custom_prompt, batch_size, use_cache)
     
     logger.info(f"Celery任务成功: generate_prompts (chapter_id={chapter_id})")
     return result
@@ -32,13 +32,13 @@ async def generate_prompts(db_session: AsyncSession, self, chapter_id: str, api_
     name="generate.generate_prompts_by_ids"
 )
 @async_task_decorator
-async def generate_prompts_by_ids(db_session: AsyncSession, self, sentence_ids: List[str], api_key_id: str, style: str, model: str = None, custom_prompt: str = None):
+async def generate_prompts_by_ids(db_session: AsyncSession, self, sentence_ids: List[str], api_key_id: str, style: str, model: str = None, custom_prompt: str = None, batch_size: int = None, use_cache: bool = True):
     """为指定句子生成提示词的 Celery 任务"""
     from src.services.prompt import PromptService
     logger.info(f"Celery任务开始: generate_prompts_by_ids (sentence_ids={sentence_ids})")
     
     service = PromptService(db_session)
-    result = await service.generate_prompts_by_ids(sentence_ids, api_key_id, style, model, custom_prompt)
+    result = await service.generate_prompts_by_ids(sentence_ids, api_key_id, style, model, custom_prompt, batch_size, use_cache)
     
     logger.info(f"Celery任务成功: generate_prompts_by_ids")
     return result
@@ -223,6 +223,24 @@ async def sync_transition_video_status(db_session: AsyncSession, self):
     return result
 
 
+@celery_app.task(
+    bind=True,
+    max_retries=0,
+    name="movie.ingest_transition_video"
+)
+@async_task_decorator
+async def ingest_transition_video(db_session: AsyncSession, self, transition_id: str, video_task_id: str, video_url: str):
+    """下载并入库已完成的过渡视频（独立队列，避免慢下载阻塞状态同步）"""
+    from src.services.transition_service import TransitionService
+    logger.info(f"Celery任务开始: ingest_transition_video (transition_id={transition_id})")
+    
+    service = TransitionService(db_session)
+    result = await service.complete_transition_video(transition_id, video_task_id, video_url)
+    
+    logger.info(f"Celery任务完成: ingest_transition_video, 结果: {result}")
+    return result
+
+
 @celery_app.task(
     bind=True,
     max_retries=0,
@@ -320,7 +338,8 @@ async def movie_regenerate_transition_prompt(
         transition.from_shot,
         transition.to_shot,
         api_key_id,
-        model
+        model,
+        use_cache=False
     )
     
     # 更新提示词
@@ -0,0 +1,52 @@
+"""
+统计对账Celery任务
+"""
+
+from typing import Any, Dict
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.logging import get_logger
+from src.tasks.app import celery_app
+from src.tasks.base import async_task_decorator
+
+logger = get_logger(__name__)
+
+
+@celery_app.task(
+    bind=True,
+    max_retries=0,
+    name="statistics.reconcile_statistics"
+)
+@async_task_decorator
+async def reconcile_statistics(
+    db_session: AsyncSession,
+    self,
+) -> Dict[str, Any]:
+    """全量对账所有用户的仪表盘统计计数，逐用户提交"""
+    logger.info("Celery任务开始: reconcile_statistics")
+
+    from src.services.statistics import StatisticsService
+
+    service = StatisticsService(db_session)
+    owner_ids = await service.list_owner_ids()
+
+    reconciled = 0
+    failed = 0
+    for owner_id in owner_ids:
+        try:
+            await service.reconcile_user(owner_id)
+            await db_session.commit()
+            reconciled += 1
+        except Exception as e:
+            await db_session.rollback()
+            failed += 1
+            logger.error(f"用户 {owner_id} 统计对账失败: {e}")
+
+    logger.info(f"Celery任务完成: reconcile_statistics (成功={reconciled}, 失败={failed})")
+    return {"reconciled": reconciled, "failed": failed}
+
+
+__all__ = [
+    "reconcile_statistics",
+]
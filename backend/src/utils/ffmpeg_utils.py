@@ -2,11 +2,17 @@
 FFmpeg工具函数 - 视频处理相关的FFmpeg操作
 """
 
+import logging
+import re
 import subprocess
+import time
+from fractions import Fraction
 from pathlib import Path
 from typing import List, Optional, Tuple
 
 from src.core.logging import get_logger
+from src.core.metrics import FFMPEG_JOB_DURATION, FFMPEG_JOBS_IN_PROGRESS
+from src.core.tracing import record_span
 
 logger = get_logger(__name__)
 
@@ -104,6 +110,51 @@ def get_audio_duration(audio_path: str) -> Optional[float]:
         return None
 
 
+def detect_silences(
+        audio_path: str,
+        noise_db: float = -35.0,
+        min_duration: float = 0.15
+) -> List[Tuple[float, float]]:
+    """
+    检测音频中的静音区间（silencedetect）
+
+    Args:
+        audio_path: 音频文件路径
+        noise_db: 低于该音量视为静音（dB）
+        min_duration: 最短静音时长（秒）
+
+    Returns:
+        静音区间列表 [(开始, 结束)]，失败时返回空列表；结尾的静音没有 silence_end 时以音频时长结束
+    """
+    command = [
+        "ffmpeg",
+        "-hide_banner",
+        "-i", audio_path,
+        "-af", f"silencedetect=noise={noise_db}dB:d={min_duration}",
+        "-f", "null",
+        "-"
+    ]
+    success, _, stderr = run_ffmpeg_command(command, timeout=60)
+    if not success:
+        logger.warning(f"静音检测失败: {stderr}")
+        return []
+
+    silences = []
+    silence_start = None
+    for match in re.finditer(r"silence_(start|end): (-?[\d.]+)", stderr):
+        kind, value = match.group(1), max(0.0, float(match.group(2)))
+        if kind == "start":
+            silence_start = value
+        elif silence_start is not None:
+            silences.append((silence_start, value))
+            silence_start = None
+    if silence_start is not None:
+        duration = get_audio_duration(audio_path)
+        if duration and duration > silence_start:
+            silences.append((silence_start, duration))
+    return silences
+
+
 def get_video_fps(video_path: str) -> Optional[float]:
     """
     获取视频帧率
@@ -150,6 +201,37 @@ def get_video_fps(video_path: str) -> Optional[float]:
         return None
 
 
+def has_audio_stream(video_path: str) -> bool:
+    """
+    检查视频文件是否包含音频流
+
+    Args:
+        video_path: 视频文件路径
+
+    Returns:
+        是否包含音频流（探测失败时返回False）
+    """
+    try:
+        result = subprocess.run(
+            [
+                "ffprobe",
+                "-v", "error",
+                "-select_streams", "a",
+                "-show_entries", "stream=index",
+                "-of", "csv=p=0",
+                video_path
+            ],
+            capture_output=True,
+            text=True,
+            timeout=10
+        )
+        return result.returncode == 0 and bool(result.stdout.strip())
+
+    except Exception as e:
+        logger.error(f"检查音频流异常: {e}")
+        return False
+
+
 def create_concat_file(video_paths: List[Path], output_path: Path) -> None:
     """
     创建FFmpeg concat文件
@@ -184,8 +266,13 @@ def run_ffmpeg_command(command: List[str], timeout: int = 300) -> Tuple[bool, st
     Returns:
         (是否成功, 标准输出, 标准错误)
     """
+    start = time.perf_counter()
+    status = "error"
+    FFMPEG_JOBS_IN_PROGRESS.inc()
     try:
-        logger.info(f"执行FFmpeg命令: {' '.join(command)}")
+        # 完整命令行只在 DEBUG 级别拼接
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("执行FFmpeg命令: %s", " ".join(command))
 
         result = subprocess.run(
             command,
@@ -195,15 +282,17 @@ def run_ffmpeg_command(command: List[str], timeout: int = 300) -> Tuple[bool, st
         )
 
         success = result.returncode == 0
+        status = "success" if success else "failed"
 
         if success:
-            logger.info("FFmpeg命令执行成功")
+            logger.debug("FFmpeg命令执行成功")
         else:
             logger.error(f"FFmpeg命令执行失败: {result.stderr}")
 
         return success, result.stdout, result.stderr
 
     except subprocess.TimeoutExpired:
+        status = "timeout"
         error_msg = f"FFmpeg命令执行超时（{timeout}秒）"
         logger.error(error_msg)
         return False, "", error_msg
@@ -213,6 +302,184 @@ def run_ffmpeg_command(command: List[str], timeout: int = 300) -> Tuple[bool, st
         logger.error(error_msg)
         return False, "", error_msg
 
+    finally:
+        FFMPEG_JOBS_IN_PROGRESS.dec()
+        FFMPEG_JOB_DURATION.observe(time.perf_counter() - start, status)
+        record_span(
+            "ffmpeg",
+            start,
+            {"ffmpeg.status": status, "ffmpeg.output": Path(command[-1]).name if command else ""},
+            error=None if status == "success" else status,
+        )
+
+
+# 编码档位
+# mezzanine: 中间文件（单句缓存视频、后续还会重新编码的拼接结果），近无损、ultrafast、短 GOP 便于再次解码
+# delivery: 最终输出，只在最后一次编码时使用
+ENCODING_PROFILES = {
+    "mezzanine": {
+        "preset": "ultrafast",
+        "crf": 12,
+        "gop_seconds": 1,
+        "bframes": 0,
+    },
+    "delivery": {
+        "preset": "medium",
+        "crf": 18,
+        "profile": "high",
+        "level": "4.2",
+    },
+}
+
+# gen_setting 中选择编码档位的键及默认值
+CLIP_ENCODING_PROFILE_KEY = "clip_encoding_profile"
+OUTPUT_ENCODING_PROFILE_KEY = "output_encoding_profile"
+DEFAULT_CLIP_ENCODING_PROFILE = "mezzanine"
+DEFAULT_OUTPUT_ENCODING_PROFILE = "delivery"
+
+
+def get_encoding_args(profile_name: str, fps: Optional[float] = None) -> List[str]:
+    """
+    获取编码档位对应的 x264 参数（不含 -c:v）
+
+    Args:
+        profile_name: 档位名称（ENCODING_PROFILES 的键）
+        fps: 帧率（用于按秒计算 GOP 长度）
+
+    Returns:
+        FFmpeg参数列表
+
+    Raises:
+        ValueError: 档位不存在
+    """
+    profile = ENCODING_PROFILES.get(profile_name)
+    if profile is None:
+        raise ValueError(f"未知的编码档位: {profile_name}，可选: {', '.join(ENCODING_PROFILES)}")
+
+    args = ["-preset", profile["preset"], "-crf", str(profile["crf"])]
+    if "profile" in profile:
+        args += ["-profile:v", profile["profile"]]
+    if "level" in profile:
+        args += ["-level", profile["level"]]
+    if "gop_seconds" in profile and fps:
+        args += ["-g", str(max(1, int(round(fps * profile["gop_seconds"]))))]
+    if "bframes" in profile:
+        args += ["-bf", str(profile["bframes"])]
+    return args
+
+
+def resolve_encoding_profile(gen_setting: Optional[dict], key: str, default: str) -> str:
+    """
+    从生成设置中读取编码档位，未设置或无效时使用默认值
+
+    Args:
+        gen_setting: 生成设置
+        key: 设置键（CLIP_ENCODING_PROFILE_KEY / OUTPUT_ENCODING_PROFILE_KEY）
+        default: 默认档位
+
+    Returns:
+        档位名称
+    """
+    name = (gen_setting or {}).get(key) or default
+    if name not in ENCODING_PROFILES:
+        logger.warning(f"未知的编码档位 {name}，使用 {default}")
+        return default
+    return name
+
+
+# Ken Burns 效果
+# scale_crop: 静帧只缩放/补边一次并解码一次，之后逐帧用 scale（双三次插值）+ crop 生成运动画面
+# zoompan: 旧实现，逐帧 zoompan（最近邻取样，画面有抖动且开销最大）
+KEN_BURNS_RENDERERS = ("scale_crop", "zoompan")
+DEFAULT_KEN_BURNS_RENDERER = "scale_crop"
+KEN_BURNS_MAX_ZOOM = 1.15
+
+
+def get_ken_burns_canvas_size(width: int, height: int) -> Tuple[int, int]:
+    """Ken Burns 预缩放画布尺寸：按最大缩放倍数过采样，保证逐帧只做缩小"""
+    return (
+        int(width * KEN_BURNS_MAX_ZOOM) // 2 * 2,
+        int(height * KEN_BURNS_MAX_ZOOM) // 2 * 2,
+    )
+
+
+def _ken_burns_canvas_filter(width: int, height: int) -> str:
+    """把静帧等比缩放到画布尺寸并居中补黑边"""
+    canvas_width, canvas_height = get_ken_burns_canvas_size(width, height)
+    return (
+        f"scale={canvas_width}:{canvas_height}:force_original_aspect_ratio=decrease:flags=lanczos,"
+        f"pad={canvas_width}:{canvas_height}:(ow-iw)/2:(oh-ih)/2:black,"
+        f"setsar=1"
+    )
+
+
+def prepare_ken_burns_still(image_path: str, output_path: str, resolution: str) -> bool:
+    """
+    预先生成 Ken Burns 画布静帧（同一张图片的多个句子共用，避免重复解码原图和 lanczos 缩放）
+
+    Args:
+        image_path: 原图路径
+        output_path: 输出静帧路径（PNG）
+        resolution: 输出视频分辨率（如 1440x1080）
+
+    Returns:
+        是否成功
+    """
+    width, height = (int(v) for v in resolution.split('x'))
+    command = [
+        "ffmpeg",
+        "-y",
+        "-i", image_path,
+        "-vf", _ken_burns_canvas_filter(width, height),
+        "-frames:v", "1",
+        output_path
+    ]
+    success, _, stderr = run_ffmpeg_command(command, timeout=60)
+    if not success:
+        logger.error(f"生成Ken Burns静帧失败: {stderr}")
+    return success
+
+
+def _build_scale_crop_filter(width: int, height: int, fps: int, total_frames: int, zoom_speed: float) -> str:
+    """
+    静帧解码一次后用 loop 滤镜在内存中重复，逐帧缩小画布再裁剪出输出尺寸
+
+    缩放从 1.0 逐渐增大到 KEN_BURNS_MAX_ZOOM，裁剪窗口从中心向左上方移动（与 zoompan 版本方向一致）。
+    已经是画布尺寸的静帧（prepare_ken_burns_still）经过第一步 scale 时不做任何运算。
+    """
+    zoom = f"min(1+{zoom_speed}*n,{KEN_BURNS_MAX_ZOOM})"
+    progress = f"(1-n/{max(total_frames, 1)})"
+    return (
+        f"[0:v]{_ken_burns_canvas_filter(width, height)},"
+        f"format=yuv420p,"
+        f"loop=loop={total_frames}:size=1:start=0,"
+        f"setpts=N/({fps}*TB),"
+        # 画布缩小到 输出尺寸*zoom，再从中裁剪出输出尺寸
+        f"scale=w='trunc({width}*{zoom}/2)*2':h='trunc({height}*{zoom}/2)*2':eval=frame:flags=bicubic,"
+        f"crop={width}:{height}:x='(iw-ow)/2*{progress}':y='(ih-oh)/2*{progress}',"
+        f"setsar=1"
+    )
+
+
+def _build_zoompan_filter(width: int, height: int, fps: int, total_frames: int, zoom_speed: float) -> str:
+    """旧版 zoompan 滤镜链（输入为 -loop 1 的图片）"""
+    # zoompan参数：
+    # z: 缩放因子，使用pzoom（前一帧的zoom）+ 增量
+    # x, y: 平移坐标
+    # d: 持续帧数
+    # s: 输出尺寸
+    return (
+        f"[0:v]scale={width}:{height}:force_original_aspect_ratio=decrease,"
+        f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2:black,"
+        f"zoompan="
+        f"z='min(1+{zoom_speed}*on,{KEN_BURNS_MAX_ZOOM})':"  # 使用配置的缩放速度
+        f"x='iw/2-(iw/zoom/2)-{int(width)*0.05}*on/{total_frames}':"  # 从左向右平移
+        f"y='ih/2-(ih/zoom/2)-{int(height)*0.05}*on/{total_frames}':"  # 从上向下平移
+        f"d={total_frames}:"
+        f"s={width}x{height}:"
+        f"fps={fps}"
+    )
+
 
 def build_sentence_video_command(
         image_path: str,
@@ -225,7 +492,7 @@ def build_sentence_video_command(
     构建单句视频合成命令（电影级效果）
 
     Args:
-        image_path: 图片路径
+        image_path: 图片路径（原图，或 prepare_ken_burns_still 生成的画布静帧）
         audio_path: 音频路径
         output_path: 输出视频路径
         subtitle_filter: 字幕滤镜字符串
@@ -246,36 +513,28 @@ def build_sentence_video_command(
     audio_codec = gen_setting.get("audio_codec", "aac")
     audio_bitrate = gen_setting.get("audio_bitrate", "192k")
     zoom_speed = gen_setting.get("zoom_speed", 0.00015)  # Ken Burns缩放速度，默认0.00015
+    encoding_profile = resolve_encoding_profile(
+        gen_setting, CLIP_ENCODING_PROFILE_KEY, DEFAULT_CLIP_ENCODING_PROFILE
+    )
+    renderer = gen_setting.get("ken_burns_renderer", DEFAULT_KEN_BURNS_RENDERER)
+    if renderer not in KEN_BURNS_RENDERERS:
+        logger.warning(f"未知的Ken Burns渲染方式 {renderer}，使用 {DEFAULT_KEN_BURNS_RENDERER}")
+        renderer = DEFAULT_KEN_BURNS_RENDERER
 
     # 解析分辨率
-    width, height = resolution.split('x')
+    width, height = (int(v) for v in resolution.split('x'))
     
     # 计算总帧数
     total_frames = int(fps * duration)
 
-    # 增强的Ken Burns效果：
-    # 1. 缩放：从1.0逐渐放大到1.15（更明显的缩放）
-    # 2. 平移：从左上角移动到右下角（增加动感）
-    # 3. 使用easing函数让动画更自然
-    
-    # zoompan参数：
-    # z: 缩放因子，使用pzoom（前一帧的zoom）+ 增量
-    # x, y: 平移坐标
-    # d: 持续帧数
-    # s: 输出尺寸
-    
-    # 构建视频滤镜链
-    video_filters = (
-        f"[0:v]scale={width}:{height}:force_original_aspect_ratio=decrease,"
-        f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2:black,"
-        f"zoompan="
-        f"z='min(1+{zoom_speed}*on,1.15)':"  # 使用配置的缩放速度
-        f"x='iw/2-(iw/zoom/2)-{int(width)*0.05}*on/{total_frames}':"  # 从左向右平移
-        f"y='ih/2-(ih/zoom/2)-{int(height)*0.05}*on/{total_frames}':"  # 从上向下平移
-        f"d={total_frames}:"
-        f"s={width}x{height}:"
-        f"fps={fps}"
-    )
+    # Ken Burns效果：从1.0逐渐放大到1.15，同时向左上方平移
+    if renderer == "zoompan":
+        video_input = ["-loop", "1", "-framerate", str(fps), "-i", image_path]
+        video_filters = _build_zoompan_filter(width, height, fps, total_frames, zoom_speed)
+    else:
+        # 单帧输入，由 loop 滤镜重复，图片只解码一次
+        video_input = ["-i", image_path]
+        video_filters = _build_scale_crop_filter(width, height, fps, total_frames, zoom_speed)
     
     if subtitle_filter:
         # 有字幕时的滤镜链
@@ -293,18 +552,13 @@ def build_sentence_video_command(
     command = [
         "ffmpeg",
         "-y",
-        "-loop", "1",
-        "-framerate", str(fps),
-        "-i", image_path,
+        *video_input,
         "-i", audio_path,
         "-filter_complex", filter_complex,
         "-map", map_video,
         "-map", "1:a",
         "-c:v", video_codec,
-        "-preset", "slow",  # 使用slow预设获得最佳质量
-        "-crf", "20",  # 提高质量（更低的CRF值）
-        "-profile:v", "high",  # 使用high profile
-        "-level", "4.2",
+        *get_encoding_args(encoding_profile, fps),
         "-c:a", audio_codec,
         "-b:a", audio_bitrate,
         "-pix_fmt", "yuv420p",
@@ -327,7 +581,8 @@ def concatenate_videos(
     transition_duration: float = 0.5,
     # trim模式参数(保留向后兼容)
     remove_duplicate_frames: bool = False,
-    trim_frames: int = 35
+    trim_frames: int = 35,
+    encoding_profile: str = DEFAULT_OUTPUT_ENCODING_PROFILE
 ) -> bool:
     """
     拼接多个视频文件,支持多种拼接模式
@@ -351,6 +606,7 @@ def concatenate_videos(
         transition_duration: 过渡时长(秒), 默认0.5秒
         remove_duplicate_frames: 是否去除重复帧(trim模式,已废弃)
         trim_frames: 裁剪帧数(trim模式,已废弃)
+        encoding_profile: 重新编码时使用的编码档位(crossfade/trim模式)
     
     Returns:
         是否成功
@@ -371,12 +627,14 @@ def concatenate_videos(
         if mode == "crossfade":
             return _concatenate_with_xfade(
                 video_paths, output_path, 
-                transition_type, transition_duration
+                transition_type, transition_duration,
+                encoding_profile
             )
         elif mode == "trim" or remove_duplicate_frames:
             return _concatenate_with_trim(
                 video_paths, output_path, 
-                concat_file_path, trim_frames
+                concat_file_path, trim_frames,
+                encoding_profile
             )
         else:  # mode == "fast"
             return _concatenate_videos_fast(
@@ -398,7 +656,8 @@ def _concatenate_with_xfade(
     video_paths: List[Path],
     output_path: Path,
     transition_type: str = "fade",
-    transition_duration: float = 0.5
+    transition_duration: float = 0.5,
+    encoding_profile: str = DEFAULT_OUTPUT_ENCODING_PROFILE
 ) -> bool:
     """
     使用交叉淡化效果拼接视频(推荐方法)
@@ -408,6 +667,7 @@ def _concatenate_with_xfade(
         output_path: 输出视频路径
         transition_type: 过渡效果类型
         transition_duration: 过渡时长(秒)
+        encoding_profile: 编码档位
     
     Returns:
         是否成功
@@ -491,8 +751,7 @@ def _concatenate_with_xfade(
             "-map", "[vout]",
             "-map", "[aout]",
             "-c:v", "libx264",
-            "-preset", "medium",
-            "-crf", "18",  # 高质量
+            *get_encoding_args(encoding_profile, get_video_fps(str(video_paths[0]))),
             "-pix_fmt", "yuv420p",  # 确保兼容性
             "-c:a", "aac",
             "-b:a", "192k",
@@ -520,7 +779,8 @@ def _concatenate_with_trim(
     video_paths: List[Path],
     output_path: Path,
     concat_file_path: Path,
-    trim_frames: int = 35
+    trim_frames: int = 35,
+    encoding_profile: str = DEFAULT_OUTPUT_ENCODING_PROFILE
 ) -> bool:
     """
     使用帧裁剪方式拼接视频(旧方法,保留兼容性)
@@ -530,6 +790,7 @@ def _concatenate_with_trim(
         output_path: 输出视频路径
         concat_file_path: concat文件路径
         trim_frames: 裁剪帧数
+        encoding_profile: 编码档位
     
     Returns:
         是否成功
@@ -596,8 +857,7 @@ def _concatenate_with_trim(
             "-map", "[outv]",
             "-map", "[outa]",
             "-c:v", "libx264",
-            "-preset", "medium",
-            "-crf", "18",
+            *get_encoding_args(encoding_profile, fps),
             "-c:a", "aac",
             "-b:a", "192k",
             "-movflags", "+faststart",
@@ -666,6 +926,177 @@ def _concatenate_videos_fast(video_paths: List[Path], output_path: Path, concat_
 
 
 
+# 过渡视频拼接规范：所有过渡视频入库时统一转成该编码参数，拼接时只需 -c copy
+# 不同视频模型输出的时间基、编码 profile 可能不同，不统一则流拷贝拼接会失败或花屏。
+# 分辨率和帧率不写死，取自源视频（probe_video_stream），避免 1080p 片段被降采样；
+# 同一部电影的片段分辨率不一致时，合成阶段按第一个片段重新规范化
+TRANSITION_CONCAT_PROFILE = {
+    "video_codec": "libx264",
+    "video_profile": "high",
+    "pix_fmt": "yuv420p",
+    "crf": 20,
+    "preset": "medium",
+    "timescale": 90000,
+    "audio_codec": "aac",
+    "audio_sample_rate": 44100,
+    "audio_channels": 2,
+    "audio_bitrate": "128k",
+}
+
+
+def probe_video_stream(video_path: str) -> Optional[dict]:
+    """
+    获取视频流的分辨率和帧率
+
+    Args:
+        video_path: 视频文件路径
+
+    Returns:
+        {"width", "height", "fps"}，fps 为 ffprobe 的分数字符串（如 "30000/1001"）；
+        失败返回None
+    """
+    try:
+        result = subprocess.run(
+            [
+                "ffprobe",
+                "-v", "error",
+                "-select_streams", "v:0",
+                "-show_entries", "stream=width,height,r_frame_rate",
+                "-of", "default=noprint_wrappers=1",
+                video_path
+            ],
+            capture_output=True,
+            text=True,
+            timeout=10
+        )
+
+        if result.returncode != 0:
+            logger.error(f"获取视频流信息失败: {result.stderr}")
+            return None
+
+        fields = dict(
+            line.split("=", 1) for line in result.stdout.strip().splitlines() if "=" in line
+        )
+        stream = {
+            "width": int(fields["width"]),
+            "height": int(fields["height"]),
+            "fps": fields["r_frame_rate"],
+        }
+        if Fraction(stream["fps"]) <= 0:
+            raise ValueError(f"无效帧率: {stream['fps']}")
+        return stream
+
+    except Exception as e:
+        logger.error(f"获取视频流信息异常: {e}")
+        return None
+
+
+def concat_geometry_from_video(video_path: str) -> Optional[dict]:
+    """
+    以视频自身的分辨率和帧率作为拼接规范的画面参数
+
+    宽高向下取偶数（yuv420p 要求）。
+
+    Args:
+        video_path: 视频文件路径
+
+    Returns:
+        {"width", "height", "fps"}，探测失败返回None
+    """
+    stream = probe_video_stream(video_path)
+    if stream is None:
+        return None
+    return {
+        "width": stream["width"] // 2 * 2,
+        "height": stream["height"] // 2 * 2,
+        "fps": stream["fps"],
+    }
+
+
+def video_matches_concat_geometry(video_path: str, geometry: dict) -> bool:
+    """
+    检查视频的分辨率和帧率是否与拼接规范一致（探测失败视为不一致）
+    """
+    stream = probe_video_stream(video_path)
+    return (
+        stream is not None
+        and stream["width"] == geometry["width"]
+        and stream["height"] == geometry["height"]
+        and Fraction(stream["fps"]) == Fraction(str(geometry["fps"]))
+    )
+
+
+def normalize_video_for_concat(
+        input_path: str,
+        output_path: str,
+        profile: Optional[dict] = None,
+        timeout: int = 300
+) -> bool:
+    """
+    将视频转换为统一的拼接规范（分辨率、帧率、时间基、编码参数、音频轨）
+
+    画面按比例缩放后居中补黑边；没有音频流的视频补一条静音音轨，
+    保证所有片段的流结构一致，可以直接 concat 流拷贝。
+
+    Args:
+        input_path: 输入视频路径
+        output_path: 输出视频路径
+        profile: 覆盖 TRANSITION_CONCAT_PROFILE 的参数；未指定 width/height/fps 时
+            沿用输入视频自身的分辨率和帧率
+        timeout: 超时时间（秒）
+
+    Returns:
+        是否成功
+    """
+    p = {**TRANSITION_CONCAT_PROFILE, **(profile or {})}
+    if not all(key in p for key in ("width", "height", "fps")):
+        geometry = concat_geometry_from_video(input_path)
+        if geometry is None:
+            logger.error(f"视频规范化失败，无法获取分辨率和帧率: {input_path}")
+            return False
+        p = {**geometry, **p}
+    width, height = p["width"], p["height"]
+
+    video_filter = (
+        f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+        f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,"
+        f"setsar=1,fps={p['fps']},format={p['pix_fmt']}"
+    )
+
+    command = ["ffmpeg", "-y", "-i", input_path]
+    if has_audio_stream(input_path):
+        command += ["-map", "0:v:0", "-map", "0:a:0"]
+    else:
+        command += [
+            "-f", "lavfi",
+            "-i", f"anullsrc=channel_layout=stereo:sample_rate={p['audio_sample_rate']}",
+            "-map", "0:v:0", "-map", "1:a:0",
+            "-shortest",
+        ]
+
+    command += [
+        "-vf", video_filter,
+        "-c:v", p["video_codec"],
+        "-profile:v", p["video_profile"],
+        "-preset", p["preset"],
+        "-crf", str(p["crf"]),
+        "-video_track_timescale", str(p["timescale"]),
+        "-c:a", p["audio_codec"],
+        "-ar", str(p["audio_sample_rate"]),
+        "-ac", str(p["audio_channels"]),
+        "-b:a", p["audio_bitrate"],
+        "-movflags", "+faststart",
+        output_path
+    ]
+
+    success, _, stderr = run_ffmpeg_command(command, timeout=timeout)
+    if success:
+        logger.info(f"视频规范化成功: {input_path} -> {output_path}")
+    else:
+        logger.error(f"视频规范化失败: {stderr}")
+    return success
+
+
 def mix_bgm_with_video(
         video_path: str,
         bgm_path: str,
@@ -756,7 +1187,8 @@ def mix_bgm_with_video(
 def apply_video_speed(
         input_path: str,
         output_path: str,
-        speed: float = 1.0
+        speed: float = 1.0,
+        encoding_profile: str = DEFAULT_OUTPUT_ENCODING_PROFILE
 ) -> bool:
     """
     对整个视频应用速度调整
@@ -765,6 +1197,7 @@ def apply_video_speed(
         input_path: 输入视频路径
         output_path: 输出视频路径
         speed: 播放速度（0.5-2.0），默认1.0（正常速度）
+        encoding_profile: 编码档位
 
     Returns:
         是否成功
@@ -808,8 +1241,8 @@ def apply_video_speed(
             "-filter:v", video_filter,
             "-filter:a", audio_filter,
             "-c:v", "libx264",
-            "-preset", "medium",
-            "-crf", "23",
+            *get_encoding_args(encoding_profile, get_video_fps(input_path)),
+            "-pix_fmt", "yuv420p",
             "-c:a", "aac",
             "-b:a", "192k",
             output_path
@@ -833,11 +1266,29 @@ def apply_video_speed(
 __all__ = [
     "check_ffmpeg_installed",
     "get_audio_duration",
+    "detect_silences",
     "get_video_fps",
+    "has_audio_stream",
     "create_concat_file",
     "run_ffmpeg_command",
+    "ENCODING_PROFILES",
+    "CLIP_ENCODING_PROFILE_KEY",
+    "OUTPUT_ENCODING_PROFILE_KEY",
+    "DEFAULT_CLIP_ENCODING_PROFILE",
+    "DEFAULT_OUTPUT_ENCODING_PROFILE",
+    "get_encoding_args",
+    "resolve_encoding_profile",
+    "KEN_BURNS_RENDERERS",
+    "DEFAULT_KEN_BURNS_RENDERER",
+    "get_ken_burns_canvas_size",
+    "prepare_ken_burns_still",
     "build_sentence_video_command",
     "concatenate_videos",
+    "TRANSITION_CONCAT_PROFILE",
+    "probe_video_stream",
+    "concat_geometry_from_video",
+    "video_matches_concat_geometry",
+    "normalize_video_for_concat",
     "apply_video_speed",
     "mix_bgm_with_video",
 ]
@@ -0,0 +1,172 @@
+"""
+图片衍生图 - 生成图片的缩略图和预览图
+
+列表页只需要小图，原图（通常是数 MB 的 PNG）只在查看详情或合成视频时使用。
+生成图片入库时同时生成：
+- thumbnail：最长边 IMAGE_THUMBNAIL_MAX_SIZE，用于列表/网格
+- preview：最长边 IMAGE_PREVIEW_MAX_SIZE，用于预览
+
+衍生图的对象键由原图对象键和格式确定（derivatives/<variant>/<原图键去扩展名>.<格式>）。
+生成成功后调用方把格式记录在原图键旁边（如 sentences.image_derivative_format），
+接口层只为记录了格式的图片签发衍生图URL，没有衍生图时返回 None，前端回退到原图。
+"""
+
+import io
+from datetime import timedelta
+from functools import lru_cache
+from pathlib import PurePosixPath
+from typing import Dict, Optional
+
+from PIL import Image, ImageOps, features
+
+from src.core.config import settings
+from src.core.executor import run_cpu_bound
+from src.core.logging import get_logger
+from src.utils.storage import get_storage_client, storage_client
+
+logger = get_logger(__name__)
+
+DERIVATIVE_PREFIX = "derivatives"
+DERIVATIVE_VARIANTS = ("thumbnail", "preview")
+_CONTENT_TYPES = {"webp": "image/webp", "avif": "image/avif"}
+
+
+@lru_cache(maxsize=1)
+def get_derivative_format() -> str:
+    """衍生图格式：配置为 avif 且 Pillow 支持 AVIF 编码时用 avif，否则 webp"""
+    configured = (settings.IMAGE_DERIVATIVE_FORMAT or "webp").lower()
+    if configured == "avif" and not features.check("avif"):
+        logger.warning("Pillow 不支持 AVIF 编码，衍生图使用 webp")
+        return "webp"
+    return configured if configured in _CONTENT_TYPES else "webp"
+
+
+def _max_size(variant: str) -> int:
+    if variant == "thumbnail":
+        return settings.IMAGE_THUMBNAIL_MAX_SIZE
+    return settings.IMAGE_PREVIEW_MAX_SIZE
+
+
+def get_derivative_key(
+        object_key: Optional[str],
+        variant: str,
+        image_format: Optional[str] = None
+) -> Optional[str]:
+    """
+    原图对象键 → 衍生图对象键
+
+    外部URL（http/data）没有衍生图，返回 None
+
+    Args:
+        object_key: 原图对象键
+        variant: 衍生图尺寸
+        image_format: 衍生图格式，默认当前配置的格式
+    """
+    if not object_key or object_key.startswith(("http://", "https://", "data:")):
+        return None
+    stem = PurePosixPath(object_key).with_suffix("")
+    return f"{DERIVATIVE_PREFIX}/{variant}/{stem}.{image_format or get_derivative_format()}"
+
+
+def render_derivatives(data: bytes) -> Dict[str, bytes]:
+    """
+    生成各尺寸衍生图（CPU 密集，调用方通过 run_cpu_bound 执行）
+
+    Args:
+        data: 原图内容
+
+    Returns:
+        {variant: 编码后的内容}
+    """
+    image_format = get_derivative_format()
+    quality = settings.IMAGE_DERIVATIVE_QUALITY
+
+    with Image.open(io.BytesIO(data)) as source:
+        # JPEG 解码时直接按目标尺寸降采样，不解码全尺寸像素
+        largest = max(_max_size(variant) for variant in DERIVATIVE_VARIANTS)
+        source.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(source)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() or "transparency" in image.info else "RGB")
+
+        rendered = {}
+        for variant in sorted(DERIVATIVE_VARIANTS, key=_max_size, reverse=True):
+            size = _max_size(variant)
+            # 从上一个（更大的）尺寸继续缩小，比每次从原图缩放更快
+            image.thumbnail((size, size), Image.Resampling.LANCZOS)
+            output = io.BytesIO()
+            image.save(output, format=image_format.upper(), quality=quality)
+            rendered[variant] = output.getvalue()
+    return rendered
+
+
+async def create_image_derivatives(object_key: str, data: Optional[bytes] = None) -> Optional[str]:
+    """
+    生成并上传原图的衍生图
+
+    衍生图只是加速展示，失败时记录日志，不影响原图入库。
+
+    Args:
+        object_key: 原图对象键
+        data: 原图内容（不传则从存储读取）
+
+    Returns:
+        衍生图格式（调用方记录在原图键旁边），未生成时返回 None
+    """
+    if not settings.IMAGE_DERIVATIVES_ENABLED or not get_derivative_key(object_key, DERIVATIVE_VARIANTS[0]):
+        return None
+
+    try:
+        storage = await get_storage_client()
+        if data is None:
+            data = await storage.read_object(object_key)
+        rendered = await run_cpu_bound(render_derivatives, data)
+
+        image_format = get_derivative_format()
+        for variant, content in rendered.items():
+            key = get_derivative_key(object_key, variant, image_format)
+            await storage.upload_bytes(key, content, content_type=_CONTENT_TYPES[image_format])
+        logger.debug(
+            f"衍生图生成完成: {object_key}, "
+            + ", ".join(f"{variant} {len(content)} bytes" for variant, content in rendered.items())
+        )
+        return image_format
+    except Exception as e:
+        logger.warning(f"衍生图生成失败: {object_key}, {e}")
+        return None
+
+
+def get_derivative_urls(
+        object_key: Optional[str],
+        image_format: Optional[str],
+        expires: timedelta = timedelta(hours=1)
+) -> Dict[str, Optional[str]]:
+    """
+    衍生图的预签名URL（签名在本地计算，不访问存储）
+
+    Args:
+        object_key: 原图对象键
+        image_format: 记录的衍生图格式，为空表示没有衍生图
+        expires: 有效期
+
+    Returns:
+        {"thumbnail_url": ..., "preview_url": ...}，未启用或没有衍生图时为 None
+    """
+    urls: Dict[str, Optional[str]] = {f"{variant}_url": None for variant in DERIVATIVE_VARIANTS}
+    if not settings.IMAGE_DERIVATIVES_ENABLED or not image_format:
+        return urls
+    for variant in DERIVATIVE_VARIANTS:
+        key = get_derivative_key(object_key, variant, image_format)
+        if key:
+            urls[f"{variant}_url"] = storage_client.get_presigned_url(key, expires)
+    return urls
+
+
+__all__ = [
+    "DERIVATIVE_VARIANTS",
+    "create_image_derivatives",
+    "get_derivative_format",
+    "get_derivative_key",
+    "get_derivative_urls",
+    "render_derivatives",
+]
@@ -1,6 +1,7 @@
 """
 图像处理工具函数
 """
+import asyncio
 import base64
 import io
 import re
@@ -9,11 +10,46 @@ import aiohttp
 from typing import Any, Tuple, Optional
 
 from src.core.logging import get_logger
+from src.utils.image_derivatives import create_image_derivatives
 from src.utils.storage import get_storage_client, UploadFile
 
 logger = get_logger(__name__)
 
 
+def encode_base64(data: bytes) -> str:
+    """字节 → base64 字符串（大图在线程中调用：asyncio.to_thread(encode_base64, data)）"""
+    return base64.b64encode(data).decode("utf-8")
+
+
+def decode_base64(data: str) -> bytes:
+    """base64 字符串 → 字节，补齐缺失的 padding"""
+    missing_padding = len(data) % 4
+    if missing_padding:
+        data += "=" * (4 - missing_padding)
+    return base64.b64decode(data)
+
+
+def detect_image_mime_type(image_bytes: bytes, content_type: Optional[str] = None) -> str:
+    """按响应头或文件头判断图片 MIME 类型"""
+    normalized_type = str(content_type or "").strip().lower()
+    if normalized_type.startswith("image/"):
+        return normalized_type.split(";", 1)[0]
+    if image_bytes.startswith(b"\x89PNG"):
+        return "image/png"
+    if image_bytes.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if image_bytes.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+    if image_bytes.startswith(b"RIFF") and image_bytes[8:12] == b"WEBP":
+        return "image/webp"
+    return "image/jpeg"
+
+
+def build_image_data_url(image_bytes: bytes, content_type: Optional[str] = None) -> str:
+    """图片 → data URL（大图由调用方通过 asyncio.to_thread 执行）"""
+    return f"data:{detect_image_mime_type(image_bytes, content_type)};base64,{encode_base64(image_bytes)}"
+
+
 async def extract_image_url_from_response(result: Any) -> str:
     """
     从Provider响应中提取图片URL
@@ -58,9 +94,9 @@ async def extract_and_upload_image(
     result: Any, 
     user_id: str, 
     metadata: dict = None
-) -> str:
+) -> Tuple[str, Optional[str]]:
     """
-    从Provider响应中提取图片并上传到存储
+    从Provider响应中提取图片并上传到存储，同时生成缩略图/预览图
     
     支持：
     - URL格式（直接返回）
@@ -73,7 +109,8 @@ async def extract_and_upload_image(
         metadata: 上传元数据
         
     Returns:
-        str: 存储对象的key
+        (存储对象的key, 衍生图格式)，衍生图未生成时格式为 None；
+        调用方把格式和对象键一起保存（如 shot.keyframe_derivative_format）
     """
     # 1. 提取图片数据
     image_bytes, mime_type = await _extract_image_bytes(result)
@@ -95,8 +132,11 @@ async def extract_and_upload_image(
         file=upload_file,
         metadata=metadata or {}
     )
+
+    # 3. 生成缩略图/预览图
+    derivative_format = await create_image_derivatives(storage_result["object_key"], image_bytes)
     
-    return storage_result["object_key"]
+    return storage_result["object_key"], derivative_format
 
 
 async def _extract_image_bytes(result: Any) -> Tuple[bytes, str]:
@@ -115,13 +155,8 @@ async def _extract_image_bytes(result: Any) -> Tuple[bytes, str]:
             mime_type = getattr(image_data, 'mime', 'image/png')
             logger.info(f"使用 b64_json 格式, MIME: {mime_type}")
             
-            # 修复base64 padding问题
-            # 确保base64字符串长度是4的倍数
-            missing_padding = len(base64_data) % 4
-            if missing_padding:
-                base64_data += '=' * (4 - missing_padding)
-            
-            image_bytes = base64.b64decode(base64_data)
+            # 修复base64 padding问题，解码放到线程里执行（图片通常有数 MB）
+            image_bytes = await asyncio.to_thread(decode_base64, base64_data)
             return image_bytes, mime_type
         
         # 使用 URL
@@ -162,7 +197,7 @@ async def _download_image_from_url(image_url: str) -> Tuple[bytes, str]:
         
         mime_type = match.group(1)
         base64_data = match.group(2)
-        image_bytes = base64.b64decode(base64_data)
+        image_bytes = await asyncio.to_thread(decode_base64, base64_data)
         logger.info(f"从 data URL 解码图片, MIME: {mime_type}, 大小: {len(image_bytes)} bytes")
         return image_bytes, mime_type
     
@@ -193,7 +228,7 @@ async def _download_image_from_url(image_url: str) -> Tuple[bytes, str]:
         if is_internal and object_key:
             try:
                 storage_client = await get_storage_client()
-                image_bytes = await storage_client.download_file(object_key)
+                image_bytes = await storage_client.read_object(object_key)
                 mime_type = 'image/png' # 默认，后续会自动处理
                 if image_bytes[:4] == b'\xff\xd8\xff\xe0': mime_type = 'image/jpeg'
                 elif image_bytes[:4] == b'\x89PNG': mime_type = 'image/png'
@@ -227,6 +262,10 @@ def _get_extension_from_mime(mime_type: str) -> str:
 
 
 __all__ = [
+    'build_image_data_url',
+    'decode_base64',
+    'detect_image_mime_type',
+    'encode_base64',
     'extract_image_url_from_response',
     'extract_and_upload_image',
 ]
@@ -2,10 +2,15 @@
 MinIO对象存储客户端 - 文件存储和管理
 """
 
+import asyncio
+import contextlib
+import io
+import queue
+import time
 import uuid
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import aiofiles
 from fastapi import UploadFile
@@ -14,10 +19,19 @@ from minio.error import S3Error
 
 from src.core.config import settings
 from src.core.logging import get_logger
+from src.core.metrics import STORAGE_TRANSFER_BYTES, STORAGE_TRANSFER_DURATION
+from src.core.tracing import record_span
 
 logger = get_logger(__name__)
 
 
+def _record_transfer(direction: str, size: int, start: float) -> None:
+    """记录一次传输的字节数和耗时（direction: upload/download）"""
+    STORAGE_TRANSFER_BYTES.inc(direction, amount=size)
+    STORAGE_TRANSFER_DURATION.observe(time.perf_counter() - start, direction)
+    record_span(f"storage.{direction}", start, {"storage.bytes": size})
+
+
 class StorageError(Exception):
     """存储异常"""
     pass
@@ -133,6 +147,7 @@ class MinIOStorage:
             file.file.seek(0)  # 重置到开头
 
             # 上传文件
+            start = time.perf_counter()
             result = self.client.put_object(
                 bucket_name=self.bucket_name,
                 object_name=object_key,
@@ -141,6 +156,7 @@ class MinIOStorage:
                 content_type=file.content_type,
                 metadata=metadata,
             )
+            _record_transfer("upload", file_size, start)
 
             logger.info(f"文件上传成功: {object_key}, 大小: {file_size} bytes")
 
@@ -204,6 +220,7 @@ class MinIOStorage:
             })
 
             # 上传文件
+            start = time.perf_counter()
             with open(file_path, 'rb') as file_data:
                 result = self.client.put_object(
                     bucket_name=self.bucket_name,
@@ -212,6 +229,7 @@ class MinIOStorage:
                     length=file_size,
                     metadata=metadata,
                 )
+            _record_transfer("upload", file_size, start)
 
             logger.info(f"文件上传成功: {object_key}, 大小: {file_size} bytes")
 
@@ -296,8 +314,11 @@ class MinIOStorage:
             文件内容
         """
         try:
+            start = time.perf_counter()
             response = self.client.get_object(self.bucket_name, object_key)
-            return response.read()
+            data = response.read()
+            _record_transfer("download", len(data), start)
+            return data
         except S3Error as e:
             logger.error(f"下载文件失败: {e}")
             raise StorageError(f"下载文件失败: {str(e)}")
@@ -310,19 +331,26 @@ class MinIOStorage:
             object_key: 对象键
             dest_path: 目标路径
         """
-        try:
+        def _download() -> None:
+            start = time.perf_counter()
             response = self.client.get_object(self.bucket_name, object_key)
+            try:
+                # 确保目标目录存在
+                Path(dest_path).parent.mkdir(parents=True, exist_ok=True)
+
+                # MinIO的stream()返回同步生成器，在线程中分块写盘，不整体读入内存
+                size = 0
+                with open(dest_path, 'wb') as f:
+                    for chunk in response.stream(1024 * 1024):
+                        f.write(chunk)
+                        size += len(chunk)
+                _record_transfer("download", size, start)
+            finally:
+                response.close()
+                response.release_conn()
 
-            # 确保目标目录存在
-            Path(dest_path).parent.mkdir(parents=True, exist_ok=True)
-
-            # MinIO的stream()返回同步生成器，使用同步写入
-            with open(dest_path, 'wb') as f:
-                for chunk in response.stream(8192):
-                    f.write(chunk)
-            
-            response.close()
-            response.release_conn()
+        try:
+            await asyncio.to_thread(_download)
 
             logger.info(f"文件下载成功: {object_key} -> {dest_path}")
 
@@ -330,6 +358,139 @@ class MinIOStorage:
             logger.error(f"下载文件失败: {e}")
             raise StorageError(f"下载文件失败: {str(e)}")
 
+    async def read_object(self, object_key: str) -> bytes:
+        """
+        在线程池中读取对象内容，不阻塞事件循环
+
+        Args:
+            object_key: 对象键
+
+        Returns:
+            文件内容
+        """
+        def _read() -> bytes:
+            start = time.perf_counter()
+            response = self.client.get_object(self.bucket_name, object_key)
+            try:
+                data = response.read()
+                _record_transfer("download", len(data), start)
+                return data
+            finally:
+                response.close()
+                response.release_conn()
+
+        try:
+            return await asyncio.to_thread(_read)
+        except S3Error as e:
+            logger.error(f"下载文件失败: {e}")
+            raise StorageError(f"下载文件失败: {str(e)}")
+
+    async def upload_bytes(
+            self,
+            object_key: str,
+            data: bytes,
+            content_type: str = "application/octet-stream",
+    ) -> Dict[str, Any]:
+        """
+        在线程池中把内存中的字节写入指定对象键
+
+        Args:
+            object_key: 对象键
+            data: 文件内容
+            content_type: 内容类型
+
+        Returns:
+            上传结果信息
+        """
+        start = time.perf_counter()
+        try:
+            result = await asyncio.to_thread(
+                self.client.put_object,
+                bucket_name=self.bucket_name,
+                object_name=object_key,
+                data=io.BytesIO(data),
+                length=len(data),
+                content_type=content_type,
+            )
+        except S3Error as e:
+            logger.error(f"MinIO上传失败: {e}")
+            raise StorageError(f"文件上传失败: {str(e)}")
+
+        _record_transfer("upload", len(data), start)
+        return {
+            "bucket": self.bucket_name,
+            "object_key": object_key,
+            "size": len(data),
+            "etag": result.etag,
+        }
+
+    async def upload_stream(
+            self,
+            object_key: str,
+            chunks: AsyncIterator[bytes],
+            content_type: str = "application/octet-stream",
+            part_size: int = 10 * 1024 * 1024,
+    ) -> Dict[str, Any]:
+        """
+        把异步字节流以分片上传方式写入MinIO，不落本地文件
+
+        Args:
+            object_key: 对象键
+            chunks: 异步字节块迭代器
+            content_type: 内容类型
+            part_size: 分片大小（MinIO 要求至少 5MB）
+
+        Returns:
+            上传结果信息
+        """
+        reader = _ChunkQueueReader()
+        start = time.perf_counter()
+        upload = asyncio.create_task(asyncio.to_thread(
+            self.client.put_object,
+            bucket_name=self.bucket_name,
+            object_name=object_key,
+            data=reader,
+            length=-1,
+            part_size=part_size,
+            content_type=content_type,
+        ))
+        # 上传线程提前结束（失败）时，让生产者不再阻塞
+        upload.add_done_callback(lambda _: reader.abort())
+        size = 0
+        try:
+            async for chunk in chunks:
+                if upload.done():
+                    break
+                size += len(chunk)
+                await asyncio.to_thread(reader.feed, chunk)
+        except BaseException:
+            reader.abort()
+            # 等上传线程退出并取走它的异常，原始异常继续向上抛出
+            with contextlib.suppress(Exception):
+                await upload
+            raise
+        finally:
+            reader.close()
+
+        try:
+            result = await upload
+        except S3Error as e:
+            logger.error(f"MinIO流式上传失败: {e}")
+            raise StorageError(f"文件上传失败: {str(e)}")
+        except Exception as e:
+            # 上传线程提前失败（连接中断、读取被中止等）
+            logger.error(f"MinIO流式上传失败: {e}")
+            raise StorageError(f"文件上传失败: {str(e)}") from e
+
+        _record_transfer("upload", size, start)
+        logger.info(f"流式上传成功: {object_key}, 大小: {size} bytes")
+        return {
+            "bucket": self.bucket_name,
+            "object_key": object_key,
+            "size": size,
+            "etag": result.etag,
+        }
+
     async def delete_file(self, object_key: str) -> bool:
         """
         删除文件
@@ -465,6 +626,55 @@ class MinIOStorage:
             return False
 
 
+class _ChunkQueueReader:
+    """
+    供 put_object 在工作线程中读取的类文件对象
+
+    生产者通过 feed() 推入字节块（队列有界，形成背压），close() 表示结束，
+    abort() 让读取方和生产者都立即停止。
+    """
+
+    def __init__(self, max_chunks: int = 8):
+        self._queue: "queue.Queue[bytes]" = queue.Queue(maxsize=max_chunks)
+        self._buffer = bytearray()
+        self._closed = False
+        self._finished = False
+        self._aborted = False
+
+    def feed(self, chunk: bytes) -> None:
+        while not self._aborted:
+            try:
+                self._queue.put(chunk, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def close(self) -> None:
+        self._closed = True
+
+    def abort(self) -> None:
+        self._aborted = True
+
+    def read(self, size: int = -1) -> bytes:
+        while not self._finished and (size < 0 or len(self._buffer) < size):
+            if self._aborted:
+                raise IOError("上传数据流已中止")
+            try:
+                self._buffer.extend(self._queue.get(timeout=0.5))
+            except queue.Empty:
+                # 生产者已结束且队列已空
+                if self._closed and self._queue.empty():
+                    self._finished = True
+
+        if size < 0 or size >= len(self._buffer):
+            data = bytes(self._buffer)
+            self._buffer.clear()
+        else:
+            data = bytes(self._buffer[:size])
+            del self._buffer[:size]
+        return data
+
+
 # 全局存储客户端实例
 storage_client = MinIOStorage()
 
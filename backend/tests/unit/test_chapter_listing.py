@@ -0,0 +1,63 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from src.core.exceptions import ValidationError
+from src.services.chapter import _decode_chapter_cursor, _encode_chapter_cursor, _escape_like
+
+
+@pytest.mark.unit
+def test_chapter_cursor_round_trip_preserves_datetime_and_id():
+    chapter_id = uuid.uuid4()
+    updated_at = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+    cursor = _encode_chapter_cursor("updated_at", True, updated_at, chapter_id)
+
+    assert _decode_chapter_cursor(cursor, "updated_at", True) == (updated_at, chapter_id)
+
+
+@pytest.mark.unit
+def test_chapter_cursor_rejects_mismatched_sort():
+    cursor = _encode_chapter_cursor("chapter_number", False, 12, uuid.uuid4())
+
+    with pytest.raises(ValidationError):
+        _decode_chapter_cursor(cursor, "chapter_number", True)
+    with pytest.raises(ValidationError):
+        _decode_chapter_cursor("not-a-cursor", "chapter_number", False)
+
+
+@pytest.mark.unit
+def test_escape_like_treats_wildcards_literally():
+    assert _escape_like("100%_a\\b") == "100\\%\\_a\\\\b"
+
+
+def _listing_sql(**kwargs):
+    from unittest.mock import AsyncMock, MagicMock
+
+    from sqlalchemy.dialects import postgresql
+
+    from src.services.chapter import ChapterService
+
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=MagicMock())
+    service = ChapterService(session)
+    asyncio.run(service.get_project_chapters(None, count_mode="none", **kwargs))
+    statement = session.execute.await_args.args[0]
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.unit
+def test_short_search_still_matches_content():
+    sql = _listing_sql(search="雪")
+    assert "chapters.title ILIKE" in sql
+    assert "chapters.content ILIKE" in sql
+
+
+@pytest.mark.unit
+def test_word_count_keyset_treats_null_as_zero():
+    cursor = _encode_chapter_cursor("word_count", False, 0, uuid.uuid4())
+    sql = _listing_sql(sort_by="word_count", cursor=cursor)
+    assert "ORDER BY coalesce(chapters.word_count" in sql
+    assert "(coalesce(chapters.word_count" in sql
@@ -0,0 +1,90 @@
+import uuid
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.models.sentence import Sentence
+from src.services.content_maintenance import ContentMaintenanceService
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_purge_chapters_deletes_in_batches_children_first():
+    service = ContentMaintenanceService(Mock(), batch_size=2, use_fk_cascade=False)
+    calls = []
+
+    def recorder(name, count):
+        async def _delete(_session, ids):
+            calls.append((name, list(ids)))
+            return count * len(ids)
+        return _delete
+
+    with patch("src.services.content_maintenance.Sentence.delete_by_chapter_ids", side_effect=recorder("sentences", 10)), \
+            patch("src.services.content_maintenance.Paragraph.delete_by_chapter_ids", side_effect=recorder("paragraphs", 3)), \
+            patch("src.services.content_maintenance.Chapter.delete_by_ids", side_effect=recorder("chapters", 1)):
+        deleted = await service.purge_chapters(["c1", "c2", "c3"])
+
+    assert deleted == {"chapters": 3, "paragraphs": 9, "sentences": 30}
+    assert calls == [
+        ("sentences", ["c1", "c2"]),
+        ("paragraphs", ["c1", "c2"]),
+        ("chapters", ["c1", "c2"]),
+        ("sentences", ["c3"]),
+        ("paragraphs", ["c3"]),
+        ("chapters", ["c3"]),
+    ]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_purge_chapters_with_fk_cascade_only_deletes_chapters():
+    service = ContentMaintenanceService(Mock(), batch_size=50, use_fk_cascade=True)
+
+    with patch("src.services.content_maintenance.Sentence.delete_by_chapter_ids", AsyncMock()) as delete_sentences, \
+            patch("src.services.content_maintenance.Paragraph.delete_by_chapter_ids", AsyncMock()) as delete_paragraphs, \
+            patch("src.services.content_maintenance.Chapter.delete_by_ids", AsyncMock(return_value=2)):
+        deleted = await service.purge_chapters(["c1", "c2"])
+
+    assert deleted == {"chapters": 2, "paragraphs": 0, "sentences": 0}
+    delete_sentences.assert_not_awaited()
+    delete_paragraphs.assert_not_awaited()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_sentence_delete_by_project_id_uses_denormalized_project_id():
+    session = Mock()
+    session.execute = AsyncMock(return_value=Mock(rowcount=7))
+
+    deleted = await Sentence.delete_by_project_id(session, "00000000-0000-0000-0000-000000000001")
+
+    statement = session.execute.await_args.args[0]
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert deleted == 7
+    assert "sentences.project_id =" in sql
+    assert "paragraphs" not in sql
+    session.execute.assert_awaited_once()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_sentence_batch_create_fills_hierarchy_from_paragraphs():
+    paragraph_id = uuid.uuid4()
+    chapter_id = uuid.uuid4()
+    project_id = uuid.uuid4()
+    lookup = Mock()
+    lookup.__iter__ = Mock(return_value=iter([
+        Mock(id=paragraph_id, chapter_id=chapter_id, project_id=project_id, order_index=3),
+    ]))
+    session = Mock()
+    session.execute = AsyncMock(side_effect=[lookup, Mock()])
+    session.flush = AsyncMock()
+
+    sentences_data = [{"content": "一句话", "order_index": 1}]
+    await Sentence.batch_create(session, sentences_data, [paragraph_id])
+
+    assert sentences_data[0]["chapter_id"] == chapter_id
+    assert sentences_data[0]["project_id"] == project_id
+    assert sentences_data[0]["paragraph_order"] == 3
+    assert session.execute.await_count == 2
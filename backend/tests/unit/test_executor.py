@@ -0,0 +1,56 @@
+"""
+CPU 密集任务执行器单元测试
+"""
+
+import asyncio
+import base64
+
+import pytest
+
+from src.core import executor
+from src.core.executor import run_cpu_bound, shutdown_cpu_executor
+
+
+@pytest.fixture(autouse=True)
+def _reset_executor(monkeypatch):
+    monkeypatch.setattr(executor, "_process_pool_disabled", False)
+    yield
+    shutdown_cpu_executor()
+
+
+@pytest.mark.unit
+def test_run_cpu_bound_in_process_pool(monkeypatch):
+    monkeypatch.setattr(executor.settings, "CPU_EXECUTOR_PROCESSES", 1)
+    result = asyncio.run(run_cpu_bound(base64.b64encode, b"image-bytes"))
+    assert result == base64.b64encode(b"image-bytes")
+    assert executor._process_pool is not None
+
+
+@pytest.mark.unit
+def test_run_cpu_bound_uses_threads_when_disabled(monkeypatch):
+    monkeypatch.setattr(executor.settings, "CPU_EXECUTOR_PROCESSES", 0)
+    result = asyncio.run(run_cpu_bound(base64.b64decode, "aW1hZ2U="))
+    assert result == b"image"
+    assert executor._process_pool is None
+
+
+@pytest.mark.unit
+def test_falls_back_to_threads_when_processes_cannot_start(monkeypatch):
+    class _DaemonPool:
+        def submit(self, *args, **kwargs):
+            raise AssertionError("daemonic processes are not allowed to have children")
+
+        def shutdown(self, *args, **kwargs):
+            pass
+
+    monkeypatch.setattr(executor.settings, "CPU_EXECUTOR_PROCESSES", 1)
+    monkeypatch.setattr(executor, "_process_pool", _DaemonPool())
+    assert asyncio.run(run_cpu_bound(len, b"abc")) == 3
+    assert executor._process_pool_disabled
+
+
+@pytest.mark.unit
+def test_function_errors_propagate(monkeypatch):
+    monkeypatch.setattr(executor.settings, "CPU_EXECUTOR_PROCESSES", 0)
+    with pytest.raises(ValueError):
+        asyncio.run(run_cpu_bound(int, "not-a-number"))
@@ -0,0 +1,92 @@
+"""
+FFmpeg工具函数单元测试
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.utils import ffmpeg_utils
+from src.utils.ffmpeg_utils import normalize_video_for_concat
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("has_audio", [True, False])
+def test_normalize_video_for_concat_builds_canonical_command(has_audio):
+    stream = {"width": 1921, "height": 1080, "fps": "30000/1001"}
+    with patch.object(ffmpeg_utils, "has_audio_stream", return_value=has_audio), \
+            patch.object(ffmpeg_utils, "probe_video_stream", return_value=stream), \
+            patch.object(ffmpeg_utils, "run_ffmpeg_command", return_value=(True, "", "")) as run:
+        assert normalize_video_for_concat("in.mp4", "out.mp4") is True
+
+    command = run.call_args.args[0]
+    video_filter = command[command.index("-vf") + 1]
+    # 分辨率和帧率沿用源视频（宽高取偶数），不降采样
+    assert "pad=1920:1080" in video_filter
+    assert "fps=30000/1001" in video_filter
+    assert command[command.index("-video_track_timescale") + 1] == "90000"
+    assert command[-1] == "out.mp4"
+
+    # 没有音轨的片段补静音，保证所有片段流结构一致
+    assert ("anullsrc" in " ".join(command)) is (not has_audio)
+
+
+@pytest.mark.unit
+def test_normalize_video_for_concat_uses_given_geometry():
+    geometry = {"width": 1280, "height": 720, "fps": "24/1"}
+    with patch.object(ffmpeg_utils, "has_audio_stream", return_value=True), \
+            patch.object(ffmpeg_utils, "probe_video_stream") as probe, \
+            patch.object(ffmpeg_utils, "run_ffmpeg_command", return_value=(True, "", "")) as run:
+        assert normalize_video_for_concat("in.mp4", "out.mp4", profile=geometry) is True
+
+    probe.assert_not_called()
+    video_filter = run.call_args.args[0][run.call_args.args[0].index("-vf") + 1]
+    assert "pad=1280:720" in video_filter and "fps=24/1" in video_filter
+
+    with patch.object(ffmpeg_utils, "probe_video_stream", return_value={"width": 1280, "height": 720, "fps": "48/2"}):
+        assert ffmpeg_utils.video_matches_concat_geometry("in.mp4", geometry)
+    with patch.object(ffmpeg_utils, "probe_video_stream", return_value=None), \
+            patch.object(ffmpeg_utils, "run_ffmpeg_command") as run:
+        assert not ffmpeg_utils.video_matches_concat_geometry("in.mp4", geometry)
+        assert normalize_video_for_concat("in.mp4", "out.mp4") is False
+    run.assert_not_called()
+
+@pytest.mark.unit
+def test_sentence_clips_use_mezzanine_profile_by_default():
+    with patch.object(ffmpeg_utils, "get_audio_duration", return_value=3.0):
+        command = ffmpeg_utils.build_sentence_video_command("i.jpg", "a.mp3", "out.mp4", "", {"fps": 25})
+        delivery = ffmpeg_utils.build_sentence_video_command(
+            "i.jpg", "a.mp3", "out.mp4", "", {"fps": 25, "clip_encoding_profile": "delivery"}
+        )
+
+    assert command[command.index("-preset") + 1] == "ultrafast"
+    assert command[command.index("-g") + 1] == "25"
+    assert delivery[delivery.index("-preset") + 1] == "medium"
+    assert delivery[delivery.index("-profile:v") + 1] == "high"
+
+
+@pytest.mark.unit
+def test_resolve_encoding_profile_falls_back_on_unknown_name():
+    assert ffmpeg_utils.resolve_encoding_profile({"output_encoding_profile": "bogus"}, "output_encoding_profile", "delivery") == "delivery"
+    with pytest.raises(ValueError):
+        ffmpeg_utils.get_encoding_args("bogus")
+
+
+@pytest.mark.unit
+def test_scale_crop_renderer_decodes_still_once():
+    with patch.object(ffmpeg_utils, "get_audio_duration", return_value=2.0):
+        command = ffmpeg_utils.build_sentence_video_command(
+            "still.png", "a.mp3", "out.mp4", "", {"fps": 30, "resolution": "1280x720"}
+        )
+        legacy = ffmpeg_utils.build_sentence_video_command(
+            "i.jpg", "a.mp3", "out.mp4", "", {"fps": 30, "resolution": "1280x720", "ken_burns_renderer": "zoompan"}
+        )
+
+    filter_complex = command[command.index("-filter_complex") + 1]
+    assert "-loop" not in command
+    assert "zoompan" not in filter_complex
+    assert "loop=loop=60:size=1" in filter_complex
+    assert "scale=1472:826" in filter_complex  # 按最大缩放倍数过采样的画布
+    assert "crop=1280:720" in filter_complex
+    assert "zoompan" in legacy[legacy.index("-filter_complex") + 1]
+    assert legacy[legacy.index("-loop") + 1] == "1"
@@ -0,0 +1,124 @@
+"""
+健康采样器单元测试
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.core import health
+from src.core.health import HealthSampler
+
+
+def _check(result=None, delay=0.0, error=None):
+    calls = []
+
+    async def check():
+        calls.append(1)
+        if delay:
+            await asyncio.sleep(delay)
+        if error:
+            raise error
+        return dict(result or {"status": "healthy"})
+
+    check.calls = calls
+    return check
+
+
+@pytest.mark.unit
+def test_snapshot_is_cached_between_refreshes():
+    database = _check()
+    sampler = HealthSampler({"database": database, "redis": _check()})
+
+    async def main():
+        first = await sampler.get_snapshot()
+        second = await sampler.get_snapshot()
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert first["status"] == "healthy"
+    assert second["sampled_at"] == first["sampled_at"]
+    assert len(database.calls) == 1
+    assert "latency_ms" in first["components"]["database"]
+
+
+@pytest.mark.unit
+def test_slow_and_failing_checks_are_isolated(monkeypatch):
+    monkeypatch.setattr(health.settings, "HEALTH_CHECK_TIMEOUT_SECONDS", 0.05)
+    sampler = HealthSampler({
+        "database": _check(),
+        "celery": _check(delay=1.0),
+        "minio": _check(error=ConnectionError("refused")),
+    })
+
+    snapshot = asyncio.run(sampler.get_snapshot())
+    assert snapshot["status"] == "degraded"
+    assert snapshot["components"]["celery"]["error"].startswith("timeout")
+    assert snapshot["components"]["minio"]["status"] == "unhealthy"
+    assert snapshot["components"]["minio"]["error"] == "refused"
+
+
+@pytest.mark.unit
+def test_critical_failure_or_stale_snapshot_is_unhealthy(monkeypatch):
+    sampler = HealthSampler({"database": _check(error=RuntimeError("down"))})
+    assert asyncio.run(sampler.get_snapshot())["status"] == "unhealthy"
+
+    sampler = HealthSampler({"database": _check()})
+    asyncio.run(sampler.refresh())
+    sampler._sampled_at -= health.settings.HEALTH_SAMPLE_INTERVAL_SECONDS * 4
+    snapshot = asyncio.run(sampler.get_snapshot())
+    assert snapshot["stale"] is True
+    assert snapshot["status"] == "unhealthy"
+
+
+@pytest.mark.unit
+def test_background_loop_refreshes_and_stops(monkeypatch):
+    monkeypatch.setattr(health.settings, "HEALTH_SAMPLE_INTERVAL_SECONDS", 0.01)
+    database = _check()
+    sampler = HealthSampler({"database": database})
+
+    async def main():
+        sampler.start()
+        await asyncio.sleep(0.05)
+        await sampler.stop()
+
+    asyncio.run(main())
+    assert len(database.calls) >= 2
+    assert sampler._task is None
+
+
+@pytest.mark.unit
+def test_blocking_check_is_skipped_while_previous_thread_runs(monkeypatch):
+    monkeypatch.setattr(health.settings, "HEALTH_CHECK_TIMEOUT_SECONDS", 0.05)
+    release = threading.Event()
+    calls = []
+
+    def hung_minio():
+        calls.append(1)
+        release.wait(5)
+        return {"status": "healthy"}
+
+    async def check():
+        return await health._run_blocking("test-hung", hung_minio)
+
+    sampler = HealthSampler({"minio": check})
+
+    async def main():
+        await sampler.refresh()
+        first = sampler._components["minio"]
+        await sampler.refresh()
+        return first, sampler._components["minio"]
+
+    try:
+        first, second = asyncio.run(main())
+    finally:
+        release.set()
+    assert first["error"].startswith("timeout")
+    assert second["error"] == "previous check still running"
+    assert len(calls) == 1
+
+
+@pytest.mark.unit
+def test_process_is_reused_between_samples():
+    assert health._get_process() is health._get_process()
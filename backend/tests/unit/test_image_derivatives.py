@@ -0,0 +1,68 @@
+"""
+图片衍生图单元测试
+"""
+
+import io
+
+import pytest
+from PIL import Image
+
+from src.utils import image_derivatives
+from src.utils.image_derivatives import get_derivative_key, get_derivative_urls, render_derivatives
+
+
+def _png(width: int, height: int, mode: str = "RGB") -> bytes:
+    output = io.BytesIO()
+    Image.new(mode, (width, height)).save(output, format="PNG")
+    return output.getvalue()
+
+
+@pytest.mark.unit
+def test_derivative_keys_are_deterministic():
+    key = "uploads/user-1/20260101/abc.png"
+    assert get_derivative_key(key, "thumbnail") == "derivatives/thumbnail/uploads/user-1/20260101/abc.webp"
+    assert get_derivative_key(key, "preview") == "derivatives/preview/uploads/user-1/20260101/abc.webp"
+    assert get_derivative_key("https://example.com/a.png", "thumbnail") is None
+    assert get_derivative_key(None, "thumbnail") is None
+
+
+@pytest.mark.unit
+def test_render_derivatives_fits_longest_edge(monkeypatch):
+    monkeypatch.setattr(image_derivatives.settings, "IMAGE_THUMBNAIL_MAX_SIZE", 320)
+    monkeypatch.setattr(image_derivatives.settings, "IMAGE_PREVIEW_MAX_SIZE", 1280)
+
+    rendered = render_derivatives(_png(2048, 1152))
+    sizes = {variant: Image.open(io.BytesIO(data)).size for variant, data in rendered.items()}
+    assert sizes == {"preview": (1280, 720), "thumbnail": (320, 180)}
+    assert Image.open(io.BytesIO(rendered["thumbnail"])).format == "WEBP"
+
+    # 小图不放大，透明通道保留
+    small = render_derivatives(_png(200, 100, mode="RGBA"))
+    image = Image.open(io.BytesIO(small["preview"]))
+    assert image.size == (200, 100)
+    assert image.mode == "RGBA"
+
+
+@pytest.mark.unit
+def test_derivative_urls_disabled(monkeypatch):
+    monkeypatch.setattr(image_derivatives.settings, "IMAGE_DERIVATIVES_ENABLED", False)
+    assert get_derivative_urls("uploads/a.png", "webp") == {"thumbnail_url": None, "preview_url": None}
+
+
+@pytest.mark.unit
+def test_derivative_urls_only_for_recorded_derivatives(monkeypatch):
+    monkeypatch.setattr(image_derivatives.settings, "IMAGE_DERIVATIVES_ENABLED", True)
+    signed = []
+    monkeypatch.setattr(
+        image_derivatives.storage_client, "get_presigned_url",
+        lambda key, expires: signed.append(key) or f"https://minio/{key}",
+    )
+
+    # 没有记录衍生图格式：不签发，前端回退到原图
+    assert get_derivative_urls("uploads/a.png", None) == {"thumbnail_url": None, "preview_url": None}
+    assert not signed
+
+    # 使用记录的格式，而不是当前配置的格式
+    urls = get_derivative_urls("uploads/a.png", "avif")
+    assert urls["thumbnail_url"] == "https://minio/derivatives/thumbnail/uploads/a.avif"
+    assert urls["preview_url"] == "https://minio/derivatives/preview/uploads/a.avif"
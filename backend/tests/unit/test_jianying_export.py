@@ -0,0 +1,68 @@
+import io
+import json
+import uuid
+import zipfile
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from src.services.jianying_export import JianYingExportPackage, JianYingExportService
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_iter_zip_streams_media_stored_and_json_deflated():
+    sentences = [
+        SimpleNamespace(id=uuid.uuid4(), image_url="img/1.jpg", audio_url="aud/1.mp3", audio_duration=2.0),
+        SimpleNamespace(id=uuid.uuid4(), image_url="img/2.jpg", audio_url="missing.mp3", audio_duration=None),
+    ]
+    objects = {"img/1.jpg": b"jpg-1", "aud/1.mp3": b"mp3-1", "img/2.jpg": b"jpg-2"}
+
+    async def read_object(key):
+        if key not in objects:
+            raise RuntimeError("not found")
+        return objects[key]
+
+    storage = Mock(read_object=AsyncMock(side_effect=read_object))
+    package = JianYingExportPackage(
+        chapter_id="c1", title="第一章", sentences=sentences, filename="c.zip", root_dir="draft_test"
+    )
+
+    with patch("src.services.jianying_export.get_storage_client", AsyncMock(return_value=storage)):
+        chunks = [chunk async for chunk in JianYingExportService(Mock()).iter_zip(package)]
+
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+    infos = {info.filename: info for info in archive.infolist()}
+    image_name = f"draft_test/draft_materials/images/{sentences[0].id}.jpg"
+    assert archive.read(image_name) == b"jpg-1"
+    assert infos[image_name].compress_type == zipfile.ZIP_STORED
+    assert infos["draft_test/draft_content.json"].compress_type == zipfile.ZIP_DEFLATED
+    assert f"draft_test/draft_materials/audios/{sentences[1].id}.mp3" not in infos
+
+    draft = json.loads(archive.read("draft_test/draft_content.json"))
+    assert len(draft["materials"]["images"]) == 2
+    assert len(draft["materials"]["audios"]) == 1
+    assert draft["duration"] == 2_000_000
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_export_to_storage_keeps_filename_returned_at_submit():
+    package = JianYingExportPackage(
+        chapter_id="c1", title="第一章", sentences=[], filename="第一章_new.zip", root_dir="draft_test"
+    )
+    storage = Mock(
+        generate_object_key=Mock(side_effect=lambda user_id, filename, prefix: f"{prefix}/{filename}"),
+        upload_stream=AsyncMock(return_value={"size": 10}),
+        get_presigned_url=Mock(return_value="https://minio/signed"),
+    )
+    service = JianYingExportService(Mock())
+    service.prepare_export = AsyncMock(return_value=package)
+    service.iter_zip = Mock(return_value=iter(()))
+
+    with patch("src.services.jianying_export.get_storage_client", AsyncMock(return_value=storage)):
+        result = await service.export_to_storage("c1", "u1", filename="第一章_submitted.zip")
+
+    assert result["filename"] == "第一章_submitted.zip"
+    assert result["object_key"] == "exports/jianying/第一章_submitted.zip"
@@ -0,0 +1,57 @@
+"""
+日志管道单元测试
+"""
+
+import logging
+import queue
+from unittest.mock import patch
+
+import pytest
+
+from src.core import logging as core_logging
+from src.core.logging import LogSamplingFilter, NonBlockingQueueHandler, get_log_pipeline_stats
+
+
+def _record(name, level=logging.INFO, msg="hello %s", args=("world",)):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+@pytest.mark.unit
+def test_rate_limit_and_sampling_use_longest_prefix():
+    log_filter = LogSamplingFilter(
+        rate_limits={"src.services": 100, "src.services.provider": 2},
+        sample_rates={"src.utils": 0.0},
+    )
+    before = get_log_pipeline_stats()
+
+    with patch.object(core_logging.time, "monotonic", return_value=1000.0):
+        allowed = [log_filter.filter(_record("src.services.provider.base")) for _ in range(5)]
+        assert allowed == [True, True, False, False, False]
+        # 告警及以上不受限速影响；其他日志器走自己的规则
+        assert log_filter.filter(_record("src.services.provider.base", logging.WARNING))
+        assert log_filter.filter(_record("src.services.prompt"))
+
+    # 令牌按时间补充
+    with patch.object(core_logging.time, "monotonic", return_value=1001.0):
+        assert log_filter.filter(_record("src.services.provider.base"))
+
+    assert not log_filter.filter(_record("src.utils.ffmpeg_utils"))
+    assert log_filter.filter(_record("src.utilsx"))
+
+    after = get_log_pipeline_stats()
+    assert after["rate_limited"] - before["rate_limited"] == 3
+    assert after["sampled_out"] - before["sampled_out"] == 1
+
+
+@pytest.mark.unit
+def test_queue_handler_interpolates_and_drops_when_full():
+    log_queue = queue.Queue(maxsize=1)
+    handler = NonBlockingQueueHandler(log_queue)
+    before = get_log_pipeline_stats()["dropped"]
+
+    handler.handle(_record("app"))
+    handler.handle(_record("app"))
+
+    queued = log_queue.get_nowait()
+    assert queued.msg == "hello world" and queued.args is None
+    assert get_log_pipeline_stats()["dropped"] - before == 1
@@ -0,0 +1,98 @@
+"""
+进程内指标单元测试
+"""
+
+import subprocess
+import urllib.request
+from unittest.mock import patch
+
+import pytest
+
+from src.core.metrics import (
+    FFMPEG_JOB_DURATION,
+    PROVIDER_RATE_LIMITED,
+    Counter,
+    Gauge,
+    Histogram,
+    Metric,
+    register_collector,
+    render_metrics,
+    start_metrics_server,
+)
+
+
+@pytest.mark.unit
+def test_metrics_render_prometheus_text():
+    histogram = Histogram("test_latency_seconds", "测试耗时", ("route",), buckets=(0.1, 1.0), register=False)
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.1, "/a")
+    histogram.observe(3, "/a")
+    lines = histogram.render()
+    assert 'test_latency_seconds_bucket{route="/a",le="0.1"} 2' in lines
+    assert 'test_latency_seconds_bucket{route="/a",le="1"} 2' in lines
+    assert 'test_latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'test_latency_seconds_count{route="/a"} 3' in lines
+
+    counter = Counter("test_events", "测试事件", ("kind",), register=False)
+    counter.inc('a"b')
+    assert counter.render()[-1] == 'test_events_total{kind="a\\"b"} 1'
+
+    gauge = Gauge("test_jobs", "测试任务数", register=False)
+    with gauge.track_inprogress():
+        assert gauge.value() == 1
+    assert gauge.value() == 0
+
+
+@pytest.mark.unit
+def test_metric_subclass_must_render_samples():
+    class Incomplete(Metric):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete("test_incomplete", "未实现渲染", register=False)
+
+
+@pytest.mark.unit
+def test_collectors_run_before_render():
+    gauge = Gauge("test_collected_value", "采集值")
+    register_collector(lambda: gauge.set(42))
+    assert "test_collected_value 42" in render_metrics()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_ffmpeg_and_provider_calls_are_recorded():
+    from src.services.provider.base import log_provider_call
+    from src.utils.ffmpeg_utils import run_ffmpeg_command
+
+    before = FFMPEG_JOB_DURATION.snapshot().get(("timeout",), {"count": 0})["count"]
+    with patch("src.utils.ffmpeg_utils.subprocess.run", side_effect=subprocess.TimeoutExpired("ffmpeg", 1)):
+        assert run_ffmpeg_command(["ffmpeg"], timeout=1)[0] is False
+    assert FFMPEG_JOB_DURATION.snapshot()[("timeout",)]["count"] == before + 1
+
+    class RateLimited(Exception):
+        status_code = 429
+
+    class FakeProvider:
+        base_url = "https://example.invalid"
+        api_key = "sk-test"
+
+        @log_provider_call("completions")
+        async def completions(self):
+            raise RateLimited("too many requests")
+
+    with pytest.raises(RateLimited):
+        await FakeProvider().completions()
+    assert sum(
+        value for (provider, _), value in PROVIDER_RATE_LIMITED._values.items() if provider == "FakeProvider"
+    ) == 1
+
+
+@pytest.mark.unit
+def test_metrics_server_serves_text():
+    server = start_metrics_server(0, host="127.0.0.1")
+    assert server is not None
+    port = server.server_address[1]
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+        assert response.headers["Content-Type"].startswith("text/plain")
+        assert b"# TYPE http_request_duration_seconds histogram" in response.read()
@@ -0,0 +1,81 @@
+"""
+密码哈希（bcrypt 线程池、排队上限、重新哈希）单元测试
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.core import security
+from src.core.security import (
+    PasswordHashBusyError,
+    get_password_hash,
+    get_password_hash_async,
+    password_needs_rehash,
+    shutdown_password_executor,
+    verify_and_update_password,
+    verify_password_async,
+)
+
+
+@pytest.fixture(autouse=True)
+def fast_rounds(monkeypatch):
+    monkeypatch.setattr(security.settings, "PASSWORD_BCRYPT_ROUNDS", 4)
+    yield
+    shutdown_password_executor()
+
+
+@pytest.mark.unit
+def test_hash_and_verify_run_in_password_pool():
+    async def main():
+        hashed = await get_password_hash_async("secret-pass")
+        return hashed, await verify_password_async("secret-pass", hashed), await verify_password_async("wrong", hashed)
+
+    hashed, ok, wrong = asyncio.run(main())
+    assert hashed.startswith("$2b$04$")
+    assert ok is True
+    assert wrong is False
+
+
+@pytest.mark.unit
+def test_rehash_when_cost_changes(monkeypatch):
+    old_hash = get_password_hash("secret-pass")
+    assert not password_needs_rehash(old_hash)
+
+    monkeypatch.setattr(security.settings, "PASSWORD_BCRYPT_ROUNDS", 5)
+    assert password_needs_rehash(old_hash)
+    assert password_needs_rehash("not-a-bcrypt-hash")
+
+    ok, new_hash = asyncio.run(verify_and_update_password("secret-pass", old_hash))
+    assert ok and new_hash.startswith("$2b$05$")
+
+    # 密码错误时不重新哈希
+    assert asyncio.run(verify_and_update_password("wrong", old_hash)) == (False, None)
+    # cost 一致时不返回新哈希
+    assert asyncio.run(verify_and_update_password("secret-pass", new_hash)) == (True, None)
+
+
+@pytest.mark.unit
+def test_rejects_when_queue_is_full(monkeypatch):
+    monkeypatch.setattr(security.settings, "PASSWORD_HASH_WORKERS", 1)
+    monkeypatch.setattr(security.settings, "PASSWORD_HASH_MAX_PENDING", 2)
+    release = threading.Event()
+    hashed = get_password_hash("secret-pass")
+
+    def blocking_verify(plain, hashed_password):
+        release.wait(5)
+        return True
+
+    monkeypatch.setattr(security, "verify_password", blocking_verify)
+
+    async def main():
+        pending = [asyncio.ensure_future(verify_password_async("secret-pass", hashed)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        with pytest.raises(PasswordHashBusyError):
+            await verify_password_async("secret-pass", hashed)
+        release.set()
+        return await asyncio.gather(*pending)
+
+    assert asyncio.run(main()) == [True, True]
+    assert security._password_pending == 0
@@ -0,0 +1,141 @@
+"""
+认证主体缓存单元测试
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy.orm import Session
+
+from src.core import principal_cache
+from src.core.principal_cache import (
+    _on_session_commit,
+    _on_user_changed,
+    build_principal,
+    cache_principal,
+    clear_local_principal_cache,
+    get_cached_principal,
+    get_principal_cache_stats,
+    serialize_principal,
+)
+from src.models.user import User
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value.encode("utf-8")
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+
+def _user(**overrides):
+    values = dict(
+        id=uuid.uuid4(),
+        username="alice",
+        email="alice@example.com",
+        password_hash="$2b$12$secret",
+        is_active=True,
+        is_verified=False,
+        timezone="Asia/Shanghai",
+        language="zh-CN",
+        created_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        updated_at=datetime(2026, 1, 2, tzinfo=timezone.utc),
+    )
+    values.update(overrides)
+    return User(**values)
+
+
+@pytest.fixture()
+def redis_client():
+    clear_local_principal_cache()
+    client = _FakeRedis()
+    with patch.object(principal_cache, "get_redis_client", return_value=client):
+        yield client
+    clear_local_principal_cache()
+
+
+@pytest.mark.unit
+def test_serialized_principal_round_trips_without_password_hash():
+    user = _user(last_login=datetime(2026, 3, 1, 8, 30, tzinfo=timezone.utc))
+    data = serialize_principal(user)
+    assert "password_hash" not in data
+
+    principal = build_principal(data)
+    assert principal.id == user.id
+    assert principal.last_login == user.last_login
+    assert principal.password_hash is None
+
+
+@pytest.mark.unit
+def test_cache_hits_local_then_redis(redis_client):
+    user = _user()
+
+    async def main():
+        assert await get_cached_principal(user.id) is None
+        await cache_principal(user)
+        local_hit = await get_cached_principal(user.id)
+        # 其它进程：本地缓存为空，从 Redis 读取
+        principal_cache._local_principals.clear()
+        redis_hit = await get_cached_principal(str(user.id))
+        return local_hit, redis_hit
+
+    local_hit, redis_hit = asyncio.run(main())
+    assert local_hit.username == redis_hit.username == "alice"
+    assert get_principal_cache_stats()["hits"] == 2
+    assert get_principal_cache_stats()["misses"] == 1
+
+
+@pytest.mark.unit
+def test_inactive_users_are_not_cached(redis_client):
+    user = _user(is_active=False)
+    asyncio.run(cache_principal(user))
+    assert not redis_client.store
+    assert asyncio.run(get_cached_principal(user.id)) is None
+
+
+@pytest.mark.unit
+def test_user_update_invalidates_after_commit(redis_client):
+    user = _user()
+    session = Session()
+    session.add(user)
+
+    async def main():
+        await cache_principal(user)
+        _on_user_changed(None, None, user)
+        assert str(user.id) not in principal_cache._local_principals
+        # 提交前被其它请求重新写入的旧记录在提交后再次失效
+        await cache_principal(user)
+        _on_session_commit(session)
+        await asyncio.gather(*principal_cache._pending_deletes)
+        return await get_cached_principal(user.id)
+
+    assert asyncio.run(main()) is None
+    assert not redis_client.store
+
+
+@pytest.mark.unit
+def test_required_dependency_skips_database_on_cache_hit(redis_client):
+    from src.api import dependencies
+
+    user = _user()
+    db = AsyncMock()
+
+    async def main():
+        await cache_principal(user)
+        with patch.object(dependencies, "identity_from_token", return_value=str(user.id)):
+            return await dependencies.get_current_user_required("token", db)
+
+    principal = asyncio.run(main())
+    assert principal.id == user.id
+    db.execute.assert_not_awaited()
@@ -0,0 +1,27 @@
+"""
+提示词批量生成单元测试
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.services.prompt import build_batch_user_message, parse_batch_response
+
+
+@pytest.mark.unit
+def test_batch_message_round_trip():
+    sentences = [SimpleNamespace(id=f"uuid-{i}", content=f"第{i}句。") for i in range(3)]
+    message, keyed = build_batch_user_message(sentences, ["前文。"])
+
+    payload = json.loads(message)
+    assert payload["context"] == "前文。"
+    assert [item["id"] for item in payload["sentences"]] == ["1", "2", "3"]
+    assert keyed["2"].id == "uuid-1"
+
+    content = '```json\n{"1": "a girl in rain", "3": "  ", "9": "extra"}\n```'
+    # 空值和多余的键被丢弃，漏掉的句子由调用方逐句补齐
+    assert parse_batch_response(content, list(keyed)) == {"1": "a girl in rain"}
+    assert parse_batch_response('{"prompts": {"2": "city"}}', list(keyed)) == {"2": "city"}
+    assert parse_batch_response("not json", list(keyed)) == {}
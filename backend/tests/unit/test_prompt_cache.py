@@ -0,0 +1,64 @@
+"""
+提示词缓存单元测试
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.services import prompt_cache
+from src.services.prompt_cache import (
+    PromptCache,
+    cached_completion,
+    clear_local_prompt_cache,
+    get_prompt_cache_stats,
+    is_json_object,
+)
+
+
+def _response(content):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+@pytest.fixture(autouse=True)
+def local_only_cache():
+    """只使用进程内缓存"""
+    clear_local_prompt_cache()
+    with patch.object(prompt_cache, "get_redis_client", return_value=None):
+        yield
+    clear_local_prompt_cache()
+
+
+@pytest.mark.unit
+def test_cache_key_changes_with_every_input():
+    cache = PromptCache("sentence_prompt")
+    base = dict(content="他推开门。", style="anime", model="deepseek-chat", system_prompt="sys")
+
+    assert cache.make_key(**base) == cache.make_key(**dict(reversed(list(base.items()))))
+    for field in base:
+        assert cache.make_key(**{**base, field: "other"}) != cache.make_key(**base)
+    assert PromptCache("storyboard_shots").make_key(**base) != cache.make_key(**base)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_cached_completion_hits_bypass_and_validation():
+    provider = SimpleNamespace(completions=AsyncMock(return_value=_response(" a cat \n")))
+    messages = [{"role": "user", "content": "猫"}]
+
+    assert await cached_completion(provider, "ns", "m", messages) == "a cat"
+    assert await cached_completion(provider, "ns", "m", messages) == "a cat"
+    assert provider.completions.await_count == 1
+
+    # 显式跳过缓存时重新请求
+    await cached_completion(provider, "ns", "m", messages, bypass=True)
+    assert provider.completions.await_count == 2
+    assert get_prompt_cache_stats()["ns"] == {"hits": 1, "misses": 1, "bypassed": 1, "errors": 0}
+
+    # 校验不通过的结果不缓存
+    provider.completions.return_value = _response("not json")
+    await cached_completion(provider, "json", "m", messages, validate=is_json_object)
+    await cached_completion(provider, "json", "m", messages, validate=is_json_object)
+    assert provider.completions.await_count == 4
+    assert is_json_object('```json\n{"shots": []}\n```')
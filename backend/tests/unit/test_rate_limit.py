@@ -0,0 +1,95 @@
+"""
+请求限流单元测试
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.core import rate_limit
+from src.core.rate_limit import RateLimiter, RateLimitPolicy, gcra, resolve_identity
+
+CLASSES = {"default": "100/60", "export": "2/60"}
+ROUTES = [["POST", r"/export/", "export", 1], ["POST", r"/batch$", "export", 2]]
+
+
+def _limiter(redis_client=None):
+    return RateLimiter(CLASSES, ROUTES, exempt_paths=["/health"], redis_factory=lambda: redis_client)
+
+
+@pytest.mark.unit
+def test_gcra_allows_burst_then_refills():
+    policy = RateLimitPolicy.parse("export", "2/60")
+    tat = now = 1000.0
+
+    allowed, tat, remaining, _, _ = gcra(tat, now, policy, 1)
+    assert allowed and remaining == 1
+    allowed, tat, remaining, reset_after, _ = gcra(tat, now, policy, 1)
+    assert allowed and remaining == 0 and reset_after == 60
+    allowed, _, _, _, retry_after = gcra(tat, now, policy, 1)
+    assert not allowed and retry_after == 30
+
+    assert gcra(tat, now + 30, policy, 1)[0]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_local_limiter_classifies_routes_and_sets_headers():
+    limiter = _limiter()
+
+    assert await limiter.check("ip:1.2.3.4", "GET", "/health/system") is None
+    assert limiter.classify("GET", "/api/v1/export/jianying/1")[0].name == "default"
+    assert limiter.classify("POST", "/api/v1/scripts/1/batch") == (limiter.policies["export"], 2)
+
+    first = await limiter.check("u:1", "POST", "/api/v1/export/jianying/1")
+    second = await limiter.check("u:1", "POST", "/api/v1/export/jianying/1")
+    denied = await limiter.check("u:1", "POST", "/api/v1/export/jianying/1")
+    assert first.allowed and second.allowed and not denied.allowed
+    assert denied.headers()["RateLimit-Limit"] == "2"
+    assert denied.headers()["RateLimit-Remaining"] == "0"
+    assert "Retry-After" in denied.headers()
+
+    # 其他用户、其他路由类各自计额
+    assert (await limiter.check("u:2", "POST", "/api/v1/export/jianying/1")).allowed
+    assert (await limiter.check("u:1", "GET", "/api/v1/projects")).allowed
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_redis_decision_is_used_and_local_denial_skips_redis():
+    client = MagicMock()
+    client.script_load = AsyncMock(return_value="sha")
+    client.evalsha = AsyncMock(return_value=[0, 0, 60000, 30000])
+    limiter = _limiter(client)
+
+    denied = await limiter.check("u:1", "POST", "/api/v1/export/x")
+    assert not denied.allowed and denied.retry_after == 30
+    assert client.evalsha.await_args.args[:3] == ("sha", 1, "rl:export:u:1")
+
+    # 本地已同步为超限，不再访问 Redis
+    assert not (await limiter.check("u:1", "POST", "/api/v1/export/x")).allowed
+    assert client.evalsha.await_count == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_redis_failure_falls_back_to_local_limiter():
+    client = MagicMock()
+    client.script_load = AsyncMock(side_effect=ConnectionError("down"))
+    limiter = _limiter(client)
+
+    assert (await limiter.check("u:1", "POST", "/api/v1/export/x")).allowed
+    assert (await limiter.check("u:1", "POST", "/api/v1/export/x")).allowed
+    assert not (await limiter.check("u:1", "POST", "/api/v1/export/x")).allowed
+    assert client.script_load.await_count == 1
+
+
+@pytest.mark.unit
+def test_identity_prefers_valid_token_over_ip():
+    rate_limit._identity_cache.clear()
+    with patch("src.core.security.verify_token", return_value={"sub": "user-1", "exp": 4102444800}) as verify:
+        assert resolve_identity("Bearer abc", "1.2.3.4") == "u:user-1"
+        assert resolve_identity("Bearer abc", "1.2.3.4") == "u:user-1"
+        assert verify.call_count == 1
+    assert resolve_identity(None, "1.2.3.4") == "ip:1.2.3.4"
+    assert resolve_identity("Bearer invalid", None) == "ip:unknown"
@@ -0,0 +1,72 @@
+"""
+请求中间件单元测试
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from src.core.exceptions import NotFoundError
+from src.core.metrics import HTTP_REQUEST_DURATION, HTTP_REQUEST_ERRORS
+from src.middleware import RequestMiddleware
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(RequestMiddleware)
+
+    @app.get("/mw-items/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    @app.get("/mw-missing")
+    async def missing():
+        raise NotFoundError("资源不存在")
+
+    @app.get("/mw-boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    @app.get("/mw-stream")
+    async def stream():
+        async def events():
+            for index in range(3):
+                yield f"data: {index}\n\n"
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return TestClient(app, raise_server_exceptions=False)
+
+
+@pytest.mark.unit
+def test_headers_request_id_and_route_histogram():
+    client = _client()
+
+    response = client.get("/mw-items/1", headers={"X-Request-ID": "req-12345678"})
+    assert response.status_code == 200
+    assert response.headers["x-request-id"] == "req-12345678"
+    assert response.headers["x-content-type-options"] == "nosniff"
+    assert float(response.headers["x-process-time"]) >= 0
+
+    # 非法的请求ID被替换
+    assert client.get("/mw-items/2", headers={"X-Request-ID": "bad id"}).headers["x-request-id"] != "bad id"
+
+    snapshot = HTTP_REQUEST_DURATION.snapshot()
+    assert snapshot[("GET", "/mw-items/{item_id}", "200")]["count"] >= 2
+
+
+@pytest.mark.unit
+def test_exceptions_are_mapped_and_streams_pass_through():
+    client = _client()
+
+    missing = client.get("/mw-missing")
+    assert missing.status_code == 404 and missing.json()["code"] == "NOT_FOUND"
+
+    boom = client.get("/mw-boom")
+    assert boom.status_code == 500 and boom.json()["code"] == "INTERNAL_SERVER_ERROR"
+    assert "x-request-id" in boom.headers
+    assert HTTP_REQUEST_ERRORS.value("GET", "/mw-boom") >= 1
+
+    stream = client.get("/mw-stream")
+    assert stream.text == "data: 0\n\ndata: 1\n\ndata: 2\n\n"
+    assert stream.headers["content-type"].startswith("text/event-stream")
@@ -0,0 +1,68 @@
+import uuid
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.services import sentence_projection
+from src.services.sentence_projection import (
+    EXPORT_SENTENCE_COLUMNS,
+    SentenceProjectionService,
+    invalidate_chapter_meta,
+    invalidate_project_meta,
+)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_list_sentence_rows_selects_only_projected_columns():
+    session = Mock()
+    session.execute = AsyncMock(return_value=Mock(all=Mock(return_value=[])))
+
+    await SentenceProjectionService(session).list_sentence_rows(uuid.uuid4(), EXPORT_SENTENCE_COLUMNS)
+
+    sql = str(session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "chapters" not in sql
+    assert "projects" not in sql
+    assert "sentences.content" not in sql
+    assert "ORDER BY sentences.paragraph_order, sentences.order_index" in sql
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_chapter_meta_is_cached_until_invalidated():
+    chapter_id, project_id, owner_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    row = (chapter_id, project_id, owner_id, "第一章", 1, "小说", "picture_narrative")
+    session = Mock()
+    session.execute = AsyncMock(return_value=Mock(first=Mock(return_value=row)))
+    service = SentenceProjectionService(session)
+
+    first = await service.get_chapter_meta(chapter_id)
+    second = await service.get_chapter_meta(chapter_id)
+    invalidate_chapter_meta(chapter_id)
+    await service.get_chapter_meta(chapter_id)
+
+    assert first is second
+    assert first.owner_id == owner_id
+    assert session.execute.await_count == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_project_update_invalidates_its_chapters_meta():
+    project_id, other_project_id = uuid.uuid4(), uuid.uuid4()
+    rows = {
+        chapter_id: (chapter_id, pid, uuid.uuid4(), "章", 1, "小说", None)
+        for chapter_id, pid in ((uuid.uuid4(), project_id), (uuid.uuid4(), other_project_id))
+    }
+    session = Mock()
+    service = SentenceProjectionService(session)
+    for chapter_id, row in rows.items():
+        session.execute = AsyncMock(return_value=Mock(first=Mock(return_value=row)))
+        await service.get_chapter_meta(chapter_id)
+
+    invalidate_project_meta(project_id)
+
+    cached = {meta.project_id for _, meta in sentence_projection._chapter_meta_cache.values()}
+    assert project_id not in cached
+    assert other_project_id in cached
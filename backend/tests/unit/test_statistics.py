@@ -0,0 +1,85 @@
+import uuid
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.services.statistics import COUNTER_FIELDS, StatisticsService
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_increment_upserts_project_and_user_rows_atomically():
+    session = Mock()
+    session.execute = AsyncMock()
+    service = StatisticsService(session)
+
+    await service.increment(uuid.uuid4(), uuid.uuid4(), image_count=3, audio_count=0)
+
+    assert session.execute.await_count == 2
+    sql = str(session.execute.await_args_list[0].args[0].compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT ON CONSTRAINT uq_statistics_scope DO UPDATE" in sql
+    assert "greatest(statistics_counters.image_count +" in sql
+    assert "audio_count +" not in sql
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_record_new_sentence_assets_counts_only_new_assets_per_project():
+    owner_id = uuid.uuid4()
+    project_a, project_b = uuid.uuid4(), uuid.uuid4()
+    sentences = [
+        Mock(id=1, project_id=project_a, image_url="a.png"),
+        Mock(id=2, project_id=project_a, image_url="b.png"),
+        Mock(id=3, project_id=project_b, image_url="c.png"),
+        Mock(id=4, project_id=project_b, image_url=None),
+    ]
+    service = StatisticsService(Mock())
+    service.increment = AsyncMock()
+
+    added = await service.record_new_sentence_assets(owner_id, sentences, "image_url", "image_count", {2})
+
+    assert added == 2
+    service.increment.assert_any_await(owner_id, project_a, image_count=1)
+    service.increment.assert_any_await(owner_id, project_b, image_count=1)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_apply_content_change_increments_difference():
+    owner_id, project_id = uuid.uuid4(), uuid.uuid4()
+    service = StatisticsService(Mock())
+    service.increment = AsyncMock()
+
+    removed = {"chapter_count": 1, "video_count": 1, "paragraph_count": 4, "sentence_count": 20, "image_count": 7}
+    await service.apply_content_change(
+        project_id,
+        removed=removed,
+        added={"chapter_count": 1, "video_count": 1, "paragraph_count": 5, "sentence_count": 18},
+        owner_id=owner_id,
+    )
+
+    service.increment.assert_awaited_once()
+    deltas = service.increment.await_args.kwargs
+    assert deltas["paragraph_count"] == 1
+    assert deltas["sentence_count"] == -2
+    assert deltas["image_count"] == -7
+    assert deltas["chapter_count"] == 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_reconcile_project_locks_row_before_counting():
+    service = StatisticsService(Mock())
+    calls = []
+    service._lock_project_row = AsyncMock(side_effect=lambda *a: calls.append("lock") or {"image_count": 2})
+    service.compute_counters = AsyncMock(
+        side_effect=lambda ids: calls.append("count") or {ids[0]: {**dict.fromkeys(COUNTER_FIELDS, 0), "image_count": 5}}
+    )
+    service._apply_delta = AsyncMock()
+    service._set_counters = AsyncMock()
+
+    await service.reconcile_project(uuid.uuid4(), uuid.uuid4())
+
+    assert calls == ["lock", "count"]
+    assert service._apply_delta.await_args.args[3]["image_count"] == 3
@@ -2,6 +2,7 @@
 存储服务单元测试
 """
 
+import asyncio
 import pytest
 import tempfile
 import os
@@ -410,6 +411,44 @@ class TestMinIOStorage:
         assert result is True
         mock_storage.client.copy_object.assert_called_once()
 
+    @pytest.mark.unit
+    def test_upload_stream_producer_error_waits_for_upload(self, storage_client):
+        """测试数据源出错时等待上传线程退出，抛出原始异常"""
+        storage, mock_client = storage_client
+        finished = []
+
+        def put_object(**kwargs):
+            try:
+                while kwargs["data"].read(1024):
+                    pass
+            finally:
+                finished.append(True)
+
+        mock_client.put_object.side_effect = put_object
+
+        async def chunks():
+            yield b"part"
+            raise ConnectionError("source closed")
+
+        with pytest.raises(ConnectionError):
+            asyncio.run(storage.upload_stream("a.bin", chunks()))
+        # 上传线程已退出，其异常已被取走
+        assert finished == [True]
+
+    @pytest.mark.unit
+    def test_upload_stream_wraps_early_upload_failure(self, storage_client):
+        """测试上传线程提前失败时抛出 StorageError"""
+        storage, mock_client = storage_client
+        mock_client.put_object.side_effect = ConnectionResetError("reset by peer")
+
+        async def chunks():
+            while True:
+                await asyncio.sleep(0.01)
+                yield b"part"
+
+        with pytest.raises(StorageError, match="reset by peer"):
+            asyncio.run(storage.upload_stream("a.bin", chunks()))
+
 
 class TestStorageIntegration:
     """存储服务集成测试"""
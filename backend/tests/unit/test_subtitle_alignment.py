@@ -0,0 +1,76 @@
+"""
+字幕强制对齐单元测试
+"""
+
+import pytest
+
+from src.services.subtitle_alignment import align_text, align_timeline, tokenize
+
+
+@pytest.mark.unit
+def test_tokenize_attaches_punctuation_and_groups_latin_words():
+    tokens = tokenize("他说：OK，走吧！")
+    assert [t["text"] for t in tokens] == ["他", "说：", "OK，", "走", "吧！"]
+    assert [t["clause_end"] for t in tokens] == [False, True, True, False, True]
+
+
+@pytest.mark.unit
+def test_align_text_without_pauses_is_proportional():
+    segments = align_text("一二三四", 2.0)
+    words = segments[0]["words"]
+    assert [(w["start"], w["end"]) for w in words] == [(0.0, 0.5), (0.5, 1.0), (1.0, 1.5), (1.5, 2.0)]
+
+
+@pytest.mark.unit
+def test_align_text_snaps_clause_boundaries_to_pauses():
+    # 第一小句 2 字、第二小句 6 字；停顿在 1.0-1.5 秒，比按字数比例（0.8 秒附近）晚
+    segments = align_text("你好，今天天气很好。", 3.5, silences=[(1.0, 1.5), (3.3, 3.5)])
+
+    assert [s["text"] for s in segments] == ["你好，", "今天天气很好。"]
+    assert segments[0]["start"] == 0.0
+    assert segments[0]["end"] == 1.0
+    assert segments[1]["start"] == 1.5
+    assert segments[1]["end"] == 3.3
+    # 小句内按字等分
+    assert [w["start"] for w in segments[1]["words"]] == [1.5, 1.8, 2.1, 2.4, 2.7, 3.0]
+
+
+@pytest.mark.unit
+def test_align_timeline_maps_provider_words_onto_text():
+    timeline = [
+        {"text": "你好", "start": 0.1, "end": 0.5},
+        {"text": "今天", "start": 0.9, "end": 1.3},
+        {"text": "天气很好", "start": 1.3, "end": 2.1},
+    ]
+    segments = align_timeline("你好，今天天气很好。", timeline, duration=2.3)
+
+    assert [s["text"] for s in segments] == ["你好，", "今天天气很好。"]
+    assert segments[0]["words"][0] == {"word": "你", "start": 0.1, "end": 0.3}
+    assert segments[1]["start"] == 0.9
+    assert segments[1]["end"] == 2.1
+
+
+@pytest.mark.unit
+def test_align_timeline_interpolates_unmatched_tokens():
+    # 服务把 "3" 读作 "三"，时间轴里没有 "3"
+    timeline = [
+        {"text": "买", "start": 0.0, "end": 0.2},
+        {"text": "三", "start": 0.2, "end": 0.4},
+        {"text": "个", "start": 0.4, "end": 0.6},
+        {"text": "苹", "start": 0.6, "end": 0.8},
+        {"text": "果", "start": 0.8, "end": 1.0},
+    ]
+    words = align_timeline("买3个苹果", timeline)[0]["words"]
+    assert (words[1]["start"], words[1]["end"]) == (0.2, 0.4)
+
+    # 时间轴对应的不是这段文本
+    assert align_timeline("完全不同的句子", timeline) == []
+
+
+
+@pytest.mark.unit
+def test_tokenize_attaches_opening_marks_to_following_token():
+    tokens = tokenize("他说：“你好，世界。”《三体》真好看……")
+    assert [t["text"] for t in tokens] == [
+        "他", "说：", "“你", "好，", "世", "界。”", "《三", "体》", "真", "好", "看……",
+    ]
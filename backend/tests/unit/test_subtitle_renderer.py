@@ -0,0 +1,65 @@
+"""
+字幕渲染单元测试
+"""
+
+import pytest
+
+from src.services.subtitle_alignment import align_text
+from src.services.subtitle_service import SubtitleService
+
+
+def _words(*items):
+    return [{"word": word, "start": start, "end": end} for word, start, end in items]
+
+
+SUBTITLE_DATA = {
+    "segments": [{
+        "words": _words(
+            ("今天", 0.0, 0.4), ("天气", 0.4, 0.8), ("很好，", 0.8, 1.2),
+            ("我们", 1.3, 1.6), ("一起", 1.6, 1.9), ("去公园散步", 1.9, 2.6),
+            ("然后", 2.6, 2.9), ("再去餐厅吃饭", 2.9, 3.4),
+        )
+    }]
+}
+
+
+@pytest.mark.unit
+def test_build_subtitle_cues_breaks_on_punctuation_and_splits_long_lines():
+    cues = SubtitleService().build_subtitle_cues(SUBTITLE_DATA)
+
+    assert cues[0] == {"start": 0.0, "end": 1.2, "lines": ["今天天气很好"]}
+    assert cues[1]["start"] == 1.3 and cues[1]["end"] == 3.4
+    assert cues[1]["lines"] == ["我们一起去公园散步", "然后再去餐厅吃饭"]
+
+
+@pytest.mark.unit
+def test_build_subtitle_cues_strips_full_width_punctuation_from_aligned_text():
+    segments = align_text("他说：“你好，世界。”《三体》真好看……", 5.0)
+    cues = SubtitleService().build_subtitle_cues({"segments": segments})
+
+    assert [cue["lines"] for cue in cues] == [["他说"], ["你好"], ["世界"], ["三体"], ["真好看"]]
+
+
+@pytest.mark.unit
+def test_ass_renderer_emits_single_filter(tmp_path):
+    service = SubtitleService()
+    gen_setting = {"resolution": "1280x720", "subtitle_style": {"font_size": 50, "color": "#FFCC00"}}
+
+    subtitle_filter = service.create_subtitle_filter(SUBTITLE_DATA, gen_setting, tmp_path)
+    assert subtitle_filter == f"ass=filename='{tmp_path / 'subtitles.ass'}'"
+
+    content = (tmp_path / "subtitles.ass").read_text(encoding="utf-8")
+    assert "PlayResX: 1280" in content
+    assert "Style: Text,Arial,50,&H0000CCFF," in content
+    # 双行字幕：每行一个底框事件和一个文字事件，第二行在基准线下方
+    assert content.count("Dialogue: 1,") == 3
+    assert "Dialogue: 1,0:00:01.30,0:00:03.40,Text,,0,0,0,,{\\an8\\pos(640,642)}然后再去餐厅吃饭" in content
+
+
+@pytest.mark.unit
+def test_drawtext_renderer_is_still_available():
+    subtitle_filter = SubtitleService().create_subtitle_filter(
+        SUBTITLE_DATA, {"resolution": "1280x720", "subtitle_renderer": "drawtext"}
+    )
+    assert subtitle_filter.count("drawtext=") == 3
+    assert "enable='between(t,0.000,1.200)'" in subtitle_filter
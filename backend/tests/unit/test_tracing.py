@@ -0,0 +1,99 @@
+"""
+链路追踪单元测试
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from src.core import tracing
+from src.core.tracing import (
+    FileSpanExporter,
+    SpanContext,
+    collect_breakdown,
+    extract,
+    get_current_span,
+    inject,
+    record_span,
+    start_span,
+)
+
+
+@pytest.mark.unit
+def test_traceparent_round_trip():
+    with start_span("parent") as span:
+        headers = {}
+        inject(headers)
+        context = extract(headers)
+    assert context == span.context
+    assert headers["traceparent"].startswith(f"00-{span.context.trace_id}-")
+
+    assert extract({"traceparent": "garbage"}) is None
+    assert extract({}) is None
+
+
+@pytest.mark.unit
+def test_child_spans_share_trace_and_restore_parent():
+    remote = SpanContext(trace_id="a" * 32, span_id="b" * 16)
+    with start_span("task", parent=remote) as task_span:
+        with start_span("child") as child:
+            assert get_current_span() is child
+        assert get_current_span() is task_span
+    assert task_span.parent_span_id == "b" * 16
+    assert child.context.trace_id == "a" * 32
+    assert child.parent_span_id == task_span.context.span_id
+    assert get_current_span() is None
+
+
+@pytest.mark.unit
+def test_breakdown_aggregates_spans_across_asyncio_tasks():
+    async def sentence(index):
+        with start_span("video.sentence", {"sentence.index": index}):
+            await asyncio.sleep(0.01)
+
+    async def main():
+        with start_span("video.synthesize"), collect_breakdown() as breakdown:
+            await asyncio.gather(*(sentence(i) for i in range(3)))
+            record_span("ffmpeg", 0.0)
+        return breakdown.to_dict()
+
+    result = asyncio.run(main())
+    assert result["trace_id"]
+    assert result["stages"]["video.sentence"]["count"] == 3
+    assert result["stages"]["ffmpeg"]["count"] == 1
+    assert "video.synthesize" not in result["stages"]
+
+
+@pytest.mark.unit
+def test_span_error_is_recorded_and_exported_as_otlp(tmp_path):
+    with pytest.raises(ValueError):
+        with start_span("failing", {"retries": 2}) as span:
+            raise ValueError("boom")
+    assert span.status_error == "ValueError: boom"
+
+    path = tmp_path / "traces.jsonl"
+    FileSpanExporter(str(path)).export([span])
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    exported = payload["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+    assert exported["name"] == "failing"
+    assert exported["status"]["code"] == 2
+    assert {"key": "retries", "value": {"intValue": "2"}} in exported["attributes"]
+
+
+@pytest.mark.unit
+def test_spans_are_not_exported_when_disabled(monkeypatch):
+    submitted = []
+
+    class _Processor:
+        def submit(self, span):
+            submitted.append(span)
+
+    monkeypatch.setattr(tracing, "_processor", _Processor())
+    monkeypatch.setattr(tracing.settings, "TRACING_ENABLED", False)
+    with start_span("quiet"):
+        pass
+    monkeypatch.setattr(tracing.settings, "TRACING_ENABLED", True)
+    with start_span("loud"):
+        pass
+    assert [span.name for span in submitted] == ["loud"]
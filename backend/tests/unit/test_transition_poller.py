@@ -0,0 +1,46 @@
+"""
+过渡视频状态轮询单元测试
+"""
+
+import pytest
+
+from src.core.config import settings
+from src.services.transition_poller import (
+    compute_next_poll_delay,
+    compute_retry_delay,
+    parse_task_status,
+)
+
+
+@pytest.mark.unit
+def test_parse_task_status_maps_vendor_states():
+    assert parse_task_status({"status": "video_generating"}).kind == "pending"
+
+    completed = parse_task_status({"status": "completed", "detail": {"video_url": "https://v/1.mp4"}})
+    assert completed.kind == "completed"
+    assert completed.video_url == "https://v/1.mp4"
+
+    assert parse_task_status({"status": "completed"}).kind == "failed"
+    assert parse_task_status({"status": "failed", "error": {"code": 1}}).error == '{"code": 1}'
+    assert parse_task_status({"status": "weird"}).kind == "unknown"
+
+
+@pytest.mark.unit
+def test_poll_delay_uses_eta_and_age_within_bounds():
+    min_interval = settings.TRANSITION_POLL_MIN_INTERVAL_SECONDS
+    max_interval = settings.TRANSITION_POLL_MAX_INTERVAL_SECONDS
+
+    # 刚提交的任务按最小间隔查询，跑得越久查得越少
+    assert compute_next_poll_delay(5) == min_interval
+    assert compute_next_poll_delay(1200) == 120
+    assert compute_next_poll_delay(10 ** 6) == max_interval
+
+    # 供应商给出预计剩余时间时按预计时间
+    assert compute_next_poll_delay(5, eta_seconds=60) == 60
+
+    # 只有进度时按已用时间推算：用时 100 秒完成 50%，剩余约 100 秒
+    outcome = parse_task_status({"status": "processing", "progress": 50}, age_seconds=100)
+    assert outcome.eta_seconds == pytest.approx(100)
+
+    assert compute_retry_delay(1) == min_interval * 2
+    assert compute_retry_delay(50) == max_interval
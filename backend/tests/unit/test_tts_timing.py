@@ -0,0 +1,54 @@
+"""
+TTS 时间轴解析单元测试
+"""
+
+import base64
+import json
+
+import pytest
+
+from src.services.provider.tts_timing import normalize_tts_timeline, parse_speech_response
+
+
+class _Response:
+    def __init__(self, content: bytes, content_type: str):
+        self.content = content
+        self.headers = {"content-type": content_type}
+
+
+@pytest.mark.unit
+def test_binary_audio_has_no_timeline():
+    result = parse_speech_response(_Response(b"ID3\x04audio", "audio/mpeg"))
+    assert result.audio == b"ID3\x04audio"
+    assert result.timeline is None
+
+
+@pytest.mark.unit
+def test_json_response_with_character_alignment():
+    payload = {
+        "audio_base64": base64.b64encode(b"mp3-bytes").decode(),
+        "alignment": {
+            "characters": ["你", "好"],
+            "character_start_times_seconds": [0.0, 0.25],
+            "character_end_times_seconds": [0.25, 0.5],
+        },
+    }
+    result = parse_speech_response(_Response(json.dumps(payload).encode(), "application/json"))
+    assert result.audio == b"mp3-bytes"
+    assert result.timeline == [
+        {"text": "你", "start": 0.0, "end": 0.25},
+        {"text": "好", "start": 0.25, "end": 0.5},
+    ]
+
+
+@pytest.mark.unit
+def test_millisecond_word_entries_nested_in_data():
+    payload = {"data": {"words": [{"word": "hello", "begin_time": 120, "end_time": 480}, {"text": "x"}]}}
+    assert normalize_tts_timeline(payload) == [{"text": "hello", "start": 0.12, "end": 0.48}]
+    assert normalize_tts_timeline({"audio": "..."}) is None
+
+
+@pytest.mark.unit
+def test_json_response_without_audio_is_rejected():
+    with pytest.raises(ValueError):
+        parse_speech_response(b'{"error": "quota"}')
@@ -0,0 +1,44 @@
+"""
+视频合成服务单元测试
+"""
+
+import asyncio
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.services import video_composition_service as composition
+from src.services.video_composition_service import VideoCompositionService
+
+
+@pytest.mark.unit
+def test_ken_burns_still_is_prepared_once_per_task(tmp_path):
+    service = VideoCompositionService()
+    prepared = []
+
+    async def fetch(image_url, path):
+        # 让出事件循环，模拟下载期间其它句子排队等待同一把锁
+        await asyncio.sleep(0.01)
+        Path(path).write_bytes(b"image")
+
+    def prepare(source_path, output_path, resolution):
+        prepared.append(output_path)
+        Path(output_path).write_bytes(b"still")
+        return True
+
+    async def main():
+        return await asyncio.gather(*(
+            service.get_ken_burns_still("img.jpg", tmp_path, "1280x720") for _ in range(3)
+        ))
+
+    with patch.object(composition.material_service, "fetch_material_from_minio", side_effect=fetch), \
+            patch.object(composition, "prepare_ken_burns_still", side_effect=prepare):
+        paths = asyncio.run(main())
+
+    assert len(set(paths)) == 1
+    assert len(prepared) == 1
+    assert service._still_locks
+
+    service.release_ken_burns_stills(tmp_path)
+    assert not service._still_locks